@@ -0,0 +1,341 @@
+"""asyncio 기반 HLS/DASH 조각 다운로더
+
+조각 URL 목록을 정해진 동시 요청 수로 받아 순서대로 파일에 이어 씁니다. HTTP/1.1 keep-alive
+연결을 재사용하므로 조각마다 TCP/TLS 연결을 새로 맺지 않습니다. 지연 시간(RTT)이 큰 환경에서
+동시 요청 수와 연결 재사용 효과를 측정하는 벤치마크 전용 모듈입니다 (`fragment_download.py`).
+"""
+
+import asyncio
+import ssl
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urljoin, urlsplit
+
+# 응답 본문을 한 번에 읽는 크기
+_READ_SIZE = 64 * 1024
+
+_USER_AGENT = "youtube-downloader-fragment-fetcher"
+
+
+class FragmentError(Exception):
+    """조각 다운로드 실패"""
+
+
+@dataclass
+class FetchStats:
+    """조각 다운로드 통계"""
+
+    fragments: int = 0
+    bytes: int = 0
+    connections_opened: int = 0
+    retries: int = 0
+    elapsed_seconds: float = 0.0
+
+
+def parse_m3u8(text: str, base_url: str) -> list[str]:
+    """
+    HLS 미디어 재생목록에서 조각 URL 추출
+
+    Args:
+        text: m3u8 내용
+        base_url: 재생목록 URL (상대 경로 기준)
+
+    Returns:
+        조각 URL 목록 (초기화 조각이 있으면 맨 앞)
+
+    Raises:
+        FragmentError: 마스터 재생목록이거나 암호화된 경우
+    """
+    if not text.lstrip().startswith("#EXTM3U"):
+        raise FragmentError("m3u8 재생목록이 아닙니다.")
+
+    urls = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("#EXT-X-STREAM-INF"):
+            raise FragmentError("마스터 재생목록은 지원하지 않습니다.")
+        if line.startswith("#EXT-X-KEY") and "METHOD=NONE" not in line:
+            raise FragmentError("암호화된 재생목록은 지원하지 않습니다.")
+        if line.startswith("#EXT-X-MAP"):
+            uri = line.split('URI="', 1)[1].split('"', 1)[0]
+            urls.append(urljoin(base_url, uri))
+        elif line and not line.startswith("#"):
+            urls.append(urljoin(base_url, line))
+    return urls
+
+
+class _Connection:
+    """keep-alive HTTP/1.1 연결"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.reused = False
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class _ConnectionPool:
+    """(scheme, host, port)별 유휴 연결 풀"""
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.opened = 0
+        self._idle: dict[tuple[str, str, int], list[_Connection]] = {}
+        self._ssl_context: ssl.SSLContext | None = None
+
+    async def acquire(self, scheme: str, host: str, port: int) -> _Connection:
+        idle = self._idle.get((scheme, host, port))
+        while idle:
+            conn = idle.pop()
+            if not conn.reader.at_eof():
+                conn.reused = True
+                return conn
+            conn.close()
+
+        if scheme == "https" and self._ssl_context is None:
+            self._ssl_context = ssl.create_default_context()
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(
+                host, port, ssl=self._ssl_context if scheme == "https" else None
+            ),
+            self.timeout,
+        )
+        self.opened += 1
+        return _Connection(reader, writer)
+
+    def release(self, key: tuple[str, str, int], conn: _Connection) -> None:
+        conn.reused = False
+        self._idle.setdefault(key, []).append(conn)
+
+    def close(self) -> None:
+        for conns in self._idle.values():
+            for conn in conns:
+                conn.close()
+        self._idle.clear()
+
+
+class FragmentFetcher:
+    """asyncio 조각 다운로더"""
+
+    def __init__(
+        self,
+        concurrency: int = 4,
+        retries: int = 10,
+        timeout: float = 30.0,
+        headers: dict[str, str] | None = None,
+    ):
+        """
+        다운로더 초기화
+
+        Args:
+            concurrency: 동시 요청 수 (= 최대 연결 수)
+            retries: 조각별 재시도 횟수
+            timeout: 연결/읽기 제한 시간 (초)
+            headers: 추가 요청 헤더
+        """
+        self.concurrency = max(1, concurrency)
+        self.retries = retries
+        self.timeout = timeout
+        self.headers = headers or {}
+
+    def run(
+        self,
+        urls: Sequence[str],
+        dest: Path,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> FetchStats:
+        """`fetch`를 새 이벤트 루프에서 실행"""
+        return asyncio.run(self.fetch(urls, dest, progress))
+
+    async def fetch(
+        self,
+        urls: Sequence[str],
+        dest: Path,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> FetchStats:
+        """
+        조각을 동시에 받아 순서대로 dest에 이어 쓰기
+
+        순서가 앞선 조각을 기다리며 메모리에 쌓이는 조각은 동시 요청 수의 2배까지입니다.
+
+        Args:
+            urls: 조각 URL 목록 (재생 순서)
+            dest: 저장 경로
+            progress: 진행률 콜백 `(완료한 조각 수, 전체 조각 수)`
+
+        Returns:
+            다운로드 통계
+
+        Raises:
+            FragmentError: 재시도 후에도 받지 못한 조각이 있는 경우
+        """
+        stats = FetchStats()
+        started = time.monotonic()
+        pool = _ConnectionPool(self.timeout)
+        # 쓰기를 기다리는 조각까지 포함한 상한, 동시 요청 수 상한
+        window = asyncio.Semaphore(self.concurrency * 2)
+        requests = asyncio.Semaphore(self.concurrency)
+        done: dict[int, bytes] = {}
+        failures: list[Exception] = []
+        ready = asyncio.Condition()
+
+        async def worker(index: int) -> None:
+            try:
+                async with requests:
+                    data = await self._fetch_with_retry(pool, urls[index], stats)
+            except Exception as e:
+                async with ready:
+                    failures.append(e)
+                    ready.notify_all()
+                return
+            async with ready:
+                done[index] = data
+                ready.notify_all()
+
+        async def schedule(tasks: list[asyncio.Task]) -> None:
+            for index in range(len(urls)):
+                await window.acquire()
+                tasks.append(asyncio.create_task(worker(index)))
+
+        async def write() -> None:
+            with open(dest, "wb") as f:
+                for index in range(len(urls)):
+                    async with ready:
+                        await ready.wait_for(lambda: index in done or failures)
+                        # 조각 하나라도 실패하면 바로 중단
+                        if failures:
+                            raise failures[0]
+                        data = done.pop(index)
+                    f.write(data)
+                    stats.fragments += 1
+                    stats.bytes += len(data)
+                    window.release()
+                    if progress:
+                        progress(stats.fragments, len(urls))
+
+        tasks: list[asyncio.Task] = []
+        scheduler = asyncio.create_task(schedule(tasks))
+        try:
+            await write()
+        finally:
+            scheduler.cancel()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(scheduler, *tasks, return_exceptions=True)
+            pool.close()
+            stats.connections_opened = pool.opened
+            stats.elapsed_seconds = time.monotonic() - started
+
+        return stats
+
+    async def _fetch_with_retry(self, pool: _ConnectionPool, url: str, stats: FetchStats) -> bytes:
+        failures = 0
+        while True:
+            try:
+                return await self._get(pool, url)
+            except _StaleConnection:
+                # 서버가 닫은 유휴 연결: 실패로 세지 않고 새 연결로 다시 요청
+                continue
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, FragmentError) as e:
+                failures += 1
+                if failures > self.retries:
+                    raise FragmentError(f"조각 다운로드 실패 ({url}): {e}") from e
+                stats.retries += 1
+                await asyncio.sleep(min(0.5 * 2 ** (failures - 1), 8.0))
+
+    async def _get(self, pool: _ConnectionPool, url: str) -> bytes:
+        parts = urlsplit(url)
+        scheme = parts.scheme
+        host = parts.hostname or ""
+        port = parts.port or (443 if scheme == "https" else 80)
+        path = parts.path or "/"
+        if parts.query:
+            path += f"?{parts.query}"
+        key = (scheme, host, port)
+
+        conn = await pool.acquire(scheme, host, port)
+        status = None
+        try:
+            request_headers = {
+                "Host": parts.netloc,
+                "User-Agent": _USER_AGENT,
+                "Accept": "*/*",
+                "Connection": "keep-alive",
+                **self.headers,
+            }
+            head = f"GET {path} HTTP/1.1\r\n" + "".join(
+                f"{name}: {value}\r\n" for name, value in request_headers.items()
+            )
+            conn.writer.write(f"{head}\r\n".encode("latin-1"))
+            await conn.writer.drain()
+
+            status_line = await asyncio.wait_for(conn.reader.readline(), self.timeout)
+            if not status_line:
+                raise _StaleConnection() if conn.reused else ConnectionError("연결이 닫혔습니다.")
+            status = int(status_line.split()[1])
+
+            headers: dict[str, str] = {}
+            while True:
+                line = await asyncio.wait_for(conn.reader.readline(), self.timeout)
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            body = await self._read_body(conn, headers)
+            keep_alive = headers.get("connection", "").lower() != "close"
+        except (OSError, asyncio.IncompleteReadError) as e:
+            conn.close()
+            if conn.reused and status is None:
+                raise _StaleConnection() from e
+            raise
+        except BaseException:
+            conn.close()
+            raise
+
+        framed = "content-length" in headers or headers.get("transfer-encoding", "").lower() == "chunked"
+        if keep_alive and framed:
+            pool.release(key, conn)
+        else:
+            conn.close()
+
+        if status not in (200, 206):
+            raise FragmentError(f"HTTP {status}")
+        return body
+
+    async def _read_body(self, conn: _Connection, headers: dict[str, str]) -> bytes:
+        reader = conn.reader
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size_line = await asyncio.wait_for(reader.readline(), self.timeout)
+                size = int(size_line.split(b";")[0], 16)
+                if size == 0:
+                    # trailer 끝까지 읽기
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    return b"".join(chunks)
+                chunks.append(await asyncio.wait_for(reader.readexactly(size), self.timeout))
+                await reader.readexactly(2)
+
+        if "content-length" in headers:
+            length = int(headers["content-length"])
+            chunks = []
+            while length > 0:
+                chunk = await asyncio.wait_for(reader.read(min(_READ_SIZE, length)), self.timeout)
+                if not chunk:
+                    raise asyncio.IncompleteReadError(b"".join(chunks), length)
+                chunks.append(chunk)
+                length -= len(chunk)
+            return b"".join(chunks)
+
+        # 길이를 모르면 연결이 닫힐 때까지
+        return await asyncio.wait_for(reader.read(), self.timeout)
+
+
+class _StaleConnection(Exception):
+    """재사용한 유휴 연결이 이미 닫혀 있음"""
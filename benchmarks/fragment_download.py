@@ -0,0 +1,145 @@
+"""HLS/DASH 조각 동시 다운로드 벤치마크
+
+요청마다 지연(TTFB)을 주고 새 연결마다 핸드셰이크 지연을 주는 로컬 HLS/DASH 서버(CDN 대용)를
+띄우고, 동시 조각 수별로 yt-dlp 기본 조각 다운로더와 asyncio 조각 다운로더(keep-alive 연결 재사용)를
+비교합니다. 배포 환경의 RTT에 맞춰 `DOWNLOAD__CONCURRENT_FRAGMENTS` 기본값을 고르는 데 사용합니다.
+
+    python benchmarks/fragment_download.py --fragments 100 --latency 50 --handshake 100 --concurrency 1 4 8 16
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import yt_dlp
+
+# 스크립트로 실행하면 이 디렉토리가 sys.path에 있음
+from fragment_client import FragmentFetcher, parse_m3u8
+
+
+def make_handler(fragments: list[bytes], latency: float, handshake: float, stats: dict):
+    """HLS 재생목록(/index.m3u8), DASH 매니페스트(/manifest.mpd), 조각(/segN.m4s) 제공"""
+    playlist = "#EXTM3U\n#EXT-X-VERSION:3\n#EXT-X-TARGETDURATION:2\n#EXT-X-PLAYLIST-TYPE:VOD\n"
+    playlist += "".join(f"#EXTINF:2.0,\nseg{i}.m4s\n" for i in range(len(fragments)))
+    playlist += "#EXT-X-ENDLIST\n"
+    manifest = (
+        '<?xml version="1.0"?>\n'
+        '<MPD xmlns="urn:mpeg:dash:schema:mpd:2011" type="static" minBufferTime="PT2S" '
+        f'mediaPresentationDuration="PT{2 * len(fragments)}S" '
+        'profiles="urn:mpeg:dash:profile:isoff-main:2011">'
+        '<Period><AdaptationSet mimeType="video/mp4" contentType="video">'
+        '<Representation id="v" bandwidth="1000000" codecs="avc1.42c01e" width="640" height="360">'
+        '<SegmentList timescale="1" duration="2">'
+        + "".join(f'<SegmentURL media="seg{i}.m4s"/>' for i in range(len(fragments)))
+        + "</SegmentList></Representation></AdaptationSet></Period></MPD>"
+    )
+    lock = threading.Lock()
+
+    class StandInHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            with lock:
+                stats["connections"] += 1
+            # TCP/TLS 연결 수립 비용
+            time.sleep(handshake)
+
+        def do_GET(self):
+            path = self.path.lstrip("/")
+            if path == "index.m3u8":
+                body, content_type = playlist.encode(), "application/vnd.apple.mpegurl"
+            elif path == "manifest.mpd":
+                body, content_type = manifest.encode(), "application/dash+xml"
+            else:
+                body, content_type = fragments[int(path[3:].split(".")[0])], "video/mp4"
+                time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StandInHandler
+
+
+class StandInServer(ThreadingHTTPServer):
+    # 동시 연결이 많아도 SYN이 버려져 재전송 지연이 생기지 않도록
+    request_queue_size = 128
+    daemon_threads = True
+
+
+def run_ytdlp(url: str, concurrency: int, output_dir: Path) -> None:
+    """yt-dlp 기본 조각 다운로더 (hlsnative / dashsegments)"""
+    params = {
+        "quiet": True,
+        "no_warnings": True,
+        "noprogress": True,
+        "fixup": "never",
+        "concurrent_fragment_downloads": concurrency,
+        "outtmpl": str(output_dir / f"ytdlp-{concurrency}-%(id)s.%(ext)s"),
+    }
+    with yt_dlp.YoutubeDL(params) as ydl:
+        ydl.download([url])
+
+
+def run_asyncio(url: str, concurrency: int, output_dir: Path) -> None:
+    """asyncio 조각 다운로더 (HLS 재생목록만)"""
+    with urllib.request.urlopen(url) as response:
+        urls = parse_m3u8(response.read().decode(), url)
+    FragmentFetcher(concurrency=concurrency).run(urls, output_dir / f"asyncio-{concurrency}.mp4")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fragments", type=int, default=100, help="조각 수")
+    parser.add_argument("--fragment-size", type=int, default=256, help="조각 크기 (KiB)")
+    parser.add_argument("--latency", type=float, default=50, help="요청당 지연 (ms)")
+    parser.add_argument("--handshake", type=float, default=100, help="새 연결당 지연 (ms)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = parser.parse_args()
+
+    fragments = [os.urandom(args.fragment_size * 1024) for _ in range(args.fragments)]
+    stats = {"connections": 0}
+    handler = make_handler(fragments, args.latency / 1000, args.handshake / 1000, stats)
+    server = StandInServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    engines = [
+        ("yt-dlp HLS", lambda c, d: run_ytdlp(f"{base_url}/index.m3u8", c, d)),
+        ("yt-dlp DASH", lambda c, d: run_ytdlp(f"{base_url}/manifest.mpd", c, d)),
+        ("asyncio HLS", lambda c, d: run_asyncio(f"{base_url}/index.m3u8", c, d)),
+    ]
+
+    total_mib = args.fragments * args.fragment_size / 1024
+    print(
+        f"조각 {args.fragments}개 x {args.fragment_size} KiB, "
+        f"요청 지연 {args.latency:.0f} ms, 연결 지연 {args.handshake:.0f} ms"
+    )
+    print(f"{'방식':<12} {'동시 수':>6} {'시간(초)':>9} {'MiB/s':>7} {'연결 수':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, run in engines:
+            for concurrency in args.concurrency:
+                stats["connections"] = 0
+                began = time.perf_counter()
+                run(concurrency, Path(tmp))
+                elapsed = time.perf_counter() - began
+                print(
+                    f"{name:<12} {concurrency:>6} {elapsed:>9.2f} "
+                    f"{total_mib / elapsed:>7.1f} {stats['connections']:>7}"
+                )
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""구간 다운로드 벤치마크
+
+연결 하나당 속도를 제한하는 로컬 Range 서버(CDN 대용)를 띄우고, 연결 수별 다운로드 시간을
+비교합니다.
+
+    python benchmarks/segmented_download.py --size 64 --rate 4 --connections 1 2 4 8
+"""
+
+import argparse
+import os
+import re
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from youtube_downloader.segmented import SegmentedDownloader
+
+
+def make_handler(data: bytes, rate: float):
+    """연결마다 rate(바이트/초)로 보내는 Range 핸들러"""
+
+    class ThrottledRangeHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            start, end = 0, len(data) - 1
+            match = re.fullmatch(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+            if match:
+                start = int(match[1])
+                end = min(int(match[2]) if match[2] else end, end)
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+            else:
+                self.send_response(200)
+            self.send_header("Content-Length", str(end - start + 1))
+            self.send_header("Accept-Ranges", "bytes")
+            self.end_headers()
+
+            began = time.monotonic()
+            sent = 0
+            chunk_size = 16 * 1024
+            for offset in range(start, end + 1, chunk_size):
+                chunk = data[offset:min(offset + chunk_size, end + 1)]
+                self.wfile.write(chunk)
+                sent += len(chunk)
+                # 연결당 속도 제한
+                delay = sent / rate - (time.monotonic() - began)
+                if delay > 0:
+                    time.sleep(delay)
+
+        def log_message(self, format, *args):
+            pass
+
+    return ThrottledRangeHandler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=64, help="파일 크기 (MiB)")
+    parser.add_argument("--rate", type=float, default=4, help="연결당 속도 제한 (MiB/s)")
+    parser.add_argument("--connections", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    data = os.urandom(args.size * 1024 * 1024)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(data, args.rate * 1024 * 1024))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/blob.bin"
+
+    print(f"파일 {args.size} MiB, 연결당 {args.rate} MiB/s 제한")
+    print(f"{'연결 수':>6} {'시간(초)':>10} {'속도(MiB/s)':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for connections in args.connections:
+            engine = SegmentedDownloader(connections=connections)
+            dest = Path(tmp) / f"blob-{connections}.bin"
+            began = time.perf_counter()
+            total = engine.probe(url)
+            engine.download(url, dest, total)
+            elapsed = time.perf_counter() - began
+            assert dest.read_bytes() == data
+            print(f"{connections:>6} {elapsed:>10.2f} {args.size / elapsed:>12.1f}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
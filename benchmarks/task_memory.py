@@ -0,0 +1,138 @@
+"""작업 레코드 메모리/진행률 갱신 벤치마크
+
+이전 방식(작업마다 13개 키 dict + 진행률 dict + datetime)과 `__slots__` 레코드(`TaskRecord`)의
+작업당 메모리와, 진행률 틱 처리 속도를 비교합니다.
+
+    python benchmarks/task_memory.py --tasks 100000 --ticks 200000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+
+from youtube_downloader.web.task_store import MemoryTaskStore, TaskProgress, TaskRecord
+
+
+def options() -> dict:
+    """웹 요청 옵션 (`DownloadOptions.model_dump()`와 같은 모양)"""
+    return {
+        "quality": "720p",
+        "audio_only": False,
+        "audio_quality": "192",
+        "save_metadata": False,
+        "save_thumbnail": False,
+        "concurrent_fragments": None,
+        "fragment_retries": None,
+    }
+
+
+def legacy_task(index: int) -> dict:
+    """이전 TaskManager가 만들던 완료 작업 dict"""
+    now = datetime.now()
+    return {
+        "task_id": str(uuid.uuid4()),
+        "url": f"https://www.youtube.com/watch?v={index:011d}",
+        "options": options(),
+        "status": "completed",
+        "progress": {
+            "percentage": 100,
+            "downloaded_bytes": 123456789,
+            "total_bytes": 123456789,
+            "speed": "1.00MiB/s",
+            "eta": "00:00",
+        },
+        "video_info": None,
+        "file_path": f"downloads/video-{index}.mp4",
+        "archive_digest": None,
+        "created_at": now,
+        "updated_at": now,
+        "completed_at": now,
+        "failed_at": None,
+        "error": None,
+    }
+
+
+def slotted_task(index: int) -> TaskRecord:
+    """같은 내용의 TaskRecord"""
+    now = time.monotonic()
+    return TaskRecord(
+        task_id=str(uuid.uuid4()),
+        url=f"https://www.youtube.com/watch?v={index:011d}",
+        options=options(),
+        status="completed",
+        progress=TaskProgress(100, 123456789, 123456789, "1.00MiB/s", "00:00"),
+        file_path=f"downloads/video-{index}.mp4",
+        created_at=now,
+        completed_at=now,
+    )
+
+
+def measure_memory(factory, count: int) -> float:
+    """작업 count개를 만들 때 늘어난 메모리 / count"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tasks = [factory(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # 리스트 자체(포인터 배열)는 빼고 계산
+    return (after - before - tasks.__sizeof__()) / count
+
+
+def legacy_ticks(ticks: int) -> float:
+    """이전 방식: 틱마다 진행률 dict를 새로 만들고 datetime.now() 두 번"""
+    task = legacy_task(0)
+    began = time.perf_counter()
+    for i in range(ticks):
+        task["progress"] = {
+            "percentage": i % 100,
+            "downloaded_bytes": i,
+            "total_bytes": ticks,
+            "speed": "1.00MiB/s",
+            "eta": "00:01",
+        }
+        task["updated_at"] = datetime.now()
+        task["updated_at"] = datetime.now()
+    return ticks / (time.perf_counter() - began)
+
+
+def slotted_ticks(ticks: int) -> float:
+    """TaskRecord: 저장소를 거쳐 진행률을 제자리에서 갱신"""
+    store = MemoryTaskStore()
+    record = slotted_task(0)
+    store.insert(record)
+    task_id = record.task_id
+    began = time.perf_counter()
+    for i in range(ticks):
+        store.update_progress(task_id, i % 100, i, ticks, "1.00MiB/s", "00:01")
+    return ticks / (time.perf_counter() - began)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=100_000, help="메모리 측정용 작업 수")
+    parser.add_argument("--ticks", type=int, default=200_000, help="진행률 갱신 횟수")
+    args = parser.parse_args()
+
+    legacy_bytes = measure_memory(legacy_task, args.tasks)
+    slotted_bytes = measure_memory(slotted_task, args.tasks)
+    legacy_rate = legacy_ticks(args.ticks)
+    slotted_rate = slotted_ticks(args.ticks)
+
+    print(f"작업 {args.tasks:,}개, 진행률 갱신 {args.ticks:,}회")
+    print(f"{'방식':<10} {'작업당 바이트':>12} {'합계(MiB)':>10} {'틱/초':>12}")
+    for name, per_task, rate in (
+        ("dict", legacy_bytes, legacy_rate),
+        ("slots", slotted_bytes, slotted_rate),
+    ):
+        print(
+            f"{name:<10} {per_task:>12,.0f} {per_task * args.tasks / 2**20:>10.1f} {rate:>12,.0f}"
+        )
+    print(f"작업당 메모리 {1 - slotted_bytes / legacy_bytes:.0%} 감소")
+
+
+if __name__ == "__main__":
+    main()
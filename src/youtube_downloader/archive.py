@@ -0,0 +1,395 @@
+"""다운로드 아카이브 및 내용 주소 기반(content-addressed) 파일 저장소"""
+
+import hashlib
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from .config import settings
+from .models import ArchiveEntry, DownloadOptions, VideoInfo
+
+# 해시 계산 시 한 번에 읽는 크기
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def archive_key(video_key: str, options: DownloadOptions, format_selector: str) -> str:
+    """
+    아카이브 키 생성
+
+    같은 동영상이라도 포맷 선택자나 오디오 옵션이 다르면 결과 파일이 다르므로 키에 포함합니다.
+
+    Args:
+        video_key: `<추출기>:<동영상 ID>` (예: `youtube:jNQXAC9IVRw`)
+        options: 다운로드 옵션
+        format_selector: yt-dlp 포맷 선택자
+
+    Returns:
+        아카이브 키
+    """
+    parts = [video_key, format_selector]
+    if options.audio_only:
+        parts.append(f"audio:{options.audio_quality}")
+        if options.audio_format != "mp3":
+            parts.append(f"format:{options.audio_format}")
+    return "|".join(parts)
+
+
+def file_digest(path: Path) -> str:
+    """파일 내용의 SHA-256 해시"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hard_link(source: Path, dest: Path) -> bool:
+    """
+    source를 dest로 하드 링크
+
+    dest가 이미 있으면 원자적으로 교체합니다.
+
+    Returns:
+        링크했으면 True, 다른 파일 시스템 등으로 링크할 수 없으면 False (dest는 그대로)
+    """
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(f".{dest.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        os.link(source, tmp)
+    except OSError:
+        return False
+    os.replace(tmp, dest)
+    return True
+
+
+def link_or_copy(source: Path, dest: Path) -> None:
+    """
+    source를 dest로 하드 링크 (다른 파일 시스템이면 복사)
+
+    dest가 이미 있으면 원자적으로 교체합니다.
+    """
+    if hard_link(source, dest):
+        return
+    tmp = dest.with_name(f".{dest.name}.{uuid.uuid4().hex}.tmp")
+    shutil.copy2(source, tmp)
+    os.replace(tmp, dest)
+
+
+class DownloadArchive:
+    """
+    다운로드 아카이브
+
+    (동영상, 포맷 선택자, 오디오 옵션) 키를 파일 내용 해시에 연결하고, 실제 파일은
+    `objects/<해시 앞 2자>/<해시><확장자>`에 한 번만 보관합니다. 사용자에게 보이는
+    출력 파일은 저장소 객체의 하드 링크이므로 추가 디스크를 쓰지 않습니다.
+
+    출력 파일을 하드 링크할 수 없으면(다른 파일 시스템) 복사하지 않고 등록하지 않습니다.
+
+    웹 작업처럼 파일을 공유하는 소유자는 `acquire`/`release`로 참조를 관리합니다. 참조도 항목도 없는
+    객체는 지우고, 참조가 없는 객체의 합이 max_size를 넘으면 오래 쓰지 않은 것부터 항목과 함께 지웁니다.
+    """
+
+    def __init__(self, root: Path, max_size: int | None = None):
+        """
+        아카이브 초기화
+
+        Args:
+            root: 아카이브 루트 디렉토리 (`archive.db`와 `objects/`가 생성됨)
+            max_size: 참조가 없는 저장소 객체의 최대 총 크기 (바이트, None이나 0이면 무제한)
+        """
+        self.root = root
+        self.max_size = max_size or None
+        self.objects_dir = root / "objects"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(root / "archive.db"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS archive_entries (
+                key TEXT PRIMARY KEY,
+                digest TEXT NOT NULL,
+                ext TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                video_info TEXT,
+                created_at REAL NOT NULL,
+                last_used_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS ix_archive_entries_digest
+                ON archive_entries (digest);
+            CREATE TABLE IF NOT EXISTS archive_refs (
+                digest TEXT NOT NULL,
+                owner TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (digest, owner)
+            );
+            """
+        )
+        self._conn.commit()
+
+    def object_path(self, digest: str, ext: str) -> Path:
+        """저장소 객체 경로"""
+        return self.objects_dir / digest[:2] / f"{digest}{ext}"
+
+    def lookup(self, key: str) -> ArchiveEntry | None:
+        """
+        아카이브 조회
+
+        저장소 객체가 사라졌으면 항목을 지우고 None을 반환합니다.
+
+        Args:
+            key: 아카이브 키
+
+        Returns:
+            아카이브 항목 또는 None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT digest, ext, filename, size, video_info FROM archive_entries "
+                "WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            digest, ext, filename, size, video_info = row
+            path = self.object_path(digest, ext)
+            if not path.exists():
+                self._conn.execute("DELETE FROM archive_entries WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+
+            self._conn.execute(
+                "UPDATE archive_entries SET last_used_at = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+
+        return ArchiveEntry(
+            key=key,
+            digest=digest,
+            path=path,
+            filename=filename,
+            size=size,
+            video_info=VideoInfo.model_validate_json(video_info) if video_info else None,
+        )
+
+    def add(
+        self, key: str, file_path: Path, video_info: VideoInfo | None = None
+    ) -> ArchiveEntry | None:
+        """
+        다운로드한 파일을 아카이브에 등록
+
+        같은 내용의 객체가 이미 있으면 file_path를 그 객체의 하드 링크로 바꿔 중복을 없앱니다.
+
+        Args:
+            key: 아카이브 키
+            file_path: 다운로드한 파일
+            video_info: 동영상 정보 (적중 시 그대로 돌려줌)
+
+        Returns:
+            등록된 항목, 하드 링크할 수 없어 등록하지 않았으면 None
+        """
+        digest = file_digest(file_path)
+        ext = file_path.suffix
+        path = self.object_path(digest, ext)
+        size = file_path.stat().st_size
+
+        with self._lock:
+            if not path.exists():
+                # 복사하면 모든 다운로드가 디스크를 두 배로 씀
+                if not hard_link(file_path, path):
+                    return None
+            elif not path.samefile(file_path) and not hard_link(path, file_path):
+                return None
+
+            now = time.time()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO archive_entries "
+                "(key, digest, ext, filename, size, video_info, created_at, last_used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    digest,
+                    ext,
+                    file_path.name,
+                    size,
+                    video_info.model_dump_json() if video_info else None,
+                    now,
+                    now,
+                ),
+            )
+            self._conn.commit()
+            self._prune()
+
+        return ArchiveEntry(
+            key=key,
+            digest=digest,
+            path=path,
+            filename=file_path.name,
+            size=size,
+            video_info=video_info,
+        )
+
+    def materialize(self, entry: ArchiveEntry, dest: Path) -> Path:
+        """
+        저장소 객체를 dest에 하드 링크로 꺼내기
+
+        Args:
+            entry: 아카이브 항목
+            dest: 출력 파일 경로
+
+        Returns:
+            dest
+        """
+        if not (dest.exists() and dest.samefile(entry.path)):
+            link_or_copy(entry.path, dest)
+        return dest
+
+    def acquire(self, digest: str, owner: str) -> int:
+        """
+        파일 참조 추가
+
+        Args:
+            digest: 파일 해시
+            owner: 참조 소유자 (예: 웹 작업 ID)
+
+        Returns:
+            현재 참조 수
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO archive_refs (digest, owner, created_at) VALUES (?, ?, ?)",
+                (digest, owner, time.time()),
+            )
+            self._conn.commit()
+            return self._ref_count(digest)
+
+    def release(self, digest: str, owner: str) -> int:
+        """
+        파일 참조 해제
+
+        Args:
+            digest: 파일 해시
+            owner: 참조 소유자
+
+        Returns:
+            남은 참조 수 (0이면 그 파일을 쓰는 소유자가 더 이상 없음)
+        """
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM archive_refs WHERE digest = ? AND owner = ?", (digest, owner)
+            )
+            self._conn.commit()
+            count = self._ref_count(digest)
+            if count == 0:
+                self._remove_orphan(digest)
+                self._prune()
+            return count
+
+    def forget(self, digest: str) -> int:
+        """
+        참조가 없는 객체를 항목과 함께 삭제 (결과 파일을 지울 때 디스크를 실제로 확보하기 위함)
+
+        Args:
+            digest: 파일 해시
+
+        Returns:
+            확보한 바이트 수 (참조가 남아 있으면 아무것도 지우지 않고 0)
+        """
+        with self._lock:
+            if self._ref_count(digest):
+                return 0
+            self._conn.execute("DELETE FROM archive_entries WHERE digest = ?", (digest,))
+            self._conn.commit()
+            return self._remove_orphan(digest)
+
+    def ref_count(self, digest: str) -> int:
+        """현재 참조 수"""
+        with self._lock:
+            return self._ref_count(digest)
+
+    def close(self) -> None:
+        """연결 종료"""
+        with self._lock:
+            self._conn.close()
+
+    def _ref_count(self, digest: str) -> int:
+        (count,) = self._conn.execute(
+            "SELECT COUNT(*) FROM archive_refs WHERE digest = ?", (digest,)
+        ).fetchone()
+        return int(count)
+
+    def _remove_orphan(self, digest: str) -> int:
+        """참조도 항목도 없는 객체 삭제 (lock 보유 상태에서 호출, 확보한 바이트 수 반환)"""
+        if self._ref_count(digest):
+            return 0
+        if self._conn.execute(
+            "SELECT 1 FROM archive_entries WHERE digest = ? LIMIT 1", (digest,)
+        ).fetchone():
+            return 0
+        reclaimed = 0
+        for path in (self.objects_dir / digest[:2]).glob(f"{digest}*"):
+            reclaimed += _unlink(path)
+        return reclaimed
+
+    def _prune(self) -> int:
+        """
+        참조가 없는 객체의 합이 max_size 이하가 되도록 오래 쓰지 않은 객체부터 항목과 함께 삭제
+        (lock 보유 상태에서 호출)
+
+        Returns:
+            확보한 바이트 수
+        """
+        if self.max_size is None:
+            return 0
+        rows = self._conn.execute(
+            "SELECT digest, MAX(size), MAX(last_used_at) AS used FROM archive_entries "
+            "WHERE digest NOT IN (SELECT digest FROM archive_refs) "
+            "GROUP BY digest ORDER BY used"
+        ).fetchall()
+        total = sum(size for _, size, _ in rows)
+        reclaimed = 0
+        for digest, size, _ in rows:
+            if total <= self.max_size:
+                break
+            self._conn.execute("DELETE FROM archive_entries WHERE digest = ?", (digest,))
+            reclaimed += self._remove_orphan(digest)
+            total -= size
+        self._conn.commit()
+        return reclaimed
+
+
+def _unlink(path: Path) -> int:
+    """파일 삭제 (다른 하드 링크가 없을 때만 확보한 크기 반환)"""
+    try:
+        stat = path.stat()
+        path.unlink()
+    except FileNotFoundError:
+        return 0
+    return stat.st_size if stat.st_nlink <= 1 else 0
+
+
+_download_archive: DownloadArchive | None = None
+_download_archive_lock = threading.Lock()
+
+
+def get_download_archive() -> DownloadArchive | None:
+    """
+    설정에 따른 공유 아카이브 인스턴스 (CLI와 웹 서버가 같이 사용)
+
+    Returns:
+        아카이브 또는 None (비활성화 시)
+    """
+    global _download_archive
+    if not settings.archive.enabled:
+        return None
+    with _download_archive_lock:
+        if _download_archive is None:
+            _download_archive = DownloadArchive(settings.archive.path, settings.archive.max_size)
+        return _download_archive
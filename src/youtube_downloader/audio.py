@@ -0,0 +1,284 @@
+"""오디오 추출 방식 결정 (스트림 복사 / 변환)
+
+`audio_format="auto"`이면 원본 코덱과 비트레이트를 확인해서, 그대로 담을 수 있는 코덱(AAC, Opus, Vorbis, MP3)이고
+요청한 음질 이하면 다시 인코딩하지 않고 m4a/opus/ogg/mp3로 스트림 복사합니다. 그 밖에는 MP3로 변환합니다.
+
+작업마다 어떤 방식을 썼는지와 ffmpeg CPU 시간을 `AudioReport`로 남깁니다. 복사한 작업의 절약 시간은
+이 프로세스에서 실제로 변환한 작업들의 오디오 1초당 CPU 시간으로 추정합니다.
+"""
+
+import re
+import subprocess
+import threading
+from dataclasses import dataclass
+from typing import Any, Literal
+
+import yt_dlp
+from yt_dlp.postprocessor.ffmpeg import FFmpegExtractAudioPP
+
+from .models import AudioReport
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+# 원본 코덱 -> 스트림 복사할 yt-dlp 오디오 코덱 이름 (저장 확장자는 ACODECS 기준 m4a/opus/ogg/mp3)
+COPY_CODECS = {"aac": "m4a", "opus": "opus", "vorbis": "vorbis", "mp3": "mp3"}
+
+# 원본 비트레이트가 요청보다 이만큼까지 높아도 복사 (메타데이터의 평균 비트레이트 오차 허용)
+BITRATE_TOLERANCE = 1.05
+
+# 변환 기록이 없을 때 쓰는 오디오 1초당 MP3 변환 CPU 시간 (초)
+DEFAULT_TRANSCODE_COST = 0.02
+
+_AUDIO_STREAM_RE = re.compile(r"Stream #.*?: Audio: (\w+)(.*)")
+_STREAM_BITRATE_RE = re.compile(r"(\d+) kb/s")
+_CONTAINER_BITRATE_RE = re.compile(r"bitrate: (\d+) kb/s")
+_DURATION_RE = re.compile(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)")
+
+
+def normalize_codec(acodec: str | None) -> str | None:
+    """yt-dlp/ffmpeg 코덱 이름을 정규화 (`mp4a.40.2` -> `aac`)"""
+    if not acodec or acodec == "none":
+        return None
+    codec = acodec.lower().split(".")[0]
+    if codec in ("mp4a", "aac"):
+        return "aac"
+    if codec in ("mp3", "mp3float"):
+        return "mp3"
+    return codec
+
+
+@dataclass
+class AudioPlan:
+    """오디오 처리 방식"""
+
+    mode: Literal["copy", "transcode"]
+    codec: str  # yt-dlp 오디오 코덱 이름 (FFmpegExtractAudio의 preferredcodec)
+    source_codec: str | None
+    source_bitrate: float | None
+    reason: str
+
+
+def plan_audio(
+    source_codec: str | None,
+    source_bitrate: float | None,
+    audio_format: str,
+    audio_quality: str,
+) -> AudioPlan:
+    """
+    오디오 처리 방식 결정
+
+    Args:
+        source_codec: 원본 오디오 코덱 (정규화된 이름, 모르면 None)
+        source_bitrate: 원본 비트레이트 (kbps, 모르면 None)
+        audio_format: mp3 (항상 MP3) 또는 auto
+        audio_quality: 요청 비트레이트 (kbps)
+
+    Returns:
+        처리 방식
+    """
+
+    def transcode(reason: str) -> AudioPlan:
+        return AudioPlan("transcode", "mp3", source_codec, source_bitrate, reason)
+
+    def copy(codec: str, reason: str) -> AudioPlan:
+        return AudioPlan("copy", COPY_CODECS[codec], codec, source_bitrate, reason)
+
+    # MP3를 MP3로는 다시 인코딩하지 않음 (yt-dlp도 복사)
+    if source_codec == "mp3":
+        return copy("mp3", "원본이 이미 MP3")
+    if audio_format != "auto":
+        return transcode("MP3 형식 요청")
+    if source_codec is None:
+        return transcode("원본 코덱을 알 수 없음")
+    if source_codec not in COPY_CODECS:
+        return transcode(f"{source_codec} 코덱은 그대로 저장하지 않음")
+    if source_bitrate is None:
+        return transcode("원본 비트레이트를 알 수 없음")
+    requested = float(audio_quality)
+    if source_bitrate > requested * BITRATE_TOLERANCE:
+        return transcode(f"원본 {source_bitrate:.0f}kbps가 요청 {requested:.0f}kbps보다 높음")
+    return copy(source_codec, f"원본 {source_codec} {source_bitrate:.0f}kbps가 요청 {requested:.0f}kbps 이하")
+
+
+def probe_audio(ffmpeg: str, path: str) -> tuple[str | None, float | None, float | None]:
+    """
+    ffmpeg로 파일의 오디오 코덱, 비트레이트, 길이 확인 (ffprobe가 없어도 동작)
+
+    Returns:
+        (정규화된 코덱, kbps, 초) (알 수 없는 값은 None)
+    """
+    try:
+        output = subprocess.run(
+            [ffmpeg, "-hide_banner", "-nostdin", "-i", path],
+            capture_output=True, text=True, errors="replace", timeout=30,
+        ).stderr
+    except (OSError, subprocess.TimeoutExpired):
+        return None, None, None
+
+    codec = bitrate = duration = None
+    stream = _AUDIO_STREAM_RE.search(output)
+    if stream:
+        codec = normalize_codec(stream[1])
+        stream_bitrate = _STREAM_BITRATE_RE.search(stream[2])
+        if stream_bitrate:
+            bitrate = float(stream_bitrate[1])
+    if bitrate is None:
+        container_bitrate = _CONTAINER_BITRATE_RE.search(output)
+        if container_bitrate:
+            bitrate = float(container_bitrate[1])
+    match = _DURATION_RE.search(output)
+    if match:
+        duration = int(match[1]) * 3600 + int(match[2]) * 60 + float(match[3])
+    return codec, bitrate, duration
+
+
+class TranscodeCost:
+    """오디오 1초당 변환 CPU 시간 (이 프로세스에서 변환한 작업들의 평균)"""
+
+    def __init__(self, default: float = DEFAULT_TRANSCODE_COST):
+        self._lock = threading.Lock()
+        self._default = default
+        self._cpu_seconds = 0.0
+        self._media_seconds = 0.0
+
+    def record(self, cpu_seconds: float, media_seconds: float | None) -> None:
+        """변환 작업 기록"""
+        if not media_seconds or media_seconds <= 0:
+            return
+        with self._lock:
+            self._cpu_seconds += cpu_seconds
+            self._media_seconds += media_seconds
+
+    def per_second(self) -> float:
+        """오디오 1초당 변환 CPU 시간"""
+        with self._lock:
+            if self._media_seconds <= 0:
+                return self._default
+            return self._cpu_seconds / self._media_seconds
+
+    def estimate(self, media_seconds: float | None) -> float | None:
+        """이 길이를 변환했다면 들었을 CPU 시간"""
+        if not media_seconds:
+            return None
+        return self.per_second() * media_seconds
+
+
+# 전역 변환 비용 추정기
+transcode_cost = TranscodeCost()
+
+
+def audio_report(plan: AudioPlan, cpu_seconds: float | None, duration: float | None) -> AudioReport:
+    """
+    작업 보고 생성 (변환이면 비용 추정에 반영, 복사면 절약한 CPU 시간 추정)
+
+    Args:
+        plan: 실제로 쓴 처리 방식
+        cpu_seconds: ffmpeg CPU 시간 (측정하지 못했으면 None)
+        duration: 오디오 길이 (초)
+    """
+    saved = None
+    if plan.mode == "transcode":
+        if cpu_seconds is not None:
+            transcode_cost.record(cpu_seconds, duration)
+        saved = 0.0
+    else:
+        estimate = transcode_cost.estimate(duration)
+        if estimate is not None:
+            saved = round(max(estimate - (cpu_seconds or 0.0), 0.0), 3)
+    return AudioReport(
+        mode=plan.mode,
+        source_codec=plan.source_codec,
+        source_bitrate=plan.source_bitrate,
+        output_codec=plan.codec,
+        reason=plan.reason,
+        cpu_seconds=round(cpu_seconds, 3) if cpu_seconds is not None else None,
+        cpu_seconds_saved=saved,
+    )
+
+
+def describe_audio(report: AudioReport) -> str:
+    """작업 보고 한 줄 요약"""
+    if report.mode == "copy":
+        summary = f"스트림 복사 ({report.source_codec} -> {report.output_codec}, {report.reason}"
+        if report.cpu_seconds_saved is not None:
+            summary += f", CPU 약 {report.cpu_seconds_saved:.2f}초 절약"
+        return summary + ")"
+    summary = f"MP3 변환 ({report.reason}"
+    if report.cpu_seconds is not None:
+        summary += f", CPU {report.cpu_seconds:.2f}초"
+    return summary + ")"
+
+
+def children_cpu_seconds() -> float | None:
+    """지금까지 끝난 자식 프로세스의 CPU 시간 합 (지원하지 않는 플랫폼이면 None)"""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+class AdaptiveExtractAudioPP(FFmpegExtractAudioPP):
+    """
+    원본에 따라 스트림 복사 또는 MP3 변환을 고르는 오디오 추출 후처리기
+
+    파일로 받은 경우에만 동작합니다 (파이프로 이미 처리한 파일은 `_audio_report`가 있어 건너뜀).
+    CPU 시간은 자식 프로세스 CPU 시간의 차이라서, 여러 작업이 동시에 변환하면 근사값입니다.
+    """
+
+    def __init__(
+        self,
+        downloader: yt_dlp.YoutubeDL | None = None,
+        audio_format: str = "mp3",
+        audio_quality: str = "192",
+    ) -> None:
+        """
+        초기화
+
+        Args:
+            downloader: YoutubeDL 인스턴스
+            audio_format: mp3 (항상 MP3) 또는 auto
+            audio_quality: 요청 비트레이트 (kbps)
+        """
+        super().__init__(downloader, preferredcodec="mp3", preferredquality=audio_quality)
+        self.audio_format = audio_format
+        self.audio_quality = audio_quality
+
+    def plan(self, info: dict[str, Any], path: str | None = None) -> AudioPlan:
+        """
+        처리 방식 결정 (info의 포맷 정보가 없으면 path 파일을 확인)
+
+        Args:
+            info: 받은 포맷 정보
+            path: 받은 파일 경로 (없으면 포맷 정보만 사용)
+        """
+        codec = normalize_codec(info.get("acodec"))
+        bitrate = info.get("abr") or (info.get("tbr") if info.get("vcodec") == "none" else None)
+        if path is not None and (codec is None or bitrate is None):
+            probed_codec, probed_bitrate, _ = probe_audio(self.executable, path)
+            codec = codec or probed_codec
+            bitrate = bitrate or probed_bitrate
+        return plan_audio(codec, bitrate, self.audio_format, self.audio_quality)
+
+    @FFmpegExtractAudioPP._restrict_to(images=False)
+    def run(self, information: dict[str, Any]) -> tuple[list[str], dict[str, Any]]:
+        if information.get("_audio_report") is not None:
+            return [], information
+
+        path = information["filepath"]
+        plan = self.plan(information, path)
+        duration = information.get("duration") or probe_audio(self.executable, path)[2]
+
+        started = children_cpu_seconds()
+        self.mapping = plan.codec
+        try:
+            files_to_delete, information = super().run(information)
+        finally:
+            self.mapping = "mp3"
+        finished = children_cpu_seconds()
+        cpu_seconds = finished - started if started is not None and finished is not None else None
+
+        information["_audio_report"] = audio_report(plan, cpu_seconds, duration).model_dump()
+        return files_to_delete, information
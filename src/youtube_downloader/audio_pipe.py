@@ -0,0 +1,311 @@
+"""오디오 추출 파이프라인
+
+오디오만 받을 때 받은 바이트를 디스크에 쓰지 않고 바로 ffmpeg 표준 입력에 넘겨 최종 오디오 파일만 씁니다.
+네트워크 전송과 인코딩이 겹치고, 원본을 파일로 썼다가 `FFmpegExtractAudio`가 다시 읽는 과정이 없으므로
+오디오 작업의 디스크 I/O가 절반 정도로 줄어듭니다.
+
+파이프로 읽을 수 있는 컨테이너(webm/ogg, 조각 MP4 등)의 단일 http(s) 포맷만 처리합니다.
+그 밖의 포맷이거나 파이프 변환이 실패하면 기존 방식(파일로 받은 뒤 변환)으로 다시 받습니다.
+
+`audio_format="auto"`로 스트림 복사할 수 있으면 파이프에서도 `-acodec copy`로 담기만 합니다.
+포맷 정보에 원본 코덱/비트레이트가 없으면 파일로 받아서 확인한 뒤 결정합니다.
+"""
+
+import os
+import re
+import subprocess
+import tempfile
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, cast
+
+import yt_dlp
+from yt_dlp.downloader.common import FileDownloader
+from yt_dlp.networking import Request
+from yt_dlp.networking.exceptions import RequestError
+from yt_dlp.postprocessor.ffmpeg import ACODECS, FFmpegExtractAudioPP
+from yt_dlp.utils import determine_protocol, replace_extension
+
+from .audio import AdaptiveExtractAudioPP, AudioPlan, audio_report
+
+# 한 번에 읽는 크기
+_READ_SIZE = 64 * 1024
+
+# 앞부분만으로 디코딩을 시작할 수 있는 원본 확장자 (일반 MP4/M4A는 moov가 끝에 있을 수 있음)
+PIPEABLE_EXTS = ("webm", "weba", "ogg", "oga", "opus", "mp3", "aac", "flac", "wav")
+
+# 조각(fragmented) MP4라 파이프로 읽을 수 있는 컨테이너
+PIPEABLE_CONTAINERS = ("m4a_dash", "mp4_dash", "webm_dash")
+
+# 출력 확장자별 ffmpeg muxer (임시 파일 이름 `.part`로는 형식을 알 수 없으므로 지정)
+_MUXERS = {"mp3": "mp3", "m4a": "ipod", "opus": "opus", "ogg": "ogg", "flac": "flac", "wav": "wav"}
+
+_CONTENT_RANGE_RE = re.compile(r"bytes\s+\d+-\d+/(\d+)")
+
+
+class AudioPipeError(Exception):
+    """파이프 변환 실패 (파일로 받아서 다시 시도)"""
+
+
+def can_pipe(info_dict: dict[str, Any]) -> bool:
+    """파이프로 변환할 수 있는 단일 파일 http(s) 포맷인지 여부"""
+    return (
+        determine_protocol(info_dict) in ("http", "https")
+        and not info_dict.get("fragments")
+        and not info_dict.get("is_live")
+        and (
+            info_dict.get("ext") in PIPEABLE_EXTS
+            or info_dict.get("container") in PIPEABLE_CONTAINERS
+        )
+    )
+
+
+class AudioPipeFD(FileDownloader):
+    """받는 대로 ffmpeg로 변환해서 최종 오디오 파일만 쓰는 yt-dlp 다운로더"""
+
+    def __init__(
+        self,
+        ydl: yt_dlp.YoutubeDL,
+        params: dict[str, Any],
+        extractor: FFmpegExtractAudioPP,
+        plan: AudioPlan | None = None,
+    ):
+        """
+        초기화
+
+        Args:
+            ydl: YoutubeDL 인스턴스
+            params: yt-dlp 옵션
+            extractor: 등록된 오디오 추출 후처리기 (같은 코덱/품질로 변환)
+            plan: 처리 방식 (None이면 후처리기 코덱으로 변환)
+        """
+        super().__init__(ydl, params)
+        self.extractor = extractor
+        self.plan = plan
+        self.output_path: str | None = None
+        self.cpu_seconds: float | None = None
+
+    def real_download(self, filename: str, info_dict: dict[str, Any]) -> bool:
+        codec = self.plan.codec if self.plan else self.extractor.mapping
+        extension, acodec, more_opts = ACODECS[codec]
+        more_opts = list(more_opts)
+        if self.plan is not None and self.plan.mode == "copy":
+            more_opts = ["-acodec", "copy", *more_opts]
+        elif acodec is not None:
+            more_opts = ["-acodec", acodec, *self.extractor._quality_args(acodec)]
+        if "-f" not in more_opts:
+            more_opts += ["-f", _MUXERS[extension]]
+
+        output_path = replace_extension(filename, extension, info_dict.get("ext"))
+        tmpfilename = f"{output_path}.part"
+        command = [
+            self.extractor.executable, "-hide_banner", "-nostdin", "-loglevel", "error", "-y",
+            "-i", "pipe:0", "-vn", *more_opts, tmpfilename,
+        ]
+
+        self.report_destination(output_path)
+        # stderr 파이프는 stdin에 쓰는 동안 읽는 쪽이 없어 가득 차면 ffmpeg와 서로 기다리므로 임시 파일 사용
+        stderr = tempfile.TemporaryFile()
+        process = subprocess.Popen(
+            command, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=stderr
+        )
+        assert process.stdin is not None
+        start = time.time()
+        downloaded = 0
+        total = info_dict.get("filesize")
+        try:
+            for chunk, total in self._chunks(info_dict):
+                try:
+                    process.stdin.write(chunk)
+                except BrokenPipeError:
+                    break
+                downloaded += len(chunk)
+                self.slow_down(start, None, downloaded)
+                elapsed = time.time() - start
+                speed = downloaded / elapsed if elapsed > 0 else None
+                self._hook_progress({
+                    "status": "downloading",
+                    "downloaded_bytes": downloaded,
+                    "total_bytes": total,
+                    "tmpfilename": tmpfilename,
+                    "filename": output_path,
+                    "elapsed": elapsed,
+                    "speed": speed,
+                    "eta": (total - downloaded) / speed if speed and total else None,
+                }, info_dict)
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+            returncode, self.cpu_seconds = _wait(process)
+            stderr.seek(0)
+            error = stderr.read().decode(errors="replace").strip()
+        except (RequestError, OSError) as e:
+            raise AudioPipeError(f"원본을 받지 못했습니다: {e}") from e
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+            stderr.close()
+            if process.returncode != 0:
+                Path(tmpfilename).unlink(missing_ok=True)
+
+        if returncode != 0:
+            raise AudioPipeError(f"ffmpeg 변환 실패 (종료 코드 {returncode}): {error}")
+        if total and downloaded < total:
+            Path(tmpfilename).unlink(missing_ok=True)
+            raise AudioPipeError(f"연결이 끊겼습니다 ({downloaded}/{total})")
+
+        self.try_rename(tmpfilename, output_path)
+        self.output_path = output_path
+        self._hook_progress({
+            "status": "finished",
+            "downloaded_bytes": downloaded,
+            "total_bytes": downloaded,
+            "filename": output_path,
+            "elapsed": time.time() - start,
+        }, info_dict)
+        return True
+
+    def _chunks(self, info_dict: dict[str, Any]) -> Iterator[tuple[bytes, int | None]]:
+        """
+        원본을 순서대로 읽기
+
+        유튜브처럼 큰 요청을 제한하는 사이트는 `http_chunk_size` 단위 Range 요청으로 나눠 받습니다.
+
+        Yields:
+            (데이터, 전체 크기)
+        """
+        url = info_dict["url"]
+        headers = dict(info_dict.get("http_headers") or {})
+        downloader_options = info_dict.get("downloader_options") or {}
+        request_size = downloader_options.get("http_chunk_size") or self.params.get("http_chunk_size")
+
+        offset = 0
+        total = info_dict.get("filesize")
+        while True:
+            request_headers = dict(headers)
+            if request_size:
+                request_headers["Range"] = f"bytes={offset}-{offset + request_size - 1}"
+            response = self.ydl.urlopen(Request(url, headers=request_headers))
+            received = 0
+            try:
+                match = _CONTENT_RANGE_RE.match(response.headers.get("Content-Range") or "")
+                if match:
+                    total = int(match[1])
+                elif response.headers.get("Content-Length") and not request_size:
+                    total = int(response.headers["Content-Length"])
+                elif request_size:
+                    # Range를 무시하고 전체를 보냄
+                    request_size = None
+                while chunk := response.read(_READ_SIZE):
+                    received += len(chunk)
+                    yield chunk, total
+            finally:
+                response.close()
+
+            offset += received
+            if not request_size or not received or (total is not None and offset >= total):
+                return
+
+
+def _wait(process: subprocess.Popen[bytes]) -> tuple[int, float | None]:
+    """
+    ffmpeg 종료 대기
+
+    Returns:
+        (종료 코드, 이 프로세스의 CPU 시간 (os.wait4가 없으면 None))
+    """
+    if not hasattr(os, "wait4"):
+        return process.wait(), None
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    return process.returncode, usage.ru_utime + usage.ru_stime
+
+
+class AudioPipeYoutubeDL(yt_dlp.YoutubeDL):
+    """오디오 추출 작업의 단일 파일 포맷을 `AudioPipeFD`로 받는 YoutubeDL"""
+
+    def dl(
+        self, name: str, info: dict[str, Any], subtitle: bool = False, test: bool = False
+    ) -> tuple[bool, bool]:
+        """
+        포맷 하나 다운로드 (파이프로 변환할 수 없으면 yt-dlp 기본 동작)
+
+        Returns:
+            (성공 여부, 실제로 받았는지 여부)
+        """
+        extractor = self._audio_extractor()
+        if (
+            test or subtitle or name == "-" or extractor is None
+            or not can_pipe(info) or not extractor.available
+        ):
+            return self._download_file(name, info, subtitle, test)
+
+        plan = extractor.plan(info)
+        if (
+            extractor.audio_format == "auto" and plan.mode == "transcode"
+            and (plan.source_codec is None or plan.source_bitrate is None)
+        ):
+            # 원본을 확인해야 복사할 수 있는지 알 수 있음
+            return self._download_file(name, info, subtitle, test)
+
+        fd = AudioPipeFD(self, self.params, extractor, plan)
+        for ph in self._progress_hooks:
+            fd.add_progress_hook(ph)
+        self.write_debug(f'Invoking audio pipe downloader on "{info["url"]}"')
+
+        new_info = self._copy_infodict(info)
+        if new_info.get("http_headers") is None:
+            new_info["http_headers"] = self._calc_headers(new_info)
+        try:
+            success, real_download = fd.download(name, new_info, subtitle)
+        except AudioPipeError as e:
+            self.report_warning(f"파이프 변환에 실패해서 파일로 받은 뒤 변환합니다: {e}")
+            return self._download_file(name, info, subtitle, test)
+
+        if success and fd.output_path:
+            info["__piped_audio"] = fd.output_path
+            info["_audio_report"] = audio_report(plan, fd.cpu_seconds, info.get("duration")).model_dump()
+        return success, real_download
+
+    def post_process(
+        self,
+        filename: str,
+        info: dict[str, Any],
+        files_to_move: dict[str, str] | None = None,
+    ) -> dict[str, Any]:
+        """
+        후처리 실행 (파이프로 변환한 파일이면 그 파일 기준)
+
+        파이프로 변환한 경우 `__postprocessors`를 비워서 yt-dlp가 다운로드 뒤 등록한 fixup
+        후처리기(DASH m4a, HLS ts, 타임스탬프 보정 등)를 의도적으로 건너뜁니다. 이들은 모두 원본
+        컨테이너를 고치는 것이고, ffmpeg가 이미 출력 파일을 새로 썼으므로 변환된 파일에 적용하면
+        오히려 형식이 바뀝니다 (예: FixupM4a가 mp3를 mp4 컨테이너로 다시 씀). `postprocessors`
+        옵션으로 등록한 후처리기는 그대로 실행됩니다.
+        """
+        piped = info.pop("__piped_audio", None)
+        if piped is not None and os.path.exists(piped):
+            # 이미 변환된 파일 (오디오 추출 후처리기는 `_audio_report`가 있어 건너뜀)
+            filename = piped
+            info["ext"] = Path(piped).suffix.lstrip(".")
+            info["__postprocessors"] = []
+        return cast(dict[str, Any], super().post_process(filename, info, files_to_move))
+
+    def _download_file(
+        self, name: str, info: dict[str, Any], subtitle: bool, test: bool
+    ) -> tuple[bool, bool]:
+        """yt-dlp 기본 다운로드 (파일로 받은 뒤 후처리기로 변환)"""
+        return cast(tuple[bool, bool], super().dl(name, info, subtitle=subtitle, test=test))
+
+    def _audio_extractor(self) -> AdaptiveExtractAudioPP | None:
+        """파이프로 대신할 수 있는 오디오 추출 후처리기"""
+        for pp in self._pps["post_process"]:
+            if isinstance(pp, AdaptiveExtractAudioPP):
+                return pp
+        return None
@@ -0,0 +1,275 @@
+"""프로세스 전체 대역폭 관리
+
+동시에 실행되는 모든 다운로드가 하나의 전체 속도 제한을 나눠 씁니다. 대역폭은 먼저 사용자끼리,
+다음에 같은 사용자의 작업끼리 가중치에 비례해 나누고(가중 공정 분배), 자기 몫을 다 쓰지 못하는
+작업의 남는 몫은 다른 작업에 다시 나눠 줍니다(max-min 공정성). 큰 4K 다운로드 하나가 작은
+오디오 다운로드들을 굶기지 않습니다.
+
+작업별로 빚(debt)을 허용하는 토큰 버킷을 두고, yt-dlp 진행률 훅에서 받은 바이트만큼 소비합니다.
+훅이 다운로드 스레드에서 호출되므로 훅 안에서 기다리면 그 다운로드가 느려집니다.
+"""
+
+import math
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any, Hashable
+
+# 할당량 재계산 간격 (초)
+_REBALANCE_INTERVAL = 0.5
+
+# 토큰 버킷 크기 (할당 속도 기준 초)
+_BURST_SECONDS = 0.5
+
+# 몫을 다 쓰지 못한다고 판단하는 사용률
+_UNDERUSE_RATIO = 0.8
+
+# 몫을 다 쓰지 못하는 작업에 측정 속도보다 더 주는 여유
+_DEMAND_HEADROOM = 1.25
+
+# 작업 하나에 보장하는 최소 속도 (바이트/초, 작업이 많으면 전체 제한 / 작업 수까지 낮춤)
+_MIN_RATE = 16 * 1024
+
+
+def fair_share(
+    capacity: float,
+    weights: dict[Hashable, float],
+    demands: dict[Hashable, float],
+) -> dict[Hashable, float]:
+    """
+    가중 max-min 공정 분배 (water-filling)
+
+    요구량이 가중치 몫보다 작은 항목은 요구량만 받고, 남은 양을 나머지 항목이 가중치대로 나눕니다.
+
+    Args:
+        capacity: 나눌 전체 양
+        weights: 항목별 가중치
+        demands: 항목별 요구량 (없으면 무제한)
+
+    Returns:
+        항목별 할당량
+    """
+    allocation: dict[Hashable, float] = {}
+    remaining = {key: weight for key, weight in weights.items() if weight > 0}
+    while remaining:
+        total_weight = sum(remaining.values())
+        satisfied = {
+            key
+            for key, weight in remaining.items()
+            if demands.get(key, math.inf) <= capacity * weight / total_weight
+        }
+        if not satisfied:
+            for key, weight in remaining.items():
+                allocation[key] = capacity * weight / total_weight
+            break
+        for key in satisfied:
+            allocation[key] = demands[key]
+            capacity -= demands[key]
+            del remaining[key]
+    return allocation
+
+
+@dataclass
+class _Task:
+    user_id: str | None
+    weight: float
+    refilled_at: float
+    allocation: float | None = None
+    tokens: float = 0.0
+    # 측정 구간 시작 시각과 그동안 받은 바이트, 마지막 측정 속도
+    window_started: float = 0.0
+    window_bytes: int = 0
+    measured_rate: float | None = None
+    # 파일별 마지막 downloaded_bytes (진행률 훅의 누적값을 증가분으로 바꾸기 위함)
+    last_bytes: dict[str, int] = field(default_factory=dict)
+
+
+class BandwidthManager:
+    """
+    전체 속도 제한 + 사용자/작업별 가중 공정 분배
+
+    rate가 None이면 제한 없이 사용량만 기록합니다.
+    """
+
+    def __init__(self, rate: float | None = None):
+        """
+        관리자 초기화
+
+        Args:
+            rate: 전체 속도 제한 (바이트/초, None이나 0이면 무제한)
+        """
+        self.rate = rate or None
+        self._lock = threading.Lock()
+        self._tasks: dict[str, _Task] = {}
+        self._rebalanced_at = time.monotonic()
+
+    def register(self, task_id: str, user_id: str | None = None, weight: float = 1.0) -> None:
+        """
+        다운로드 작업 등록
+
+        Args:
+            task_id: 작업 ID
+            user_id: 사용자 ID (None이면 작업마다 별도 사용자로 취급)
+            weight: 같은 사용자의 작업 사이 가중치
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tasks[task_id] = _Task(
+                user_id=user_id, weight=weight, refilled_at=now, window_started=now
+            )
+            self._rebalance(now)
+
+    def unregister(self, task_id: str) -> None:
+        """작업 등록 해제 (남은 작업에 대역폭 재분배)"""
+        with self._lock:
+            if self._tasks.pop(task_id, None) is not None:
+                self._rebalance(time.monotonic())
+
+    def consume(self, task_id: str, nbytes: int) -> None:
+        """
+        받은 바이트 수만큼 토큰 소비 (몫을 넘었으면 그만큼 대기)
+
+        Args:
+            task_id: 작업 ID
+            nbytes: 받은 바이트 수
+        """
+        if nbytes <= 0:
+            return
+
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if task is None:
+                return
+            now = time.monotonic()
+            task.window_bytes += nbytes
+            if now - self._rebalanced_at >= _REBALANCE_INTERVAL:
+                self._measure(now)
+                self._rebalance(now)
+
+            rate = task.allocation
+            if rate is None:
+                return
+            capacity = rate * _BURST_SECONDS
+            task.tokens = min(capacity, task.tokens + (now - task.refilled_at) * rate)
+            task.refilled_at = now
+            task.tokens -= nbytes
+            delay = -task.tokens / rate if task.tokens < 0 else 0.0
+
+        if delay > 0:
+            time.sleep(delay)
+
+    def allocation(self, task_id: str) -> float | None:
+        """작업의 현재 할당 속도 (바이트/초, 무제한이거나 등록되지 않았으면 None)"""
+        with self._lock:
+            task = self._tasks.get(task_id)
+            return task.allocation if task else None
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """작업별 할당/측정 속도"""
+        with self._lock:
+            return {
+                task_id: {
+                    "user_id": task.user_id,
+                    "weight": task.weight,
+                    "allocation": task.allocation,
+                    "measured_rate": task.measured_rate,
+                }
+                for task_id, task in self._tasks.items()
+            }
+
+    def throttled(
+        self,
+        task_id: str,
+        callback: Callable[[dict[str, Any]], None] | None = None,
+    ) -> Callable[[dict[str, Any]], None]:
+        """
+        yt-dlp 진행률 훅 감싸기
+
+        누적 downloaded_bytes를 파일별 증가분으로 바꿔 소비한 뒤 callback을 호출합니다.
+
+        Args:
+            task_id: 작업 ID (`register`로 등록한 ID)
+            callback: 원래 진행률 콜백
+
+        Returns:
+            진행률 훅
+        """
+
+        def hook(d: dict[str, Any]) -> None:
+            downloaded = d.get("downloaded_bytes")
+            if d.get("status") == "downloading" and downloaded is not None:
+                self.consume(task_id, self._delta(task_id, str(d.get("tmpfilename") or d.get("filename")), downloaded))
+            if callback:
+                callback(d)
+
+        return hook
+
+    def _delta(self, task_id: str, filename: str, downloaded: int) -> int:
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if task is None:
+                return 0
+            last = task.last_bytes.get(filename, 0)
+            task.last_bytes[filename] = downloaded
+            # 다시 시작한 파일이면 누적값 전체가 새로 받은 양
+            return downloaded - last if downloaded >= last else downloaded
+
+    def _measure(self, now: float) -> None:
+        """측정 구간이 충분히 긴 작업의 속도 갱신 (lock 보유 상태에서 호출)"""
+        for task in self._tasks.values():
+            elapsed = now - task.window_started
+            # 막 시작한 작업을 몫을 못 쓰는 작업으로 오판하지 않도록
+            if elapsed >= _REBALANCE_INTERVAL:
+                task.measured_rate = task.window_bytes / elapsed
+                task.window_started = now
+                task.window_bytes = 0
+
+    def _rebalance(self, now: float) -> None:
+        """할당량 재계산 (lock 보유 상태에서 호출)"""
+        self._rebalanced_at = now
+        if self.rate is None:
+            for task in self._tasks.values():
+                task.allocation = None
+            return
+
+        # 최소 속도를 모두에게 보장해도 합이 전체 제한을 넘지 않도록
+        floor = min(_MIN_RATE, self.rate / len(self._tasks)) if self._tasks else _MIN_RATE
+
+        # 몫을 다 쓰지 못하는 작업은 측정 속도 + 여유만 요구하는 것으로 봄
+        demands = {}
+        for task_id, task in self._tasks.items():
+            if (
+                task.allocation is not None
+                and task.measured_rate is not None
+                and task.measured_rate < task.allocation * _UNDERUSE_RATIO
+            ):
+                demands[task_id] = max(task.measured_rate * _DEMAND_HEADROOM, floor)
+
+        # 사용자별로 먼저 나누고, 사용자 몫을 그 사용자의 작업끼리 나눔
+        users: dict[Hashable, list[str]] = {}
+        for task_id, task in self._tasks.items():
+            users.setdefault(task.user_id or ("task", task_id), []).append(task_id)
+
+        user_demands = {
+            user: sum(demands.get(task_id, math.inf) for task_id in task_ids)
+            for user, task_ids in users.items()
+        }
+        user_allocation = fair_share(self.rate, {user: 1.0 for user in users}, user_demands)
+
+        allocations: dict[str, float] = {}
+        for user, task_ids in users.items():
+            task_allocation = fair_share(
+                user_allocation.get(user, 0.0),
+                {task_id: self._tasks[task_id].weight for task_id in task_ids},
+                demands,
+            )
+            for task_id in task_ids:
+                allocations[task_id] = max(task_allocation.get(task_id, 0.0), floor)
+
+        # 최소 속도로 올려 준 만큼 최소 속도를 넘는 몫에서 비율대로 덜어냄
+        excess = sum(allocations.values()) - self.rate
+        above = sum(rate - floor for rate in allocations.values())
+        scale = 1 - excess / above if excess > 0 and above > 0 else 1.0
+        for task_id, rate in allocations.items():
+            self._tasks[task_id].allocation = floor + (rate - floor) * scale
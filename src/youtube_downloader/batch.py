@@ -0,0 +1,174 @@
+"""여러 URL 동시 다운로드 (배치)"""
+
+import itertools
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, TextIO
+
+from .archive import DownloadArchive
+from .bandwidth import BandwidthManager
+from .cache import InfoCache
+from .downloader import Downloader
+from .models import BatchItem, BatchSummary, DownloadOptions, DownloadResult
+
+
+def read_urls(stream: TextIO) -> Iterator[str]:
+    """
+    파일/표준입력에서 URL 목록 읽기
+
+    빈 줄과 `#`으로 시작하는 주석 줄은 건너뛰고, 중복 URL은 한 번만 반환합니다.
+    같은 URL을 동시에 받으면 같은 출력 파일에 겹쳐 쓰게 되기 때문입니다.
+
+    Args:
+        stream: 한 줄에 URL 하나씩 들어 있는 텍스트 스트림
+
+    Yields:
+        URL
+    """
+    seen: set[str] = set()
+    for line in stream:
+        url = line.strip()
+        if not url or url.startswith("#") or url in seen:
+            continue
+        seen.add(url)
+        yield url
+
+
+class BatchDownloader:
+    """고정 크기 스레드 풀로 여러 URL을 동시에 다운로드"""
+
+    def __init__(
+        self,
+        options: DownloadOptions | None = None,
+        jobs: int = 4,
+        info_cache: InfoCache | None = None,
+        archive: DownloadArchive | None = None,
+        bandwidth: BandwidthManager | None = None,
+    ):
+        """
+        배치 다운로더 초기화
+
+        Args:
+            options: 모든 작업에 공통으로 적용할 다운로드 옵션
+            jobs: 동시에 실행할 최대 다운로드 수
+            info_cache: 추출 정보 캐시
+            archive: 다운로드 아카이브
+            bandwidth: 동시 작업이 나눠 쓸 대역폭 관리자 (None이면 제한 없음)
+        """
+        if jobs < 1:
+            raise ValueError("jobs는 1 이상이어야 합니다.")
+        self.options = options or DownloadOptions()
+        self.jobs = jobs
+        self.info_cache = info_cache
+        self.archive = archive
+        self.bandwidth = bandwidth
+
+    def run(
+        self,
+        urls: Iterable[str],
+        on_start: Callable[[int, str], None] | None = None,
+        on_progress: Callable[[int, dict[str, Any]], None] | None = None,
+        on_finish: Callable[[BatchItem], None] | None = None,
+        message_callback: Callable[[str], None] | None = None,
+    ) -> BatchSummary:
+        """
+        배치 다운로드 실행
+
+        URL은 필요한 만큼만 소비하므로 (동시 실행 수만큼) 지연 생성되는
+        이터러블도 그대로 넘길 수 있습니다. 한 URL이 실패해도 나머지는 계속 진행되며,
+        입력 자체가 실패하면 그때까지 시작한 작업만 마치고 `error_message`에 기록합니다.
+
+        Args:
+            urls: 다운로드할 URL 목록
+            on_start: 작업 시작 콜백 (작업 번호, URL)
+            on_progress: yt-dlp 진행률 콜백 (작업 번호, 진행률 dict)
+            on_finish: 작업 종료 콜백
+            message_callback: 메시지 출력 콜백
+
+        Returns:
+            모든 작업 결과 요약
+        """
+        started_at = time.monotonic()
+        items: list[BatchItem] = []
+        pending: set[Future[BatchItem]] = set()
+
+        def collect(done: set[Future[BatchItem]]) -> None:
+            for future in done:
+                item = future.result()
+                items.append(item)
+                if on_finish:
+                    on_finish(item)
+
+        error_message: str | None = None
+        iterator = iter(urls)
+
+        with ThreadPoolExecutor(max_workers=self.jobs, thread_name_prefix="ytdl-batch") as pool:
+            for index in itertools.count():
+                # 동시 실행 수만큼만 제출해서 입력을 지연 소비
+                if len(pending) >= self.jobs:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+
+                # 입력(재생목록 열거 등)이 중간에 실패해도 이미 시작한 작업은 마무리
+                try:
+                    url = next(iterator)
+                except StopIteration:
+                    break
+                except Exception as e:
+                    error_message = str(e)
+                    break
+
+                if on_start:
+                    on_start(index, url)
+                pending.add(
+                    pool.submit(self._run_one, index, url, on_progress, message_callback)
+                )
+
+            done, _ = wait(pending)
+            collect(done)
+
+        items.sort(key=lambda item: item.index)
+        return BatchSummary(
+            total=len(items),
+            succeeded=sum(1 for item in items if item.result.success),
+            failed=sum(1 for item in items if not item.result.success),
+            elapsed_seconds=time.monotonic() - started_at,
+            items=items,
+            error_message=error_message,
+        )
+
+    def _run_one(
+        self,
+        index: int,
+        url: str,
+        on_progress: Callable[[int, dict[str, Any]], None] | None,
+        message_callback: Callable[[str], None] | None,
+    ) -> BatchItem:
+        """작업 하나 실행 (예외가 나도 실패 결과로 변환)"""
+        started_at = time.monotonic()
+
+        def progress_callback(d: dict[str, Any]) -> None:
+            if on_progress:
+                on_progress(index, d)
+
+        hook: Callable[[dict[str, Any]], None] = progress_callback
+        if self.bandwidth is not None:
+            self.bandwidth.register(str(index))
+            hook = self.bandwidth.throttled(str(index), progress_callback)
+
+        try:
+            downloader = Downloader(self.options, self.info_cache, self.archive)
+            result = downloader.download(url, hook, message_callback)
+        except Exception as e:
+            result = DownloadResult(success=False, error_message=str(e))
+        finally:
+            if self.bandwidth is not None:
+                self.bandwidth.unregister(str(index))
+
+        return BatchItem(
+            index=index,
+            url=url,
+            result=result,
+            elapsed_seconds=time.monotonic() - started_at,
+        )
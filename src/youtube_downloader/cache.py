@@ -0,0 +1,398 @@
+"""추출 정보 캐시 (메모리 LRU + SQLite)"""
+
+import atexit
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+from yt_dlp import YoutubeDL
+
+from .config import settings
+from .models import CacheStats
+
+# 유튜브 동영상 ID (11자)
+_YOUTUBE_ID = re.compile(r"^[0-9A-Za-z_-]{11}$")
+_YOUTUBE_HOSTS = ("youtube.com", "youtu.be", "youtube-nocookie.com")
+_YOUTUBE_PATH_PREFIXES = ("shorts", "embed", "live", "v", "e")
+
+# 라이브 방송은 포맷 URL이 계속 바뀌므로 캐시하지 않음
+_UNCACHEABLE_LIVE_STATUS = ("is_live", "is_upcoming", "post_live")
+
+# 서명된 스트림 URL 만료 직전의 정보는 쓰지 않도록 두는 여유 시간 (초)
+_EXPIRE_MARGIN = 300
+
+# 카운터를 디스크에 반영하는 최소 간격 (초)
+_COUNTER_FLUSH_INTERVAL = 10.0
+
+_COUNTERS = ("memory_hits", "disk_hits", "misses", "expired", "evictions")
+
+
+def canonical_video_id(url: str) -> str | None:
+    """
+    유튜브 URL에서 동영상 ID 추출
+
+    watch, youtu.be, shorts, embed, live 형식을 모두 같은 ID로 정규화합니다.
+
+    Args:
+        url: 유튜브 URL
+
+    Returns:
+        11자리 동영상 ID 또는 None
+    """
+    try:
+        parsed = urlparse(url.strip())
+    except ValueError:
+        return None
+
+    host = (parsed.hostname or "").lower()
+    if not any(host == h or host.endswith("." + h) for h in _YOUTUBE_HOSTS):
+        return None
+
+    candidate: str | None = None
+    parts = [p for p in parsed.path.split("/") if p]
+    if host.endswith("youtu.be"):
+        candidate = parts[0] if parts else None
+    elif parts[:1] == ["watch"]:
+        candidate = parse_qs(parsed.query).get("v", [None])[0]
+    elif len(parts) >= 2 and parts[0] in _YOUTUBE_PATH_PREFIXES:
+        candidate = parts[1]
+
+    if candidate and _YOUTUBE_ID.match(candidate):
+        return candidate
+    return None
+
+
+def cache_key(url: str) -> str | None:
+    """
+    캐시 키 생성
+
+    유튜브 URL은 `youtube:<ID>`로 정규화하고, 그 밖의 http(s) URL은 URL 그대로 사용합니다.
+    """
+    video_id = canonical_video_id(url)
+    if video_id:
+        return f"youtube:{video_id}"
+    if url.startswith(("http://", "https://")):
+        return f"url:{url.strip()}"
+    return None
+
+
+def _signed_url_expiry(info: dict[str, Any]) -> float | None:
+    """포맷 URL의 `expire` 파라미터 중 가장 이른 만료 시각"""
+    earliest: float | None = None
+    for fmt in info.get("formats") or []:
+        url = fmt.get("url") if isinstance(fmt, dict) else None
+        if not url:
+            continue
+        expire = parse_qs(urlparse(url).query).get("expire")
+        if expire and expire[0].isdigit():
+            value = float(expire[0])
+            earliest = value if earliest is None else min(earliest, value)
+    return earliest
+
+
+class InfoCache:
+    """
+    yt-dlp 추출 결과 캐시
+
+    메모리 LRU를 먼저 보고, 없으면 SQLite 파일을 봅니다.
+    값은 JSON 문자열로 보관하고 꺼낼 때마다 새 dict를 만들어 주므로,
+    yt-dlp가 반환된 dict를 수정해도 캐시에는 영향이 없습니다.
+    """
+
+    def __init__(
+        self,
+        path: Path | None,
+        ttl_seconds: int = 1800,
+        max_entries: int = 5000,
+        memory_entries: int = 256,
+    ):
+        """
+        캐시 초기화
+
+        Args:
+            path: SQLite 파일 경로 (None이면 메모리만 사용)
+            ttl_seconds: 항목 유효 시간 (초)
+            max_entries: 디스크에 보관할 최대 항목 수
+            memory_entries: 메모리에 보관할 최대 항목 수
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+
+        self._lock = threading.Lock()
+        # key -> (만료 시각, JSON 문자열)
+        self._memory: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._counters = dict.fromkeys(_COUNTERS, 0)
+        self._unflushed = dict.fromkeys(_COUNTERS, 0)
+        self._last_flush = time.monotonic()
+
+        self._conn: sqlite3.Connection | None = None
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS info_cache (
+                    key TEXT PRIMARY KEY,
+                    info TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS ix_info_cache_accessed_at
+                    ON info_cache (accessed_at);
+                CREATE TABLE IF NOT EXISTS cache_counters (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                );
+                """
+            )
+            self._conn.commit()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """
+        캐시 조회
+
+        Args:
+            key: 캐시 키 (`cache_key` 참고)
+
+        Returns:
+            추출 정보 (새 dict) 또는 None
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, text = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._count("memory_hits")
+                    return json.loads(text)
+                del self._memory[key]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT info, expires_at FROM info_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    text, expires_at = row
+                    if expires_at > now:
+                        self._conn.execute(
+                            "UPDATE info_cache SET accessed_at = ? WHERE key = ?", (now, key)
+                        )
+                        self._conn.commit()
+                        self._remember(key, expires_at, text)
+                        self._count("disk_hits")
+                        return json.loads(text)
+                    self._conn.execute("DELETE FROM info_cache WHERE key = ?", (key,))
+                    self._conn.commit()
+                    self._count("expired")
+
+            self._count("misses")
+            return None
+
+    def put(self, key: str, info: dict[str, Any]) -> bool:
+        """
+        추출 정보 저장
+
+        라이브 방송처럼 캐시하면 안 되는 정보는 저장하지 않습니다.
+
+        Args:
+            key: 캐시 키
+            info: `extract_info(..., process=False)` 결과
+
+        Returns:
+            저장 여부
+        """
+        if info.get("_type", "video") != "video":
+            return False
+        if info.get("is_live") or info.get("live_status") in _UNCACHEABLE_LIVE_STATUS:
+            return False
+
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+        signed_expiry = _signed_url_expiry(info)
+        if signed_expiry is not None:
+            expires_at = min(expires_at, signed_expiry - _EXPIRE_MARGIN)
+        if expires_at <= now:
+            return False
+
+        sanitized = YoutubeDL.sanitize_info(info, remove_private_keys=True)
+        text = json.dumps(sanitized, ensure_ascii=False)
+
+        with self._lock:
+            self._remember(key, expires_at, text)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO info_cache (key, info, expires_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, text, expires_at, now),
+                )
+                self._evict_disk(now)
+                self._flush_counters(force=True)
+                self._conn.commit()
+        return True
+
+    def clear(self) -> int:
+        """
+        모든 항목과 카운터 삭제
+
+        Returns:
+            삭제된 항목 수
+        """
+        with self._lock:
+            removed = len(self._memory)
+            self._memory.clear()
+            if self._conn is not None:
+                removed = self._conn.execute("DELETE FROM info_cache").rowcount
+                self._conn.execute("DELETE FROM cache_counters")
+                self._conn.commit()
+            self._counters = dict.fromkeys(_COUNTERS, 0)
+            self._unflushed = dict.fromkeys(_COUNTERS, 0)
+        return removed
+
+    def stats(self) -> CacheStats:
+        """캐시 통계 (디스크를 쓰면 이전 실행까지 누적된 값)"""
+        with self._lock:
+            counters = dict(self._counters)
+            entries = len(self._memory)
+            size_bytes = 0
+            if self._conn is not None:
+                self._flush_counters(force=True)
+                self._conn.commit()
+                counters = dict(
+                    self._conn.execute("SELECT name, value FROM cache_counters").fetchall()
+                )
+                entries, size_bytes = self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(LENGTH(info)), 0) FROM info_cache"
+                ).fetchone()
+
+        return CacheStats(
+            path=self.path,
+            entries=entries,
+            memory_entries=len(self._memory),
+            size_bytes=size_bytes,
+            ttl_seconds=self.ttl_seconds,
+            **{name: counters.get(name, 0) for name in _COUNTERS},
+        )
+
+    def close(self) -> None:
+        """남은 카운터를 기록하고 연결 종료"""
+        with self._lock:
+            if self._conn is not None:
+                self._flush_counters(force=True)
+                self._conn.commit()
+                self._conn.close()
+                self._conn = None
+
+    def _remember(self, key: str, expires_at: float, text: str) -> None:
+        """메모리 LRU에 추가 (lock 보유 상태에서 호출)"""
+        self._memory[key] = (expires_at, text)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self, now: float) -> None:
+        """만료 항목 삭제 후 최대 개수를 넘으면 가장 오래 안 쓴 항목부터 삭제"""
+        assert self._conn is not None
+        self._conn.execute("DELETE FROM info_cache WHERE expires_at <= ?", (now,))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM info_cache").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM info_cache WHERE key IN "
+                "(SELECT key FROM info_cache ORDER BY accessed_at LIMIT ?)",
+                (overflow,),
+            )
+            self._count("evictions", overflow)
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        """카운터 증가 (lock 보유 상태에서 호출)"""
+        self._counters[name] += amount
+        self._unflushed[name] += amount
+        self._flush_counters()
+
+    def _flush_counters(self, force: bool = False) -> None:
+        """쌓인 카운터를 디스크에 반영 (메모리 히트마다 쓰지 않도록 주기적으로만)"""
+        if self._conn is None:
+            return
+        if not force and time.monotonic() - self._last_flush < _COUNTER_FLUSH_INTERVAL:
+            return
+        for name, amount in self._unflushed.items():
+            if amount:
+                self._conn.execute(
+                    "INSERT INTO cache_counters (name, value) VALUES (?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                    (name, amount),
+                )
+        self._unflushed = dict.fromkeys(_COUNTERS, 0)
+        self._last_flush = time.monotonic()
+        if not force:
+            self._conn.commit()
+
+
+def extract_info(
+    ydl: YoutubeDL,
+    url: str,
+    cache: InfoCache | None,
+    on_extract: Callable[[], None] | None = None,
+) -> dict[str, Any] | None:
+    """
+    캐시를 거쳐 원본 추출 정보 가져오기
+
+    `extract_info(url, download=False, process=False)`와 같은 값을 반환합니다.
+    포맷 목록 등이 필요하면 `ydl.process_ie_result(info, download=False)`로 가공하세요.
+
+    Args:
+        ydl: YoutubeDL 인스턴스
+        url: 동영상 URL
+        cache: 캐시 (None이면 항상 추출)
+        on_extract: 캐시를 못 써서 추출기를 실행할 때 호출되는 콜백
+    """
+    key = cache_key(url) if cache is not None else None
+    if cache is not None and key is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    if on_extract:
+        on_extract()
+    info = ydl.extract_info(url, download=False, process=False)
+    if cache is not None and key is not None and info is not None:
+        cache.put(key, info)
+    return info
+
+
+_info_cache: InfoCache | None = None
+_info_cache_lock = threading.Lock()
+
+
+def get_info_cache() -> InfoCache | None:
+    """
+    설정에 따른 공유 캐시 인스턴스 (CLI와 웹 서버가 같이 사용)
+
+    Returns:
+        캐시 또는 None (캐시 비활성화 시)
+    """
+    global _info_cache
+    if not settings.cache.enabled:
+        return None
+    with _info_cache_lock:
+        if _info_cache is None:
+            _info_cache = InfoCache(
+                path=settings.cache.path,
+                ttl_seconds=settings.cache.ttl_seconds,
+                max_entries=settings.cache.max_entries,
+                memory_entries=settings.cache.memory_entries,
+            )
+            # 프로세스 종료 시 남은 카운터 기록
+            atexit.register(_info_cache.close)
+        return _info_cache
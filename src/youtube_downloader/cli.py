@@ -1,22 +1,33 @@
 """CLI 인터페이스"""
 
+import itertools
+from collections.abc import Callable, Iterable
 from pathlib import Path
+from typing import TextIO, cast
 
 import click
+import yt_dlp
 from rich.console import Console
 from rich.progress import (
     BarColumn,
     DownloadColumn,
     Progress,
+    TaskID,
     TextColumn,
     TimeRemainingColumn,
     TransferSpeedColumn,
 )
 
 from . import __version__
+from .archive import get_download_archive
+from .audio import describe_audio
+from .bandwidth import BandwidthManager
+from .batch import BatchDownloader, read_urls
+from .cache import extract_info, get_info_cache
 from .config import settings
 from .downloader import Downloader
-from .models import DownloadOptions
+from .models import AudioFormat, BatchItem, BatchSummary, DownloadOptions
+from .playlist import iter_playlist_entries, parse_items, prefetch
 from .utils import trim_audio
 
 console = Console()
@@ -32,51 +43,108 @@ def cli() -> None:
     pass
 
 
+class ByteRate(click.ParamType):
+    """`50K`, `4.2M` 같은 속도 표기 (바이트/초)"""
+
+    name = "rate"
+
+    def convert(self, value, param, ctx):
+        if isinstance(value, int):
+            return value
+        rate = yt_dlp.utils.parse_bytes(value)
+        if not rate:
+            self.fail(f"올바른 속도가 아닙니다: {value} (예: 500K, 4.2M)", param, ctx)
+        return rate
+
+
+def download_options(func: Callable[..., None]) -> Callable[..., None]:
+    """download/batch 명령 공통 다운로드 옵션"""
+    options = [
+        click.option(
+            "--quality",
+            "-q",
+            default="best",
+            help="화질 선택 (best, 1080p, 720p, 480p 등)",
+        ),
+        click.option(
+            "--output",
+            "-o",
+            type=click.Path(path_type=Path),
+            default=None,
+            help="출력 디렉토리",
+        ),
+        click.option(
+            "--audio-only",
+            is_flag=True,
+            help="오디오만 다운로드 (기본 MP3, --audio-format 참고)",
+        ),
+        click.option(
+            "--audio-quality",
+            "-aq",
+            type=click.Choice(["32", "48", "64", "96", "128", "192", "256", "320"]),
+            default="192",
+            help="오디오 비트레이트 (kbps)",
+        ),
+        click.option(
+            "--audio-format",
+            type=click.Choice(["mp3", "auto"]),
+            default="mp3",
+            show_default=True,
+            help="오디오 형식 (auto: 원본이 요청 음질 이하면 변환 없이 m4a/opus/ogg로 복사)",
+        ),
+        click.option(
+            "--metadata",
+            is_flag=True,
+            help="메타데이터 저장",
+        ),
+        click.option(
+            "--thumbnail",
+            is_flag=True,
+            help="썸네일 저장",
+        ),
+        click.option(
+            "--connections",
+            type=click.IntRange(1, 32),
+            default=1,
+            show_default=True,
+            help="파일 하나를 받을 동시 연결 수 (2 이상이면 구간 다운로드)",
+        ),
+        click.option(
+            "--concurrent-fragments",
+            "-N",
+            type=click.IntRange(1, 32),
+            default=settings.download.concurrent_fragments,
+            show_default=True,
+            help="HLS/DASH 조각 동시 다운로드 수",
+        ),
+        click.option(
+            "--fragment-retries",
+            type=click.IntRange(min=0),
+            default=settings.download.fragment_retries,
+            show_default=True,
+            help="조각별 재시도 횟수",
+        ),
+    ]
+    for option in reversed(options):
+        func = option(func)
+    return func
+
+
 @cli.command()
 @click.argument("url")
-@click.option(
-    "--quality",
-    "-q",
-    default="best",
-    help="화질 선택 (best, 1080p, 720p, 480p 등)",
-)
-@click.option(
-    "--output",
-    "-o",
-    type=click.Path(path_type=Path),
-    default=None,
-    help="출력 디렉토리",
-)
-@click.option(
-    "--audio-only",
-    is_flag=True,
-    help="오디오만 다운로드 (MP3)",
-)
-@click.option(
-    "--audio-quality",
-    "-aq",
-    type=click.Choice(["32", "48", "64", "96", "128", "192", "256", "320"]),
-    default="192",
-    help="오디오 비트레이트 (kbps)",
-)
-@click.option(
-    "--metadata",
-    is_flag=True,
-    help="메타데이터 저장",
-)
-@click.option(
-    "--thumbnail",
-    is_flag=True,
-    help="썸네일 저장",
-)
+@download_options
 def download(
     url: str,
     quality: str,
     output: Path | None,
     audio_only: bool,
     audio_quality: str,
+    audio_format: str,
     metadata: bool,
     thumbnail: bool,
+    connections: int,
+    concurrent_fragments: int,
+    fragment_retries: int,
 ) -> None:
     """동영상 다운로드
 
@@ -85,6 +153,7 @@ def download(
         ytdl download <URL> --quality 1080p
         ytdl download <URL> --audio-only
         ytdl download <URL> --audio-only --audio-quality 320
+        ytdl download <URL> --audio-only --audio-format auto
     """
     # 옵션 설정
     options = DownloadOptions(
@@ -92,12 +161,16 @@ def download(
         output_dir=output or settings.download.output_dir,
         audio_only=audio_only,
         audio_quality=audio_quality,
+        audio_format=cast(AudioFormat, audio_format),
         save_metadata=metadata,
         save_thumbnail=thumbnail,
+        connections=connections,
+        concurrent_fragments=concurrent_fragments,
+        fragment_retries=fragment_retries,
     )
 
     # 다운로더 생성
-    downloader = Downloader(options)
+    downloader = Downloader(options, get_info_cache(), get_download_archive())
 
     # 진행률 표시를 위한 Progress 설정
     with Progress(
@@ -138,11 +211,256 @@ def download(
             console.print("\n[green]✓ 다운로드 완료![/green]")
             if result.file_path:
                 console.print(f"[cyan]저장 위치: {result.file_path}[/cyan]")
+            if result.audio:
+                console.print(f"[cyan]오디오: {describe_audio(result.audio)}[/cyan]")
         else:
             console.print(f"\n[red]✗ 다운로드 실패: {result.error_message}[/red]")
             raise click.Abort()
 
 
+@cli.command()
+@click.argument("source", type=click.File("r", encoding="utf-8"))
+@download_options
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="동시 다운로드 수",
+)
+@click.option(
+    "--limit-rate",
+    "-r",
+    type=ByteRate(),
+    default=None,
+    help="모든 동시 다운로드가 나눠 쓸 전체 속도 제한 (예: 500K, 4.2M)",
+)
+@click.option(
+    "--summary",
+    type=click.Path(path_type=Path),
+    default=None,
+    help="결과 요약 JSON 경로 (기본: <출력 디렉토리>/batch-summary.json)",
+)
+def batch(
+    source: TextIO,
+    quality: str,
+    output: Path | None,
+    audio_only: bool,
+    audio_quality: str,
+    audio_format: str,
+    metadata: bool,
+    thumbnail: bool,
+    connections: int,
+    concurrent_fragments: int,
+    fragment_retries: int,
+    jobs: int,
+    limit_rate: int | None,
+    summary: Path | None,
+) -> None:
+    """여러 동영상 동시 다운로드
+
+    SOURCE 파일(또는 `-`이면 표준입력)에서 한 줄에 하나씩 URL을 읽습니다.
+    실패한 URL이 있어도 나머지는 계속 다운로드합니다.
+
+    예시:
+        ytdl batch urls.txt --jobs 8
+        ytdl batch urls.txt --jobs 8 --limit-rate 5M
+        cat urls.txt | ytdl batch - --audio-only
+    """
+    options = DownloadOptions(
+        quality=quality,
+        output_dir=output or settings.download.output_dir,
+        audio_only=audio_only,
+        audio_quality=audio_quality,
+        audio_format=cast(AudioFormat, audio_format),
+        save_metadata=metadata,
+        save_thumbnail=thumbnail,
+        connections=connections,
+        concurrent_fragments=concurrent_fragments,
+        fragment_retries=fragment_retries,
+    )
+    # 입력을 미리 다 읽지 않고 다운로드 슬롯이 빌 때마다 한 줄씩 읽음 (첫 URL만 확인)
+    urls = read_urls(source)
+    first = next(urls, None)
+    if first is None:
+        console.print("[yellow]다운로드할 URL이 없습니다.[/yellow]")
+        return
+
+    runner = BatchDownloader(
+        options,
+        jobs=jobs,
+        info_cache=get_info_cache(),
+        archive=get_download_archive(),
+        bandwidth=BandwidthManager(limit_rate) if limit_rate else None,
+    )
+    result = _run_batch(runner, itertools.chain([first], urls), total=None)
+    _write_batch_summary(result, summary or options.output_dir / "batch-summary.json")
+
+    if result.failed or result.error_message:
+        raise click.exceptions.Exit(1)
+
+
+@cli.command()
+@click.argument("url")
+@download_options
+@click.option(
+    "--items",
+    "-I",
+    default=None,
+    help="다운로드할 항목 범위 (예: 1-100, 1,3,5, 10-)",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="동시 다운로드 수",
+)
+@click.option(
+    "--limit-rate",
+    "-r",
+    type=ByteRate(),
+    default=None,
+    help="모든 동시 다운로드가 나눠 쓸 전체 속도 제한 (예: 500K, 4.2M)",
+)
+@click.option(
+    "--summary",
+    type=click.Path(path_type=Path),
+    default=None,
+    help="결과 요약 JSON 경로 (기본: <출력 디렉토리>/batch-summary.json)",
+)
+def playlist(
+    url: str,
+    quality: str,
+    output: Path | None,
+    audio_only: bool,
+    audio_quality: str,
+    audio_format: str,
+    metadata: bool,
+    thumbnail: bool,
+    connections: int,
+    concurrent_fragments: int,
+    fragment_retries: int,
+    items: str | None,
+    jobs: int,
+    limit_rate: int | None,
+    summary: Path | None,
+) -> None:
+    """재생목록/채널 다운로드
+
+    항목 목록을 가져오는 동안 앞쪽 항목부터 바로 다운로드를 시작합니다.
+
+    예시:
+        ytdl playlist https://www.youtube.com/playlist?list=...
+        ytdl playlist https://www.youtube.com/@channel/videos --items 1-100 --jobs 8
+    """
+    try:
+        ranges = parse_items(items) if items else None
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--items") from None
+
+    options = DownloadOptions(
+        quality=quality,
+        output_dir=output or settings.download.output_dir,
+        audio_only=audio_only,
+        audio_quality=audio_quality,
+        audio_format=cast(AudioFormat, audio_format),
+        save_metadata=metadata,
+        save_thumbnail=thumbnail,
+        connections=connections,
+        concurrent_fragments=concurrent_fragments,
+        fragment_retries=fragment_retries,
+    )
+
+    # 다운로드 슬롯보다 넉넉하게 항목을 미리 열거해 둠
+    entries = prefetch(iter_playlist_entries(url, ranges), size=jobs * 2)
+    runner = BatchDownloader(
+        options,
+        jobs=jobs,
+        info_cache=get_info_cache(),
+        archive=get_download_archive(),
+        bandwidth=BandwidthManager(limit_rate) if limit_rate else None,
+    )
+    result = _run_batch(runner, entries, total=None)
+    _write_batch_summary(result, summary or options.output_dir / "batch-summary.json")
+
+    if result.failed or result.error_message:
+        raise click.exceptions.Exit(1)
+
+
+def _run_batch(runner: BatchDownloader, urls: Iterable[str], total: int | None) -> BatchSummary:
+    """배치 다운로드를 실행하면서 작업별 진행률과 전체 처리량을 표시"""
+    with Progress(
+        TextColumn("[bold blue]{task.description}"),
+        BarColumn(),
+        DownloadColumn(),
+        TransferSpeedColumn(),
+        TimeRemainingColumn(),
+        console=console,
+    ) as progress:
+        # 전체 행: 모든 작업의 누적 바이트로 전체 처리량을 표시
+        overall = progress.add_task("전체", total=None)
+        rows: dict[int, TaskID] = {}
+        last_bytes: dict[int, int] = {}
+        counts = {"done": 0, "failed": 0}
+
+        def describe_overall() -> str:
+            planned = f"/{total}" if total is not None else ""
+            failed = f", 실패 {counts['failed']}" if counts["failed"] else ""
+            return f"전체 ({counts['done']}{planned} 완료{failed})"
+
+        progress.update(overall, description=describe_overall())
+
+        def on_start(index: int, url: str) -> None:
+            rows[index] = progress.add_task(f"#{index + 1} {url}", total=None)
+            last_bytes[index] = 0
+
+        def on_progress(index: int, d: dict) -> None:
+            if d["status"] != "downloading":
+                return
+            downloaded = d.get("downloaded_bytes", 0)
+            total_bytes = d.get("total_bytes") or d.get("total_bytes_estimate")
+            progress.update(rows[index], completed=downloaded, total=total_bytes)
+
+            # 포맷이 바뀌면(영상→음성) downloaded_bytes가 0부터 다시 시작
+            delta = downloaded - last_bytes[index]
+            last_bytes[index] = downloaded
+            progress.advance(overall, delta if delta >= 0 else downloaded)
+
+        def on_finish(item: BatchItem) -> None:
+            counts["done"] += 1
+            if not item.result.success:
+                counts["failed"] += 1
+                progress.console.print(
+                    f"[red]✗ #{item.index + 1} {item.url}: {item.result.error_message}[/red]"
+                )
+            progress.remove_task(rows.pop(item.index))
+            progress.update(overall, description=describe_overall())
+
+        def message_callback(msg: str) -> None:
+            progress.console.print(msg)
+
+        return runner.run(urls, on_start, on_progress, on_finish, message_callback)
+
+
+def _write_batch_summary(result: BatchSummary, path: Path) -> None:
+    """배치 결과 요약 출력 및 JSON 저장"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(result.model_dump_json(indent=2), encoding="utf-8")
+
+    if result.error_message:
+        console.print(f"\n[red]✗ URL 목록 읽기 실패: {result.error_message}[/red]")
+
+    color = "green" if result.failed == 0 else "yellow"
+    console.print(
+        f"\n[{color}]완료: 성공 {result.succeeded}, 실패 {result.failed} "
+        f"({result.elapsed_seconds:.1f}초)[/{color}]"
+    )
+    console.print(f"[cyan]결과 요약: {path}[/cyan]")
+
+
 @cli.command()
 @click.argument("url")
 def list_formats(url: str) -> None:
@@ -162,10 +480,11 @@ def list_formats(url: str) -> None:
         }
 
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=False)
+            info = extract_info(ydl, url, get_info_cache())
             if info is None:
                 console.print("[red]동영상 정보를 가져올 수 없습니다.[/red]")
                 raise click.Abort()
+            info = ydl.process_ie_result(info, download=False)
 
             console.print(f"\n[bold]제목:[/bold] {info.get('title', 'Unknown')}")
             console.print(f"[bold]업로더:[/bold] {info.get('uploader', 'Unknown')}\n")
@@ -259,10 +578,67 @@ def show() -> None:
     table.add_row("오디오만", "예" if settings.download.audio_only else "아니오")
     table.add_row("메타데이터 저장", "예" if settings.download.save_metadata else "아니오")
     table.add_row("썸네일 저장", "예" if settings.download.save_thumbnail else "아니오")
+    table.add_row("조각 동시 다운로드", str(settings.download.concurrent_fragments))
+    table.add_row("조각 재시도", str(settings.download.fragment_retries))
 
     console.print(table)
 
 
+@cli.group()
+def cache() -> None:
+    """추출 정보 캐시 관리
+
+    예시:
+        ytdl cache stats
+        ytdl cache clear
+    """
+    pass
+
+
+@cache.command()
+def stats() -> None:
+    """캐시 통계 표시"""
+    from rich.table import Table
+
+    from .utils import format_filesize
+
+    info_cache = get_info_cache()
+    if info_cache is None:
+        console.print("[yellow]캐시가 비활성화되어 있습니다.[/yellow]")
+        return
+
+    cache_stats = info_cache.stats()
+
+    table = Table(title="캐시 통계")
+    table.add_column("항목", style="cyan")
+    table.add_column("값", style="green")
+
+    table.add_row("캐시 파일", str(cache_stats.path) if cache_stats.path else "(메모리)")
+    table.add_row("항목 수", str(cache_stats.entries))
+    table.add_row("크기", format_filesize(cache_stats.size_bytes))
+    table.add_row("유효 시간", f"{cache_stats.ttl_seconds}초")
+    table.add_row("메모리 적중", str(cache_stats.memory_hits))
+    table.add_row("디스크 적중", str(cache_stats.disk_hits))
+    table.add_row("미스", str(cache_stats.misses))
+    table.add_row("만료", str(cache_stats.expired))
+    table.add_row("축출", str(cache_stats.evictions))
+    table.add_row("적중률", f"{cache_stats.hit_rate:.1%}")
+
+    console.print(table)
+
+
+@cache.command()
+def clear() -> None:
+    """캐시 비우기"""
+    info_cache = get_info_cache()
+    if info_cache is None:
+        console.print("[yellow]캐시가 비활성화되어 있습니다.[/yellow]")
+        return
+
+    removed = info_cache.clear()
+    console.print(f"[green]✓ 캐시 항목 {removed}개 삭제[/green]")
+
+
 def main() -> None:
     """CLI 진입점"""
     cli()
@@ -1,8 +1,9 @@
 """설정 관리"""
 
 from pathlib import Path
+from typing import Literal
 
-from pydantic import Field
+from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -14,6 +15,126 @@ class DownloadSettings(BaseSettings):
     audio_only: bool = Field(default=False, description="오디오만 다운로드")
     save_metadata: bool = Field(default=False, description="메타데이터 저장")
     save_thumbnail: bool = Field(default=False, description="썸네일 저장")
+    concurrent_fragments: int = Field(
+        default=4, ge=1, le=32, description="HLS/DASH 조각 동시 다운로드 수"
+    )
+    fragment_retries: int = Field(default=10, ge=0, description="조각별 재시도 횟수")
+
+
+class CacheSettings(BaseSettings):
+    """추출 정보 캐시 설정"""
+
+    # 접두사 없이 읽으면 `path` 필드가 PATH 환경 변수를 가져감
+    model_config = SettingsConfigDict(env_prefix="CACHE__")
+
+    enabled: bool = Field(default=True, description="캐시 사용 여부")
+    path: Path = Field(
+        default=Path.home() / ".cache" / "youtube_downloader" / "info_cache.db",
+        description="캐시 파일 경로",
+    )
+    ttl_seconds: int = Field(
+        default=1800, ge=0, description="항목 유효 시간 (초, 서명된 스트림 URL 만료 전이어야 함)"
+    )
+    max_entries: int = Field(default=5000, ge=1, description="디스크 최대 항목 수")
+    memory_entries: int = Field(default=256, ge=0, description="메모리 최대 항목 수")
+
+
+class ArchiveSettings(BaseSettings):
+    """다운로드 아카이브 설정"""
+
+    model_config = SettingsConfigDict(env_prefix="ARCHIVE__")
+
+    enabled: bool = Field(default=True, description="아카이브 사용 여부")
+    path: Path = Field(
+        default=Path.home() / ".cache" / "youtube_downloader" / "archive",
+        description="아카이브 디렉토리 (출력 디렉토리와 같은 파일 시스템이어야 등록됨, 다르면 복사하지 않고 건너뜀)",
+    )
+    max_size: int = Field(
+        default=10 * 1024**3,
+        ge=0,
+        description="작업이 참조하지 않는 아카이브 파일의 최대 총 크기 (바이트, 넘으면 오래 쓰지 않은 것부터 삭제, 0이면 무제한)",
+    )
+
+
+class WebSettings(BaseSettings):
+    """웹 서버 설정"""
+
+    model_config = SettingsConfigDict(env_prefix="WEB__")
+
+    max_concurrent_downloads: int = Field(default=4, ge=1, description="동시에 실행할 최대 다운로드 수")
+    max_queue_size: int = Field(default=100, ge=0, description="대기열 최대 길이 (넘으면 429 응답)")
+    execution_mode: Literal["thread", "process"] = Field(
+        default="thread", description="다운로드 실행 방식 (thread: 서버 프로세스, process: 프로세스 풀)"
+    )
+    max_tasks_per_worker: int = Field(
+        default=20, ge=1, description="process 모드에서 워커 프로세스 하나가 처리할 최대 작업 수"
+    )
+    download_timeout: int = Field(
+        default=3600, ge=0, description="process 모드에서 작업 하나의 최대 실행 시간 (초, 넘으면 실패 처리하고 워커 교체, 0이면 무제한)"
+    )
+    task_store: Literal["memory", "sqlite"] = Field(
+        default="memory", description="작업 저장소 (memory: 프로세스 메모리, sqlite: 재시작/워커 간 공유)"
+    )
+    task_db_path: Path = Field(
+        default=Path.home() / ".cache" / "youtube_downloader" / "tasks.db",
+        description="sqlite 작업 저장소 파일 경로",
+    )
+    progress_flush_interval: float = Field(
+        default=1.0, ge=0, description="sqlite 저장소에 진행률을 모아서 기록하는 간격 (초)"
+    )
+    completed_task_ttl: int = Field(
+        default=86400, ge=0, description="완료된 작업과 파일 보관 시간 (초, 0이면 무기한)"
+    )
+    failed_task_ttl: int = Field(default=3600, ge=0, description="실패한 작업 보관 시간 (초, 0이면 무기한)")
+    stale_task_ttl: int = Field(
+        default=21600, ge=0, description="갱신 없이 멈춘 대기/진행 중 작업 보관 시간 (초, 0이면 무기한, 대기열에 있는 작업은 제외)"
+    )
+    max_tasks: int = Field(
+        default=10000, ge=1, description="보관할 최대 작업 수 (넘으면 오래 조회되지 않은 완료/실패 작업부터 삭제)"
+    )
+    temp_file_ttl: int = Field(default=3600, ge=0, description="남은 임시/부분 파일 보관 시간 (초)")
+    reaper_interval: float = Field(default=60.0, gt=0, description="정리 작업 실행 간격 (초)")
+    bandwidth_limit: int = Field(
+        default=0, ge=0, description="모든 다운로드가 나눠 쓰는 전체 속도 제한 (바이트/초, 0이면 무제한)"
+    )
+    progress_max_rate: float = Field(
+        default=4.0, ge=0, description="작업별 WebSocket 진행률 메시지 최대 전송 횟수 (초당, 0이면 제한 없음)"
+    )
+    event_history_size: int = Field(
+        default=20, ge=1, description="작업별로 남겨 두고 새 WebSocket 연결에 다시 보내는 최근 이벤트 수"
+    )
+    subscriber_queue_size: int = Field(
+        default=64, ge=1, description="WebSocket 연결별 전송 큐 크기 (차면 진행률부터 버림)"
+    )
+    ws_batch_interval: float = Field(
+        default=0.1, ge=0, description="사용자 WebSocket 연결에서 여러 작업 이벤트를 한 프레임으로 모으는 시간 (초)"
+    )
+    file_delivery: Literal["direct", "x-accel-redirect", "x-sendfile", "signed-url"] = Field(
+        default="direct",
+        description=(
+            "결과 파일 전송 방식 (direct: 서버가 직접 전송, x-accel-redirect: nginx, x-sendfile: Apache/lighttpd, "
+            "signed-url: 서명된 정적 파일 URL로 리다이렉트)"
+        ),
+    )
+    file_internal_prefix: str = Field(
+        default="/protected-downloads/",
+        description="x-accel-redirect 모드에서 다운로드 디렉토리에 연결된 프록시 internal location",
+    )
+    signed_url_base: str = Field(
+        default="/files/", description="signed-url 모드에서 프록시가 다운로드 디렉토리를 제공하는 경로"
+    )
+    signed_url_ttl: int = Field(default=300, ge=1, description="서명된 파일 URL 유효 시간 (초)")
+    file_signing_key: str = Field(
+        default="",
+        description="파일 URL 서명 키 (signed-url 모드에서 필수, 모든 워커와 검증 엔드포인트가 같은 키를 써야 함)",
+    )
+
+    @model_validator(mode="after")
+    def _require_signing_key(self) -> "WebSettings":
+        # 워커마다 다른 임의 키를 쓰면 한 워커가 서명한 URL을 다른 워커가 검증하지 못함
+        if self.file_delivery == "signed-url" and not self.file_signing_key:
+            raise ValueError("file_delivery=signed-url이면 file_signing_key를 지정해야 합니다")
+        return self
 
 
 class Settings(BaseSettings):
@@ -27,6 +148,9 @@ class Settings(BaseSettings):
     )
 
     download: DownloadSettings = Field(default_factory=DownloadSettings)
+    cache: CacheSettings = Field(default_factory=CacheSettings)
+    archive: ArchiveSettings = Field(default_factory=ArchiveSettings)
+    web: WebSettings = Field(default_factory=WebSettings)
 
 
 # 싱글톤 인스턴스
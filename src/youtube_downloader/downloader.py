@@ -10,25 +10,50 @@ import imageio_ffmpeg
 import yt_dlp
 from rich.console import Console
 
-from .models import DownloadOptions, DownloadResult, VideoInfo
-from .utils import ensure_directory, sanitize_filename
+from .archive import DownloadArchive, archive_key
+from .audio import AdaptiveExtractAudioPP
+from .audio_pipe import AudioPipeYoutubeDL
+from .cache import InfoCache, canonical_video_id, extract_info
+from .models import AudioReport, DownloadOptions, DownloadResult, VideoInfo
+from .segmented import SegmentedYoutubeDL
+from .utils import ensure_directory
 
 console = Console()
 
+# 조각 재시도 대기 시간 상한 (초)
+_FRAGMENT_RETRY_MAX_SLEEP = 8.0
+
+
+def _fragment_retry_sleep(n: int) -> float:
+    """조각 재시도 대기 시간 (지수 백오프, n은 0부터)"""
+    return min(0.5 * 2**n, _FRAGMENT_RETRY_MAX_SLEEP)
+
 
 class Downloader:
     """유튜브 동영상 다운로더"""
 
-    def __init__(self, options: DownloadOptions | None = None):
+    def __init__(
+        self,
+        options: DownloadOptions | None = None,
+        info_cache: InfoCache | None = None,
+        archive: DownloadArchive | None = None,
+    ):
         """
         다운로더 초기화
 
         Args:
             options: 다운로드 옵션
+            info_cache: 추출 정보 캐시 (None이면 매번 추출)
+            archive: 다운로드 아카이브 (None이면 항상 새로 다운로드)
         """
         self.options = options or DownloadOptions()
+        self.info_cache = info_cache
+        self.archive = archive
         ensure_directory(self.options.output_dir)
 
+        # 추출기 실행 횟수 (다운로드 1회당 1번이어야 함)
+        self.extraction_count = 0
+
     def download(
         self,
         url: str,
@@ -46,12 +71,31 @@ class Downloader:
             다운로드 결과
         """
         try:
+            # 유튜브 URL은 추출 없이 바로 아카이브 확인
+            key: str | None = None
+            video_id = canonical_video_id(url) if self.archive is not None else None
+            if video_id:
+                key = self._archive_key(f"youtube:{video_id}")
+                cached = self._download_from_archive(key, message_callback)
+                if cached:
+                    return cached
+
             # yt-dlp 옵션 설정
             ydl_opts = self._build_ydl_options(progress_callback, message_callback)
 
-            # 동영상 정보 추출
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
+            # 후처리(오디오 변환, 병합, 이동)까지 끝난 최종 파일 경로
+            final_paths: list[Path] = []
+            ydl_opts["post_hooks"] = [lambda filepath: final_paths.append(Path(filepath))]
+
+            # 동영상 정보 추출 (포맷 선택 전 원본 정보)
+            with self._ydl_class()(ydl_opts) as ydl:
+                if self.options.audio_only:
+                    # 원본 코덱/비트레이트에 따라 스트림 복사 또는 MP3 변환
+                    ydl.add_post_processor(AdaptiveExtractAudioPP(
+                        ydl, self.options.audio_format, self.options.audio_quality
+                    ))
+
+                info = self._extract_info(ydl, url)
                 if info is None:
                     return DownloadResult(
                         success=False,
@@ -60,15 +104,30 @@ class Downloader:
 
                 video_info = self._extract_video_info(info)
 
+                # 그 밖의 사이트는 추출한 ID로 아카이브 확인
+                if self.archive is not None and key is None and info.get("id"):
+                    extractor = str(info.get("extractor_key") or info.get("extractor") or "")
+                    key = self._archive_key(f"{extractor.lower()}:{info['id']}")
+                    cached = self._download_from_archive(key, message_callback)
+                    if cached:
+                        return cached
+
                 # 다운로드 실행
                 if message_callback:
                     message_callback(f"[cyan]다운로드 시작: {video_info.title}[/cyan]")
                 else:
                     console.print(f"[cyan]다운로드 시작: {video_info.title}[/cyan]")
-                ydl.download([url])
+                # 이미 추출한 정보로 포맷 선택 + 다운로드 (추출기를 다시 실행하지 않음)
+                processed = ydl.process_ie_result(info, download=True)
+
+                # 파일 경로 (디렉토리를 뒤지지 않고 yt-dlp가 알려준 경로 사용)
+                file_path = self._resolve_output_path(processed, final_paths)
 
-                # 파일 경로 찾기
-                file_path = self._find_downloaded_file(video_info.title)
+                # 아카이브 등록 (다음에 같은 요청이 오면 다운로드/변환 생략)
+                archive_digest = None
+                if self.archive is not None and key and file_path and file_path.exists():
+                    entry = self.archive.add(key, file_path, video_info)
+                    archive_digest = entry.digest if entry else None
 
                 # 메타데이터 저장
                 if self.options.save_metadata:
@@ -77,7 +136,9 @@ class Downloader:
                 return DownloadResult(
                     success=True,
                     video_info=video_info,
-                    file_path=file_path
+                    file_path=file_path,
+                    archive_digest=archive_digest,
+                    audio=self._audio_report(processed),
                 )
 
         except Exception as e:
@@ -87,6 +148,72 @@ class Downloader:
                 error_message=str(e)
             )
 
+    def _extract_info(self, ydl: yt_dlp.YoutubeDL, url: str) -> dict[str, Any] | None:
+        """
+        추출기만 실행해서 원본 정보 반환 (캐시에 있으면 추출하지 않음)
+
+        `process=False`이므로 포맷 선택/다운로드는 하지 않습니다.
+        반환값은 `process_ie_result`에 그대로 넘겨 다운로드할 수 있습니다.
+        """
+
+        def count_extraction() -> None:
+            self.extraction_count += 1
+
+        return extract_info(ydl, url, self.info_cache, on_extract=count_extraction)
+
+    def _archive_key(self, video_key: str) -> str:
+        """현재 옵션 기준 아카이브 키"""
+        return archive_key(video_key, self.options, self._format_selector())
+
+    def _download_from_archive(
+        self,
+        key: str,
+        message_callback: Callable[[str], None] | None,
+    ) -> DownloadResult | None:
+        """아카이브에 있으면 출력 디렉토리에 하드 링크로 꺼내서 결과 반환"""
+        assert self.archive is not None
+        entry = self.archive.lookup(key)
+        if entry is None:
+            return None
+
+        file_path = self.archive.materialize(entry, self.options.output_dir / entry.filename)
+        message = f"[cyan]아카이브에서 재사용: {file_path.name}[/cyan]"
+        if message_callback:
+            message_callback(message)
+        else:
+            console.print(message)
+
+        if self.options.save_metadata and entry.video_info:
+            self._save_metadata(entry.video_info, file_path)
+
+        return DownloadResult(
+            success=True,
+            video_info=entry.video_info,
+            file_path=file_path,
+            from_archive=True,
+            archive_digest=entry.digest,
+        )
+
+    def _ydl_class(self) -> type[yt_dlp.YoutubeDL]:
+        """
+        옵션에 맞는 YoutubeDL 클래스
+
+        오디오 추출은 받는 대로 ffmpeg에 넘기고 (중간 파일 없음), 연결 수가 2 이상이면 구간 다운로드를 씁니다.
+        """
+        if self.options.audio_only and self.options.pipe_audio:
+            return AudioPipeYoutubeDL
+        if self.options.connections > 1:
+            return SegmentedYoutubeDL
+        return yt_dlp.YoutubeDL
+
+    def _format_selector(self) -> str:
+        """옵션에 맞는 yt-dlp 포맷 선택자"""
+        if self.options.audio_only:
+            return "bestaudio/best"
+        if self.options.quality == "best":
+            return "bestvideo+bestaudio/best"
+        return f"bestvideo[height<={self.options.quality.rstrip('p')}]+bestaudio/best"
+
     def _build_ydl_options(
         self,
         progress_callback: Callable[[dict[str, Any]], None] | None,
@@ -108,19 +235,21 @@ class Downloader:
             except Exception as e:
                 console.print(f"[yellow]경고: FFmpeg를 찾을 수 없습니다. ({str(e)})[/yellow]")
 
-        # 포맷 설정
-        if self.options.audio_only:
-            opts["format"] = "bestaudio/best"
-            opts["postprocessors"] = [{
-                "key": "FFmpegExtractAudio",
-                "preferredcodec": "mp3",
-                "preferredquality": self.options.audio_quality,
-            }]
-        else:
-            if self.options.quality == "best":
-                opts["format"] = "bestvideo+bestaudio/best"
-            else:
-                opts["format"] = f"bestvideo[height<={self.options.quality.rstrip('p')}]+bestaudio/best"
+        # 포맷 설정 (오디오 추출 후처리기는 download()에서 등록)
+        opts["format"] = self._format_selector()
+
+        # HLS/DASH 조각 동시 다운로드와 조각별 재시도
+        opts["concurrent_fragment_downloads"] = self.options.concurrent_fragments
+        opts["fragment_retries"] = self.options.fragment_retries
+        opts["retry_sleep_functions"] = {"fragment": _fragment_retry_sleep}
+
+        # 고정 속도 제한 (여러 다운로드가 나눠 쓰는 제한은 BandwidthManager가 담당)
+        if self.options.rate_limit:
+            opts["ratelimit"] = self.options.rate_limit
+
+        # 구간 다운로드 연결 수
+        if self.options.connections > 1:
+            opts["segmented_connections"] = self.options.connections
 
         # 썸네일 저장
         if self.options.save_thumbnail:
@@ -143,23 +272,37 @@ class Downloader:
             description=info.get("description"),
         )
 
-    def _find_downloaded_file(self, title: str) -> Path | None:
-        """다운로드된 파일 찾기"""
-        safe_title = sanitize_filename(title)
+    def _resolve_output_path(
+        self, info: dict[str, Any] | None, final_paths: list[Path]
+    ) -> Path | None:
+        """
+        최종 출력 파일 경로 결정
 
-        # 가능한 확장자들
-        extensions = [".mp4", ".webm", ".mkv", ".mp3", ".m4a"]
+        `post_hooks`로 받은 경로를 우선 사용하고, 없으면 처리된 정보의
+        `requested_downloads`/`filepath`를 사용합니다. 둘 다 후처리기가 확장자를
+        바꾼 뒤(mp3 추출, mkv 병합 등)의 경로입니다.
+        """
+        if final_paths:
+            return final_paths[-1]
 
-        for ext in extensions:
-            file_path = self.options.output_dir / f"{safe_title}{ext}"
-            if file_path.exists():
-                return file_path
+        if info:
+            for download in reversed(info.get("requested_downloads") or []):
+                if download.get("filepath"):
+                    return Path(download["filepath"])
+            if info.get("filepath"):
+                return Path(info["filepath"])
 
-        # 정확한 매칭이 안되면 디렉토리에서 검색
-        for file in self.options.output_dir.iterdir():
-            if file.is_file() and safe_title in file.stem:
-                return file
+        return None
 
+    def _audio_report(self, info: dict[str, Any] | None) -> AudioReport | None:
+        """오디오 추출 후처리기(또는 파이프 변환)가 남긴 보고"""
+        if not info:
+            return None
+        for download in reversed(info.get("requested_downloads") or []):
+            if download.get("_audio_report"):
+                return AudioReport.model_validate(download["_audio_report"])
+        if info.get("_audio_report"):
+            return AudioReport.model_validate(info["_audio_report"])
         return None
 
     def _save_metadata(self, video_info: VideoInfo, file_path: Path | None) -> None:
@@ -2,9 +2,13 @@
 
 from datetime import datetime
 from pathlib import Path
+from typing import Literal
 
 from pydantic import BaseModel, Field
 
+# 오디오 형식 (mp3: 항상 MP3로 변환, auto: 가능하면 원본 코덱 그대로 복사)
+AudioFormat = Literal["mp3", "auto"]
+
 
 class VideoInfo(BaseModel):
     """동영상 정보 모델"""
@@ -25,8 +29,37 @@ class DownloadOptions(BaseModel):
     output_dir: Path = Field(default=Path("./downloads"), description="출력 디렉토리")
     audio_only: bool = Field(default=False, description="오디오만 다운로드")
     audio_quality: str = Field(default="192", description="오디오 비트레이트 (kbps)")
+    audio_format: AudioFormat = Field(
+        default="mp3",
+        description="오디오 형식 (auto면 원본 코덱이 요청 음질 이하일 때 변환 없이 m4a/opus/ogg로 복사)",
+    )
     save_metadata: bool = Field(default=False, description="메타데이터 저장")
     save_thumbnail: bool = Field(default=False, description="썸네일 저장")
+    connections: int = Field(
+        default=1, ge=1, le=32, description="파일 하나를 받을 동시 연결 수 (2 이상이면 구간 다운로드)"
+    )
+    concurrent_fragments: int = Field(
+        default=4, ge=1, le=32, description="HLS/DASH 조각 동시 다운로드 수"
+    )
+    fragment_retries: int = Field(default=10, ge=0, description="조각별 재시도 횟수")
+    rate_limit: int | None = Field(default=None, ge=1, description="다운로드 속도 제한 (바이트/초)")
+    pipe_audio: bool = Field(
+        default=True, description="오디오만 받을 때 원본을 파일로 쓰지 않고 받는 대로 ffmpeg로 변환"
+    )
+
+
+class AudioReport(BaseModel):
+    """오디오 추출 방식과 비용"""
+
+    mode: Literal["copy", "transcode"] = Field(description="스트림 복사 또는 변환")
+    source_codec: str | None = Field(default=None, description="원본 오디오 코덱")
+    source_bitrate: float | None = Field(default=None, description="원본 비트레이트 (kbps)")
+    output_codec: str = Field(description="출력 코덱 (yt-dlp 오디오 코덱 이름)")
+    reason: str = Field(description="방식을 고른 이유")
+    cpu_seconds: float | None = Field(default=None, description="ffmpeg CPU 시간 (초)")
+    cpu_seconds_saved: float | None = Field(
+        default=None, description="변환했다면 더 들었을 CPU 시간 추정 (초)"
+    )
 
 
 class DownloadResult(BaseModel):
@@ -36,3 +69,58 @@ class DownloadResult(BaseModel):
     video_info: VideoInfo | None = None
     file_path: Path | None = None
     error_message: str | None = None
+    from_archive: bool = Field(default=False, description="아카이브에 있던 파일을 재사용했는지 여부")
+    archive_digest: str | None = Field(default=None, description="아카이브 파일 해시 (SHA-256)")
+    audio: AudioReport | None = Field(default=None, description="오디오 추출 보고 (오디오만 받은 경우)")
+
+
+class BatchItem(BaseModel):
+    """배치 다운로드 개별 작업 결과"""
+
+    index: int = Field(description="입력 순서 (0부터)")
+    url: str
+    result: DownloadResult
+    elapsed_seconds: float = Field(description="작업 소요 시간 (초)")
+
+
+class BatchSummary(BaseModel):
+    """배치 다운로드 결과 요약"""
+
+    total: int
+    succeeded: int
+    failed: int
+    elapsed_seconds: float = Field(description="전체 소요 시간 (초)")
+    items: list[BatchItem] = Field(default_factory=list)
+    error_message: str | None = Field(default=None, description="URL 목록 읽기 실패 사유")
+
+
+class CacheStats(BaseModel):
+    """추출 정보 캐시 통계"""
+
+    path: Path | None = Field(default=None, description="캐시 파일 경로 (None이면 메모리 전용)")
+    entries: int
+    memory_entries: int
+    size_bytes: int
+    ttl_seconds: int
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """적중률 (0~1)"""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0
+
+
+class ArchiveEntry(BaseModel):
+    """다운로드 아카이브 항목"""
+
+    key: str = Field(description="(동영상, 포맷 선택자, 오디오 옵션) 키")
+    digest: str = Field(description="파일 내용 해시 (SHA-256)")
+    path: Path = Field(description="저장소 객체 경로")
+    filename: str = Field(description="처음 다운로드했을 때의 파일명")
+    size: int
+    video_info: VideoInfo | None = None
@@ -0,0 +1,165 @@
+"""재생목록/채널 항목 지연 열거"""
+
+import queue
+import threading
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+import yt_dlp
+
+# 항목 범위: (시작, 끝) — 끝이 None이면 마지막까지
+ItemRange = tuple[int, int | None]
+
+_URL_TYPES = ("url", "url_transparent")
+
+
+def parse_items(spec: str) -> list[ItemRange]:
+    """
+    `--items` 범위 문자열 파싱
+
+    Args:
+        spec: "1-100", "1,3,5", "10-" 처럼 쉼표로 구분된 1부터 시작하는 범위
+
+    Returns:
+        (시작, 끝) 범위 목록
+
+    Raises:
+        ValueError: 형식이 잘못된 경우
+    """
+    ranges: list[ItemRange] = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        start_str, sep, end_str = part.partition("-")
+        try:
+            start = int(start_str) if start_str else 1
+            end = (int(end_str) if end_str else None) if sep else start
+        except ValueError:
+            raise ValueError(f"잘못된 항목 범위입니다: {part}") from None
+        if start < 1 or (end is not None and end < start):
+            raise ValueError(f"잘못된 항목 범위입니다: {part}")
+        ranges.append((start, end))
+
+    if not ranges:
+        raise ValueError("항목 범위가 비어 있습니다.")
+    return ranges
+
+
+def _selected(position: int, ranges: list[ItemRange] | None) -> bool:
+    """position이 선택 범위에 포함되는지 확인"""
+    if ranges is None:
+        return True
+    return any(start <= position and (end is None or position <= end) for start, end in ranges)
+
+
+def _last_position(ranges: list[ItemRange] | None) -> int | None:
+    """선택 범위의 마지막 위치 (열린 범위가 있으면 None)"""
+    if ranges is None or any(end is None for _, end in ranges):
+        return None
+    return max(end for _, end in ranges if end is not None)
+
+
+def iter_playlist_entries(url: str, items: list[ItemRange] | None = None) -> Iterator[str]:
+    """
+    재생목록/채널의 동영상 URL을 하나씩 지연 반환
+
+    각 항목의 포맷 목록은 풀지 않고(`extract_flat`) 페이지 단위로 필요한 만큼만 가져옵니다.
+    선택 범위의 끝을 넘으면 나머지 페이지는 요청하지 않습니다.
+    단일 동영상 URL이면 그 URL 하나만 반환합니다.
+
+    Args:
+        url: 재생목록, 채널 또는 동영상 URL
+        items: 선택할 항목 범위 (None이면 전체)
+
+    Yields:
+        동영상 URL
+    """
+    ydl_opts = {
+        "quiet": True,
+        "no_warnings": True,
+        "extract_flat": "in_playlist",
+        "lazy_playlist": True,
+    }
+    last = _last_position(items)
+    seen: set[str] = set()
+
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        info = ydl.extract_info(url, download=False, process=False)
+        # 채널 루트 등은 실제 탭/재생목록 URL로 한 번 더 리다이렉트됨
+        while info is not None and info.get("_type") in _URL_TYPES:
+            info = ydl.extract_info(
+                info["url"], download=False, process=False, ie_key=info.get("ie_key")
+            )
+        if info is None:
+            return
+
+        if info.get("_type", "video") == "video":
+            if _selected(1, items):
+                yield info.get("webpage_url") or url
+            return
+
+        position = 0
+        for entry in _flatten(info.get("entries") or []):
+            position += 1
+            if last is not None and position > last:
+                break
+            entry_url = entry.get("url") or entry.get("webpage_url")
+            if not entry_url or not _selected(position, items) or entry_url in seen:
+                continue
+            seen.add(entry_url)
+            yield entry_url
+
+
+def _flatten(entries: Iterable[dict[str, Any] | None]) -> Iterator[dict[str, Any]]:
+    """중첩 재생목록(채널 탭 등)을 펼쳐서 동영상 항목만 반환"""
+    for entry in entries:
+        if not entry:
+            continue
+        if entry.get("_type") == "playlist":
+            yield from _flatten(entry.get("entries") or [])
+        else:
+            yield entry
+
+
+def prefetch(iterable: Iterable[str], size: int) -> Iterator[str]:
+    """
+    백그라운드 스레드에서 이터러블을 미리 size개까지 읽어 두기
+
+    재생목록 열거(네트워크 요청)가 다운로드와 겹쳐서 진행되도록 합니다.
+    열거 중 발생한 예외는 소비하는 쪽에서 다시 발생합니다.
+    """
+    buffer: queue.Queue[tuple[str | None, BaseException | None]] = queue.Queue(maxsize=size)
+    stop = threading.Event()
+
+    def put(item: tuple[str | None, BaseException | None]) -> bool:
+        # 소비하는 쪽이 중단되면 생산도 멈춤
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for value in iterable:
+                if not put((value, None)):
+                    return
+            put((None, None))
+        except BaseException as e:
+            put((None, e))
+
+    thread = threading.Thread(target=produce, name="ytdl-playlist", daemon=True)
+    thread.start()
+    try:
+        while True:
+            value, error = buffer.get()
+            if error is not None:
+                raise error
+            if value is None:
+                return
+            yield value
+    finally:
+        stop.set()
@@ -0,0 +1,477 @@
+"""다중 연결 구간(Range) 다운로더
+
+길이를 아는 단일 파일(progressive 포맷)을 여러 바이트 구간으로 나눠 동시에 받고,
+미리 크기를 잡아 둔 파일의 해당 위치에 바로 씁니다. CDN이 연결 하나당 속도를 제한할 때
+회선 대역폭을 더 활용할 수 있습니다.
+
+진행 상태는 `<파일>.segments`에 저장되어 중단된 다운로드는 받은 구간 이후부터 이어받습니다.
+속도 제한은 모든 연결이 나눠 쓰는 토큰 버킷으로 적용합니다.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+import urllib.request
+from collections.abc import Callable, Mapping
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Protocol, cast
+
+import yt_dlp
+from yt_dlp.downloader.common import FileDownloader
+from yt_dlp.downloader.http import HttpFD
+from yt_dlp.networking import Request
+from yt_dlp.utils import determine_protocol
+
+# 구간 하나의 최소 크기 (이보다 작은 파일은 나누지 않음)
+MIN_SEGMENT_SIZE = 1024 * 1024
+
+# 연결 하나에 할당하는 구간 수 (먼저 끝난 연결이 남은 구간을 가져가도록 잘게 나눔)
+SEGMENTS_PER_CONNECTION = 4
+
+# 한 번에 읽는 크기
+_READ_SIZE = 64 * 1024
+
+# 진행 상태 파일 저장 간격 (초)
+_STATE_SAVE_INTERVAL = 1.0
+
+_CONTENT_RANGE_RE = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+)")
+
+
+class SegmentedDownloadError(Exception):
+    """구간 다운로드 실패"""
+
+
+class _Response(Protocol):
+    status: int
+    headers: Mapping[str, str]
+
+    def read(self, amt: int | None = None) -> bytes: ...
+
+    def close(self) -> None: ...
+
+
+Opener = Callable[[str, dict[str, str]], _Response]
+
+
+def _urllib_open(url: str, headers: dict[str, str]) -> _Response:
+    """기본 HTTP 요청 함수"""
+    request = urllib.request.Request(url, headers=headers)
+    return cast(_Response, urllib.request.urlopen(request, timeout=30))
+
+
+@dataclass
+class Segment:
+    """바이트 구간 (end 포함)"""
+
+    start: int
+    end: int
+    downloaded: int = 0
+
+    @property
+    def size(self) -> int:
+        return self.end - self.start + 1
+
+    @property
+    def done(self) -> bool:
+        return self.downloaded >= self.size
+
+
+def split_segments(total: int, parts: int) -> list[Segment]:
+    """
+    전체 크기를 거의 같은 크기의 구간으로 나누기
+
+    Args:
+        total: 전체 바이트 수
+        parts: 구간 수
+
+    Returns:
+        빈틈없이 이어지는 구간 목록
+    """
+    parts = max(1, min(parts, total))
+    base, extra = divmod(total, parts)
+    segments = []
+    start = 0
+    for index in range(parts):
+        size = base + (1 if index < extra else 0)
+        segments.append(Segment(start, start + size - 1))
+        start += size
+    return segments
+
+
+class RateLimiter:
+    """
+    여러 연결이 나눠 쓰는 토큰 버킷 속도 제한
+
+    받은 만큼 토큰을 빼고, 모자라면 빚을 갚을 때까지 호출한 스레드가 잠듭니다.
+    대기는 lock 밖에서 하므로 다른 연결의 기록을 막지 않습니다. 최대 1초 분량까지 몰아 받을 수 있습니다.
+    """
+
+    def __init__(self, rate: int):
+        """
+        속도 제한 초기화
+
+        Args:
+            rate: 전체 속도 제한 (바이트/초)
+        """
+        self.rate = rate
+        self._lock = threading.Lock()
+        self._tokens = 0.0
+        self._updated = time.monotonic()
+
+    def consume(self, size: int) -> None:
+        """size 바이트를 받았음을 기록하고 제한을 넘었으면 대기"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= size
+            wait = -self._tokens / self.rate
+        if wait > 0:
+            time.sleep(wait)
+
+
+class SegmentedDownloader:
+    """다중 연결 구간 다운로더"""
+
+    def __init__(
+        self,
+        connections: int = 4,
+        min_segment_size: int | None = None,
+        retries: int = 10,
+        request_size: int | None = None,
+        opener: Opener | None = None,
+        rate_limit: int | None = None,
+    ):
+        """
+        다운로더 초기화
+
+        Args:
+            connections: 동시 연결 수
+            min_segment_size: 구간 최소 크기 (None이면 MIN_SEGMENT_SIZE)
+            retries: 구간별 연속 실패 허용 횟수 (진행이 있으면 다시 0부터)
+            request_size: 요청 하나가 받는 최대 바이트 수 (None이면 구간 전체)
+            opener: HTTP 요청 함수 `(url, headers) -> 응답`
+            rate_limit: 모든 연결을 합친 속도 제한 (바이트/초, None이면 무제한)
+        """
+        self.connections = max(1, connections)
+        self.min_segment_size = min_segment_size or MIN_SEGMENT_SIZE
+        self.retries = retries
+        self.request_size = request_size
+        self.opener = opener or _urllib_open
+        self.rate_limit = rate_limit
+
+    def probe(self, url: str, headers: Mapping[str, str] | None = None) -> int | None:
+        """
+        전체 크기와 Range 지원 여부 확인
+
+        Returns:
+            전체 바이트 수, Range 요청을 지원하지 않으면 None
+        """
+        response = self.opener(url, {**(headers or {}), "Range": "bytes=0-0"})
+        try:
+            if response.status != 206:
+                return None
+            match = _CONTENT_RANGE_RE.match(response.headers.get("Content-Range") or "")
+            return int(match[3]) if match else None
+        finally:
+            response.close()
+
+    def plan(self, total: int) -> list[Segment]:
+        """전체 크기에 맞는 구간 목록"""
+        parts = min(
+            self.connections * SEGMENTS_PER_CONNECTION,
+            max(1, total // self.min_segment_size),
+        )
+        return split_segments(total, parts)
+
+    def download(
+        self,
+        url: str,
+        dest: Path,
+        total: int,
+        headers: Mapping[str, str] | None = None,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> int:
+        """
+        구간을 동시에 받아 dest에 쓰기
+
+        이전 진행 상태 파일이 있고 크기가 같으면 이어받습니다. progress는 구간 lock 밖에서
+        한 번에 하나씩 호출되므로 콜백이 대기(속도 조절)해도 다른 연결의 기록을 막지 않습니다.
+
+        Args:
+            url: 파일 URL
+            dest: 저장 경로
+            total: 전체 바이트 수 (`probe` 결과)
+            headers: 요청 헤더
+            progress: 진행률 콜백 `(받은 바이트 수, 전체 바이트 수)`
+
+        Returns:
+            이번 호출에서 실제로 받은 바이트 수
+
+        Raises:
+            SegmentedDownloadError: 재시도 후에도 받지 못한 구간이 있는 경우
+        """
+        state_path = dest.with_name(dest.name + ".segments")
+        segments = self._load_state(state_path, dest, total) or self.plan(total)
+        self._preallocate(dest, total)
+
+        lock = threading.Lock()
+        progress_lock = threading.Lock()
+        stop = threading.Event()
+        limiter = RateLimiter(self.rate_limit) if self.rate_limit else None
+        done = sum(s.downloaded for s in segments)
+        received = 0
+        saved_at = 0.0
+
+        def on_data(segment: Segment, size: int) -> None:
+            nonlocal done, received, saved_at
+            with lock:
+                segment.downloaded += size
+                done += size
+                received += size
+                now = time.monotonic()
+                if now - saved_at >= _STATE_SAVE_INTERVAL:
+                    saved_at = now
+                    self._save_state(state_path, total, segments)
+
+            if limiter:
+                limiter.consume(size)
+            if progress:
+                # 호출 순서대로 누적값이 늘어나도록 호출하는 시점의 값을 읽음
+                with progress_lock:
+                    with lock:
+                        current = done
+                    progress(current, total)
+
+        pending = [s for s in segments if not s.done]
+        errors: list[Exception] = []
+        with ThreadPoolExecutor(
+            max_workers=min(self.connections, len(pending)) or 1,
+            thread_name_prefix="segment",
+        ) as pool:
+            futures = [
+                pool.submit(self._fetch_segment, url, dict(headers or {}), dest, s, on_data, stop)
+                for s in pending
+            ]
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    errors.append(e)
+                    stop.set()
+
+        if errors or not all(s.done for s in segments):
+            with lock:
+                self._save_state(state_path, total, segments)
+            raise SegmentedDownloadError(
+                f"구간 다운로드 실패: {errors[0] if errors else '중단됨'}"
+            )
+
+        state_path.unlink(missing_ok=True)
+        return received
+
+    def _fetch_segment(
+        self,
+        url: str,
+        headers: dict[str, str],
+        dest: Path,
+        segment: Segment,
+        on_data: Callable[[Segment, int], None],
+        stop: threading.Event,
+    ) -> None:
+        """구간 하나 받기 (끊기면 받은 위치부터 다시 요청)"""
+        failures = 0
+        # 버퍼 없이 써야 저장된 진행 상태가 실제로 쓴 위치를 넘지 않음
+        with open(dest, "r+b", buffering=0) as f:
+            while not segment.done:
+                if stop.is_set():
+                    return
+
+                offset = segment.start + segment.downloaded
+                end = segment.end
+                if self.request_size:
+                    end = min(end, offset + self.request_size - 1)
+
+                received = 0
+                try:
+                    response = self.opener(url, {**headers, "Range": f"bytes={offset}-{end}"})
+                    try:
+                        if response.status != 206:
+                            raise SegmentedDownloadError(
+                                f"Range 요청이 무시되었습니다 (HTTP {response.status})"
+                            )
+                        f.seek(offset)
+                        remaining = end - offset + 1
+                        while remaining > 0 and not stop.is_set():
+                            chunk = response.read(min(_READ_SIZE, remaining))
+                            if not chunk:
+                                break
+                            f.write(chunk)
+                            received += len(chunk)
+                            remaining -= len(chunk)
+                            on_data(segment, len(chunk))
+                        if remaining > 0 and not stop.is_set():
+                            raise SegmentedDownloadError(
+                                f"연결이 끊겼습니다 ({offset + received}/{end + 1})"
+                            )
+                    finally:
+                        response.close()
+                except Exception:
+                    # 조금이라도 받았으면 실패 횟수를 다시 셈
+                    failures = 1 if received else failures + 1
+                    if failures > self.retries:
+                        raise
+                    time.sleep(min(0.5 * 2 ** (failures - 1), 10.0))
+
+    @staticmethod
+    def _preallocate(dest: Path, total: int) -> None:
+        """파일 크기 미리 확보 (이미 같은 크기면 그대로 둠)"""
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        mode = "r+b" if dest.exists() else "w+b"
+        with open(dest, mode) as f:
+            if os.fstat(f.fileno()).st_size == total:
+                return
+            f.truncate(total)
+            if hasattr(os, "posix_fallocate"):
+                try:
+                    os.posix_fallocate(f.fileno(), 0, total)
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _load_state(state_path: Path, dest: Path, total: int) -> list[Segment] | None:
+        """이어받을 진행 상태 (없거나 맞지 않으면 None)"""
+        if not (state_path.exists() and dest.exists() and dest.stat().st_size == total):
+            return None
+        try:
+            state = json.loads(state_path.read_text())
+            if state.get("total") != total:
+                return None
+            segments = [Segment(*values) for values in state["segments"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return segments or None
+
+    @staticmethod
+    def _save_state(state_path: Path, total: int, segments: list[Segment]) -> None:
+        state = {
+            "total": total,
+            "segments": [[s.start, s.end, s.downloaded] for s in segments],
+        }
+        tmp = state_path.with_name(state_path.name + ".tmp")
+        tmp.write_text(json.dumps(state))
+        os.replace(tmp, state_path)
+
+
+class SegmentedFD(FileDownloader):
+    """yt-dlp용 구간 다운로더 (Range를 지원하지 않거나 작은 파일은 기본 HTTP 다운로더 사용)"""
+
+    @staticmethod
+    def can_download(info_dict: dict[str, Any]) -> bool:
+        """단일 파일 http(s) 포맷인지 여부"""
+        return (
+            determine_protocol(info_dict) in ("http", "https")
+            and not info_dict.get("fragments")
+            and not info_dict.get("is_live")
+        )
+
+    def real_download(self, filename: str, info_dict: dict[str, Any]) -> bool:
+        url = info_dict["url"]
+        headers = dict(info_dict.get("http_headers") or {})
+        tmpfilename = self.temp_name(filename)
+        downloader_options = info_dict.get("downloader_options") or {}
+
+        engine = SegmentedDownloader(
+            connections=self.params.get("segmented_connections", 4),
+            retries=self.params.get("retries", 10),
+            # 유튜브처럼 큰 Range 요청을 제한하는 사이트는 요청 크기를 나눔
+            request_size=downloader_options.get("http_chunk_size") or self.params.get("http_chunk_size"),
+            opener=self._open,
+            rate_limit=self.params.get("ratelimit"),
+        )
+
+        try:
+            total = engine.probe(url, headers)
+        except Exception:
+            total = None
+        if total is None or total < engine.min_segment_size * 2:
+            return self._fallback(filename, info_dict)
+
+        if not self.params.get("continuedl", True):
+            Path(tmpfilename + ".segments").unlink(missing_ok=True)
+
+        self.report_destination(filename)
+        start = time.time()
+        resumed_at: list[int] = []
+
+        def progress(downloaded: int, total_bytes: int) -> None:
+            if not resumed_at:
+                resumed_at.append(downloaded)
+            elapsed = time.time() - start
+            speed = (downloaded - resumed_at[0]) / elapsed if elapsed > 0 else None
+            self._hook_progress({
+                "status": "downloading",
+                "downloaded_bytes": downloaded,
+                "total_bytes": total_bytes,
+                "tmpfilename": tmpfilename,
+                "filename": filename,
+                "elapsed": elapsed,
+                "speed": speed,
+                "eta": (total_bytes - downloaded) / speed if speed else None,
+            }, info_dict)
+
+        try:
+            engine.download(url, Path(tmpfilename), total, headers, progress)
+        except SegmentedDownloadError as e:
+            self.report_error(str(e))
+            return False
+
+        self.try_rename(tmpfilename, filename)
+        self._hook_progress({
+            "status": "finished",
+            "downloaded_bytes": total,
+            "total_bytes": total,
+            "filename": filename,
+            "elapsed": time.time() - start,
+        }, info_dict)
+        return True
+
+    def _open(self, url: str, headers: dict[str, str]) -> _Response:
+        """yt-dlp 네트워크 계층으로 요청 (쿠키, 프록시 설정 공유)"""
+        return cast(_Response, self.ydl.urlopen(Request(url, headers=headers)))
+
+    def _fallback(self, filename: str, info_dict: dict[str, Any]) -> bool:
+        fd = HttpFD(self.ydl, self.params)
+        for ph in self.ydl._progress_hooks:
+            fd.add_progress_hook(ph)
+        return cast(bool, fd.real_download(filename, info_dict))
+
+
+class SegmentedYoutubeDL(yt_dlp.YoutubeDL):
+    """단일 파일 http(s) 포맷을 `SegmentedFD`로 받는 YoutubeDL"""
+
+    def dl(
+        self, name: str, info: dict[str, Any], subtitle: bool = False, test: bool = False
+    ) -> tuple[bool, bool]:
+        """
+        포맷 하나 다운로드 (구간 다운로드를 쓸 수 없으면 yt-dlp 기본 동작)
+
+        Returns:
+            (성공 여부, 실제로 받았는지 여부)
+        """
+        if test or subtitle or name == "-" or not SegmentedFD.can_download(info):
+            return cast(tuple[bool, bool], super().dl(name, info, subtitle=subtitle, test=test))
+
+        fd = SegmentedFD(self, self.params)
+        for ph in self._progress_hooks:
+            fd.add_progress_hook(ph)
+        self.write_debug(f'Invoking segmented downloader on "{info["url"]}"')
+
+        new_info = self._copy_infodict(info)
+        if new_info.get("http_headers") is None:
+            new_info["http_headers"] = self._calc_headers(new_info)
+        return cast(tuple[bool, bool], fd.download(name, new_info, subtitle))
@@ -1,9 +1,12 @@
 """API 라우터"""
 
-from fastapi import APIRouter, HTTPException, Query, BackgroundTasks, Depends
-from fastapi.responses import FileResponse
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Header, Depends, Response, status
+from fastapi.responses import StreamingResponse
+from functools import lru_cache
+from typing import List, Optional
 from pathlib import Path
+import json
+import time
 from sqlalchemy.orm import Session
 import yt_dlp
 
@@ -20,10 +23,25 @@ from .models import (
     DownloadStatusData,
     DownloadProgress,
     DownloadFileInfo,
+    RetentionStats,
+    TaskStatusSummary,
+    BatchStatusResponse,
 )
-from .tasks import task_manager
+from .files import file_delivery, file_etag
+from .tasks import ACTIVE_STATUSES, task_manager
+from .tee import open_partial, stream_source, tee_response
+from .singleflight import download_flights, flight_key
+from .jobs import QueueFullError, bandwidth_manager, job_scheduler
+from .process_pool import get_process_executor
+from .progress import progress_bridge
+from .retention import task_reaper
+from .websocket import manager as ws_manager
+from ..archive import get_download_archive
+from ..audio import describe_audio
+from ..cache import extract_info, get_info_cache
+from ..config import settings
 from ..downloader import Downloader
-from ..models import DownloadOptions as CLIDownloadOptions
+from ..models import DownloadOptions as CLIDownloadOptions, DownloadResult
 from .database import get_db
 from .models_db import User, Download as DownloadDB
 from .auth_api import get_current_user
@@ -31,6 +49,16 @@ from .auth_api import get_current_user
 # API 라우터 생성
 router = APIRouter(prefix="/api/v1", tags=["api"])
 
+# 상태 조회 long-poll 최대 대기 시간과, 이벤트 없이 다시 확인하는 간격 (초)
+_MAX_LONG_POLL_WAIT = 60
+_LONG_POLL_RECHECK = 1.0
+
+# 여러 작업 상태 조회 최대 작업 수
+_MAX_BATCH_TASKS = 100
+
+# 프록시가 SSE 응답을 모아 두지 않도록
+_SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
 
 @router.get("/version")
 async def get_version():
@@ -42,6 +70,12 @@ async def get_version():
     }
 
 
+@router.get("/metrics/retention", response_model=RetentionStats)
+async def get_retention_metrics():
+    """작업/파일 정리 통계 (삭제한 작업 수, 확보한 디스크 용량 등)"""
+    return task_reaper.stats()
+
+
 @router.get(
     "/video/info",
     response_model=VideoInfoResponse,
@@ -75,9 +109,9 @@ async def get_video_info(url: str = Query(..., description="유튜브 동영상
             "extract_flat": False,
         }
         
-        # 동영상 정보 추출
+        # 동영상 정보 추출 (다운로드 요청과 캐시 공유)
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=False)
+            info = extract_info(ydl, url, get_info_cache())
             
             if info is None:
                 raise HTTPException(
@@ -87,6 +121,7 @@ async def get_video_info(url: str = Query(..., description="유튜브 동영상
                         "message": "동영상을 찾을 수 없습니다.",
                     }
                 )
+            info = ydl.process_ie_result(info, download=False)
             
             # 포맷 정보 파싱
             video_formats = []
@@ -140,12 +175,12 @@ async def get_video_info(url: str = Query(..., description="유튜브 동영상
     responses={
         400: {"model": ErrorResponse, "description": "잘못된 요청"},
         401: {"model": ErrorResponse, "description": "인증 필요"},
+        429: {"model": ErrorResponse, "description": "대기열이 가득 참"},
         500: {"model": ErrorResponse, "description": "서버 오류"},
     },
 )
 async def start_download(
     request: DownloadRequest,
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -154,10 +189,11 @@ async def start_download(
     
     유튜브 동영상 다운로드를 시작합니다.
     인증된 사용자만 사용할 수 있습니다.
+    동시 다운로드 수를 넘는 요청은 대기열에서 기다리며, 대기열이 가득 차면 429를 반환합니다.
     """
     try:
         # 크레딧 비용 계산
-        from .credit_api import calculate_credits, deduct_credits
+        from .credit_api import calculate_credits, deduct_credits, refund_credits
         
         quality = request.options.quality or "best"
         audio_quality = request.options.audio_quality if hasattr(request.options, 'audio_quality') else None
@@ -175,10 +211,16 @@ async def start_download(
                 }
             )
         
+        # 대기열 확인 (크레딧 차감 전, 진행 중인 다운로드에 합류하는 요청은 대기열을 쓰지 않음)
+        key = flight_key(str(request.url), request.options)
+        if job_scheduler.is_full() and not download_flights.subscribers(key):
+            raise _queue_full_error(job_scheduler.retry_after())
+        
         # Task 생성
         task_id = task_manager.create_task(
             url=str(request.url),
-            options=request.options.model_dump()
+            options=request.options.model_dump(),
+            user_id=str(current_user.id),
         )
         
         # 크레딧 차감
@@ -211,13 +253,37 @@ async def start_download(
         db.commit()
         db.refresh(current_user)  # Refresh to get updated credits
         
-        # 백그라운드 작업 추가
-        background_tasks.add_task(
-            download_task,
-            task_id=task_id,
-            url=str(request.url),
-            options=request.options
+        # 같은 동영상/옵션 다운로드가 이미 진행 중이면 그 결과를 같이 받음
+        # 합류하면 지금까지의 상태를 복사 (leader의 finish()보다 먼저 끝나도록 join 안에서)
+        leader_id = download_flights.join(
+            key, task_id, on_join=lambda leader: task_manager.copy_task_state(leader, task_id)
         )
+        queue_position = None
+        if leader_id is None:
+            # 작업 큐에 추가
+            try:
+                queue_position = job_scheduler.submit(
+                    task_id,
+                    download_task,
+                    task_id=task_id,
+                    url=str(request.url),
+                    options=request.options,
+                    flight_key=key,
+                    user_id=str(current_user.id),
+                )
+            except QueueFullError as e:
+                # 확인 이후 다른 요청이 대기열을 채운 경우: 취소하고 크레딧 환불
+                _reject_queued(key, task_id, e)
+                download_record.status = "failed"
+                refund_credits(
+                    user=current_user,
+                    credits=credits_required,
+                    description=f"환불 (대기열 초과): {task_id}",
+                    db=db,
+                )
+                raise _queue_full_error(e.retry_after)
+        else:
+            queue_position = job_scheduler.position(leader_id)
         
         task = task_manager.get_task(task_id)
         
@@ -225,13 +291,16 @@ async def start_download(
             success=True,
             data={
                 "task_id": task_id,
-                "status": "pending",
+                "status": task["status"],
+                "queue_position": queue_position,
                 "created_at": task["created_at"].isoformat(),
                 "credits_used": credits_required,
                 "credits_remaining": current_user.credits
             }
         )
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -242,56 +311,316 @@ async def start_download(
         )
 
 
+def _queue_full_error(retry_after: int) -> HTTPException:
+    """대기열 초과 응답 (429)"""
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail={
+            "code": "QUEUE_FULL",
+            "message": "다운로드 대기열이 가득 찼습니다. 잠시 후 다시 시도하세요.",
+            "retry_after": retry_after,
+        },
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
+def _reject_queued(key: str, task_id: str, error: QueueFullError):
+    """대기열에 넣지 못한 다운로드와 그 사이 합류한 작업을 실패 처리"""
+    for tid in download_flights.finish(key) or [task_id]:
+        task_manager.fail_task(tid, {"code": "QUEUE_FULL", "message": str(error)})
+
+
 @router.get(
     "/download/{task_id}/status",
     response_model=DownloadStatusResponse,
     responses={
+        304: {"description": "마지막으로 받은 뒤 바뀌지 않음 (If-None-Match, since_version)"},
         404: {"model": ErrorResponse, "description": "작업을 찾을 수 없음"},
     },
 )
-async def get_download_status(task_id: str):
-    """다운로드 상태 조회"""
-    task = task_manager.get_task(task_id)
+async def get_download_status(
+    task_id: str,
+    response: Response,
+    wait: float = Query(0, ge=0, le=_MAX_LONG_POLL_WAIT, description="바뀔 때까지 기다릴 최대 시간 (초, long-poll)"),
+    since_version: Optional[int] = Query(None, ge=0, description="마지막으로 받은 작업 버전"),
+    if_none_match: Optional[str] = Header(None),
+):
+    """
+    다운로드 상태 조회
     
-    if not task:
-        raise HTTPException(
-            status_code=404,
-            detail={
-                "code": "TASK_NOT_FOUND",
-                "message": "작업을 찾을 수 없습니다.",
-            }
+    응답의 `ETag`를 `If-None-Match`로, 또는 `version`을 `since_version`으로 보내면 그 뒤로 바뀐 것이
+    없을 때 본문 없이 304를 반환합니다. `wait`를 주면 바뀔 때까지 최대 그 시간 동안 기다렸다가
+    응답합니다 (long-poll).
+    """
+    deadline = time.monotonic() + wait
+    while True:
+        task = task_manager.get_task(task_id)
+        
+        if not task:
+            raise HTTPException(
+                status_code=404,
+                detail={
+                    "code": "TASK_NOT_FOUND",
+                    "message": "작업을 찾을 수 없습니다.",
+                }
+            )
+        
+        queue_position = job_scheduler.position(task_id) if task["status"] == "pending" else None
+        bandwidth_allocation = _bandwidth_allocation(task_id)
+        etag = _status_etag(task, queue_position, bandwidth_allocation)
+        unchanged = (
+            (if_none_match is not None and _etag_matches(if_none_match, etag))
+            or (since_version is not None and task["version"] <= since_version)
         )
+        remaining = deadline - time.monotonic()
+        if not unchanged or remaining <= 0:
+            break
+        # 진행률/상태 이벤트가 오면 바로, 아니면 (다른 워커가 바꾼 경우 등) 잠시 뒤 다시 확인
+        await ws_manager.wait(task_id, min(remaining, _LONG_POLL_RECHECK))
+    
+    if unchanged:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
     
     # 응답 데이터 구성
     status_data = DownloadStatusData(
         task_id=task["task_id"],
         status=task["status"],
+        queue_position=queue_position,
+        bandwidth_allocation=bandwidth_allocation,
         progress=DownloadProgress(**task["progress"]) if task["progress"] else None,
         video_info=VideoInfo(**task["video_info"]) if task["video_info"] else None,
         file=DownloadFileInfo(
             filename=Path(task["file_path"]).name,
-            size=Path(task["file_path"]).stat().st_size,
+            size=_task_file_size(task),
             download_url=f"/api/v1/download/{task_id}/file"
         ) if task["file_path"] and task["status"] == "completed" else None,
         created_at=task["created_at"],
         completed_at=task.get("completed_at"),
         failed_at=task.get("failed_at"),
         error=task.get("error"),
+        version=task["version"],
     )
     
+    response.headers["ETag"] = etag
     return DownloadStatusResponse(success=True, data=status_data)
 
 
 @router.get(
+    "/download/{task_id}/events",
+    responses={
+        200: {"content": {"text/event-stream": {}}, "description": "진행률/상태 이벤트 스트림"},
+        404: {"model": ErrorResponse, "description": "작업을 찾을 수 없음"},
+    },
+)
+async def stream_download_events(task_id: str):
+    """
+    다운로드 이벤트 스트림 (Server-Sent Events)
+    
+    WebSocket을 쓸 수 없는 클라이언트용입니다. WebSocket과 같은 progress, status, complete, error
+    이벤트를 `event:` 이름으로 보내고, complete/error 뒤에 스트림을 닫습니다.
+    """
+    task = task_manager.get_task(task_id)
+    
+    if not task:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "code": "TASK_NOT_FOUND",
+                "message": "작업을 찾을 수 없습니다.",
+            }
+        )
+    
+    # 최근 이벤트 기록이 남아 있지 않은 끝난 작업은 저장된 결과로 마지막 이벤트만 보냄
+    if task["status"] in ("completed", "failed") and task_id not in ws_manager.history:
+        message = _terminal_event(task)
+        
+        async def finished():
+            yield f"event: {message['type']}\ndata: {json.dumps(message['data'], ensure_ascii=False)}\n\n"
+        
+        return StreamingResponse(finished(), media_type="text/event-stream", headers=_SSE_HEADERS)
+    
+    stream = ws_manager.connect_stream(task_id)
+    
+    async def events():
+        try:
+            async for chunk in stream.events():
+                yield chunk
+        finally:
+            ws_manager.remove(stream)
+    
+    return StreamingResponse(events(), media_type="text/event-stream", headers=_SSE_HEADERS)
+
+
+def _status_etag(task: dict, queue_position: Optional[int], bandwidth_allocation: Optional[int]) -> str:
+    """상태 응답 ETag (작업 버전 + 작업 밖에서 바뀌는 값)"""
+    return f'W/"{task["version"]}-{queue_position or 0}-{bandwidth_allocation or 0}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match 헤더가 etag와 맞는지 (여러 값, `*` 허용)"""
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def _task_file_size(task: dict) -> int:
+    """작업 결과 파일 크기 (완료 시 저장한 값, 없으면 한 번만 stat)"""
+    if task.get("file_size") is not None:
+        return task["file_size"]
+    return _file_size(task["file_path"], task["version"])
+
+
+@lru_cache(maxsize=1024)
+def _file_size(file_path: str, version: int) -> int:
+    """완료된 파일 크기 (버전이 같으면 파일도 같으므로 다시 stat하지 않음)"""
+    try:
+        return Path(file_path).stat().st_size
+    except OSError:
+        return 0
+
+
+def _terminal_event(task: dict) -> dict:
+    """저장된 작업 결과로 만든 complete/error 이벤트"""
+    from .websocket import complete_event, error_event
+    
+    if task["status"] == "failed":
+        error = task.get("error") or {}
+        return error_event(error.get("code", "DOWNLOAD_FAILED"), error.get("message", "다운로드 실패"))
+    file_path = Path(task["file_path"]) if task["file_path"] else None
+    return complete_event(
+        filename=file_path.name if file_path else "",
+        size=_task_file_size(task) if file_path else 0,
+        download_url=f"/api/v1/download/{task['task_id']}/file" if file_path else "",
+    )
+
+
+@router.get(
+    "/downloads/status",
+    response_model=BatchStatusResponse,
+    response_model_exclude_none=True,
+    responses={
+        400: {"model": ErrorResponse, "description": "작업 ID가 너무 많음"},
+    },
+)
+async def get_downloads_status(
+    ids: List[str] = Query(..., description="작업 ID (쉼표로 구분하거나 여러 번 지정)"),
+):
+    """
+    여러 작업 상태 조회
+    
+    대시보드처럼 많은 작업을 지켜볼 때 작업마다 상태를 조회하는 대신 한 번에 요약 상태를 받습니다.
+    한 번에 최대 100개까지 조회할 수 있고, 찾을 수 없는 작업 ID는 `missing`에 담깁니다.
+    """
+    task_ids = list(dict.fromkeys(
+        task_id.strip() for value in ids for task_id in value.split(",") if task_id.strip()
+    ))
+    if len(task_ids) > _MAX_BATCH_TASKS:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "code": "TOO_MANY_TASKS",
+                "message": f"한 번에 최대 {_MAX_BATCH_TASKS}개 작업까지 조회할 수 있습니다.",
+            }
+        )
+    
+    tasks = task_manager.get_tasks(task_ids)
+    found = {task["task_id"] for task in tasks}
+    return BatchStatusResponse(
+        data=_status_summaries(tasks),
+        missing=[task_id for task_id in task_ids if task_id not in found],
+    )
+
+
+@router.get(
+    "/downloads/active",
+    response_model=BatchStatusResponse,
+    response_model_exclude_none=True,
+    responses={
+        401: {"model": ErrorResponse, "description": "인증 필요"},
+    },
+)
+async def get_active_downloads(current_user: User = Depends(get_current_user)):
+    """
+    내 진행 중인 작업 목록 (인증 필요)
+    
+    대기, 다운로드 중, 처리 중인 작업의 요약 상태를 최근 생성 순으로 반환합니다.
+    """
+    tasks = task_manager.list_tasks(
+        user_id=str(current_user.id), limit=_MAX_BATCH_TASKS, statuses=ACTIVE_STATUSES
+    )
+    return BatchStatusResponse(data=_status_summaries(tasks))
+
+
+def _status_summaries(tasks: List[dict]) -> List[TaskStatusSummary]:
+    """작업 목록을 요약 상태로 (대기열 순번은 한 번만 계산)"""
+    positions = job_scheduler.positions() if any(task["status"] == "pending" for task in tasks) else {}
+    summaries = []
+    for task in tasks:
+        progress = task["progress"] or {}
+        summaries.append(TaskStatusSummary(
+            task_id=task["task_id"],
+            status=task["status"],
+            version=task["version"],
+            queue_position=positions.get(task["task_id"]),
+            percentage=progress.get("percentage"),
+            downloaded_bytes=progress.get("downloaded_bytes"),
+            total_bytes=progress.get("total_bytes"),
+            speed=progress.get("speed") or None,
+            eta=progress.get("eta") or None,
+            file=DownloadFileInfo(
+                filename=Path(task["file_path"]).name,
+                size=_task_file_size(task),
+                download_url=f"/api/v1/download/{task['task_id']}/file",
+            ) if task["file_path"] and task["status"] == "completed" else None,
+            error=task.get("error"),
+            updated_at=task["updated_at"],
+        ))
+    return summaries
+
+
+def _bandwidth_allocation(task_id: str) -> Optional[int]:
+    """작업에 현재 할당된 속도 (바이트/초)"""
+    allocation = bandwidth_manager.allocation(task_id)
+    return int(allocation) if allocation is not None else None
+
+
+@router.api_route(
     "/download/{task_id}/file",
+    methods=["GET", "HEAD"],
     responses={
+        206: {"description": "요청한 구간 (Range)"},
+        304: {"description": "변경 없음 (If-None-Match/If-Modified-Since)"},
+        307: {"description": "서명된 파일 URL로 이동 (signed-url 모드)"},
         404: {"model": ErrorResponse, "description": "파일을 찾을 수 없음"},
+        416: {"description": "범위를 벗어나거나 여러 구간을 요청함"},
     },
 )
-async def download_file(task_id: str):
-    """파일 다운로드"""
+async def download_file(
+    task_id: str,
+    inline: bool = Query(False, description="브라우저에서 바로 재생 (Content-Disposition: inline)"),
+    stream: bool = Query(False, description="완료 전이면 받는 중인 파일을 바로 스트리밍 (변환/병합이 없는 다운로드)"),
+):
+    """
+    파일 다운로드
+
+    한 구간 Range 요청(이어받기/탐색)과 ETag/Last-Modified 조건부 요청을 지원합니다.
+    프록시 전송 모드에서는 권한만 확인하고 전송은 프록시에 맡깁니다.
+    `stream=true`면 다운로드 중인 파일을 받는 대로 보내고, 스트리밍할 수 없는 다운로드는
+    완료될 때까지 (최대 60초) 기다렸다가 파일을 보냅니다.
+    """
     task = task_manager.get_task(task_id)
     
+    if stream:
+        deadline = time.monotonic() + _MAX_LONG_POLL_WAIT
+        while task and task["status"] in ACTIVE_STATUSES:
+            file = open_partial(task)
+            if file is not None:
+                return tee_response(task_id, file)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            await ws_manager.wait(task_id, min(remaining, _LONG_POLL_RECHECK))
+            task = task_manager.get_task(task_id)
+    
     if not task:
         raise HTTPException(
             status_code=404,
@@ -312,7 +641,9 @@ async def download_file(task_id: str):
     
     file_path = Path(task["file_path"])
     
-    if not file_path.exists():
+    try:
+        stat_result = file_path.stat()
+    except FileNotFoundError:
         raise HTTPException(
             status_code=404,
             detail={
@@ -321,49 +652,139 @@ async def download_file(task_id: str):
             }
         )
     
-    return FileResponse(
-        path=str(file_path),
-        filename=file_path.name,
-        media_type="application/octet-stream",
+    return file_delivery.response(
+        file_path,
+        stat_result,
+        root=task_manager.output_dir,
+        etag=file_etag(stat_result, task.get("archive_digest")),
+        inline=inline,
     )
 
 
-def download_task(task_id: str, url: str, options):
+@router.get(
+    "/files/verify",
+    status_code=204,
+    responses={
+        204: {"description": "서명이 맞고 만료되지 않음"},
+        403: {"model": ErrorResponse, "description": "서명이 틀렸거나 만료됨"},
+    },
+)
+async def verify_file_url(
+    x_original_uri: Optional[str] = Header(None, description="프록시가 받은 요청 URI (nginx `$request_uri`)"),
+):
     """
-    백그라운드 다운로드 작업
+    서명된 파일 URL 검증 (signed-url 모드)
+    
+    nginx `auth_request` 등 프록시의 하위 요청용입니다. 프록시는 서명된 정적 파일 요청을 받으면
+    원래 URI를 `X-Original-URI` 헤더에 담아 이 엔드포인트를 호출하고, 204면 파일을 보내고 403이면 거부합니다.
+    """
+    if not x_original_uri or not file_delivery.verify_uri(x_original_uri):
+        raise HTTPException(
+            status_code=403,
+            detail={
+                "code": "INVALID_SIGNATURE",
+                "message": "서명이 올바르지 않거나 만료되었습니다.",
+            }
+        )
+    return Response(status_code=204)
+
+
+def download_task(
+    task_id: str,
+    url: str,
+    options,
+    flight_key: Optional[str] = None,
+    user_id: Optional[str] = None,
+):
+    """
+    다운로드 작업 (작업 큐 워커 스레드에서 실행)
+    
+    같은 요청 키로 합류한 작업(subscriber)이 있으면 진행률, 상태, 결과 파일을
+    모든 작업에 똑같이 전달합니다.
     
     Args:
-        task_id: 작업 ID
+        task_id: 작업 ID (실제 다운로드를 실행하는 leader)
         url: 유튜브 URL
         options: 다운로드 옵션
+        flight_key: single-flight 요청 키
+        user_id: 요청한 사용자 ID (사용자별 대역폭 공정 분배에 사용)
     """
-    import asyncio
-    from .websocket import (
-        send_progress_update,
-        send_status_update,
-        send_complete_message,
-        send_error_message,
-    )
+    from .websocket import progress_event, status_event, complete_event, error_event
     
-    # 비동기 함수를 동기 컨텍스트에서 실행하기 위한 헬퍼
-    def run_async(coro):
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
+    def subscribers():
+        """현재 이 다운로드를 기다리는 모든 작업 ID"""
+        if flight_key is None:
+            return [task_id]
+        return download_flights.subscribers(flight_key) or [task_id]
+    
+    def set_status(status: str, message: str):
+        for tid in subscribers():
+            task_manager.update_task_status(tid, status)
+            progress_bridge.publish(tid, status_event(status, message))
+    
+    def finish(result):
+        # 종료 시점까지 합류한 작업을 확정 (이후 요청은 새 다운로드를 시작)
+        task_ids = download_flights.finish(flight_key) if flight_key else [task_id]
+        for tid in task_ids or [task_id]:
+            if result.success:
+                complete(tid, result)
+            else:
+                fail(tid, result.error_message or "다운로드 실패")
+    
+    def complete(tid: str, result):
+        # 처리 중 상태
+        task_manager.update_task_status(tid, "processing")
+        message = "파일 처리 중..."
+        if result.audio:
+            # 오디오를 복사했는지 변환했는지 (CPU 시간 포함)
+            message = f"파일 처리 중... 오디오: {describe_audio(result.audio)}"
+        progress_bridge.publish(tid, status_event("processing", message))
         
-        if loop.is_running():
-            # 이미 실행 중인 루프가 있으면 태스크 생성
-            asyncio.create_task(coro)
-        else:
-            # 루프가 없으면 실행
-            loop.run_until_complete(coro)
+        # 동영상 정보 저장
+        if result.video_info:
+            task_manager.set_task_video_info(tid, result.video_info.model_dump())
+        
+        # 파일 경로 저장
+        if result.file_path:
+            task_manager.set_task_file_path(tid, result.file_path)
+        
+        # 아카이브 파일 참조 (다른 작업과 공유하는 파일을 지우지 않도록)
+        if archive is not None and result.archive_digest:
+            archive.acquire(result.archive_digest, tid)
+            task_manager.set_task_archive_digest(tid, result.archive_digest)
+        
+        # 작업 완료
+        task_manager.complete_task(tid)
+        
+        # WebSocket으로 완료 메시지 전송 (파일이 없어도 마지막 메시지는 항상 보냄)
+        file_path = Path(result.file_path) if result.file_path else None
+        progress_bridge.publish(tid, complete_event(
+            filename=file_path.name if file_path else "",
+            size=file_path.stat().st_size if file_path and file_path.exists() else 0,
+            download_url=f"/api/v1/download/{tid}/file" if file_path else ""
+        ))
+    
+    def fail(tid: str, error_msg: str):
+        # 작업 실패
+        task_manager.fail_task(
+            tid,
+            {
+                "code": "DOWNLOAD_FAILED",
+                "message": error_msg,
+            }
+        )
+        
+        # WebSocket으로 에러 메시지 전송
+        progress_bridge.publish(tid, error_event(
+            error_code="DOWNLOAD_FAILED",
+            error_message=error_msg
+        ))
+    
+    archive = get_download_archive()
     
     try:
         # 상태 업데이트: downloading
-        task_manager.update_task_status(task_id, "downloading")
-        run_async(send_status_update(task_id, "downloading", "다운로드를 시작합니다..."))
+        set_status("downloading", "다운로드를 시작합니다...")
         
         # CLI Downloader 옵션 변환
         cli_options = CLIDownloadOptions(
@@ -371,108 +792,76 @@ def download_task(task_id: str, url: str, options):
             output_dir=task_manager.output_dir,
             audio_only=options.audio_only,
             audio_quality=options.audio_quality,
+            audio_format=options.audio_format,
             save_metadata=options.save_metadata,
             save_thumbnail=options.save_thumbnail,
+            concurrent_fragments=options.concurrent_fragments or settings.download.concurrent_fragments,
+            fragment_retries=(
+                options.fragment_retries
+                if options.fragment_retries is not None
+                else settings.download.fragment_retries
+            ),
         )
         
-        # Downloader 생성
-        downloader = Downloader(cli_options)
+        # 변환/병합 없이 받은 파일이 그대로 결과가 되면 완료 전 스트리밍 허용
+        streamable = not options.audio_only
+        streaming_tasks = set()
         
         # 진행률 콜백
         def progress_callback(d: dict):
             if d["status"] == "downloading":
+                if streamable and len(streaming_tasks) < len(subscribers()):
+                    partial_path = stream_source(d)
+                    if partial_path is not None:
+                        for tid in subscribers():
+                            if tid not in streaming_tasks:
+                                task_manager.set_task_partial_path(tid, partial_path)
+                                streaming_tasks.add(tid)
+                
                 downloaded = d.get("downloaded_bytes", 0)
                 total = d.get("total_bytes") or d.get("total_bytes_estimate", 0)
                 
                 if total > 0:
                     percentage = int((downloaded / total) * 100)
                     
-                    # TaskManager 업데이트
-                    task_manager.update_task_progress(
-                        task_id=task_id,
-                        percentage=percentage,
-                        downloaded_bytes=downloaded,
-                        total_bytes=total,
-                        speed=d.get("_speed_str", ""),
-                        eta=d.get("_eta_str", ""),
-                    )
-                    
-                    # WebSocket으로 진행률 전송
-                    run_async(send_progress_update(
-                        task_id=task_id,
-                        percentage=percentage,
-                        downloaded_bytes=downloaded,
-                        total_bytes=total,
-                        speed=d.get("_speed_str", ""),
-                        eta=d.get("_eta_str", ""),
-                    ))
+                    for tid in subscribers():
+                        # TaskManager 업데이트
+                        task_manager.update_task_progress(
+                            task_id=tid,
+                            percentage=percentage,
+                            downloaded_bytes=downloaded,
+                            total_bytes=total,
+                            speed=d.get("_speed_str", ""),
+                            eta=d.get("_eta_str", ""),
+                        )
+                        
+                        # WebSocket으로 진행률 전송 (초당 전송 횟수는 브리지가 제한)
+                        progress_bridge.publish(tid, progress_event(
+                            percentage=percentage,
+                            downloaded_bytes=downloaded,
+                            total_bytes=total,
+                            speed=d.get("_speed_str", ""),
+                            eta=d.get("_eta_str", ""),
+                        ))
         
-        # 다운로드 실행
-        result = downloader.download(url, progress_callback)
+        # 전체 속도 제한을 다른 다운로드와 나눠 씀
+        bandwidth_manager.register(task_id, user_id=user_id)
         
-        if result.success:
-            # 처리 중 상태
-            task_manager.update_task_status(task_id, "processing")
-            run_async(send_status_update(task_id, "processing", "파일 처리 중..."))
-            
-            # 동영상 정보 저장
-            if result.video_info:
-                task_manager.set_task_video_info(
-                    task_id,
-                    result.video_info.model_dump()
-                )
-            
-            # 파일 경로 저장
-            if result.file_path:
-                task_manager.set_task_file_path(task_id, result.file_path)
-            
-            # 작업 완료
-            task_manager.complete_task(task_id)
-            
-            # WebSocket으로 완료 메시지 전송
-            if result.file_path:
-                from pathlib import Path
-                file_path = Path(result.file_path)
-                run_async(send_complete_message(
-                    task_id=task_id,
-                    filename=file_path.name,
-                    size=file_path.stat().st_size if file_path.exists() else 0,
-                    download_url=f"/api/v1/download/{task_id}/file"
-                ))
+        # 다운로드 실행
+        if settings.web.execution_mode == "process":
+            # 워커 프로세스에서 실행 (진행률은 프로세스 간 큐로 전달됨)
+            # 워커의 다운로드 속도는 조절할 수 없으므로 시작 시점의 몫을 고정 제한으로 적용
+            allocation = bandwidth_manager.allocation(task_id)
+            if allocation is not None:
+                cli_options.rate_limit = int(allocation)
+            result = get_process_executor().run(task_id, url, cli_options, progress_callback)
         else:
-            # 작업 실패
-            error_msg = result.error_message or "다운로드 실패"
-            task_manager.fail_task(
-                task_id,
-                {
-                    "code": "DOWNLOAD_FAILED",
-                    "message": error_msg,
-                }
-            )
-            
-            # WebSocket으로 에러 메시지 전송
-            run_async(send_error_message(
-                task_id=task_id,
-                error_code="DOWNLOAD_FAILED",
-                error_message=error_msg
-            ))
+            downloader = Downloader(cli_options, get_info_cache(), archive)
+            result = downloader.download(url, bandwidth_manager.throttled(task_id, progress_callback))
     
     except Exception as e:
         # 예외 발생 시 실패 처리
-        error_msg = str(e)
-        task_manager.fail_task(
-            task_id,
-            {
-                "code": "DOWNLOAD_FAILED",
-                "message": error_msg,
-            }
-        )
-        
-        # WebSocket으로 에러 메시지 전송
-        run_async(send_error_message(
-            task_id=task_id,
-            error_code="DOWNLOAD_FAILED",
-            error_message=error_msg
-        ))
-
-
+        result = DownloadResult(success=False, error_message=str(e))
+    
+    bandwidth_manager.unregister(task_id)
+    finish(result)
@@ -1,13 +1,38 @@
 """FastAPI 애플리케이션"""
 
+import json
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
+
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from pathlib import Path
+from starlette.concurrency import run_in_threadpool
 
 from . import __version__
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """서버 시작/종료 시 작업 큐, 백그라운드 정리 작업, 진행률 전달 시작/중지"""
+    from .jobs import job_scheduler
+    from .process_pool import shutdown_process_executor
+    from .progress import progress_bridge
+    from .retention import task_reaper
+    
+    job_scheduler.start()
+    progress_bridge.start()
+    task_reaper.start()
+    yield
+    task_reaper.stop()
+    # 대기 중인 작업은 버리고 실행 중인 다운로드는 기다리지 않음 (워커는 데몬 스레드)
+    job_scheduler.shutdown(wait=False)
+    shutdown_process_executor()
+    await progress_bridge.stop()
+
+
 # FastAPI 앱 생성
 app = FastAPI(
     title="YouTube Downloader API",
@@ -15,6 +40,7 @@ app = FastAPI(
     version=__version__,
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # CORS 설정
@@ -82,7 +108,101 @@ async def websocket_endpoint(websocket: WebSocket, task_id: str):
             # 클라이언트로부터 메시지를 받을 수 있지만, 현재는 사용하지 않음
             # 필요시 ping/pong 메시지 처리 가능
     except WebSocketDisconnect:
-        manager.disconnect(task_id)
+        pass
+    finally:
+        manager.disconnect(task_id, websocket)
+
+
+
+@app.websocket("/ws/tasks")
+async def user_websocket_endpoint(
+    websocket: WebSocket, token: str = "", encoding: str = "json"
+) -> None:
+    """
+    사용자 WebSocket 엔드포인트 (인증 필요)
+    
+    연결 하나로 사용자의 여러 작업 진행률을 받습니다. 연결 직후 진행 중인 작업을 모두 구독하며,
+    클라이언트는 다음 JSON 메시지로 구독을 바꿀 수 있습니다.
+    
+        {"action": "subscribe", "task_ids": ["..."]}
+        {"action": "unsubscribe", "task_ids": ["..."]}
+    
+    서버는 모인 이벤트를 `{"type": "batch", "events": [{"task_id": ..., "type": ..., "data": ...}]}`
+    프레임으로 보냅니다. `encoding=msgpack`이면 같은 내용을 msgpack 바이너리 프레임으로 보냅니다.
+    브라우저 WebSocket은 헤더를 설정할 수 없으므로 액세스 토큰은 `token` 쿼리 파라미터로 받습니다.
+    """
+    from . import auth_api
+    from .database import SessionLocal
+    from .models_db import User
+    from .tasks import ACTIVE_STATUSES, task_manager
+    from .websocket import encoding_available, manager
+    
+    def authenticate() -> Optional[User]:
+        db = SessionLocal()
+        try:
+            return auth_api.user_from_token(token, db)
+        finally:
+            db.close()
+    
+    # DB 조회는 블로킹이므로 이벤트 루프 밖에서
+    user = await run_in_threadpool(authenticate)
+    if user is None:
+        await websocket.close(code=1008)
+        return
+    if not encoding_available(encoding):
+        await websocket.close(code=1003)
+        return
+    
+    user_id = str(user.id)
+    subscriber = await manager.connect_user(websocket, encoding)
+    active = [
+        task["task_id"]
+        for task in task_manager.list_tasks(user_id=user_id, statuses=ACTIVE_STATUSES)
+    ]
+    subscriber.offer(None, {"type": "subscribed", "data": {"task_ids": active, "rejected": []}})
+    for task_id in active:
+        manager.subscribe(subscriber, task_id)
+    
+    try:
+        while True:
+            try:
+                request = json.loads(await websocket.receive_text())
+                action = request["action"]
+                task_ids = [str(task_id) for task_id in request.get("task_ids", [])]
+            except (ValueError, KeyError, TypeError):
+                subscriber.offer(None, {
+                    "type": "error",
+                    "data": {"code": "INVALID_MESSAGE", "message": "잘못된 메시지입니다."},
+                })
+                continue
+            
+            if action == "subscribe":
+                # 다른 사용자의 작업은 구독할 수 없음
+                accepted: List[str] = []
+                rejected: List[str] = []
+                for task_id in task_ids:
+                    task = task_manager.get_task(task_id)
+                    owned = task is not None and task.get("user_id") == user_id
+                    (accepted if owned else rejected).append(task_id)
+                subscriber.offer(None, {
+                    "type": "subscribed",
+                    "data": {"task_ids": accepted, "rejected": rejected},
+                })
+                for task_id in accepted:
+                    manager.subscribe(subscriber, task_id)
+            elif action == "unsubscribe":
+                for task_id in task_ids:
+                    manager.unsubscribe(subscriber, task_id)
+                subscriber.offer(None, {"type": "unsubscribed", "data": {"task_ids": task_ids}})
+            else:
+                subscriber.offer(None, {
+                    "type": "error",
+                    "data": {"code": "INVALID_ACTION", "message": f"알 수 없는 action: {action}"},
+                })
+    except WebSocketDisconnect:
+        pass
+    finally:
+        manager.remove(subscriber)
 
 
 if __name__ == "__main__":
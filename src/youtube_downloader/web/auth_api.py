@@ -75,17 +75,34 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    email = verify_token(token)
-    if email is None:
-        raise credentials_exception
-    
-    user = db.query(User).filter(User.email == email).first()
+    user = user_from_token(token, db)
     if user is None:
         raise credentials_exception
     
     return user
 
 
+def user_from_token(token: str, db: Session) -> User | None:
+    """
+    Get the user a JWT token belongs to.
+    
+    Used where the token does not arrive in an Authorization header
+    (e.g. WebSocket query parameters).
+    
+    Args:
+        token: JWT token
+        db: Database session
+        
+    Returns:
+        User, or None if the token is invalid or the user does not exist
+    """
+    email = verify_token(token)
+    if email is None:
+        return None
+    
+    return db.query(User).filter(User.email == email).first()
+
+
 # API endpoints
 @router.post("/register", response_model=Token, status_code=status.HTTP_201_CREATED)
 async def register(user_data: UserRegister, db: Session = Depends(get_db)):
@@ -0,0 +1,331 @@
+"""다운로드 결과 파일 전송
+
+`FileResponse`(단일 Range, If-Range, 서버가 지원하면 `http.response.pathsend`)에 다음을 더합니다.
+
+- 강한 ETag (아카이브 내용 해시, 없으면 크기/수정 시각/inode)와 `Last-Modified`
+- `If-None-Match`/`If-Modified-Since` 조건부 요청에 본문 없이 304
+- 여러 구간 Range 요청은 multipart로 보내지 않고 416으로 거절 (재개/탐색에는 한 구간이면 충분)
+- 확장자별 정확한 미디어 타입 (브라우저 미리보기/탐색용)
+- 큰 청크 (멀티 GB 파일을 보낼 때 ASGI 메시지 수를 줄임)
+
+앞단 프록시가 있으면 `FileDelivery`가 권한 확인만 하고 전송은 프록시에 맡깁니다
+(`X-Accel-Redirect`, `X-Sendfile`, 또는 HMAC 서명된 정적 파일 URL로 리다이렉트).
+"""
+
+import base64
+import hashlib
+import hmac
+import mimetypes
+import os
+import secrets
+import time
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qs, quote, urlencode, urlsplit
+
+from fastapi.responses import FileResponse, RedirectResponse, Response
+from starlette.datastructures import Headers
+from starlette.types import Receive, Scope, Send
+
+from ..config import settings
+
+# 시스템 mime.types에 없거나 다르게 등록된 미디어 확장자
+_MEDIA_TYPES = {
+    ".mp4": "video/mp4",
+    ".m4v": "video/mp4",
+    ".webm": "video/webm",
+    ".mkv": "video/x-matroska",
+    ".mov": "video/quicktime",
+    ".m4a": "audio/mp4",
+    ".mp3": "audio/mpeg",
+    ".opus": "audio/ogg",
+    ".ogg": "audio/ogg",
+    ".flac": "audio/flac",
+    ".wav": "audio/wav",
+    ".aac": "audio/aac",
+    ".jpg": "image/jpeg",
+    ".webp": "image/webp",
+    ".json": "application/json",
+}
+
+# 304 응답에 다시 보내는 헤더 (RFC 9110 15.4.5)
+_NOT_MODIFIED_HEADERS = ("etag", "last-modified", "cache-control", "content-location", "vary")
+
+
+def media_type(filename: str) -> str:
+    """파일 이름에 맞는 미디어 타입"""
+    ext = Path(filename).suffix.lower()
+    return _MEDIA_TYPES.get(ext) or mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+
+def content_disposition(filename: str, inline: bool = False) -> str:
+    """`Content-Disposition` 헤더 값 (ASCII가 아닌 이름은 RFC 5987 인코딩)"""
+    disposition_type = "inline" if inline else "attachment"
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"{disposition_type}; filename*=utf-8''{quoted}"
+    return f'{disposition_type}; filename="{filename}"'
+
+
+def file_etag(stat_result: os.stat_result, digest: Optional[str] = None) -> str:
+    """
+    강한 ETag 생성
+
+    Args:
+        stat_result: 파일 stat 결과
+        digest: 파일 내용의 SHA-256 해시 (아카이브에 있는 파일이면 같은 내용은 다시 받아도 ETag가 같음)
+    """
+    if digest:
+        return f'"sha256-{digest}"'
+    return f'"{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}-{stat_result.st_ino:x}"'
+
+
+class MediaFileResponse(FileResponse):
+    """조건부 요청과 한 구간 Range를 처리하는 다운로드 파일 응답"""
+
+    chunk_size = 1024 * 1024
+
+    def __init__(
+        self,
+        path: Path,
+        stat_result: os.stat_result,
+        filename: str,
+        etag: Optional[str] = None,
+        inline: bool = False,
+    ):
+        """
+        응답 초기화
+
+        Args:
+            path: 파일 경로
+            stat_result: 파일 stat 결과 (응답 헤더와 조건 비교에 사용)
+            filename: 다운로드 파일 이름
+            etag: ETag (None이면 stat 결과로 생성)
+            inline: True면 브라우저에서 바로 재생 (`Content-Disposition: inline`)
+        """
+        super().__init__(
+            path,
+            headers={
+                "ETag": etag or file_etag(stat_result),
+                # 캐시는 허용하되 매번 ETag로 확인 (작업이 삭제되면 파일도 사라지므로)
+                "Cache-Control": "private, no-cache",
+            },
+            media_type=media_type(filename),
+            filename=filename,
+            stat_result=stat_result,
+            content_disposition_type="inline" if inline else "attachment",
+        )
+        # FileResponse.stat_result는 Optional이므로 받은 값을 따로 보관
+        self._stat = stat_result
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            request_headers = Headers(scope=scope)
+
+            if self._not_modified(request_headers):
+                headers = {
+                    name: self.headers[name] for name in _NOT_MODIFIED_HEADERS if name in self.headers
+                }
+                await Response(status_code=304, headers=headers)(scope, receive, send)
+                return
+
+            http_range = request_headers.get("range")
+            http_if_range = request_headers.get("if-range")
+            if (
+                http_range is not None
+                and "," in http_range
+                and (http_if_range is None or self._should_use_range(http_if_range))
+            ):
+                # 여러 구간: multipart/byteranges 대신 거절 (클라이언트는 한 구간씩 다시 요청)
+                response = Response(
+                    status_code=416,
+                    headers={"Content-Range": f"bytes */{self._stat.st_size}"},
+                )
+                await response(scope, receive, send)
+                return
+
+        await super().__call__(scope, receive, send)
+
+    def _not_modified(self, request_headers: Headers) -> bool:
+        """조건부 요청에서 클라이언트가 가진 파일이 최신인지"""
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            # GET/HEAD는 약한 비교 (W/ 접두사 무시)
+            etag = self.headers["etag"].removeprefix("W/")
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags
+
+        if_modified_since = request_headers.get("if-modified-since")
+        if if_modified_since is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(self._stat.st_mtime) <= since
+
+        return False
+
+
+class FileDelivery:
+    """
+    결과 파일 전송 방식 선택
+
+    direct가 아니면 파이썬 워커는 헤더만 보내고, 파일 내용(Range/조건부 요청 포함)은 프록시가 전송합니다.
+    다운로드 디렉토리 밖의 파일은 프록시가 찾을 수 없으므로 항상 직접 전송합니다.
+    """
+
+    def __init__(
+        self,
+        mode: str = "direct",
+        internal_prefix: str = "/protected-downloads/",
+        signed_url_base: str = "/files/",
+        signed_url_ttl: int = 300,
+        signing_key: str = "",
+    ):
+        """
+        초기화
+
+        Args:
+            mode: direct, x-accel-redirect, x-sendfile, signed-url
+            internal_prefix: 다운로드 디렉토리에 연결된 nginx internal location
+            signed_url_base: 프록시가 다운로드 디렉토리를 제공하는 경로
+            signed_url_ttl: 서명된 URL 유효 시간 (초)
+            signing_key: 서명 키 (signed-url 모드에서 필수, 다른 모드에서 비어 있으면 임의 생성)
+
+        Raises:
+            ValueError: signed-url 모드인데 서명 키가 없을 때
+        """
+        if mode == "signed-url" and not signing_key:
+            raise ValueError("signed-url 모드에는 서명 키가 필요합니다")
+        self.mode = mode
+        self.internal_prefix = "/" + internal_prefix.strip("/") + "/"
+        self.signed_url_base = "/" + signed_url_base.strip("/") + "/"
+        self.signed_url_ttl = signed_url_ttl
+        self._key = signing_key.encode() if signing_key else secrets.token_bytes(32)
+
+    def response(
+        self,
+        path: Path,
+        stat_result: os.stat_result,
+        root: Path,
+        etag: Optional[str] = None,
+        inline: bool = False,
+    ) -> Response:
+        """
+        파일 응답 생성
+
+        Args:
+            path: 파일 경로
+            stat_result: 파일 stat 결과
+            root: 다운로드 디렉토리 (프록시가 제공하는 디렉토리)
+            etag: ETag (직접 전송할 때)
+            inline: 브라우저에서 바로 재생
+
+        Returns:
+            Response: 직접 전송, 프록시 전송 헤더, 또는 서명된 URL 리다이렉트
+        """
+        relative = self._relative_path(path, root)
+        if self.mode == "direct" or (relative is None and self.mode != "x-sendfile"):
+            return MediaFileResponse(path, stat_result, path.name, etag=etag, inline=inline)
+
+        # 여기부터 relative가 None일 수 있는 모드는 x-sendfile뿐
+        if self.mode == "signed-url":
+            assert relative is not None
+            return RedirectResponse(
+                self.signed_url(relative, inline=inline),
+                status_code=307,
+                headers={"Cache-Control": "no-store"},
+            )
+
+        headers = {
+            "Content-Disposition": content_disposition(path.name, inline),
+            "Cache-Control": "private, no-cache",
+        }
+        if self.mode == "x-accel-redirect":
+            assert relative is not None
+            headers["X-Accel-Redirect"] = self.internal_prefix + quote(relative)
+        else:
+            # 헤더는 latin-1만 허용하므로 퍼센트 인코딩 (mod_xsendfile의 XSendFileUnescape 기본값)
+            headers["X-Sendfile"] = quote(str(path.resolve()))
+        # 본문은 프록시가 채우므로 Content-Length는 보내지 않음
+        return Response(media_type=media_type(path.name), headers=headers)
+
+    def signed_url(self, relative: str, inline: bool = False, now: Optional[float] = None) -> str:
+        """
+        다운로드 디렉토리 안의 파일에 대한 서명된 URL
+
+        Args:
+            relative: 다운로드 디렉토리 기준 경로 (`/` 구분)
+            inline: 브라우저에서 바로 재생 (프록시에 전달할 힌트)
+            now: 현재 시각 (테스트용)
+        """
+        url_path = self.signed_url_base + quote(relative)
+        expires = int(now if now is not None else time.time()) + self.signed_url_ttl
+        query: dict[str, str | int] = {"expires": expires, "signature": self.sign(url_path, expires)}
+        if inline:
+            query["disposition"] = "inline"
+        return f"{url_path}?{urlencode(query)}"
+
+    def sign(self, url_path: str, expires: int) -> str:
+        """URL 경로와 만료 시각의 HMAC-SHA256 서명 (base64url, 패딩 없음)"""
+        digest = hmac.new(self._key, f"{expires}\n{url_path}".encode(), hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(digest).rstrip(b"=").decode()
+
+    def verify(self, url_path: str, expires: str, signature: str, now: Optional[float] = None) -> bool:
+        """
+        서명된 URL 검증 (프록시의 auth_request 등에서 사용)
+
+        Args:
+            url_path: 요청 경로 (퍼센트 인코딩된 그대로)
+            expires: 만료 시각 (유닉스 초)
+            signature: 서명
+
+        Returns:
+            bool: 서명이 맞고 만료되지 않았으면 True
+        """
+        try:
+            expires_at = int(expires)
+        except (TypeError, ValueError):
+            return False
+        if expires_at < (now if now is not None else time.time()):
+            return False
+        return hmac.compare_digest(self.sign(url_path, expires_at), signature or "")
+
+    def verify_uri(self, original_uri: str, now: Optional[float] = None) -> bool:
+        """
+        프록시가 받은 요청 URI(경로 + 쿼리) 검증 (nginx `$request_uri`)
+
+        Args:
+            original_uri: 요청 URI (퍼센트 인코딩된 그대로)
+
+        Returns:
+            bool: signed-url 모드이고 서명된 파일 경로의 유효한 서명이면 True
+        """
+        if self.mode != "signed-url":
+            return False
+        parts = urlsplit(original_uri)
+        if not parts.path.startswith(self.signed_url_base):
+            return False
+        query = parse_qs(parts.query)
+        expires = query.get("expires", [""])[0]
+        signature = query.get("signature", [""])[0]
+        return self.verify(parts.path, expires, signature, now=now)
+
+    @staticmethod
+    def _relative_path(path: Path, root: Path) -> Optional[str]:
+        """다운로드 디렉토리 기준 경로 (밖에 있으면 None)"""
+        try:
+            return path.resolve().relative_to(root.resolve()).as_posix()
+        except ValueError:
+            return None
+
+
+# 전역 FileDelivery 인스턴스
+file_delivery = FileDelivery(
+    settings.web.file_delivery,
+    settings.web.file_internal_prefix,
+    settings.web.signed_url_base,
+    settings.web.signed_url_ttl,
+    settings.web.file_signing_key,
+)
@@ -0,0 +1,208 @@
+"""다운로드 작업 큐와 워커 풀"""
+
+import heapq
+import itertools
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from ..bandwidth import BandwidthManager
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    """대기열이 가득 차서 작업을 받을 수 없음"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"대기열이 가득 찼습니다. {retry_after}초 후 다시 시도하세요.")
+        self.retry_after = retry_after
+
+
+@dataclass(order=True)
+class _Job:
+    priority: int
+    seq: int
+    job_id: str = field(compare=False)
+    fn: Callable[..., Any] = field(compare=False)
+    args: tuple[Any, ...] = field(compare=False)
+    kwargs: Dict[str, Any] = field(compare=False)
+
+
+class JobScheduler:
+    """
+    고정 크기 워커 풀 작업 스케줄러
+
+    동시에 실행되는 작업 수를 max_workers로 제한하고, 나머지는 우선순위(작을수록 먼저),
+    같은 우선순위 안에서는 들어온 순서대로 대기합니다. 대기열이 max_queue_size를 넘으면
+    `QueueFullError`로 거절해서 서버가 처리할 수 있는 양만 받습니다.
+    """
+
+    def __init__(self, max_workers: int = 4, max_queue_size: int = 100):
+        """
+        스케줄러 초기화
+
+        Args:
+            max_workers: 동시에 실행할 최대 작업 수
+            max_queue_size: 대기열 최대 길이
+        """
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+
+        self._queue: List[_Job] = []
+        self._running: Dict[str, float] = {}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._workers: List[threading.Thread] = []
+        self._shutdown = False
+
+        # 최근 작업 소요 시간 (지수 이동 평균, 재시도 시간 추정용)
+        self._avg_duration = 30.0
+
+    def submit(
+        self, job_id: str, fn: Callable[..., Any], *args: Any, priority: int = 0, **kwargs: Any
+    ) -> int:
+        """
+        작업 추가
+
+        Args:
+            job_id: 작업 ID
+            fn: 실행할 함수
+            priority: 우선순위 (작을수록 먼저)
+
+        Returns:
+            대기열 순번 (1부터)
+
+        Raises:
+            QueueFullError: 대기열이 가득 찬 경우
+        """
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("스케줄러가 종료되었습니다.")
+            if len(self._queue) >= self.max_queue_size:
+                raise QueueFullError(self._retry_after())
+
+            job = _Job(priority, next(self._seq), job_id, fn, args, kwargs)
+            heapq.heappush(self._queue, job)
+            self._ensure_workers()
+            self._cond.notify()
+            return sorted(self._queue).index(job) + 1
+
+    def is_full(self) -> bool:
+        """대기열이 가득 찼는지 여부"""
+        with self._cond:
+            return len(self._queue) >= self.max_queue_size
+
+    def retry_after(self) -> int:
+        """다시 시도하기까지 예상 대기 시간 (초)"""
+        with self._cond:
+            return self._retry_after()
+
+    def position(self, job_id: str) -> Optional[int]:
+        """
+        대기열 순번 조회
+
+        Returns:
+            순번 (1부터), 실행 중이거나 대기열에 없으면 None
+        """
+        with self._cond:
+            for index, job in enumerate(sorted(self._queue)):
+                if job.job_id == job_id:
+                    return index + 1
+            return None
+
+    def holds(self, job_id: str) -> bool:
+        """대기 중이거나 실행 중인 작업인지 여부"""
+        with self._cond:
+            return job_id in self._running or any(job.job_id == job_id for job in self._queue)
+
+    def positions(self) -> Dict[str, int]:
+        """
+        대기 중인 모든 작업의 순번 (여러 작업 상태를 한 번에 조회할 때)
+
+        Returns:
+            작업 ID -> 순번 (1부터)
+        """
+        with self._cond:
+            return {job.job_id: index + 1 for index, job in enumerate(sorted(self._queue))}
+
+    def stats(self) -> Dict[str, int]:
+        """대기/실행 중인 작업 수"""
+        with self._cond:
+            return {
+                "queued": len(self._queue),
+                "running": len(self._running),
+                "max_workers": self.max_workers,
+                "max_queue_size": self.max_queue_size,
+            }
+
+    def start(self) -> None:
+        """작업 받기 시작 (종료 후 다시 시작할 때, 워커는 작업이 들어오면 시작)"""
+        with self._cond:
+            self._shutdown = False
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        스케줄러 종료
+
+        대기 중인 작업은 버리고, wait이면 실행 중인 작업이 끝날 때까지 기다립니다.
+        """
+        with self._cond:
+            self._shutdown = True
+            self._queue.clear()
+            self._cond.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def _ensure_workers(self) -> None:
+        """필요한 만큼 워커 스레드 시작 (lock 보유 상태에서 호출)"""
+        self._workers = [w for w in self._workers if w.is_alive()]
+        while len(self._workers) < min(self.max_workers, len(self._queue) + len(self._running)):
+            worker = threading.Thread(
+                target=self._work,
+                name=f"download-worker-{len(self._workers)}",
+                daemon=True,
+            )
+            self._workers.append(worker)
+            worker.start()
+
+    def _work(self) -> None:
+        """워커 루프"""
+        while True:
+            with self._cond:
+                while not self._queue and not self._shutdown:
+                    self._cond.wait()
+                if self._shutdown:
+                    return
+                job = heapq.heappop(self._queue)
+                self._running[job.job_id] = time.monotonic()
+
+            try:
+                job.fn(*job.args, **job.kwargs)
+            except Exception:
+                logger.exception("작업 실행 실패: job_id=%s", job.job_id)
+            finally:
+                with self._cond:
+                    started_at = self._running.pop(job.job_id, time.monotonic())
+                    duration = time.monotonic() - started_at
+                    self._avg_duration = self._avg_duration * 0.8 + duration * 0.2
+
+    def _retry_after(self) -> int:
+        """lock 보유 상태에서 재시도 시간 계산"""
+        waves = (len(self._queue) + len(self._running)) / max(self.max_workers, 1)
+        return max(1, math.ceil(waves * self._avg_duration))
+
+
+# 전역 JobScheduler 인스턴스
+job_scheduler = JobScheduler(
+    max_workers=settings.web.max_concurrent_downloads,
+    max_queue_size=settings.web.max_queue_size,
+)
+
+# 전역 BandwidthManager 인스턴스 (실행 중인 다운로드가 전체 속도 제한을 나눠 씀)
+bandwidth_manager = BandwidthManager(settings.web.bandwidth_limit)
@@ -1,7 +1,7 @@
 """Pydantic 모델 정의"""
 
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field, HttpUrl
 
@@ -20,8 +20,17 @@ class DownloadOptions(BaseModel):
     quality: str = Field(default="best", description="화질 (best, 1080p, 720p, 480p)")
     audio_only: bool = Field(default=False, description="오디오만 다운로드")
     audio_quality: str = Field(default="192", description="오디오 비트레이트 (32-320 kbps)")
+    audio_format: Literal["mp3", "auto"] = Field(
+        default="mp3", description="오디오 형식 (auto: 원본이 요청 음질 이하면 변환 없이 m4a/opus/ogg로 복사)"
+    )
     save_metadata: bool = Field(default=False, description="메타데이터 저장")
     save_thumbnail: bool = Field(default=False, description="썸네일 저장")
+    concurrent_fragments: Optional[int] = Field(
+        default=None, ge=1, le=16, description="HLS/DASH 조각 동시 다운로드 수 (기본: 서버 설정)"
+    )
+    fragment_retries: Optional[int] = Field(
+        default=None, ge=0, le=20, description="조각별 재시도 횟수 (기본: 서버 설정)"
+    )
 
 
 class DownloadRequest(BaseModel):
@@ -85,6 +94,10 @@ class DownloadStatusData(BaseModel):
     """다운로드 상태 데이터"""
     task_id: str
     status: str = Field(description="pending, downloading, processing, completed, failed")
+    queue_position: Optional[int] = Field(default=None, description="대기열 순번 (pending일 때, 1부터)")
+    bandwidth_allocation: Optional[int] = Field(
+        default=None, description="현재 할당된 속도 (바이트/초, 다운로드 중이고 전체 속도 제한이 있을 때)"
+    )
     progress: Optional[DownloadProgress] = None
     video_info: Optional[VideoInfo] = None
     file: Optional[DownloadFileInfo] = None
@@ -92,6 +105,23 @@ class DownloadStatusData(BaseModel):
     completed_at: Optional[datetime] = None
     failed_at: Optional[datetime] = None
     error: Optional[Dict[str, Any]] = None
+    version: int = Field(default=0, description="작업 버전 (갱신마다 증가, long-poll의 since_version에 사용)")
+
+
+class TaskStatusSummary(BaseModel):
+    """작업 상태 요약 (여러 작업 조회용, 값이 없는 필드는 응답에서 빠짐)"""
+    task_id: str
+    status: str
+    version: int = 0
+    queue_position: Optional[int] = None
+    percentage: Optional[int] = None
+    downloaded_bytes: Optional[int] = None
+    total_bytes: Optional[int] = None
+    speed: Optional[str] = None
+    eta: Optional[str] = None
+    file: Optional[DownloadFileInfo] = None
+    error: Optional[Dict[str, Any]] = None
+    updated_at: Optional[datetime] = None
 
 
 class DownloadResponse(BaseModel):
@@ -108,6 +138,24 @@ class DownloadStatusResponse(BaseModel):
     data: DownloadStatusData
 
 
+class BatchStatusResponse(BaseModel):
+    """여러 작업 상태 조회 응답"""
+    success: bool = True
+    data: List[TaskStatusSummary]
+    missing: List[str] = Field(default_factory=list, description="찾을 수 없는 작업 ID")
+
+
+class RetentionStats(BaseModel):
+    """작업/파일 정리 통계 (서버 시작 이후 누적)"""
+    runs: int = 0
+    tasks: int = Field(default=0, description="현재 보관 중인 작업 수")
+    expired_tasks: int = Field(default=0, description="보관 시간이 지나 삭제한 작업 수")
+    evicted_tasks: int = Field(default=0, description="최대 작업 수를 넘어 삭제한 작업 수")
+    deleted_temp_files: int = Field(default=0, description="삭제한 임시/부분 파일 수")
+    reclaimed_bytes: int = Field(default=0, description="확보한 디스크 용량 (바이트)")
+    last_run_at: Optional[datetime] = None
+
+
 # ============================================================================
 # Error 모델
 # ============================================================================
@@ -135,3 +183,4 @@ class WebSocketMessage(BaseModel):
     type: str = Field(description="progress, status, complete, error")
     data: Dict[str, Any]
     timestamp: datetime = Field(default_factory=datetime.now)
+
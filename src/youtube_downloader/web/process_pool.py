@@ -0,0 +1,310 @@
+"""프로세스 풀 다운로드 실행기
+
+yt-dlp의 파이썬 코드(조각 처리, 진행률 훅, JSON 변환)를 API 서버 프로세스 밖에서 실행해서
+이벤트 루프와 GIL을 다투지 않게 하고, 추출기가 멈추거나 죽어도 서버에 영향이 없게 합니다.
+진행률은 프로세스 간 큐로 부모 프로세스에 전달됩니다. 제한 시간을 넘긴 작업은 실패로 처리하고
+그 워커 프로세스를 종료합니다.
+"""
+
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.queues import Queue
+from typing import Any
+
+from ..config import settings
+from ..models import DownloadOptions, DownloadResult
+
+logger = logging.getLogger(__name__)
+
+# 자식 프로세스에서 보내는 진행률 최소 간격 (초, 마지막 이벤트는 항상 전송)
+_PROGRESS_INTERVAL = 0.1
+
+# 부모 프로세스로 전달하는 진행률 키 (info_dict 등 큰 값은 제외)
+_PROGRESS_KEYS = (
+    "status",
+    "downloaded_bytes",
+    "total_bytes",
+    "total_bytes_estimate",
+    "elapsed",
+    "speed",
+    "eta",
+    "_speed_str",
+    "_eta_str",
+    "_percent_str",
+    "filename",
+    "tmpfilename",
+)
+
+# info_dict에서 골라 보내는 키 (완료 전 스트리밍 가능 여부 판단용)
+_INFO_KEYS = ("protocol", "format_id", "container")
+
+# 작업이 끝난 뒤 남은 진행률 이벤트를 기다리는 최대 시간 (초)
+_DRAIN_TIMEOUT = 5.0
+
+# 자식 프로세스 -> 부모 프로세스 이벤트: (작업 ID, 워커 PID | 진행률 | 작업 끝(None))
+_Event = tuple[str, int | dict[str, Any] | None]
+
+# 자식 프로세스의 이벤트 큐 (워커 초기화 시 설정)
+_events: "Queue[_Event | None] | None" = None
+
+
+def _init_worker(events: "Queue[_Event | None]") -> None:
+    """워커 프로세스 초기화"""
+    global _events
+    _events = events
+
+
+def _run_download(job_id: str, url: str, options: DownloadOptions) -> DownloadResult:
+    """
+    워커 프로세스에서 다운로드 실행
+
+    Args:
+        job_id: 작업 ID (진행률 이벤트 구분용)
+        url: 동영상 URL
+        options: 다운로드 옵션
+
+    Returns:
+        다운로드 결과
+    """
+    from ..archive import get_download_archive
+    from ..cache import get_info_cache
+    from ..downloader import Downloader
+
+    events = _events
+    assert events is not None, "워커 초기화 전에 호출됨"
+
+    # 제한 시간을 넘기면 부모 프로세스가 이 워커를 종료할 수 있도록 PID 전달
+    events.put((job_id, os.getpid()))
+    last_sent = 0.0
+
+    def progress_callback(d: dict[str, Any]) -> None:
+        nonlocal last_sent
+        now = time.monotonic()
+        if d.get("status") == "downloading" and now - last_sent < _PROGRESS_INTERVAL:
+            return
+        last_sent = now
+        event = {key: d[key] for key in _PROGRESS_KEYS if d.get(key) is not None}
+        info = d.get("info_dict") or {}
+        event.update({key: info[key] for key in _INFO_KEYS if info.get(key) is not None})
+        events.put((job_id, event))
+
+    try:
+        downloader = Downloader(options, get_info_cache(), get_download_archive())
+        return downloader.download(url, progress_callback)
+    finally:
+        # 이 작업의 마지막 이벤트
+        events.put((job_id, None))
+
+
+class ProcessDownloadExecutor:
+    """
+    프로세스 풀 다운로드 실행기
+
+    각 워커 프로세스는 max_tasks_per_child개 작업 후 새 프로세스로 교체되어 yt-dlp의
+    메모리 증가를 제한합니다. 워커가 비정상 종료되면 풀을 다시 만들고 진행 중이던 작업은
+    실패로 처리합니다.
+
+    작업이 제한 시간을 넘기면 실패로 처리하고 새 풀로 교체합니다. 이전 풀에서 실행 중인 다른
+    작업이 끝날 때까지 기다린 뒤 멈춘 워커 프로세스를 종료하므로 다른 작업은 영향을 받지 않습니다.
+    """
+
+    def __init__(
+        self, max_workers: int = 4, max_tasks_per_child: int = 20, timeout: float | None = None
+    ) -> None:
+        """
+        실행기 초기화
+
+        Args:
+            max_workers: 워커 프로세스 수
+            max_tasks_per_child: 워커 프로세스 하나가 처리할 최대 작업 수
+            timeout: 작업 하나의 최대 실행 시간 (초, None이면 무제한)
+        """
+        self.max_workers = max_workers
+        self.max_tasks_per_child = max_tasks_per_child
+        self.timeout = timeout
+
+        self._context = multiprocessing.get_context("spawn")
+        self._events: Queue[_Event | None] = self._context.Queue()
+        self._lock = threading.Lock()
+        self._callbacks: dict[str, Callable[[dict[str, Any]], None] | None] = {}
+        self._drained: dict[str, threading.Event] = {}
+        self._pids: dict[str, int] = {}
+        # 풀별 실행 중인 작업 수
+        self._active: dict[ProcessPoolExecutor, int] = {}
+        # 교체된 풀 -> 다른 작업이 모두 끝나면 종료할 멈춘 워커 (PID, 작업 Future)
+        self._stuck: dict[ProcessPoolExecutor, list[tuple[int, Future[DownloadResult]]]] = {}
+        self._pool = self._new_pool()
+
+        self._listener = threading.Thread(
+            target=self._listen, name="download-progress-listener", daemon=True
+        )
+        self._listener.start()
+
+    def run(
+        self,
+        job_id: str,
+        url: str,
+        options: DownloadOptions,
+        progress_callback: Callable[[dict[str, Any]], None] | None = None,
+    ) -> DownloadResult:
+        """
+        다운로드 실행 (끝날 때까지 대기)
+
+        progress_callback은 부모 프로세스의 진행률 수신 스레드에서 호출됩니다.
+
+        Args:
+            job_id: 작업 ID
+            url: 동영상 URL
+            options: 다운로드 옵션
+            progress_callback: 진행률 콜백 함수
+
+        Returns:
+            다운로드 결과
+        """
+        drained = threading.Event()
+        with self._lock:
+            self._callbacks[job_id] = progress_callback
+            self._drained[job_id] = drained
+            pool = self._pool
+            self._active[pool] = self._active.get(pool, 0) + 1
+
+        try:
+            future: Future[DownloadResult] = pool.submit(_run_download, job_id, url, options)
+            result = future.result(timeout=self.timeout)
+            # 결과보다 늦게 도착하는 진행률 이벤트까지 전달
+            drained.wait(_DRAIN_TIMEOUT)
+            return result
+        except TimeoutError:
+            if not future.cancel():
+                self._retire_worker(pool, job_id, future)
+            return DownloadResult(
+                success=False,
+                error_message=f"다운로드가 제한 시간({self.timeout:g}초)을 넘겨 중단되었습니다.",
+            )
+        except BrokenProcessPool:
+            self._replace_pool(pool)
+            return DownloadResult(
+                success=False, error_message="다운로드 프로세스가 비정상 종료되었습니다."
+            )
+        finally:
+            with self._lock:
+                self._callbacks.pop(job_id, None)
+                self._drained.pop(job_id, None)
+                self._pids.pop(job_id, None)
+                self._active[pool] -= 1
+                stuck = self._reap_retired(pool)
+            self._kill(stuck)
+
+    def shutdown(self) -> None:
+        """실행기 종료 (대기 중인 작업 취소)"""
+        with self._lock:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        self._events.put(None)
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=self._context,
+            initializer=_init_worker,
+            initargs=(self._events,),
+            max_tasks_per_child=self.max_tasks_per_child,
+        )
+
+    def _replace_pool(self, broken: ProcessPoolExecutor) -> None:
+        """비정상 종료된 풀 교체 (여러 작업이 동시에 감지해도 한 번만)"""
+        with self._lock:
+            if self._pool is broken:
+                broken.shutdown(wait=False, cancel_futures=True)
+                self._pool = self._new_pool()
+
+    def _retire_worker(
+        self, pool: ProcessPoolExecutor, job_id: str, future: Future[DownloadResult]
+    ) -> None:
+        """제한 시간을 넘긴 작업의 풀을 교체하고 멈춘 워커를 종료 대상으로 등록"""
+        with self._lock:
+            if self._pool is pool:
+                pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = self._new_pool()
+            pid = self._pids.get(job_id)
+            if pid is not None:
+                self._stuck.setdefault(pool, []).append((pid, future))
+
+    def _reap_retired(
+        self, pool: ProcessPoolExecutor
+    ) -> list[tuple[int, Future[DownloadResult]]]:
+        """교체된 풀에서 실행 중인 작업이 없으면 종료할 워커 목록을 꺼냄 (lock 안에서 호출)"""
+        if self._active[pool] > 0:
+            return []
+        del self._active[pool]
+        return self._stuck.pop(pool, [])
+
+    @staticmethod
+    def _kill(stuck: list[tuple[int, Future[DownloadResult]]]) -> None:
+        """멈춘 워커 프로세스 종료 (그 사이 작업이 끝났으면 PID가 재사용됐을 수 있으므로 건너뜀)"""
+        for pid, future in stuck:
+            if future.done():
+                continue
+            try:
+                os.kill(pid, signal.SIGKILL if hasattr(signal, "SIGKILL") else signal.SIGTERM)
+            except OSError:
+                pass
+
+    def _listen(self) -> None:
+        """진행률 이벤트 수신 루프"""
+        while True:
+            event = self._events.get()
+            if event is None:
+                return
+
+            job_id, data = event
+            with self._lock:
+                if isinstance(data, int):
+                    if job_id in self._callbacks:
+                        self._pids[job_id] = data
+                    continue
+                callback = self._callbacks.get(job_id)
+                drained = self._drained.get(job_id)
+
+            if data is None:
+                if drained is not None:
+                    drained.set()
+                continue
+
+            if callback is not None:
+                try:
+                    callback(data)
+                except Exception:
+                    logger.exception("진행률 전달 실패: job_id=%s", job_id)
+
+
+_process_executor: ProcessDownloadExecutor | None = None
+_process_executor_lock = threading.Lock()
+
+
+def get_process_executor() -> ProcessDownloadExecutor:
+    """설정에 따른 공유 프로세스 풀 실행기 (처음 사용할 때 생성)"""
+    global _process_executor
+    with _process_executor_lock:
+        if _process_executor is None:
+            _process_executor = ProcessDownloadExecutor(
+                max_workers=settings.web.max_concurrent_downloads,
+                max_tasks_per_child=settings.web.max_tasks_per_worker,
+                timeout=settings.web.download_timeout or None,
+            )
+        return _process_executor
+
+
+def shutdown_process_executor() -> None:
+    """공유 프로세스 풀 실행기 종료 (만들어진 적이 없으면 아무것도 하지 않음)"""
+    global _process_executor
+    with _process_executor_lock:
+        executor, _process_executor = _process_executor, None
+    if executor is not None:
+        executor.shutdown()
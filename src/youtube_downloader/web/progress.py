@@ -0,0 +1,174 @@
+"""다운로드 스레드 → WebSocket 진행률 전달
+
+다운로드는 작업 큐 워커 스레드에서 실행되고, WebSocket은 서버 이벤트 루프에 속합니다.
+`ProgressBridge`는 워커 스레드에서 받은 메시지를 `call_soon_threadsafe`로 서버 루프의
+작업별 큐에 넘기고, 작업마다 하나씩 있는 전송 태스크가 순서대로 보냅니다.
+
+yt-dlp 진행률 훅은 초당 수십 번 호출되므로 진행률 메시지는 합칩니다. 아직 보내지 않은
+진행률이 있으면 최신 값으로 바꿔 두기만 하고, 작업마다 초당 max_rate번까지만 보냅니다.
+상태/완료/에러 메시지는 합치거나 버리지 않고 들어온 순서대로 모두 보냅니다.
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# 작업의 마지막 메시지 (보낸 뒤 작업별 큐를 정리)
+TERMINAL_TYPES = ("complete", "error")
+
+# 작업별 큐에서 "최신 진행률을 보낼 차례"를 나타내는 표시
+_PROGRESS = object()
+
+# 작업별 큐 항목: 보낼 메시지, _PROGRESS 표시, 또는 전송 중지(None)
+_QueueItem = Union[Dict[str, Any], object, None]
+
+
+class _Channel:
+    """작업별 전송 큐 (서버 루프에서만 사용)"""
+
+    __slots__ = ("queue", "sender", "last_progress_at")
+
+    def __init__(self) -> None:
+        self.queue: asyncio.Queue[_QueueItem] = asyncio.Queue()
+        self.sender: Optional[asyncio.Task[None]] = None
+        self.last_progress_at = float("-inf")
+
+
+class ProgressBridge:
+    """워커 스레드의 진행/상태 메시지를 서버 이벤트 루프에서 전송"""
+
+    def __init__(
+        self, send: Callable[[str, Dict[str, Any]], Awaitable[None]], max_rate: float = 4.0
+    ) -> None:
+        """
+        브리지 초기화
+
+        Args:
+            send: 메시지 전송 코루틴 함수 (task_id, message)
+            max_rate: 작업별 진행률 메시지 최대 전송 횟수 (초당, 0이면 제한 없음)
+        """
+        self._send = send
+        self._interval = 1 / max_rate if max_rate > 0 else 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # 워커 스레드와 공유: 작업별 아직 보내지 않은 최신 진행률
+        self._lock = threading.Lock()
+        self._progress: Dict[str, Dict[str, Any]] = {}
+
+        # 서버 루프 전용
+        self._channels: Dict[str, _Channel] = {}
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """
+        메시지를 보낼 이벤트 루프 지정 (서버 시작 시)
+
+        Args:
+            loop: 서버 이벤트 루프 (None이면 현재 실행 중인 루프)
+        """
+        self._loop = loop or asyncio.get_running_loop()
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """
+        남은 메시지를 보내고 전송 중지 (서버 종료 시)
+
+        Args:
+            timeout: 남은 메시지 전송을 기다릴 최대 시간 (초)
+        """
+        senders = [channel.sender for channel in self._channels.values() if channel.sender]
+        for channel in self._channels.values():
+            channel.queue.put_nowait(None)
+        if senders:
+            await asyncio.wait(senders, timeout=timeout)
+        for sender in senders:
+            sender.cancel()
+        self._channels.clear()
+        with self._lock:
+            self._progress.clear()
+        self._loop = None
+
+    def publish(self, task_id: str, message: Dict[str, Any]) -> None:
+        """
+        메시지 전송 요청 (어느 스레드에서나 호출 가능, 기다리지 않음)
+
+        Args:
+            task_id: 작업 ID
+            message: 전송할 메시지 (`type`, `data`)
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+
+        item: _QueueItem = message
+        if message.get("type") == "progress":
+            with self._lock:
+                queued = task_id in self._progress
+                self._progress[task_id] = message
+            # 이미 큐에 들어간 진행률이 있으면 그때 최신 값을 보냄
+            if queued:
+                return
+            item = _PROGRESS
+
+        try:
+            loop.call_soon_threadsafe(self._enqueue, task_id, item)
+        except RuntimeError:
+            # 서버 루프가 종료됨
+            pass
+
+    def pending(self) -> int:
+        """전송 대기 중인 작업 수"""
+        return len(self._channels)
+
+    def _enqueue(self, task_id: str, item: _QueueItem) -> None:
+        channel = self._channels.get(task_id)
+        if channel is None:
+            channel = self._channels[task_id] = _Channel()
+            channel.sender = asyncio.get_running_loop().create_task(self._drain(task_id, channel))
+        channel.queue.put_nowait(item)
+
+    async def _drain(self, task_id: str, channel: _Channel) -> None:
+        """작업별 큐의 메시지를 순서대로 전송"""
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await channel.queue.get()
+            if item is None:
+                return
+
+            if item is _PROGRESS:
+                # 초당 max_rate번을 넘지 않도록 기다린 뒤, 그동안 들어온 최신 값을 보냄
+                delay = channel.last_progress_at + self._interval - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                with self._lock:
+                    latest = self._progress.pop(task_id, None)
+                if latest is None:
+                    continue
+                message = latest
+                channel.last_progress_at = loop.time()
+            else:
+                assert isinstance(item, dict)
+                message = item
+
+            try:
+                await self._send(task_id, message)
+            except Exception:
+                logger.exception("메시지 전송 실패: task_id=%s", task_id)
+
+            if message.get("type") in TERMINAL_TYPES and channel.queue.empty():
+                if self._channels.get(task_id) is channel:
+                    del self._channels[task_id]
+                return
+
+
+def _send_to_websocket(task_id: str, message: Dict[str, Any]) -> Awaitable[None]:
+    from .websocket import manager
+
+    return manager.send_message(task_id, message)
+
+
+# 전역 ProgressBridge 인스턴스
+progress_bridge = ProgressBridge(_send_to_websocket, settings.web.progress_max_rate)
@@ -0,0 +1,199 @@
+"""작업/파일 보관 기간 관리
+
+완료/실패한 작업은 누가 지우지 않는 한 저장소와 `./downloads`에 계속 남습니다. 정리 작업(reaper)이
+주기적으로 다음을 삭제합니다.
+
+- 상태별 보관 시간(TTL)이 지난 작업과 결과 파일 (대기열이나 진행 중인 다운로드에 남아 있는 작업은 제외,
+  마지막 참조였으면 하드 링크된 아카이브 항목과 객체도 함께)
+- 최대 작업 수를 넘는 만큼, 가장 오래 조회되지 않은 완료/실패 작업 (LRU)
+- 임시 디렉토리와 출력 디렉토리에 남은 오래된 임시/부분 파일 (중단된 다운로드)
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from .jobs import job_scheduler
+from .models import RetentionStats
+from .singleflight import download_flights
+from .tasks import TaskManager, task_manager
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# 최대 작업 수를 넘었을 때 삭제 대상이 되는 상태 (진행 중인 작업은 지우지 않음)
+_EVICTABLE_STATUSES = ("completed", "failed")
+
+# 중단된 다운로드가 출력 디렉토리에 남기는 파일
+_PARTIAL_SUFFIXES = (".part", ".ytdl", ".segments")
+
+# 한 번에 조회/삭제하는 작업 수
+_BATCH_SIZE = 500
+
+
+class TaskReaper:
+    """주기적으로 만료된 작업과 파일을 삭제하는 정리 작업"""
+
+    def __init__(
+        self,
+        manager: TaskManager,
+        ttls: Dict[str, int],
+        max_tasks: int,
+        temp_file_ttl: int,
+        interval: float = 60.0,
+        is_held: Optional[Callable[[str], bool]] = None,
+    ):
+        """
+        정리 작업 초기화
+
+        Args:
+            manager: 작업 관리자
+            ttls: 상태별 보관 시간 (초, 0이면 무기한)
+            max_tasks: 보관할 최대 작업 수
+            temp_file_ttl: 임시/부분 파일 보관 시간 (초)
+            interval: 실행 간격 (초)
+            is_held: 아직 스케줄러가 들고 있는 작업인지 확인하는 함수 (갱신이 없어도 지우지 않음)
+        """
+        self.manager = manager
+        self.ttls = ttls
+        self.max_tasks = max_tasks
+        self.temp_file_ttl = temp_file_ttl
+        self.interval = interval
+        self.is_held = is_held
+
+        self._lock = threading.Lock()
+        self._stats = RetentionStats()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """백그라운드 스레드에서 주기적으로 실행"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="task-reaper", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """백그라운드 실행 중지"""
+        self._stop.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join()
+
+    def run_once(self) -> RetentionStats:
+        """
+        정리 작업 한 번 실행
+
+        Returns:
+            누적 통계
+        """
+        now = time.monotonic()
+        expired = evicted = deleted_temp = reclaimed = 0
+
+        # 상태별 보관 시간이 지난 작업
+        for status, ttl in self.ttls.items():
+            if ttl <= 0:
+                continue
+            while True:
+                tasks = self.manager.store.expired(status, now - ttl, _BATCH_SIZE)
+                # 대기열에서 차례를 기다리는 작업은 갱신이 없어도 멈춘 것이 아님
+                deletable = [
+                    task for task in tasks
+                    if self.is_held is None or not self.is_held(task["task_id"])
+                ]
+                for task in deletable:
+                    reclaimed += self.manager.delete_task(task["task_id"])
+                expired += len(deletable)
+                if len(tasks) < _BATCH_SIZE or not deletable:
+                    break
+
+        # 최대 작업 수를 넘는 만큼 오래 조회되지 않은 작업부터
+        overflow = self.manager.store.count() - self.max_tasks
+        while overflow > 0:
+            tasks = self.manager.store.least_recently_used(
+                _EVICTABLE_STATUSES, min(overflow, _BATCH_SIZE)
+            )
+            if not tasks:
+                break
+            for task in tasks:
+                reclaimed += self.manager.delete_task(task["task_id"])
+            evicted += len(tasks)
+            overflow -= len(tasks)
+
+        # 중단된 다운로드가 남긴 임시/부분 파일
+        cutoff = time.time() - self.temp_file_ttl
+        candidates = list(self.manager.temp_dir.rglob("*")) if self.manager.temp_dir.exists() else []
+        candidates += [
+            path for path in self.manager.output_dir.glob("*") if _is_partial(path)
+        ]
+        for path in candidates:
+            freed = _remove_if_older(path, cutoff)
+            if freed is not None:
+                deleted_temp += 1
+                reclaimed += freed
+
+        with self._lock:
+            stats = self._stats
+            stats.runs += 1
+            stats.tasks = self.manager.store.count()
+            stats.expired_tasks += expired
+            stats.evicted_tasks += evicted
+            stats.deleted_temp_files += deleted_temp
+            stats.reclaimed_bytes += reclaimed
+            stats.last_run_at = datetime.now()
+            return stats.model_copy()
+
+    def stats(self) -> RetentionStats:
+        """누적 통계 (현재 작업 수 포함)"""
+        with self._lock:
+            stats = self._stats.model_copy()
+        stats.tasks = self.manager.store.count()
+        return stats
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("작업 정리 실패")
+
+
+def _is_partial(path: Path) -> bool:
+    """중단된 다운로드가 남긴 파일인지 (`.part`, `.part-Frag3` 등)"""
+    return path.suffix in _PARTIAL_SUFFIXES or ".part-Frag" in path.name
+
+
+def _remove_if_older(path: Path, cutoff: float) -> Optional[int]:
+    """수정 시각이 cutoff 이전인 파일 삭제 (삭제했으면 크기, 아니면 None)"""
+    try:
+        stat = path.stat()
+        if not path.is_file() or stat.st_mtime >= cutoff:
+            return None
+        path.unlink()
+    except OSError:
+        return None
+    return stat.st_size if stat.st_nlink <= 1 else 0
+
+
+# 전역 TaskReaper 인스턴스
+task_reaper = TaskReaper(
+    task_manager,
+    ttls={
+        "completed": settings.web.completed_task_ttl,
+        "failed": settings.web.failed_task_ttl,
+        # 서버 재시작 등으로 멈춘 작업
+        "pending": settings.web.stale_task_ttl,
+        "downloading": settings.web.stale_task_ttl,
+        "processing": settings.web.stale_task_ttl,
+    },
+    max_tasks=settings.web.max_tasks,
+    temp_file_ttl=settings.web.temp_file_ttl,
+    interval=settings.web.reaper_interval,
+    is_held=lambda task_id: job_scheduler.holds(task_id) or download_flights.holds(task_id),
+)
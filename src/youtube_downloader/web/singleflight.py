@@ -0,0 +1,108 @@
+"""동일한 다운로드 요청 합치기 (single-flight)"""
+
+import json
+import threading
+from typing import Callable, Dict, List, Optional
+
+from .models import DownloadOptions
+from ..cache import cache_key
+
+
+def flight_key(url: str, options: DownloadOptions) -> str:
+    """
+    요청 식별 키 생성
+
+    같은 동영상이면 URL 형식(watch, youtu.be, shorts 등)이 달라도 같은 키가 되도록
+    정규화하고, 결과 파일에 영향을 주는 옵션만 포함합니다.
+
+    Args:
+        url: 동영상 URL
+        options: 다운로드 옵션
+
+    Returns:
+        요청 키
+    """
+    normalized = {
+        "quality": options.quality.strip().lower(),
+        "audio_only": options.audio_only,
+        # 오디오 비트레이트는 오디오 추출 시에만 결과에 영향
+        "audio_quality": options.audio_quality if options.audio_only else None,
+        "audio_format": options.audio_format if options.audio_only else None,
+        "save_metadata": options.save_metadata,
+        "save_thumbnail": options.save_thumbnail,
+    }
+    video = cache_key(url) or url.strip()
+    return f"{video}|{json.dumps(normalized, sort_keys=True)}"
+
+
+class DownloadFlights:
+    """
+    진행 중인 다운로드 관리자
+
+    키마다 실제 다운로드를 실행하는 첫 작업(leader)과, 같은 결과를 기다리는
+    나머지 작업(subscriber) 목록을 관리합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # key -> 작업 ID 목록 (첫 번째가 leader)
+        self._flights: Dict[str, List[str]] = {}
+
+    def join(
+        self,
+        key: str,
+        task_id: str,
+        on_join: Optional[Callable[[str], None]] = None,
+    ) -> Optional[str]:
+        """
+        다운로드 참여
+
+        Args:
+            key: 요청 키
+            task_id: 작업 ID
+            on_join: 진행 중인 다운로드에 합류할 때 leader 작업 ID로 호출 (lock 안에서 호출되므로
+                `finish()`보다 먼저 끝남, 합류 작업의 상태 복사가 leader의 완료/실패 결과를 덮어쓰지 않음)
+
+        Returns:
+            이미 진행 중이면 leader 작업 ID, 새로 시작해야 하면 None
+        """
+        with self._lock:
+            task_ids = self._flights.get(key)
+            if task_ids is None:
+                self._flights[key] = [task_id]
+                return None
+            task_ids.append(task_id)
+            if on_join is not None:
+                on_join(task_ids[0])
+            return task_ids[0]
+
+    def subscribers(self, key: str) -> List[str]:
+        """현재 참여 중인 모든 작업 ID (leader 포함)"""
+        with self._lock:
+            return list(self._flights.get(key, []))
+
+    def finish(self, key: str) -> List[str]:
+        """
+        다운로드 종료
+
+        이후 같은 키로 들어오는 요청은 새 다운로드를 시작합니다.
+
+        Returns:
+            종료 시점까지 참여한 모든 작업 ID
+        """
+        with self._lock:
+            return self._flights.pop(key, [])
+
+    def holds(self, task_id: str) -> bool:
+        """진행 중인 다운로드에 참여하고 있는 작업인지 여부 (leader 포함)"""
+        with self._lock:
+            return any(task_id in task_ids for task_ids in self._flights.values())
+
+    def in_flight(self) -> int:
+        """진행 중인 다운로드 수"""
+        with self._lock:
+            return len(self._flights)
+
+
+# 전역 DownloadFlights 인스턴스
+download_flights = DownloadFlights()
@@ -0,0 +1,699 @@
+"""다운로드 작업 저장소
+
+`TaskManager`가 쓰는 작업 레코드 저장소입니다. 메모리 저장소는 한 프로세스 안에서만 보이고,
+SQLite 저장소(WAL)는 서버를 재시작해도 남고 여러 uvicorn 워커가 같은 작업을 볼 수 있습니다.
+
+메모리에서는 작업을 `__slots__` 데이터 클래스(`TaskRecord`)로 보관하고, 진행률은 틱마다 새로 만들지 않고
+같은 `TaskProgress`를 고쳐 씁니다. 시각은 `time.monotonic()` 값(초)으로 보관하며, 조회 결과(dict)에서만
+`datetime`으로 바꿉니다.
+
+작업의 `version`은 갱신(진행률 포함)마다 1씩 늘어나므로, 클라이언트가 마지막으로 본 버전과 비교해서
+바뀌었는지 알 수 있습니다 (ETag, long-poll).
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+# JSON으로 저장하는 필드
+_JSON_FIELDS = ("options", "progress", "video_info", "error")
+
+# 시각 필드 (메모리에서는 단조 시계, SQLite에는 유닉스 타임스탬프)
+_TIMESTAMP_FIELDS = ("created_at", "updated_at", "completed_at", "failed_at")
+
+# 단조 시계 -> 유닉스 타임스탬프 변환값 (프로세스 시작 시 한 번 계산)
+_WALL_OFFSET = time.time() - time.monotonic()
+
+_COLUMNS = (
+    "task_id",
+    "user_id",
+    "url",
+    "status",
+    "options",
+    "progress",
+    "video_info",
+    "file_path",
+    "file_size",
+    "partial_path",
+    "archive_digest",
+    "error",
+    "created_at",
+    "updated_at",
+    "completed_at",
+    "failed_at",
+    "accessed_at",
+    "version",
+)
+
+
+def to_datetime(timestamp: Optional[float]) -> Optional[datetime]:
+    """`time.monotonic()` 시각을 datetime으로 변환"""
+    return datetime.fromtimestamp(timestamp + _WALL_OFFSET) if timestamp is not None else None
+
+
+@dataclass(slots=True)
+class TaskProgress:
+    """다운로드 진행률 (진행률 틱마다 제자리에서 갱신)"""
+
+    percentage: int = 0
+    downloaded_bytes: int = 0
+    total_bytes: int = 0
+    speed: Optional[str] = None
+    eta: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "percentage": self.percentage,
+            "downloaded_bytes": self.downloaded_bytes,
+            "total_bytes": self.total_bytes,
+            "speed": self.speed,
+            "eta": self.eta,
+        }
+
+    def set(
+        self,
+        percentage: int,
+        downloaded_bytes: int,
+        total_bytes: int,
+        speed: Optional[str],
+        eta: Optional[str],
+    ) -> None:
+        self.percentage = percentage
+        self.downloaded_bytes = downloaded_bytes
+        self.total_bytes = total_bytes
+        self.speed = speed
+        self.eta = eta
+
+
+def _as_progress(value: Any) -> Optional[TaskProgress]:
+    """dict/TaskProgress를 새 TaskProgress로 (저장소 밖 객체와 공유하지 않도록 복사)"""
+    if value is None:
+        return None
+    if isinstance(value, TaskProgress):
+        return TaskProgress(*(getattr(value, name) for name in TaskProgress.__slots__))
+    return TaskProgress(**value)
+
+
+@dataclass(slots=True)
+class TaskRecord:
+    """다운로드 작업 레코드 (시각은 `time.monotonic()` 값)"""
+
+    task_id: str
+    url: str
+    options: Dict[str, Any]
+    user_id: Optional[str] = None
+    status: str = "pending"
+    progress: Optional[TaskProgress] = None
+    video_info: Optional[Dict[str, Any]] = None
+    file_path: Optional[str] = None
+    file_size: Optional[int] = None
+    partial_path: Optional[str] = None
+    archive_digest: Optional[str] = None
+    error: Optional[Dict[str, Any]] = None
+    created_at: float = field(default_factory=lambda: time.monotonic())
+    updated_at: Optional[float] = None
+    completed_at: Optional[float] = None
+    failed_at: Optional[float] = None
+    version: int = 0
+
+    def __post_init__(self) -> None:
+        if self.updated_at is None:
+            self.updated_at = self.created_at
+
+    def fields(self) -> Dict[str, Any]:
+        """필드 이름 -> 값 (복사하지 않음)"""
+        return {name: getattr(self, name) for name in _RECORD_FIELDS}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """API에서 쓰는 작업 dict (시각은 datetime)"""
+        task = self.fields()
+        task["options"] = dict(self.options)
+        task["progress"] = self.progress.to_dict() if self.progress is not None else None
+        for name in _TIMESTAMP_FIELDS:
+            task[name] = to_datetime(task[name])
+        return task
+
+
+_RECORD_FIELDS = TaskRecord.__slots__
+
+
+class TaskStore(ABC):
+    """작업 저장소 인터페이스"""
+
+    @abstractmethod
+    def insert(self, record: TaskRecord) -> None:
+        """작업 추가"""
+
+    @abstractmethod
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """작업 조회 (없으면 None, 반환값을 수정해도 저장소에는 영향 없음)"""
+
+    @abstractmethod
+    def get_many(self, task_ids: Sequence[str]) -> List[Dict[str, Any]]:
+        """여러 작업 한 번에 조회 (없거나 중복된 작업은 빠짐, 순서는 task_ids와 같음)"""
+
+    @abstractmethod
+    def update(self, task_id: str, fields: Dict[str, Any]) -> bool:
+        """
+        필드 갱신
+
+        Args:
+            task_id: 작업 ID
+            fields: 필드 이름 -> 값 (시각은 `time.monotonic()` 값, progress는 dict도 가능)
+
+        Returns:
+            작업이 있었는지 여부
+        """
+
+    @abstractmethod
+    def update_progress(
+        self,
+        task_id: str,
+        percentage: int,
+        downloaded_bytes: int,
+        total_bytes: int,
+        speed: Optional[str] = None,
+        eta: Optional[str] = None,
+    ) -> None:
+        """진행률 갱신 (자주 호출되므로 저장소가 모아서 기록할 수 있음)"""
+
+    @abstractmethod
+    def delete(self, task_id: str) -> bool:
+        """작업 삭제"""
+
+    @abstractmethod
+    def list(
+        self,
+        status: Optional[str] = None,
+        user_id: Optional[str] = None,
+        limit: int = 100,
+        statuses: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """조건에 맞는 작업 목록 (최근 생성 순, statuses는 그중 하나인 상태)"""
+
+    @abstractmethod
+    def count(self) -> int:
+        """저장된 작업 수"""
+
+    @abstractmethod
+    def file_references(self, file_path: str) -> int:
+        """결과 파일이 file_path인 작업 수 (single-flight로 합류한 작업은 같은 파일을 공유)"""
+
+    @abstractmethod
+    def expired(self, status: str, before: float, limit: int = 500) -> List[Dict[str, Any]]:
+        """status 상태로 before(`time.monotonic()` 값) 이전부터 갱신이 없는 작업 목록"""
+
+    @abstractmethod
+    def least_recently_used(self, statuses: Sequence[str], limit: int) -> List[Dict[str, Any]]:
+        """statuses 상태의 작업 중 가장 오래 조회되지 않은 작업 목록"""
+
+    def flush(self) -> None:
+        """모아 둔 진행률 기록"""
+
+    def close(self) -> None:
+        """저장소 닫기"""
+
+
+class MemoryTaskStore(TaskStore):
+    """프로세스 메모리 저장소"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # 조회할 때마다 맨 뒤로 옮기므로 앞쪽이 가장 오래 조회되지 않은 작업
+        self._tasks: OrderedDict[str, TaskRecord] = OrderedDict()
+        # 결과 파일 경로 -> 그 파일을 쓰는 작업 수 (정리 작업이 삭제마다 전체를 훑지 않도록)
+        self._file_refs: Dict[str, int] = {}
+        # user_id -> 그 사용자의 작업 (사용자별 목록이 전체를 훑지 않도록)
+        self._user_tasks: Dict[str, Dict[str, TaskRecord]] = {}
+
+    def insert(self, record: TaskRecord) -> None:
+        with self._lock:
+            previous = self._tasks.get(record.task_id)
+            if previous is not None:
+                self._count_file(previous.file_path, -1)
+                self._index_user(previous, previous.user_id, None)
+            self._tasks[record.task_id] = record
+            self._count_file(record.file_path, 1)
+            self._index_user(record, None, record.user_id)
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            record = self._tasks.get(task_id)
+            if record is None:
+                return None
+            self._tasks.move_to_end(task_id)
+            return record.to_dict()
+
+    def get_many(self, task_ids: Sequence[str]) -> List[Dict[str, Any]]:
+        tasks = []
+        with self._lock:
+            for task_id in dict.fromkeys(task_ids):
+                record = self._tasks.get(task_id)
+                if record is not None:
+                    self._tasks.move_to_end(task_id)
+                    tasks.append(record.to_dict())
+        return tasks
+
+    def update(self, task_id: str, fields: Dict[str, Any]) -> bool:
+        with self._lock:
+            record = self._tasks.get(task_id)
+            if record is None:
+                return False
+            file_path, user_id = record.file_path, record.user_id
+            for name, value in fields.items():
+                setattr(record, name, _as_progress(value) if name == "progress" else value)
+            if record.file_path != file_path:
+                self._count_file(file_path, -1)
+                self._count_file(record.file_path, 1)
+            if record.user_id != user_id:
+                self._index_user(record, user_id, record.user_id)
+            record.version += 1
+            return True
+
+    def update_progress(
+        self,
+        task_id: str,
+        percentage: int,
+        downloaded_bytes: int,
+        total_bytes: int,
+        speed: Optional[str] = None,
+        eta: Optional[str] = None,
+    ) -> None:
+        now = time.monotonic()
+        with self._lock:
+            record = self._tasks.get(task_id)
+            if record is None:
+                return
+            if record.progress is None:
+                record.progress = TaskProgress()
+            record.progress.set(percentage, downloaded_bytes, total_bytes, speed, eta)
+            record.updated_at = now
+            record.version += 1
+
+    def delete(self, task_id: str) -> bool:
+        with self._lock:
+            record = self._tasks.pop(task_id, None)
+            if record is None:
+                return False
+            self._count_file(record.file_path, -1)
+            self._index_user(record, record.user_id, None)
+            return True
+
+    def list(
+        self,
+        status: Optional[str] = None,
+        user_id: Optional[str] = None,
+        limit: int = 100,
+        statuses: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        with self._lock:
+            candidates = (
+                self._user_tasks.get(user_id, {}) if user_id is not None else self._tasks
+            ).values()
+            records = [
+                record
+                for record in candidates
+                if (status is None or record.status == status)
+                and (statuses is None or record.status in statuses)
+            ]
+            records.sort(key=lambda record: record.created_at, reverse=True)
+            return [record.to_dict() for record in records[:limit]]
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._tasks)
+
+    def file_references(self, file_path: str) -> int:
+        with self._lock:
+            return self._file_refs.get(file_path, 0)
+
+    def expired(self, status: str, before: float, limit: int = 500) -> List[Dict[str, Any]]:
+        tasks: List[Dict[str, Any]] = []
+        with self._lock:
+            for record in self._tasks.values():
+                if len(tasks) >= limit:
+                    break
+                updated_at = record.updated_at if record.updated_at is not None else record.created_at
+                if record.status == status and updated_at < before:
+                    tasks.append(record.to_dict())
+        return tasks
+
+    def least_recently_used(self, statuses: Sequence[str], limit: int) -> List[Dict[str, Any]]:
+        tasks: List[Dict[str, Any]] = []
+        with self._lock:
+            for record in self._tasks.values():
+                if len(tasks) >= limit:
+                    break
+                if record.status in statuses:
+                    tasks.append(record.to_dict())
+        return tasks
+
+    def _index_user(
+        self, record: TaskRecord, previous: Optional[str], current: Optional[str]
+    ) -> None:
+        """사용자별 작업 목록에서 record를 previous에서 current로 옮김 (lock 보유 상태에서 호출)"""
+        if previous is not None:
+            tasks = self._user_tasks.get(previous)
+            if tasks is not None:
+                tasks.pop(record.task_id, None)
+                if not tasks:
+                    del self._user_tasks[previous]
+        if current is not None:
+            self._user_tasks.setdefault(current, {})[record.task_id] = record
+
+    def _count_file(self, file_path: Optional[str], delta: int) -> None:
+        """결과 파일 참조 수 갱신 (lock 보유 상태에서 호출)"""
+        if file_path is None:
+            return
+        count = self._file_refs.get(file_path, 0) + delta
+        if count > 0:
+            self._file_refs[file_path] = count
+        else:
+            self._file_refs.pop(file_path, None)
+
+
+class SQLiteTaskStore(TaskStore):
+    """
+    SQLite 저장소 (WAL)
+
+    진행률은 메모리에 모았다가 `flush_interval`마다 한 트랜잭션으로 기록하므로 진행률 틱마다
+    디스크에 쓰지 않습니다. 같은 프로세스의 조회는 모아 둔 값을 바로 반영하고, 다른 워커는
+    최대 `flush_interval`만큼 늦게 봅니다. 상태 변경 등 다른 갱신은 바로 기록합니다.
+    """
+
+    def __init__(self, path: Path, flush_interval: float = 1.0):
+        """
+        저장소 초기화
+
+        Args:
+            path: SQLite 파일 경로
+            flush_interval: 진행률을 모아서 기록하는 간격 (초)
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+
+        self._lock = threading.Lock()
+        # task_id -> 아직 기록하지 않은 진행률, 갱신 시각, 갱신 횟수 (version 증가분)
+        self._pending: Dict[str, TaskProgress] = {}
+        self._pending_at: Dict[str, float] = {}
+        self._pending_ticks: Dict[str, int] = {}
+        # task_id -> 아직 기록하지 않은 마지막 조회 시각 (LRU용, 조회마다 쓰지 않도록 모아서 기록)
+        self._accessed: Dict[str, float] = {}
+        self._last_flush = time.monotonic()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 다른 워커가 쓰는 중이면 잠깐 기다림
+        self._conn = sqlite3.connect(str(path), timeout=10, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL에서는 체크포인트 때만 fsync (전원 장애 시 마지막 커밋 몇 개만 잃을 수 있음)
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS tasks (
+                task_id TEXT PRIMARY KEY,
+                user_id TEXT,
+                url TEXT NOT NULL,
+                status TEXT NOT NULL,
+                options TEXT,
+                progress TEXT,
+                video_info TEXT,
+                file_path TEXT,
+                file_size INTEGER,
+                partial_path TEXT,
+                archive_digest TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                completed_at REAL,
+                failed_at REAL,
+                accessed_at REAL,
+                version INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS ix_tasks_status_created_at
+                ON tasks (status, created_at);
+            CREATE INDEX IF NOT EXISTS ix_tasks_created_at
+                ON tasks (created_at);
+            CREATE INDEX IF NOT EXISTS ix_tasks_user_id_created_at
+                ON tasks (user_id, created_at);
+            """
+        )
+        # accessed_at/version/file_size/partial_path가 없던 이전 파일
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(tasks)")}
+        if "accessed_at" not in columns:
+            self._conn.execute("ALTER TABLE tasks ADD COLUMN accessed_at REAL")
+        if "version" not in columns:
+            self._conn.execute("ALTER TABLE tasks ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+        if "file_size" not in columns:
+            self._conn.execute("ALTER TABLE tasks ADD COLUMN file_size INTEGER")
+        if "partial_path" not in columns:
+            self._conn.execute("ALTER TABLE tasks ADD COLUMN partial_path TEXT")
+        self._conn.executescript(
+            """
+            CREATE INDEX IF NOT EXISTS ix_tasks_status_updated_at
+                ON tasks (status, updated_at);
+            CREATE INDEX IF NOT EXISTS ix_tasks_status_accessed_at
+                ON tasks (status, accessed_at);
+            CREATE INDEX IF NOT EXISTS ix_tasks_file_path
+                ON tasks (file_path);
+            """
+        )
+        self._conn.commit()
+
+    def insert(self, record: TaskRecord) -> None:
+        row = _to_row(record.fields())
+        row["accessed_at"] = row["created_at"]
+        columns = [column for column in _COLUMNS if column in row]
+        with self._lock:
+            self._conn.execute(
+                f"INSERT INTO tasks ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' for _ in columns)})",
+                [row[column] for column in columns],
+            )
+            self._conn.commit()
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM tasks WHERE task_id = ?", (task_id,)
+            ).fetchone()
+            pending = self._pending_state(task_id)
+            if row is not None:
+                self._accessed[task_id] = time.time()
+            self._maybe_flush()
+        if row is None:
+            return None
+        return _from_row(row, pending)
+
+    def get_many(self, task_ids: Sequence[str]) -> List[Dict[str, Any]]:
+        if not task_ids:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM tasks WHERE task_id IN ({', '.join('?' for _ in task_ids)})",
+                list(task_ids),
+            ).fetchall()
+            now = time.time()
+            found = {}
+            for row in rows:
+                self._accessed[row["task_id"]] = now
+                found[row["task_id"]] = (row, self._pending_state(row["task_id"]))
+            self._maybe_flush()
+        return [_from_row(*found[task_id]) for task_id in dict.fromkeys(task_ids) if task_id in found]
+
+    def update(self, task_id: str, fields: Dict[str, Any]) -> bool:
+        with self._lock:
+            # 모아 둔 진행률이 나중 값을 덮어쓰지 않도록 먼저 반영
+            pending = self._pending.pop(task_id, None)
+            self._pending_at.pop(task_id, None)
+            ticks = self._pending_ticks.pop(task_id, 0)
+            if pending is not None and "progress" not in fields:
+                fields = {"progress": pending, **fields}
+            row = _to_row(fields)
+            cursor = self._conn.execute(
+                f"UPDATE tasks SET {', '.join(f'{column} = ?' for column in row)}, "
+                "version = version + ? WHERE task_id = ?",
+                [*row.values(), ticks + 1, task_id],
+            )
+            self._conn.commit()
+            self._maybe_flush()
+            return cursor.rowcount > 0
+
+    def update_progress(
+        self,
+        task_id: str,
+        percentage: int,
+        downloaded_bytes: int,
+        total_bytes: int,
+        speed: Optional[str] = None,
+        eta: Optional[str] = None,
+    ) -> None:
+        now = time.monotonic()
+        with self._lock:
+            progress = self._pending.get(task_id)
+            if progress is None:
+                progress = self._pending[task_id] = TaskProgress()
+            progress.set(percentage, downloaded_bytes, total_bytes, speed, eta)
+            self._pending_at[task_id] = now
+            self._pending_ticks[task_id] = self._pending_ticks.get(task_id, 0) + 1
+            self._maybe_flush()
+
+    def delete(self, task_id: str) -> bool:
+        with self._lock:
+            self._pending.pop(task_id, None)
+            self._pending_at.pop(task_id, None)
+            self._pending_ticks.pop(task_id, None)
+            self._accessed.pop(task_id, None)
+            cursor = self._conn.execute("DELETE FROM tasks WHERE task_id = ?", (task_id,))
+            self._conn.commit()
+            return cursor.rowcount > 0
+
+    def list(
+        self,
+        status: Optional[str] = None,
+        user_id: Optional[str] = None,
+        limit: int = 100,
+        statuses: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        conditions: List[str] = []
+        params: List[Any] = []
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status)
+        if statuses is not None:
+            conditions.append(f"status IN ({', '.join('?' for _ in statuses) or 'NULL'})")
+            params.extend(statuses)
+        if user_id is not None:
+            conditions.append("user_id = ?")
+            params.append(user_id)
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM tasks {where}ORDER BY created_at DESC LIMIT ?",
+                [*params, limit],
+            ).fetchall()
+            pending = {row["task_id"]: self._pending_state(row["task_id"]) for row in rows}
+
+        return [_from_row(row, pending[row["task_id"]]) for row in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0])
+
+    def file_references(self, file_path: str) -> int:
+        with self._lock:
+            return int(self._conn.execute(
+                "SELECT COUNT(*) FROM tasks WHERE file_path = ?", (file_path,)
+            ).fetchone()[0])
+
+    def expired(self, status: str, before: float, limit: int = 500) -> List[Dict[str, Any]]:
+        with self._lock:
+            # 아직 기록하지 않은 진행률이 있으면 최근에 갱신된 작업
+            self._flush()
+            rows = self._conn.execute(
+                "SELECT * FROM tasks WHERE status = ? AND updated_at < ? LIMIT ?",
+                (status, before + _WALL_OFFSET, limit),
+            ).fetchall()
+        return [_from_row(row) for row in rows]
+
+    def least_recently_used(self, statuses: Sequence[str], limit: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            self._flush()
+            rows = self._conn.execute(
+                f"SELECT * FROM tasks WHERE status IN ({', '.join('?' for _ in statuses)}) "
+                "ORDER BY accessed_at LIMIT ?",
+                [*statuses, limit],
+            ).fetchall()
+        return [_from_row(row) for row in rows]
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush()
+            self._conn.close()
+
+    def _pending_state(self, task_id: str) -> Optional[tuple[Dict[str, Any], float, int]]:
+        """아직 기록하지 않은 (진행률 dict, 갱신 시각, 갱신 횟수) (lock 보유 상태에서 호출)"""
+        progress = self._pending.get(task_id)
+        if progress is None:
+            return None
+        return progress.to_dict(), self._pending_at[task_id], self._pending_ticks[task_id]
+
+    def _maybe_flush(self) -> None:
+        """간격이 지났으면 모아 둔 진행률 기록 (lock 보유 상태에서 호출)"""
+        if (self._pending or self._accessed) and time.monotonic() - self._last_flush >= self.flush_interval:
+            self._flush()
+
+    def _flush(self) -> None:
+        """모아 둔 진행률/조회 시각을 한 트랜잭션으로 기록 (lock 보유 상태에서 호출)"""
+        self._last_flush = time.monotonic()
+        if not self._pending and not self._accessed:
+            return
+        self._conn.executemany(
+            "UPDATE tasks SET progress = ?, updated_at = ?, version = version + ? WHERE task_id = ?",
+            [
+                (
+                    json.dumps(progress.to_dict()),
+                    self._pending_at[task_id] + _WALL_OFFSET,
+                    self._pending_ticks[task_id],
+                    task_id,
+                )
+                for task_id, progress in self._pending.items()
+            ],
+        )
+        self._conn.executemany(
+            "UPDATE tasks SET accessed_at = ? WHERE task_id = ?",
+            [(accessed_at, task_id) for task_id, accessed_at in self._accessed.items()],
+        )
+        self._conn.commit()
+        self._pending.clear()
+        self._pending_at.clear()
+        self._pending_ticks.clear()
+        self._accessed.clear()
+
+
+def _to_row(fields: Dict[str, Any]) -> Dict[str, Any]:
+    """작업 필드를 SQLite 값으로 변환"""
+    row = {}
+    for name, value in fields.items():
+        if name not in _COLUMNS:
+            raise KeyError(f"알 수 없는 작업 필드: {name}")
+        if name == "progress":
+            progress = _as_progress(value)
+            value = json.dumps(progress.to_dict()) if progress is not None else None
+        elif value is not None and name in _JSON_FIELDS:
+            value = json.dumps(value)
+        elif value is not None and name in _TIMESTAMP_FIELDS:
+            value = value + _WALL_OFFSET
+        row[name] = value
+    return row
+
+
+def _from_row(
+    row: sqlite3.Row,
+    pending: Optional[tuple[Dict[str, Any], float, int]] = None,
+) -> Dict[str, Any]:
+    """SQLite 행을 작업 dict로 변환 (아직 기록하지 않은 진행률이 있으면 반영)"""
+    task = dict(row)
+    # LRU 관리용 내부 필드
+    task.pop("accessed_at", None)
+    for name in _JSON_FIELDS:
+        if task[name] is not None:
+            task[name] = json.loads(task[name])
+    for name in _TIMESTAMP_FIELDS:
+        if task[name] is not None:
+            task[name] = datetime.fromtimestamp(task[name])
+    if pending is not None:
+        task["progress"], task["updated_at"] = pending[0], to_datetime(pending[1])
+        task["version"] += pending[2]
+    return task
@@ -1,55 +1,57 @@
 """작업 관리 시스템"""
 
+import atexit
+import time
 import uuid
-from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Sequence
 from pathlib import Path
 
 from .models import DownloadStatusData, DownloadProgress, VideoInfo
+from .task_store import MemoryTaskStore, SQLiteTaskStore, TaskRecord, TaskStore
+from ..archive import get_download_archive
+from ..config import settings
+
+
+# 진행 중인 작업 상태 (대기 포함)
+ACTIVE_STATUSES = ("pending", "downloading", "processing")
 
 
 class TaskManager:
     """다운로드 작업 관리자"""
     
-    def __init__(self):
-        # 작업 저장소 (in-memory)
-        self.tasks: Dict[str, Dict] = {}
+    def __init__(self, store: Optional[TaskStore] = None, output_dir: Path = Path("./downloads")):
+        """
+        작업 관리자 초기화
+        
+        Args:
+            store: 작업 저장소 (None이면 메모리 저장소)
+            output_dir: 완료된 파일 저장 경로 (임시 파일은 그 아래 `temp`)
+        """
+        self.store = store or MemoryTaskStore()
         
         # 임시 파일 저장 경로
-        self.temp_dir = Path("./downloads/temp")
+        self.temp_dir = output_dir / "temp"
         self.temp_dir.mkdir(parents=True, exist_ok=True)
         
         # 완료된 파일 저장 경로
-        self.output_dir = Path("./downloads")
+        self.output_dir = output_dir
         self.output_dir.mkdir(parents=True, exist_ok=True)
     
-    def create_task(self, url: str, options: dict) -> str:
+    def create_task(self, url: str, options: dict, user_id: Optional[str] = None) -> str:
         """
         새로운 다운로드 작업 생성
         
         Args:
             url: 유튜브 URL
             options: 다운로드 옵션
+            user_id: 요청한 사용자 ID
             
         Returns:
             task_id: 생성된 작업 ID
         """
         task_id = str(uuid.uuid4())
         
-        self.tasks[task_id] = {
-            "task_id": task_id,
-            "url": url,
-            "options": options,
-            "status": "pending",
-            "progress": None,
-            "video_info": None,
-            "file_path": None,
-            "created_at": datetime.now(),
-            "updated_at": datetime.now(),
-            "completed_at": None,
-            "failed_at": None,
-            "error": None,
-        }
+        self.store.insert(TaskRecord(task_id=task_id, url=url, options=options, user_id=user_id))
         
         return task_id
     
@@ -63,13 +65,58 @@ class TaskManager:
         Returns:
             작업 정보 또는 None
         """
-        return self.tasks.get(task_id)
+        return self.store.get(task_id)
+    
+    def get_tasks(self, task_ids: List[str]) -> List[Dict]:
+        """
+        여러 작업 정보 한 번에 조회
+        
+        Args:
+            task_ids: 작업 ID 목록
+            
+        Returns:
+            있는 작업 정보 목록 (task_ids 순서)
+        """
+        return self.store.get_many(task_ids)
+    
+    def list_tasks(
+        self,
+        status: Optional[str] = None,
+        user_id: Optional[str] = None,
+        limit: int = 100,
+        statuses: Optional[Sequence[str]] = None,
+    ) -> List[Dict]:
+        """
+        작업 목록 조회 (최근 생성 순)
+        
+        Args:
+            status: 상태 필터
+            user_id: 사용자 필터
+            limit: 최대 개수
+            statuses: 상태 필터 (그중 하나인 작업)
+        """
+        return self.store.list(status=status, user_id=user_id, limit=limit, statuses=statuses)
+    
+    def copy_task_state(self, source_id: str, target_id: str):
+        """
+        진행 상태 복사
+        
+        이미 진행 중인 다운로드에 합류한 작업이 지금까지의 상태/진행률을 바로 볼 수 있도록 합니다.
+        """
+        source = self.store.get(source_id)
+        # 완료/실패 결과는 leader가 합류한 모든 작업에 직접 전달
+        if source is None or source["status"] in ("completed", "failed"):
+            return
+        self.store.update(target_id, {
+            "status": source["status"],
+            "progress": source["progress"],
+            "video_info": source["video_info"],
+            "updated_at": time.monotonic(),
+        })
     
     def update_task_status(self, task_id: str, status: str):
         """작업 상태 업데이트"""
-        if task_id in self.tasks:
-            self.tasks[task_id]["status"] = status
-            self.tasks[task_id]["updated_at"] = datetime.now()
+        self.store.update(task_id, {"status": status, "updated_at": time.monotonic()})
     
     def update_task_progress(
         self,
@@ -80,56 +127,88 @@ class TaskManager:
         speed: Optional[str] = None,
         eta: Optional[str] = None,
     ):
-        """진행률 업데이트"""
-        if task_id in self.tasks:
-            self.tasks[task_id]["progress"] = {
-                "percentage": percentage,
-                "downloaded_bytes": downloaded_bytes,
-                "total_bytes": total_bytes,
-                "speed": speed,
-                "eta": eta,
-            }
-            self.tasks[task_id]["updated_at"] = datetime.now()
+        """진행률 업데이트 (저장소가 모아서 기록할 수 있음)"""
+        self.store.update_progress(task_id, percentage, downloaded_bytes, total_bytes, speed, eta)
     
     def set_task_video_info(self, task_id: str, video_info: dict):
         """동영상 정보 설정"""
-        if task_id in self.tasks:
-            self.tasks[task_id]["video_info"] = video_info
-            self.tasks[task_id]["updated_at"] = datetime.now()
+        self.store.update(task_id, {"video_info": video_info, "updated_at": time.monotonic()})
     
     def set_task_file_path(self, task_id: str, file_path: Path):
-        """파일 경로 설정"""
-        if task_id in self.tasks:
-            self.tasks[task_id]["file_path"] = str(file_path)
-            self.tasks[task_id]["updated_at"] = datetime.now()
+        """파일 경로와 크기 설정 (상태 조회마다 stat하지 않도록 크기를 함께 저장)"""
+        try:
+            size = Path(file_path).stat().st_size
+        except OSError:
+            size = None
+        self.store.update(
+            task_id, {"file_path": str(file_path), "file_size": size, "updated_at": time.monotonic()}
+        )
+    
+    def set_task_partial_path(self, task_id: str, partial_path: Path):
+        """다운로드 중인 파일 경로 설정 (완료 전 스트리밍용)"""
+        self.store.update(task_id, {"partial_path": str(partial_path), "updated_at": time.monotonic()})
+    
+    def set_task_archive_digest(self, task_id: str, digest: str):
+        """아카이브 파일 해시 설정 (파일 참조 관리용)"""
+        self.store.update(task_id, {"archive_digest": digest, "updated_at": time.monotonic()})
     
     def complete_task(self, task_id: str):
         """작업 완료 처리"""
-        if task_id in self.tasks:
-            self.tasks[task_id]["status"] = "completed"
-            self.tasks[task_id]["completed_at"] = datetime.now()
-            self.tasks[task_id]["updated_at"] = datetime.now()
+        now = time.monotonic()
+        self.store.update(task_id, {"status": "completed", "completed_at": now, "updated_at": now})
     
     def fail_task(self, task_id: str, error: dict):
         """작업 실패 처리"""
-        if task_id in self.tasks:
-            self.tasks[task_id]["status"] = "failed"
-            self.tasks[task_id]["error"] = error
-            self.tasks[task_id]["failed_at"] = datetime.now()
-            self.tasks[task_id]["updated_at"] = datetime.now()
-    
-    def delete_task(self, task_id: str):
-        """작업 삭제"""
-        if task_id in self.tasks:
-            # 파일도 함께 삭제
-            file_path = self.tasks[task_id].get("file_path")
-            if file_path:
-                try:
-                    Path(file_path).unlink(missing_ok=True)
-                except Exception:
-                    pass
+        now = time.monotonic()
+        self.store.update(
+            task_id, {"status": "failed", "error": error, "failed_at": now, "updated_at": now}
+        )
+    
+    def delete_task(self, task_id: str) -> int:
+        """
+        작업 삭제
+        
+        Args:
+            task_id: 작업 ID
             
-            del self.tasks[task_id]
+        Returns:
+            파일을 지워서 확보한 디스크 용량 (바이트)
+        """
+        task = self.store.get(task_id)
+        if task is None:
+            return 0
+        
+        # 다른 작업이 같은 아카이브 파일을 쓰고 있으면 파일은 남겨 둠
+        remaining = 0
+        digest = task.get("archive_digest")
+        archive = get_download_archive()
+        if digest and archive is not None:
+            remaining = archive.release(digest, task_id)
+        
+        # 작업을 먼저 지우고, single-flight로 같은 파일을 받은 작업이 남아 있으면 파일은 남겨 둠
+        self.store.delete(task_id)
+        file_path = task.get("file_path")
+        if file_path:
+            remaining += self.store.file_references(file_path)
+        
+        # 파일도 함께 삭제
+        reclaimed = 0
+        if file_path and remaining == 0:
+            try:
+                path = Path(file_path)
+                stat = path.stat()
+                path.unlink()
+                # 아카이브 객체 등 다른 하드 링크가 남아 있으면 용량은 그대로
+                if stat.st_nlink <= 1:
+                    reclaimed = stat.st_size
+            except Exception:
+                pass
+        
+        # 결과 파일은 아카이브 객체의 하드 링크이므로 객체까지 지워야 용량이 확보됨
+        if digest and archive is not None and remaining == 0:
+            reclaimed += archive.forget(digest)
+        
+        return reclaimed
     
     def get_temp_file_path(self, task_id: str, filename: str) -> Path:
         """임시 파일 경로 생성"""
@@ -140,5 +219,15 @@ class TaskManager:
         return self.output_dir / filename
 
 
+def create_task_store() -> TaskStore:
+    """설정에 따른 작업 저장소 생성"""
+    if settings.web.task_store == "sqlite":
+        store = SQLiteTaskStore(settings.web.task_db_path, settings.web.progress_flush_interval)
+        # 프로세스 종료 시 남은 진행률 기록
+        atexit.register(store.close)
+        return store
+    return MemoryTaskStore()
+
+
 # 전역 TaskManager 인스턴스
-task_manager = TaskManager()
+task_manager = TaskManager(create_task_store())
@@ -0,0 +1,143 @@
+"""다운로드 중인 파일 스트리밍 (tee)
+
+변환/병합 없이 받은 그대로 최종 파일이 되는 다운로드는 `.part` 파일을 받은 만큼 클라이언트에 보냅니다.
+yt-dlp는 완료 시 `.part`를 최종 이름으로 바꾸기만 하므로 열어 둔 파일을 끝까지 읽으면 최종 파일과 같습니다.
+새 데이터는 작업 이벤트(진행률/완료)를 기다려서 읽고, 다른 워커가 받는 작업은 1초마다 확인합니다.
+"""
+
+import os
+from pathlib import Path
+from typing import Any, AsyncIterator, BinaryIO, Dict, Optional
+
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from .files import content_disposition, media_type
+from .tasks import ACTIVE_STATUSES, task_manager
+from .websocket import manager as ws_manager
+
+# 받은 순서대로 한 파일에 쓰는 프로토콜 (HLS/DASH 조각 다운로드는 완료 후 fixup으로 파일이 바뀔 수 있음)
+STREAMABLE_PROTOCOLS = ("http", "https")
+
+# 완료 후 FixupM4a로 다시 쓰는 컨테이너
+_FIXUP_CONTAINERS = ("m4a_dash",)
+
+_CHUNK_SIZE = 1024 * 1024
+
+# 이벤트가 없을 때 작업/파일을 다시 확인하는 간격 (초)
+_RECHECK_INTERVAL = 1.0
+
+
+class TeeAborted(Exception):
+    """스트리밍 중 다운로드가 실패했거나 최종 파일이 보낸 내용과 달라짐"""
+
+
+def stream_source(d: Dict[str, Any]) -> Optional[Path]:
+    """
+    진행률 훅 값에서 그대로 스트리밍할 수 있는 다운로드 중 파일 경로
+
+    병합 전 개별 포맷(`<이름>.f<format_id>.<ext>`), 조각 다운로드, 구간 다운로드(순서 없이 씀)는 제외합니다.
+    process 모드에서는 info_dict 대신 필요한 키만 펼쳐서 전달됩니다.
+
+    Args:
+        d: yt-dlp 진행률 훅 값
+
+    Returns:
+        `.part` 파일 경로 (스트리밍할 수 없으면 None)
+    """
+    tmpfilename = d.get("tmpfilename")
+    filename = d.get("filename")
+    if not tmpfilename or not filename:
+        return None
+
+    info = d.get("info_dict") or d
+    if info.get("protocol") not in STREAMABLE_PROTOCOLS or info.get("container") in _FIXUP_CONTAINERS:
+        return None
+
+    format_id = info.get("format_id")
+    if format_id and Path(filename).stem.endswith(f".f{format_id}"):
+        return None
+
+    if Path(f"{tmpfilename}.segments").exists():
+        return None
+
+    return Path(tmpfilename)
+
+
+def open_partial(task: Dict[str, Any]) -> Optional[BinaryIO]:
+    """
+    작업의 다운로드 중 파일 열기
+
+    Returns:
+        열린 파일 (스트리밍할 수 없거나 이미 최종 이름으로 바뀌었으면 None)
+    """
+    partial_path = task.get("partial_path")
+    if task["status"] not in ACTIVE_STATUSES or not partial_path:
+        return None
+    try:
+        return open(partial_path, "rb")
+    except FileNotFoundError:
+        return None
+
+
+def tee_response(task_id: str, file: BinaryIO) -> StreamingResponse:
+    """
+    다운로드 중 파일 스트리밍 응답
+
+    길이를 미리 알 수 없으므로 chunked로 보내고 Range는 지원하지 않습니다.
+    """
+    filename = Path(file.name).name.removesuffix(".part")
+    return StreamingResponse(
+        tee(task_id, file),
+        media_type=media_type(filename),
+        headers={
+            "Content-Disposition": content_disposition(filename),
+            "Cache-Control": "no-store",
+            "Accept-Ranges": "none",
+        },
+    )
+
+
+async def tee(task_id: str, file: BinaryIO, chunk_size: int = _CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """
+    다운로드 중인 파일을 받은 만큼 보내고, 작업이 완료되면 남은 부분을 보내고 끝냄
+
+    Args:
+        task_id: 작업 ID
+        file: 열린 `.part` 파일
+        chunk_size: 한 번에 읽는 크기
+
+    Raises:
+        TeeAborted: 다운로드가 실패했거나 후처리로 최종 파일이 바뀜 (연결을 끊어 클라이언트가 불완전한 파일임을 알게 함)
+    """
+    opened = os.fstat(file.fileno())
+    try:
+        while True:
+            chunk = await run_in_threadpool(file.read, chunk_size)
+            if chunk:
+                yield chunk
+                continue
+
+            task = task_manager.get_task(task_id)
+            status = task["status"] if task else None
+            if status == "completed":
+                assert task is not None
+                break
+            if status not in ACTIVE_STATUSES:
+                raise TeeAborted(f"다운로드가 끝나지 않았습니다: {task_id} ({status})")
+            await ws_manager.wait(task_id, _RECHECK_INTERVAL)
+
+        # 최종 파일이 지금까지 읽은 파일(같은 inode)인지 확인
+        try:
+            final = os.stat(task["file_path"]) if task.get("file_path") else None
+        except FileNotFoundError:
+            final = None
+        if final is None or (final.st_dev, final.st_ino) != (opened.st_dev, opened.st_ino):
+            raise TeeAborted(f"최종 파일이 스트리밍한 파일과 다릅니다: {task_id}")
+
+        while chunk := await run_in_threadpool(file.read, chunk_size):
+            yield chunk
+        if file.tell() != final.st_size:
+            raise TeeAborted(f"최종 파일 크기가 다릅니다: {task_id}")
+    finally:
+        file.close()
@@ -1,104 +1,454 @@
-"""WebSocket 연결 관리"""
+"""WebSocket 연결 관리
+
+작업마다 여러 연결(브라우저 탭 등)이 구독할 수 있는 pub/sub 허브입니다.
+
+- 작업별로 최근 이벤트를 링 버퍼에 남겨 두고, 새 연결에 먼저 보내 줍니다. 다운로드가 시작된 뒤
+  (또는 끝난 뒤) 연결해도 현재 상태와 완료/에러 메시지를 받을 수 있습니다.
+- 연결마다 크기가 정해진 전송 큐와 전송 태스크가 있어서, 느린 연결이 다른 연결이나 발행 쪽을
+  막지 않습니다. 큐가 차면 아직 보내지 않은 진행률 이벤트부터 버리고, 그래도 자리가 없으면
+  따라오지 못하는 연결로 보고 끊습니다.
+- 사용자 연결(`/ws/tasks`) 하나로 여러 작업을 구독할 수 있습니다. 이 연결은 모인 이벤트를
+  프레임 하나(`batch`)로 묶어 보내고, msgpack 바이너리 인코딩을 선택할 수 있습니다.
+- WebSocket을 쓸 수 없는 클라이언트를 위해 같은 이벤트를 Server-Sent Events(`EventStream`)로도
+  보내고, 상태 조회 long-poll이 작업 이벤트를 기다릴 수 있습니다 (`wait`).
+"""
 
-from typing import Dict
-from fastapi import WebSocket, WebSocketDisconnect
-import json
 import asyncio
+import json
+import logging
+from collections import OrderedDict, deque
+from typing import Any, AsyncIterator, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+from .progress import TERMINAL_TYPES
+from ..config import settings
+
+try:
+    import msgpack
+except ImportError:  # 선택 의존성 (pip install "youtubedownloadercli[msgpack]")
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+# 링 버퍼를 유지할 최대 작업 수 (넘으면 가장 오래전에 갱신된 작업부터 제거)
+_MAX_HISTORY_TASKS = 1000
+
+# 사용자 연결에서 쓸 수 있는 인코딩
+ENCODINGS = ("json", "msgpack")
+
+
+def encoding_available(encoding: str) -> bool:
+    """사용자 연결에서 쓸 수 있는 인코딩인지 (msgpack은 설치된 경우만)"""
+    return encoding in ENCODINGS and (encoding != "msgpack" or msgpack is not None)
+
+# 전송 큐 항목: (작업 ID, 메시지)
+_Item = Tuple[Optional[str], Dict[str, Any]]
+
+
+class Subscriber:
+    """WebSocket 연결 하나 (크기가 정해진 전송 큐와 전송 태스크)"""
+    
+    def __init__(
+        self,
+        websocket: Optional[WebSocket],
+        queue_size: int,
+        task_ids: Iterable[str] = (),
+        multiplex: bool = False,
+        encoding: str = "json",
+        batch_interval: float = 0.0,
+    ) -> None:
+        """
+        구독 연결 초기화
+        
+        Args:
+            websocket: WebSocket 연결 (SSE 스트림이면 None)
+            queue_size: 전송 큐 크기
+            task_ids: 구독 중인 작업 ID
+            multiplex: True면 이벤트에 task_id를 붙이고 여러 개를 `batch` 프레임으로 묶어 보냄
+            encoding: multiplex 연결의 프레임 인코딩 (json, msgpack)
+            batch_interval: multiplex 연결에서 첫 이벤트 뒤 더 모으는 시간 (초)
+        """
+        self.websocket = websocket
+        self.queue_size = queue_size
+        self.task_ids: Set[str] = set(task_ids)
+        self.multiplex = multiplex
+        self.encoding = encoding
+        self.batch_interval = batch_interval
+        self.queue: Deque[_Item] = deque()
+        self.dropped = 0
+        self.closed = False
+        self._ready = asyncio.Event()
+        self._sender: Optional[asyncio.Task[None]] = None
+    
+    def start(self) -> None:
+        """전송 태스크 시작"""
+        self._sender = asyncio.get_running_loop().create_task(self._drain())
+    
+    def offer(self, task_id: Optional[str], message: Dict[str, Any]) -> bool:
+        """
+        전송 큐에 메시지 추가 (기다리지 않음)
+        
+        진행률은 최신 값만 의미가 있으므로 큐에 남은 같은 작업의 이전 진행률을 새 값으로 바꿉니다.
+        
+        Args:
+            task_id: 작업 ID (작업과 관계없는 제어 메시지면 None)
+            message: 전송할 메시지
+            
+        Returns:
+            False면 큐가 가득 차서 연결을 끊어야 함
+        """
+        if message.get("type") == "progress":
+            self._discard_progress(task_id)
+        elif len(self.queue) >= self.queue_size:
+            self._discard_progress()
+        if len(self.queue) >= self.queue_size:
+            return False
+        self.queue.append((task_id, message))
+        self._ready.set()
+        return True
+    
+    def close(self) -> None:
+        """전송 중지"""
+        self.closed = True
+        if self._sender is not None:
+            self._sender.cancel()
+    
+    def _discard_progress(self, task_id: Optional[str] = None) -> None:
+        """큐에서 아직 보내지 않은 진행률 이벤트 제거 (task_id가 있으면 그 작업만)"""
+        def stale(item: _Item) -> bool:
+            return item[1].get("type") == "progress" and (task_id is None or item[0] == task_id)
+        
+        if any(stale(item) for item in self.queue):
+            before = len(self.queue)
+            self.queue = deque(item for item in self.queue if not stale(item))
+            self.dropped += before - len(self.queue)
+    
+    async def _drain(self) -> None:
+        while not self.closed:
+            if not self.queue:
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+            try:
+                if self.multiplex:
+                    # 잠시 더 모은 뒤 큐에 있는 이벤트를 한 프레임으로
+                    if self.batch_interval > 0:
+                        await asyncio.sleep(self.batch_interval)
+                    items, self.queue = list(self.queue), deque()
+                else:
+                    items = [self.queue.popleft()]
+                await self._deliver(items)
+            except Exception:
+                # 끊어진 연결 (구독 목록에서는 다음 전송 때 제거)
+                logger.debug("메시지 전송 실패", exc_info=True)
+                self.closed = True
+                return
+    
+    async def _deliver(self, items: List[_Item]) -> None:
+        assert self.websocket is not None
+        if not self.multiplex:
+            for _, message in items:
+                await self.websocket.send_text(json.dumps(message, ensure_ascii=False))
+            return
+        frame = {
+            "type": "batch",
+            "events": [{"task_id": task_id, **message} for task_id, message in items],
+        }
+        if self.encoding == "msgpack":
+            await self.websocket.send_bytes(msgpack.packb(frame))
+        else:
+            await self.websocket.send_text(json.dumps(frame, ensure_ascii=False))
+
+
+class EventStream(Subscriber):
+    """
+    Server-Sent Events 스트림 하나
+    
+    WebSocket 연결처럼 전송 큐에서 진행률을 합치거나 버리고, HTTP 응답 본문으로 보냅니다.
+    응답이 읽어 가는 속도만큼만 큐에서 꺼내므로 느린 클라이언트에도 메모리가 늘지 않습니다.
+    """
+    
+    def __init__(self, queue_size: int, heartbeat: float = 15.0) -> None:
+        """
+        스트림 초기화
+    
+        Args:
+            queue_size: 전송 큐 크기
+            heartbeat: 이벤트가 없을 때 연결 유지용 주석을 보내는 간격 (초)
+        """
+        super().__init__(None, queue_size)
+        self.heartbeat = heartbeat
+        self._out: asyncio.Queue[Dict[str, Any]] = asyncio.Queue(maxsize=1)
+    
+    async def events(self) -> AsyncIterator[str]:
+        """
+        SSE 형식 문자열 생성 (작업이 끝나거나 연결이 닫히면 종료)
+    
+        `event:`는 메시지 종류(progress, status, complete, error), `data:`는 메시지 내용(JSON)입니다.
+        """
+        while not self.closed:
+            try:
+                message = await asyncio.wait_for(self._out.get(), self.heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            data = json.dumps(message["data"], ensure_ascii=False)
+            yield f"event: {message['type']}\ndata: {data}\n\n"
+            if message["type"] in TERMINAL_TYPES:
+                return
+    
+    async def _deliver(self, items: List[_Item]) -> None:
+        for _, message in items:
+            await self._out.put(message)
 
 
 class ConnectionManager:
-    """WebSocket 연결 관리자"""
+    """WebSocket 연결 관리자 (작업별 pub/sub 허브)"""
     
-    def __init__(self):
-        # task_id별 WebSocket 연결 저장
-        self.active_connections: Dict[str, WebSocket] = {}
+    def __init__(
+        self, history_size: int = 20, queue_size: int = 64, batch_interval: float = 0.1
+    ) -> None:
+        """
+        연결 관리자 초기화
+        
+        Args:
+            history_size: 작업별로 남겨 두고 새 연결에 다시 보내는 최근 이벤트 수
+            queue_size: 연결별 전송 큐 크기
+            batch_interval: 사용자 연결에서 이벤트를 모아 보내는 간격 (초)
+        """
+        self.history_size = history_size
+        self.queue_size = queue_size
+        self.batch_interval = batch_interval
+        
+        # task_id별 구독 중인 연결
+        self.subscribers: Dict[str, Set[Subscriber]] = {}
+        # task_id별 최근 이벤트 (오래 갱신되지 않은 작업부터 제거)
+        self.history: "OrderedDict[str, Deque[Dict[str, Any]]]" = OrderedDict()
+        # task_id별 다음 이벤트를 기다리는 long-poll 요청
+        self.watchers: Dict[str, Set[asyncio.Event]] = {}
     
-    async def connect(self, task_id: str, websocket: WebSocket):
+    async def connect(self, task_id: str, websocket: WebSocket) -> Subscriber:
         """
-        WebSocket 연결 수락
+        WebSocket 연결 수락 후 구독 (최근 이벤트를 먼저 보냄)
         
         Args:
             task_id: 작업 ID
             websocket: WebSocket 연결
+            
+        Returns:
+            구독 정보
         """
         await websocket.accept()
-        self.active_connections[task_id] = websocket
-        print(f"WebSocket 연결: task_id={task_id}")
+        subscriber = Subscriber(websocket, self.queue_size)
+        self.subscribe(subscriber, task_id)
+        subscriber.start()
+        logger.debug("WebSocket 연결: task_id=%s", task_id)
+        return subscriber
+    
+    async def connect_user(self, websocket: WebSocket, encoding: str = "json") -> Subscriber:
+        """
+        사용자 연결 수락 (구독은 `subscribe`로 추가)
+        
+        Args:
+            websocket: WebSocket 연결
+            encoding: 프레임 인코딩 (json, msgpack)
+            
+        Returns:
+            구독 정보
+        """
+        await websocket.accept()
+        subscriber = Subscriber(
+            websocket,
+            self.queue_size,
+            multiplex=True,
+            encoding=encoding,
+            batch_interval=self.batch_interval,
+        )
+        subscriber.start()
+        return subscriber
+    
+    def connect_stream(self, task_id: str) -> EventStream:
+        """
+        Server-Sent Events 스트림으로 작업 구독 (최근 이벤트를 먼저 보냄)
+        
+        Args:
+            task_id: 작업 ID
+            
+        Returns:
+            스트림 (`events()`를 응답 본문으로 사용, 끝나면 `remove`)
+        """
+        stream = EventStream(self.queue_size)
+        self.subscribe(stream, task_id)
+        stream.start()
+        return stream
+    
+    async def wait(self, task_id: str, timeout: float) -> bool:
+        """
+        작업의 다음 이벤트 대기 (long-poll)
+        
+        Args:
+            task_id: 작업 ID
+            timeout: 최대 대기 시간 (초)
+            
+        Returns:
+            시간 안에 이벤트가 발행됐는지 여부
+        """
+        event = asyncio.Event()
+        watchers = self.watchers.setdefault(task_id, set())
+        watchers.add(event)
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            watchers.discard(event)
+            if not watchers and self.watchers.get(task_id) is watchers:
+                del self.watchers[task_id]
+    
+    def subscribe(self, subscriber: Subscriber, task_id: str) -> None:
+        """
+        작업 구독 추가 (그 작업의 최근 이벤트를 먼저 보냄)
+        
+        Args:
+            subscriber: 구독 연결
+            task_id: 작업 ID
+        """
+        if task_id in subscriber.task_ids:
+            return
+        for message in self.history.get(task_id, ()):
+            subscriber.offer(task_id, message)
+        subscriber.task_ids.add(task_id)
+        self.subscribers.setdefault(task_id, set()).add(subscriber)
     
-    def disconnect(self, task_id: str):
+    def unsubscribe(self, subscriber: Subscriber, task_id: str) -> None:
+        """
+        작업 구독 해제
+        
+        Args:
+            subscriber: 구독 연결
+            task_id: 작업 ID
+        """
+        subscriber.task_ids.discard(task_id)
+        subscribers = self.subscribers.get(task_id)
+        if subscribers is None:
+            return
+        subscribers.discard(subscriber)
+        if not subscribers:
+            del self.subscribers[task_id]
+    
+    def disconnect(self, task_id: str, websocket: WebSocket) -> None:
         """
         WebSocket 연결 해제
         
         Args:
             task_id: 작업 ID
+            websocket: WebSocket 연결
         """
-        if task_id in self.active_connections:
-            del self.active_connections[task_id]
-            print(f"WebSocket 연결 해제: task_id={task_id}")
+        for subscriber in [s for s in self.subscribers.get(task_id, ()) if s.websocket is websocket]:
+            self.remove(subscriber)
+            logger.debug("WebSocket 연결 해제: task_id=%s", task_id)
     
-    async def send_message(self, task_id: str, message: dict):
+    def remove(self, subscriber: Subscriber) -> None:
         """
-        특정 task_id에 메시지 전송
+        연결의 모든 구독 해제 후 전송 중지
+        
+        Args:
+            subscriber: 구독 연결
+        """
+        for task_id in list(subscriber.task_ids):
+            self.unsubscribe(subscriber, task_id)
+        subscriber.close()
+    
+    def connections(self, task_id: str) -> int:
+        """작업을 구독 중인 연결 수"""
+        return len(self.subscribers.get(task_id, ()))
+    
+    async def send_message(self, task_id: str, message: Dict[str, Any]) -> None:
+        """
+        특정 task_id의 모든 구독자에게 메시지 전송 (기다리지 않음)
         
         Args:
             task_id: 작업 ID
             message: 전송할 메시지 (dict)
         """
-        if task_id in self.active_connections:
-            try:
-                await self.active_connections[task_id].send_text(
-                    json.dumps(message, ensure_ascii=False)
-                )
-            except Exception as e:
-                print(f"메시지 전송 실패: {e}")
-                self.disconnect(task_id)
+        self._remember(task_id, message)
+        for event in self.watchers.get(task_id, ()):
+            event.set()
+        for subscriber in list(self.subscribers.get(task_id, ())):
+            await self._offer(subscriber, task_id, message)
     
-    async def broadcast(self, message: dict):
+    async def broadcast(self, message: Dict[str, Any]) -> None:
         """
         모든 연결에 메시지 브로드캐스트
         
         Args:
             message: 전송할 메시지 (dict)
         """
-        disconnected = []
-        
-        for task_id, connection in self.active_connections.items():
-            try:
-                await connection.send_text(
-                    json.dumps(message, ensure_ascii=False)
-                )
-            except Exception:
-                disconnected.append(task_id)
-        
-        # 연결 실패한 클라이언트 제거
-        for task_id in disconnected:
-            self.disconnect(task_id)
+        connected = {s for subscribers in self.subscribers.values() for s in subscribers}
+        for subscriber in connected:
+            await self._offer(subscriber, None, message)
+    
+    async def _offer(
+        self, subscriber: Subscriber, task_id: Optional[str], message: Dict[str, Any]
+    ) -> None:
+        if subscriber.closed:
+            self.remove(subscriber)
+        elif not subscriber.offer(task_id, message):
+            logger.warning("전송 큐 초과로 연결 종료: task_id=%s", task_id)
+            await self._close_slow(subscriber)
+    
+    def _remember(self, task_id: str, message: Dict[str, Any]) -> None:
+        """링 버퍼에 이벤트 추가 (연속된 진행률은 최신 값 하나만 유지)"""
+        history = self.history.get(task_id)
+        if history is None:
+            history = self.history[task_id] = deque(maxlen=self.history_size)
+            while len(self.history) > _MAX_HISTORY_TASKS:
+                self.history.popitem(last=False)
+        else:
+            self.history.move_to_end(task_id)
+        if message.get("type") == "progress" and history and history[-1].get("type") == "progress":
+            history.pop()
+        history.append(message)
+    
+    async def _close_slow(self, subscriber: Subscriber) -> None:
+        """따라오지 못하는 연결 종료"""
+        self.remove(subscriber)
+        if subscriber.websocket is None:
+            return
+        try:
+            await subscriber.websocket.close(code=1013)
+        except Exception:
+            pass
 
 
 # 전역 ConnectionManager 인스턴스
-manager = ConnectionManager()
+manager = ConnectionManager(
+    settings.web.event_history_size,
+    settings.web.subscriber_queue_size,
+    settings.web.ws_batch_interval,
+)
 
 
-async def send_progress_update(
-    task_id: str,
+def progress_event(
     percentage: int,
     downloaded_bytes: int,
     total_bytes: int,
     speed: str = "",
     eta: str = ""
-):
+) -> Dict[str, Any]:
     """
-    진행률 업데이트 메시지 전송
+    진행률 업데이트 이벤트
     
     Args:
-        task_id: 작업 ID
         percentage: 진행률 (0-100)
         downloaded_bytes: 다운로드된 바이트
         total_bytes: 전체 바이트
         speed: 다운로드 속도
         eta: 예상 남은 시간
     """
-    message = {
+    return {
         "type": "progress",
         "data": {
             "percentage": percentage,
@@ -108,39 +458,35 @@ async def send_progress_update(
             "eta": eta,
         }
     }
-    await manager.send_message(task_id, message)
 
 
-async def send_status_update(task_id: str, status: str, message: str = ""):
+def status_event(status: str, message: str = "") -> Dict[str, Any]:
     """
-    상태 변경 메시지 전송
+    상태 변경 이벤트
     
     Args:
-        task_id: 작업 ID
         status: 상태 (downloading, processing, etc.)
         message: 상태 메시지
     """
-    msg = {
+    return {
         "type": "status",
         "data": {
             "status": status,
             "message": message,
         }
     }
-    await manager.send_message(task_id, msg)
 
 
-async def send_complete_message(task_id: str, filename: str, size: int, download_url: str):
+def complete_event(filename: str, size: int, download_url: str) -> Dict[str, Any]:
     """
-    완료 메시지 전송
+    완료 이벤트
     
     Args:
-        task_id: 작업 ID
         filename: 파일명
         size: 파일 크기
         download_url: 다운로드 URL
     """
-    message = {
+    return {
         "type": "complete",
         "data": {
             "filename": filename,
@@ -148,23 +494,83 @@ async def send_complete_message(task_id: str, filename: str, size: int, download
             "download_url": download_url,
         }
     }
-    await manager.send_message(task_id, message)
 
 
-async def send_error_message(task_id: str, error_code: str, error_message: str):
+def error_event(error_code: str, error_message: str) -> Dict[str, Any]:
     """
-    에러 메시지 전송
+    에러 이벤트
     
     Args:
-        task_id: 작업 ID
         error_code: 에러 코드
         error_message: 에러 메시지
     """
-    message = {
+    return {
         "type": "error",
         "data": {
             "code": error_code,
             "message": error_message,
         }
     }
-    await manager.send_message(task_id, message)
+
+
+async def send_progress_update(
+    task_id: str,
+    percentage: int,
+    downloaded_bytes: int,
+    total_bytes: int,
+    speed: str = "",
+    eta: str = ""
+) -> None:
+    """
+    진행률 업데이트 메시지 전송
+    
+    Args:
+        task_id: 작업 ID
+        percentage: 진행률 (0-100)
+        downloaded_bytes: 다운로드된 바이트
+        total_bytes: 전체 바이트
+        speed: 다운로드 속도
+        eta: 예상 남은 시간
+    """
+    await manager.send_message(
+        task_id, progress_event(percentage, downloaded_bytes, total_bytes, speed, eta)
+    )
+
+
+async def send_status_update(task_id: str, status: str, message: str = "") -> None:
+    """
+    상태 변경 메시지 전송
+    
+    Args:
+        task_id: 작업 ID
+        status: 상태 (downloading, processing, etc.)
+        message: 상태 메시지
+    """
+    await manager.send_message(task_id, status_event(status, message))
+
+
+async def send_complete_message(
+    task_id: str, filename: str, size: int, download_url: str
+) -> None:
+    """
+    완료 메시지 전송
+    
+    Args:
+        task_id: 작업 ID
+        filename: 파일명
+        size: 파일 크기
+        download_url: 다운로드 URL
+    """
+    await manager.send_message(task_id, complete_event(filename, size, download_url))
+
+
+async def send_error_message(task_id: str, error_code: str, error_message: str) -> None:
+    """
+    에러 메시지 전송
+    
+    Args:
+        task_id: 작업 ID
+        error_code: 에러 코드
+        error_message: 에러 메시지
+    """
+    await manager.send_message(task_id, error_event(error_code, error_message))
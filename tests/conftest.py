@@ -1,8 +1,18 @@
 """Pytest 설정 파일"""
 
 
+import functools
+import io
+import os
+import re
+import subprocess
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
 import pytest
 
+from youtube_downloader.utils import get_ffmpeg_path
+
 
 @pytest.fixture
 def test_output_dir(tmp_path):
@@ -16,3 +26,84 @@ def test_output_dir(tmp_path):
 def sample_video_url():
     """테스트용 샘플 동영상 URL (짧은 테스트 동영상)"""
     return "https://www.youtube.com/watch?v=jNQXAC9IVRw"
+
+
+@pytest.fixture(scope="session")
+def media_dir(tmp_path_factory):
+    """ffmpeg로 만든 짧은 테스트용 미디어 파일 디렉토리 (hls/에 HLS 재생목록 포함)"""
+    media_dir = tmp_path_factory.mktemp("media")
+    ffmpeg = get_ffmpeg_path()
+    subprocess.run(
+        [ffmpeg, "-v", "error", "-f", "lavfi", "-i", "sine=frequency=440:duration=1",
+         "-c:a", "aac", "-b:a", "64k", str(media_dir / "tone.m4a")],
+        check=True,
+    )
+    subprocess.run(
+        [ffmpeg, "-v", "error", "-f", "lavfi", "-i", "testsrc=size=64x64:rate=10:duration=1",
+         "-f", "lavfi", "-i", "sine=frequency=440:duration=1",
+         "-c:v", "mpeg4", "-c:a", "aac", "-shortest", str(media_dir / "clip.mp4")],
+        check=True,
+    )
+    hls_dir = media_dir / "hls"
+    hls_dir.mkdir()
+    subprocess.run(
+        [ffmpeg, "-v", "error", "-i", str(media_dir / "clip.mp4"),
+         "-c:v", "mpeg4", "-g", "2", "-c:a", "aac", "-f", "hls", "-hls_time", "0.2",
+         "-hls_segment_type", "fmp4", "-hls_playlist_type", "vod", str(hls_dir / "index.m3u8")],
+        check=True,
+    )
+    return media_dir
+
+
+@pytest.fixture(scope="session")
+def media_server(media_dir):
+    """media_dir를 제공하는 로컬 HTTP 서버 (Range 요청 지원)의 기본 URL"""
+    handler = functools.partial(_QuietHandler, directory=str(media_dir))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    """로그를 출력하지 않고 단일 Range 요청을 지원하는 정적 파일 핸들러"""
+
+    def send_head(self):
+        path = self.translate_path(self.path)
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+        if match is None or not os.path.isfile(path):
+            return super().send_head()
+
+        size = os.path.getsize(path)
+        start = int(match[1])
+        end = min(int(match[2]) if match[2] else size - 1, size - 1)
+        if start >= size:
+            self.send_error(416)
+            return None
+
+        with open(path, "rb") as f:
+            f.seek(start)
+            body = f.read(end - start + 1)
+        self.send_response(206)
+        self.send_header("Content-Type", self.guess_type(path))
+        self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+        return io.BytesIO(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="session")
+def webm(media_dir):
+    """파이프로 읽을 수 있는 opus/webm 파일 이름"""
+    subprocess.run(
+        [get_ffmpeg_path(), "-v", "error", "-f", "lavfi", "-i", "sine=frequency=440:duration=2",
+         "-c:a", "libopus", "-b:a", "32k", str(media_dir / "tone.webm")],
+        check=True,
+    )
+    return "tone.webm"
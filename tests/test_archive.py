@@ -0,0 +1,130 @@
+"""다운로드 아카이브 테스트"""
+
+
+import errno
+import os
+
+import pytest
+
+from youtube_downloader.archive import DownloadArchive
+from youtube_downloader.config import ArchiveSettings, Settings
+from youtube_downloader.downloader import Downloader
+from youtube_downloader.models import DownloadOptions
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = DownloadArchive(tmp_path / "archive")
+    yield archive
+    archive.close()
+
+
+def test_second_download_is_served_from_archive(tmp_path, media_server, archive):
+    """같은 동영상/옵션이면 다운로드 없이 아카이브 파일을 재사용"""
+    first_dir = tmp_path / "first"
+    second_dir = tmp_path / "second"
+
+    first = Downloader(DownloadOptions(output_dir=first_dir), archive=archive)
+    first_result = first.download(f"{media_server}/clip.mp4")
+    assert first_result.success and not first_result.from_archive
+
+    second = Downloader(DownloadOptions(output_dir=second_dir), archive=archive)
+    second_result = second.download(f"{media_server}/clip.mp4")
+
+    assert second_result.success and second_result.from_archive
+    assert second_result.archive_digest == first_result.archive_digest
+    assert second_result.file_path == second_dir / "clip.mp4"
+    # 같은 저장소 객체의 하드 링크
+    assert second_result.file_path.samefile(first_result.file_path)
+    assert second_result.video_info.title == "clip"
+
+
+def test_different_options_use_different_entries(tmp_path, media_server, archive):
+    """오디오 옵션이 다르면 아카이브 키도 다름"""
+    video = Downloader(DownloadOptions(output_dir=tmp_path / "v"), archive=archive)
+    audio = Downloader(
+        DownloadOptions(output_dir=tmp_path / "a", audio_only=True, audio_quality="64"),
+        archive=archive,
+    )
+
+    assert video.download(f"{media_server}/tone.m4a").success
+    result = audio.download(f"{media_server}/tone.m4a")
+
+    assert result.success and not result.from_archive
+    assert result.file_path.suffix == ".mp3"
+
+
+def test_identical_content_is_stored_once(tmp_path, archive):
+    """키가 달라도 내용이 같으면 저장소 객체는 하나"""
+    a = tmp_path / "a.mp4"
+    b = tmp_path / "b.mp4"
+    a.write_bytes(b"same bytes")
+    b.write_bytes(b"same bytes")
+
+    entry_a = archive.add("x:1|best", a)
+    entry_b = archive.add("x:1|worst", b)
+
+    assert entry_a.path == entry_b.path
+    assert a.samefile(b)
+
+
+def test_reference_counting(tmp_path, archive):
+    """마지막 참조가 해제되어야 0"""
+    file_path = tmp_path / "a.mp4"
+    file_path.write_bytes(b"data")
+    digest = archive.add("x:1|best", file_path).digest
+
+    assert archive.acquire(digest, "task-1") == 1
+    assert archive.acquire(digest, "task-2") == 2
+    assert archive.acquire(digest, "task-2") == 2
+    assert archive.release(digest, "task-1") == 1
+    assert archive.release(digest, "task-2") == 0
+
+
+def test_archive_path_ignores_path_environment(monkeypatch, tmp_path):
+    """PATH 환경 변수가 아카이브 디렉토리가 되지 않음 (ARCHIVE__PATH로만 지정)"""
+    monkeypatch.setenv("PATH", "/usr/local/bin:/usr/bin:/bin")
+    assert Settings().archive.path == ArchiveSettings.model_fields["path"].default
+    assert ArchiveSettings().path == ArchiveSettings.model_fields["path"].default
+
+    monkeypatch.setenv("ARCHIVE__PATH", str(tmp_path / "archive"))
+    assert Settings().archive.path == tmp_path / "archive"
+
+
+def test_unreferenced_objects_are_pruned_oldest_first(tmp_path):
+    """참조가 없는 객체의 합이 max_size를 넘으면 오래 쓰지 않은 것부터 항목과 함께 삭제"""
+    archive = DownloadArchive(tmp_path / "archive", max_size=10)
+    a = tmp_path / "a.mp4"
+    b = tmp_path / "b.mp4"
+    a.write_bytes(b"aaaaaa")
+    b.write_bytes(b"bbbbbb")
+
+    entry_a = archive.add("x:1|best", a)
+    assert archive.acquire(entry_a.digest, "task-1") == 1
+    # 참조 중인 객체는 한도에 세지 않음
+    entry_b = archive.add("x:2|best", b)
+    assert entry_a.path.exists() and entry_b.path.exists()
+
+    # 마지막 참조가 해제되면 한도를 넘으므로 오래된 a부터 삭제
+    assert archive.release(entry_a.digest, "task-1") == 0
+    assert not entry_a.path.exists()
+    assert archive.lookup("x:1|best") is None
+    assert archive.lookup("x:2|best") is not None
+    # 출력 파일은 그대로
+    assert a.read_bytes() == b"aaaaaa"
+    archive.close()
+
+
+def test_cross_filesystem_files_are_not_copied(tmp_path, archive, monkeypatch):
+    """하드 링크할 수 없으면 복사하지 않고 등록하지도 않음"""
+    file_path = tmp_path / "a.mp4"
+    file_path.write_bytes(b"data")
+
+    def cross_device(source, dest):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(os, "link", cross_device)
+
+    assert archive.add("x:1|best", file_path) is None
+    assert not any(path.is_file() for path in archive.objects_dir.rglob("*"))
+    assert archive.lookup("x:1|best") is None
@@ -0,0 +1,130 @@
+"""오디오 스트림 복사/변환 선택 테스트"""
+
+
+import pytest
+import yt_dlp
+
+from youtube_downloader.archive import archive_key
+from youtube_downloader.audio import AdaptiveExtractAudioPP, TranscodeCost, plan_audio, probe_audio
+from youtube_downloader.audio_pipe import AudioPipeFD
+from youtube_downloader.downloader import Downloader
+from youtube_downloader.models import DownloadOptions
+from youtube_downloader.utils import get_ffmpeg_path
+
+
+def test_plan_audio():
+    """복사할 수 있는 코덱이고 요청 음질 이하일 때만 복사"""
+    assert plan_audio("aac", 128, "auto", "192").mode == "copy"
+    assert plan_audio("aac", 128, "auto", "192").codec == "m4a"
+    assert plan_audio("opus", 160, "auto", "160").codec == "opus"
+    assert plan_audio("vorbis", 96, "auto", "128").codec == "vorbis"
+
+    assert plan_audio("opus", 256, "auto", "192").mode == "transcode"
+    assert plan_audio("flac", 900, "auto", "192").mode == "transcode"
+    assert plan_audio("aac", None, "auto", "192").mode == "transcode"
+    assert plan_audio(None, 128, "auto", "192").mode == "transcode"
+
+    # 기본(mp3)은 항상 MP3, 원본이 MP3면 yt-dlp처럼 복사
+    assert plan_audio("aac", 128, "mp3", "192").mode == "transcode"
+    assert plan_audio("mp3", 320, "mp3", "192").mode == "copy"
+
+
+def test_probe_audio(media_dir, webm):
+    """ffprobe 없이 ffmpeg 출력으로 코덱/비트레이트/길이 확인"""
+    codec, bitrate, duration = probe_audio(get_ffmpeg_path(), str(media_dir / "tone.m4a"))
+    assert codec == "aac"
+    assert 0 < bitrate <= 70
+    assert duration == pytest.approx(1, abs=0.1)
+
+    # opus는 스트림 비트레이트가 없어 전체 비트레이트 사용
+    codec, bitrate, _ = probe_audio(get_ffmpeg_path(), str(media_dir / webm))
+    assert codec == "opus"
+    assert bitrate is not None
+
+    assert probe_audio(get_ffmpeg_path(), str(media_dir / "missing.webm")) == (None, None, None)
+
+
+def test_transcode_cost():
+    """실제 변환 기록으로 오디오 1초당 CPU 시간 추정"""
+    cost = TranscodeCost(default=0.02)
+    assert cost.estimate(100) == pytest.approx(2.0)
+    cost.record(1.0, 200)
+    cost.record(0.5, None)
+    assert cost.estimate(100) == pytest.approx(0.5)
+    assert cost.estimate(None) is None
+
+
+def test_auto_copies_aac(test_output_dir, media_server):
+    """요청 음질 이하 AAC는 다시 인코딩하지 않고 m4a 그대로"""
+    options = DownloadOptions(output_dir=test_output_dir, audio_only=True, audio_format="auto")
+    result = Downloader(options).download(f"{media_server}/tone.m4a")
+
+    assert result.success, result.error_message
+    assert result.file_path == test_output_dir / "tone.m4a"
+    assert result.audio.mode == "copy"
+    assert result.audio.source_codec == "aac"
+    assert result.audio.cpu_seconds_saved > 0
+
+
+def test_auto_copies_opus(test_output_dir, media_server, webm):
+    """opus는 opus 파일로 복사 (포맷 정보가 없으면 파일로 받아 확인)"""
+    options = DownloadOptions(output_dir=test_output_dir, audio_only=True, audio_format="auto")
+    result = Downloader(options).download(f"{media_server}/{webm}")
+
+    assert result.success, result.error_message
+    assert result.file_path == test_output_dir / "tone.opus"
+    assert result.audio.mode == "copy"
+    assert probe_audio(get_ffmpeg_path(), str(result.file_path))[0] == "opus"
+    assert sorted(p.name for p in test_output_dir.iterdir()) == ["tone.opus"]
+
+
+def test_auto_transcodes_above_requested_quality(test_output_dir, media_server):
+    """원본이 요청보다 높은 음질이면 MP3로 변환하고 CPU 시간 보고"""
+    options = DownloadOptions(
+        output_dir=test_output_dir, audio_only=True, audio_format="auto", audio_quality="32"
+    )
+    result = Downloader(options).download(f"{media_server}/tone.m4a")
+
+    assert result.success, result.error_message
+    assert result.file_path == test_output_dir / "tone.mp3"
+    assert result.audio.mode == "transcode"
+    assert result.audio.cpu_seconds is not None
+    assert result.audio.cpu_seconds_saved == 0
+
+
+def test_default_format_still_mp3(test_output_dir, media_server):
+    """audio_format을 지정하지 않으면 기존처럼 MP3"""
+    options = DownloadOptions(output_dir=test_output_dir, audio_only=True)
+    result = Downloader(options).download(f"{media_server}/tone.m4a")
+
+    assert result.success, result.error_message
+    assert result.file_path == test_output_dir / "tone.mp3"
+    assert result.audio.mode == "transcode"
+
+
+def test_pipe_stream_copy(tmp_path, media_server, webm):
+    """포맷 정보로 복사할 수 있으면 파이프에서도 다시 인코딩하지 않음"""
+    with yt_dlp.YoutubeDL({"quiet": True, "ffmpeg_location": get_ffmpeg_path()}) as ydl:
+        extractor = AdaptiveExtractAudioPP(ydl, "auto", "192")
+        info = {
+            "url": f"{media_server}/{webm}", "protocol": "http", "ext": "webm",
+            "acodec": "opus", "abr": 32, "http_headers": {},
+        }
+        plan = extractor.plan(info)
+        fd = AudioPipeFD(ydl, ydl.params, extractor, plan)
+        assert fd.real_download(str(tmp_path / "tone.webm"), info)
+
+    assert plan.mode == "copy"
+    assert fd.output_path == str(tmp_path / "tone.opus")
+    assert probe_audio(get_ffmpeg_path(), fd.output_path)[0] == "opus"
+    assert fd.cpu_seconds is not None
+
+
+def test_archive_key_includes_audio_format():
+    """형식이 다르면 다른 아카이브 항목 (기본값의 키는 그대로)"""
+    mp3 = archive_key("youtube:x", DownloadOptions(audio_only=True), "bestaudio/best")
+    auto = archive_key(
+        "youtube:x", DownloadOptions(audio_only=True, audio_format="auto"), "bestaudio/best"
+    )
+    assert mp3 == "youtube:x|bestaudio/best|audio:192"
+    assert auto == "youtube:x|bestaudio/best|audio:192|format:auto"
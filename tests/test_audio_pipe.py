@@ -0,0 +1,131 @@
+"""오디오 추출 파이프라인 테스트"""
+
+
+import subprocess
+import sys
+import threading
+
+import yt_dlp
+from yt_dlp.networking.exceptions import TransportError
+
+from youtube_downloader import audio_pipe
+from youtube_downloader.audio_pipe import AudioPipeError, AudioPipeFD, can_pipe
+from youtube_downloader.downloader import Downloader
+from youtube_downloader.models import DownloadOptions
+from youtube_downloader.utils import get_ffmpeg_path
+
+
+def decodes(path):
+    """ffmpeg로 끝까지 디코딩되는지"""
+    return subprocess.run(
+        [get_ffmpeg_path(), "-v", "error", "-i", str(path), "-f", "null", "-"], capture_output=True
+    ).returncode == 0
+
+
+def test_can_pipe():
+    """앞부분부터 디코딩할 수 있는 단일 파일 포맷만 파이프"""
+    assert can_pipe({"url": "https://a/x", "protocol": "https", "ext": "webm"})
+    assert can_pipe({"url": "https://a/x", "protocol": "https", "ext": "m4a", "container": "m4a_dash"})
+    assert not can_pipe({"url": "https://a/x", "protocol": "https", "ext": "m4a"})
+    assert not can_pipe({"url": "https://a/x.m3u8", "protocol": "m3u8_native", "ext": "webm"})
+    assert not can_pipe({"url": "https://a/x", "protocol": "https", "ext": "webm", "is_live": True})
+
+
+def test_audio_is_converted_while_downloading(test_output_dir, media_server, webm):
+    """원본 파일 없이 받는 대로 mp3로 변환"""
+    hooks = []
+    options = DownloadOptions(output_dir=test_output_dir, audio_only=True, audio_quality="64")
+    result = Downloader(options).download(f"{media_server}/{webm}", hooks.append)
+
+    assert result.success, result.error_message
+    assert result.file_path == test_output_dir / "tone.mp3"
+    assert decodes(result.file_path)
+    assert sorted(p.name for p in test_output_dir.iterdir()) == ["tone.mp3"]
+    assert {hook.get("tmpfilename") for hook in hooks if hook["status"] == "downloading"} == {
+        str(test_output_dir / "tone.mp3.part")
+    }
+
+
+def test_pipe_failure_falls_back_to_file(test_output_dir, media_server, webm, monkeypatch):
+    """파이프 중 연결이 끊기면 파일로 받은 뒤 변환"""
+
+    def broken(self, info_dict):
+        yield b"\x1a\x45\xdf\xa3", None
+        raise TransportError("connection reset")
+
+    monkeypatch.setattr(AudioPipeFD, "_chunks", broken)
+    options = DownloadOptions(output_dir=test_output_dir, audio_only=True, audio_quality="64")
+    result = Downloader(options).download(f"{media_server}/{webm}")
+
+    assert result.success, result.error_message
+    assert decodes(result.file_path)
+    assert sorted(p.name for p in test_output_dir.iterdir()) == ["tone.mp3"]
+
+
+def test_chunked_range_requests(media_dir, media_server, webm):
+    """http_chunk_size가 있으면 Range 요청으로 나눠서 순서대로 읽음"""
+    data = (media_dir / webm).read_bytes()
+    with yt_dlp.YoutubeDL({"quiet": True}) as ydl:
+        fd = AudioPipeFD(ydl, ydl.params, extractor=None)
+        info = {
+            "url": f"{media_server}/{webm}",
+            "http_headers": {},
+            "downloader_options": {"http_chunk_size": 1000},
+        }
+        chunks = list(fd._chunks(info))
+
+    assert b"".join(chunk for chunk, _ in chunks) == data
+    assert {total for _, total in chunks} == {len(data)}
+
+
+def test_pipe_can_be_disabled(test_output_dir, media_server, webm, monkeypatch):
+    """pipe_audio=False면 기존 방식"""
+    monkeypatch.setattr(audio_pipe.AudioPipeFD, "real_download", None)
+    options = DownloadOptions(output_dir=test_output_dir, audio_only=True, audio_quality="64", pipe_audio=False)
+    result = Downloader(options).download(f"{media_server}/{webm}")
+
+    assert result.success, result.error_message
+    assert result.file_path == test_output_dir / "tone.mp3"
+
+
+def test_noisy_ffmpeg_does_not_block_pipe(tmp_path, monkeypatch):
+    """ffmpeg가 stderr에 많이 써도 stdin 쓰기가 막히지 않음"""
+    script = tmp_path / "noisy-ffmpeg"
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import sys\n"
+        "sys.stderr.write('x' * 1024 * 1024)\n"
+        "sys.stderr.flush()\n"
+        "sys.stdin.buffer.read()\n"
+        "sys.exit(1)\n"
+    )
+    script.chmod(0o755)
+
+    class NoisyExtractor:
+        executable = str(script)
+        mapping = "mp3"
+
+        def _quality_args(self, codec):
+            return []
+
+    def chunks(self, info_dict):
+        for _ in range(32):
+            yield b"\0" * 64 * 1024, None
+
+    monkeypatch.setattr(AudioPipeFD, "_chunks", chunks)
+    errors = []
+
+    def run():
+        with yt_dlp.YoutubeDL({"quiet": True}) as ydl:
+            fd = AudioPipeFD(ydl, ydl.params, NoisyExtractor())
+            try:
+                fd.real_download(str(tmp_path / "out.webm"), {"ext": "webm"})
+            except AudioPipeError as e:
+                errors.append(e)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout=30)
+
+    assert not thread.is_alive()
+    assert len(errors) == 1 and "xxxx" in str(errors[0])
@@ -0,0 +1,152 @@
+"""대역폭 관리자 테스트"""
+
+
+import threading
+
+import pytest
+
+from youtube_downloader import bandwidth
+from youtube_downloader.bandwidth import BandwidthManager, fair_share
+from youtube_downloader.batch import BatchDownloader
+from youtube_downloader.downloader import Downloader
+from youtube_downloader.models import DownloadOptions, DownloadResult
+
+KIB = 1024
+
+
+class FakeClock:
+    """sleep하면 시간이 그만큼 흐르는 가짜 시계"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+        self.slept += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(bandwidth.time, "monotonic", fake.monotonic)
+    monkeypatch.setattr(bandwidth.time, "sleep", fake.sleep)
+    return fake
+
+
+def test_fair_share_redistributes_unused_share():
+    """요구량이 몫보다 작은 항목의 남는 몫을 나머지가 가중치대로 나눔"""
+    allocation = fair_share(900, {"a": 1, "b": 1, "c": 2}, {"a": 100})
+
+    assert allocation["a"] == 100
+    assert allocation["b"] == pytest.approx(800 / 3)
+    assert allocation["c"] == pytest.approx(1600 / 3)
+
+
+def test_users_share_before_tasks(clock):
+    """사용자끼리 먼저 나누므로 작업을 많이 건 사용자가 독차지하지 못함"""
+    manager = BandwidthManager(rate=1000 * KIB)
+    for i in range(4):
+        manager.register(f"a{i}", user_id="alice")
+    manager.register("b0", user_id="bob")
+
+    assert manager.allocation("b0") == pytest.approx(500 * KIB)
+    assert manager.allocation("a0") == pytest.approx(125 * KIB)
+
+    manager.unregister("b0")
+    assert manager.allocation("a0") == pytest.approx(250 * KIB)
+
+
+def test_minimum_rate_stays_within_limit(clock):
+    """최소 속도를 보장해도 할당 합이 전체 제한을 넘지 않음"""
+    # 작업이 많으면 최소 속도가 전체 제한 / 작업 수로 낮아짐
+    manager = BandwidthManager(rate=64 * KIB)
+    for i in range(8):
+        manager.register(f"t{i}")
+    assert all(manager.allocation(f"t{i}") == pytest.approx(8 * KIB) for i in range(8))
+
+    # 가중치가 작은 작업을 최소 속도로 올린 만큼 다른 작업의 몫이 줄어듦
+    manager = BandwidthManager(rate=100 * KIB)
+    manager.register("small", user_id="alice", weight=1)
+    manager.register("large", user_id="alice", weight=99)
+    assert manager.allocation("small") == pytest.approx(16 * KIB)
+    assert manager.allocation("large") == pytest.approx(84 * KIB)
+
+
+def test_consume_limits_rate(clock):
+    """할당 속도를 넘으면 그만큼 대기"""
+    manager = BandwidthManager(rate=100 * KIB)
+    manager.register("t")
+
+    for _ in range(50):
+        manager.consume("t", 10 * KIB)
+
+    # 500 KiB / 100 KiB/s
+    assert clock.slept == pytest.approx(5.0, rel=0.05)
+
+
+def test_underused_share_goes_to_busy_task(clock):
+    """다른 곳에서 막혀 몫을 다 못 쓰는 작업의 남는 대역폭을 다른 작업이 받음"""
+    manager = BandwidthManager(rate=1000 * KIB)
+    manager.register("slow")
+    manager.register("fast")
+
+    for _ in range(40):
+        manager.consume("fast", 50 * KIB)
+        manager.consume("slow", 2 * KIB)
+
+    assert manager.allocation("slow") < 200 * KIB
+    assert manager.allocation("fast") > 800 * KIB
+
+
+def test_throttled_hook_consumes_increments(clock):
+    """진행률 훅의 누적 바이트를 파일별 증가분으로 소비"""
+    manager = BandwidthManager(rate=100 * KIB)
+    manager.register("t")
+    seen = []
+    hook = manager.throttled("t", seen.append)
+
+    hook({"status": "downloading", "filename": "v.mp4", "downloaded_bytes": 50 * KIB})
+    hook({"status": "downloading", "filename": "v.mp4", "downloaded_bytes": 100 * KIB})
+    # 두 번째 포맷 파일은 0부터 다시 셈
+    hook({"status": "downloading", "filename": "a.m4a", "downloaded_bytes": 100 * KIB})
+    hook({"status": "finished", "filename": "a.m4a"})
+
+    assert len(seen) == 4
+    assert clock.slept == pytest.approx(2.0, rel=0.05)
+
+
+def test_unlimited_manager_never_waits(clock):
+    """속도 제한이 없으면 대기하지 않고 할당도 없음"""
+    manager = BandwidthManager()
+    manager.register("t")
+    manager.consume("t", 100 * 1024 * KIB)
+
+    assert clock.slept == 0
+    assert manager.allocation("t") is None
+
+
+def test_batch_registers_running_jobs(monkeypatch, test_output_dir):
+    """배치 작업은 실행되는 동안만 대역폭을 나눠 가짐"""
+    manager = BandwidthManager(rate=1000 * KIB)
+    barrier = threading.Barrier(2)
+    allocations = []
+
+    def fake_download(self, url, progress_callback=None, message_callback=None):
+        barrier.wait(timeout=5)
+        allocations.append(sorted(task["allocation"] for task in manager.snapshot().values()))
+        progress_callback({"status": "downloading", "filename": url, "downloaded_bytes": KIB})
+        barrier.wait(timeout=5)
+        return DownloadResult(success=True)
+
+    monkeypatch.setattr(Downloader, "download", fake_download)
+
+    runner = BatchDownloader(DownloadOptions(output_dir=test_output_dir), jobs=2, bandwidth=manager)
+    summary = runner.run(["a", "b"])
+
+    assert summary.succeeded == 2
+    assert allocations == [[500 * KIB, 500 * KIB]] * 2
+    assert manager.snapshot() == {}
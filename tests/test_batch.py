@@ -0,0 +1,122 @@
+"""배치 다운로드 테스트"""
+
+
+import io
+import threading
+
+from click.testing import CliRunner
+
+from youtube_downloader import cli
+from youtube_downloader.batch import BatchDownloader, read_urls
+from youtube_downloader.downloader import Downloader
+from youtube_downloader.models import BatchItem, BatchSummary, DownloadOptions, DownloadResult
+
+
+def test_read_urls_skips_comments_blanks_and_duplicates():
+    """주석/빈 줄/중복 URL 제외"""
+    stream = io.StringIO("# 목록\nhttps://a\n\n  https://b  \nhttps://a\n")
+    assert list(read_urls(stream)) == ["https://a", "https://b"]
+
+
+def test_batch_continues_after_failure(monkeypatch, test_output_dir):
+    """실패한 URL이 있어도 나머지 작업은 계속 진행"""
+
+    def fake_download(self, url, progress_callback=None, message_callback=None):
+        if url == "bad":
+            raise RuntimeError("boom")
+        return DownloadResult(success=True)
+
+    monkeypatch.setattr(Downloader, "download", fake_download)
+
+    runner = BatchDownloader(DownloadOptions(output_dir=test_output_dir), jobs=2)
+    summary = runner.run(["a", "bad", "c"])
+
+    assert summary.total == 3
+    assert summary.succeeded == 2
+    assert summary.failed == 1
+    assert [item.url for item in summary.items] == ["a", "bad", "c"]
+    assert summary.items[1].result.error_message == "boom"
+
+
+def test_batch_limits_concurrency(monkeypatch, test_output_dir):
+    """동시 실행 수가 jobs를 넘지 않음"""
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+
+    def fake_download(self, url, progress_callback=None, message_callback=None):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        threading.Event().wait(0.01)
+        with lock:
+            running -= 1
+        return DownloadResult(success=True)
+
+    monkeypatch.setattr(Downloader, "download", fake_download)
+
+    runner = BatchDownloader(DownloadOptions(output_dir=test_output_dir), jobs=3)
+    summary = runner.run(str(i) for i in range(20))
+
+    assert summary.succeeded == 20
+    assert peak <= 3
+
+
+def test_batch_command_reads_urls_lazily(monkeypatch, test_output_dir):
+    """batch 명령은 URL 목록을 미리 다 읽지 않고 완료 수는 실행 결과로 셈"""
+    consumed = []
+
+    def tracking_read_urls(stream):
+        for url in read_urls(stream):
+            consumed.append(url)
+            yield url
+
+    started_with = {}
+
+    def fake_download(self, url, progress_callback=None, message_callback=None):
+        started_with[url] = len(consumed)
+        return DownloadResult(success=True)
+
+    monkeypatch.setattr(cli, "read_urls", tracking_read_urls)
+    monkeypatch.setattr(Downloader, "download", fake_download)
+    summary_path = test_output_dir / "summary.json"
+
+    result = CliRunner().invoke(
+        cli.cli,
+        ["batch", "-", "--jobs", "1", "-o", str(test_output_dir), "--summary", str(summary_path)],
+        input="".join(f"https://v/{i}\n" for i in range(10)),
+    )
+
+    assert result.exit_code == 0, result.output
+    # 동시 실행 수가 1이면 앞 작업이 끝나야 다음 URL을 읽음
+    assert started_with["https://v/0"] <= 2
+    assert BatchSummary.model_validate_json(summary_path.read_text()).succeeded == 10
+
+
+def test_overall_progress_ignores_repeated_hook_values(monkeypatch):
+    """같은 downloaded_bytes가 반복돼도 전체 진행률을 다시 더하지 않음 (새 포맷은 0부터)"""
+    progresses = []
+
+    class RecordingProgress(cli.Progress):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            progresses.append(self)
+
+    class FakeRunner:
+        def run(self, urls, on_start, on_progress, on_finish, message_callback):
+            on_start(0, "a")
+            for downloaded in (100, 100, 150, 150, 50):
+                on_progress(0, {"status": "downloading", "downloaded_bytes": downloaded})
+            item = BatchItem(
+                index=0, url="a", result=DownloadResult(success=True), elapsed_seconds=0
+            )
+            on_finish(item)
+            return BatchSummary(total=1, succeeded=1, failed=0, elapsed_seconds=0, items=[item])
+
+    monkeypatch.setattr(cli, "Progress", RecordingProgress)
+    cli._run_batch(FakeRunner(), ["a"], total=None)
+
+    # 영상 150바이트 + 음성 50바이트
+    (overall,) = progresses[0].tasks
+    assert overall.completed == 200
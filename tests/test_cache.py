@@ -0,0 +1,129 @@
+"""추출 정보 캐시 테스트"""
+
+
+import time
+
+import pytest
+
+from youtube_downloader import downloader as downloader_module
+from youtube_downloader.cache import InfoCache, cache_key, canonical_video_id
+from youtube_downloader.config import CacheSettings, Settings
+from youtube_downloader.downloader import Downloader
+from youtube_downloader.models import DownloadOptions
+
+
+@pytest.fixture
+def info_cache(tmp_path):
+    cache = InfoCache(tmp_path / "cache.db", ttl_seconds=60, max_entries=2, memory_entries=1)
+    yield cache
+    cache.close()
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://www.youtube.com/watch?v=jNQXAC9IVRw",
+        "https://youtube.com/watch?feature=share&v=jNQXAC9IVRw",
+        "https://youtu.be/jNQXAC9IVRw?t=10",
+        "https://m.youtube.com/shorts/jNQXAC9IVRw",
+        "https://www.youtube.com/embed/jNQXAC9IVRw",
+    ],
+)
+def test_canonical_video_id(url):
+    """여러 URL 형식이 같은 ID로 정규화"""
+    assert canonical_video_id(url) == "jNQXAC9IVRw"
+    assert cache_key(url) == "youtube:jNQXAC9IVRw"
+
+
+def test_canonical_video_id_rejects_other_urls():
+    """유튜브가 아니거나 ID가 없는 URL"""
+    assert canonical_video_id("https://example.com/watch?v=jNQXAC9IVRw") is None
+    assert canonical_video_id("https://www.youtube.com/playlist?list=PL123") is None
+    assert cache_key("invalid-url") is None
+
+
+def test_cache_hit_returns_independent_copy(info_cache):
+    """조회 결과를 수정해도 캐시는 그대로"""
+    info_cache.put("youtube:a", {"id": "a", "title": "A"})
+
+    first = info_cache.get("youtube:a")
+    first["title"] = "changed"
+
+    assert info_cache.get("youtube:a")["title"] == "A"
+    assert info_cache.get("youtube:b") is None
+
+    stats = info_cache.stats()
+    assert stats.memory_hits == 2
+    assert stats.misses == 1
+
+
+def test_cache_persists_and_evicts(tmp_path, info_cache):
+    """디스크에 저장되고 최대 개수를 넘으면 오래된 항목부터 축출"""
+    for key in ("a", "b", "c"):
+        info_cache.put(key, {"id": key})
+        time.sleep(0.01)
+    info_cache.close()
+
+    reopened = InfoCache(tmp_path / "cache.db", ttl_seconds=60, max_entries=2)
+    assert reopened.get("a") is None
+    assert reopened.get("c")["id"] == "c"
+    stats = reopened.stats()
+    assert stats.entries == 2
+    assert stats.evictions == 1
+    assert stats.disk_hits == 1
+    reopened.close()
+
+
+def test_cache_respects_ttl_and_signed_url_expiry(tmp_path):
+    """TTL과 서명된 URL 만료 시각 중 이른 쪽에 만료"""
+    cache = InfoCache(None, ttl_seconds=0)
+    assert cache.put("a", {"id": "a"}) is False
+
+    cache = InfoCache(None, ttl_seconds=3600)
+    soon = int(time.time()) + 10
+    info = {"id": "b", "formats": [{"url": f"https://cdn.example/v?expire={soon}"}]}
+    assert cache.put("b", info) is False
+    assert cache.put("c", {"id": "c", "live_status": "is_live"}) is False
+
+
+def test_downloader_uses_cache(monkeypatch, test_output_dir, info_cache):
+    """캐시가 있으면 두 번째 다운로드는 추출기를 실행하지 않음"""
+    extracted = []
+
+    class FakeYoutubeDL:
+        def __init__(self, params):
+            self.params = params
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            return False
+
+        def extract_info(self, url, download=True, process=True):
+            extracted.append(url)
+            return {"_type": "video", "id": "abc", "title": "sample", "webpage_url": url}
+
+        def process_ie_result(self, ie_result, download=True):
+            return ie_result
+
+    monkeypatch.setattr(downloader_module.yt_dlp, "YoutubeDL", FakeYoutubeDL)
+
+    options = DownloadOptions(output_dir=test_output_dir)
+    first = Downloader(options, info_cache)
+    second = Downloader(options, info_cache)
+    assert first.download("https://www.youtube.com/watch?v=jNQXAC9IVRw").success
+    assert second.download("https://youtu.be/jNQXAC9IVRw").success
+
+    assert len(extracted) == 1
+    assert (first.extraction_count, second.extraction_count) == (1, 0)
+
+
+def test_cache_path_ignores_path_environment(monkeypatch, tmp_path):
+    """PATH 환경 변수가 캐시 파일 경로가 되지 않음 (CACHE__PATH로만 지정)"""
+    monkeypatch.setenv("PATH", "/usr/local/bin:/usr/bin:/bin")
+    assert Settings().cache.path == CacheSettings.model_fields["path"].default
+    assert CacheSettings().path == CacheSettings.model_fields["path"].default
+
+    monkeypatch.setenv("CACHE__PATH", str(tmp_path / "info.db"))
+    assert Settings().cache.path == tmp_path / "info.db"
@@ -3,6 +3,7 @@
 
 import pytest
 
+from youtube_downloader import downloader as downloader_module
 from youtube_downloader.downloader import Downloader
 from youtube_downloader.models import DownloadOptions, DownloadResult
 
@@ -53,6 +54,67 @@ def test_download_invalid_url():
     assert result.error_message is not None
 
 
+def test_download_extracts_once(monkeypatch, test_output_dir):
+    """다운로드 1회당 추출기는 한 번만 실행"""
+    calls = {"extract": 0, "process": 0, "download": 0}
+
+    class FakeYoutubeDL:
+        def __init__(self, params):
+            self.params = params
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            return False
+
+        def extract_info(self, url, download=True, process=True):
+            calls["extract"] += 1
+            assert download is False and process is False
+            return {"_type": "video", "id": "abc", "title": "sample", "webpage_url": url}
+
+        def process_ie_result(self, ie_result, download=True):
+            calls["process"] += 1
+            assert download is True and ie_result["id"] == "abc"
+            return ie_result
+
+        def download(self, urls):
+            calls["download"] += 1
+
+    monkeypatch.setattr(downloader_module.yt_dlp, "YoutubeDL", FakeYoutubeDL)
+
+    downloader = Downloader(DownloadOptions(output_dir=test_output_dir))
+    result = downloader.download("https://www.youtube.com/watch?v=abc")
+
+    assert result.success is True
+    assert downloader.extraction_count == 1
+    assert calls == {"extract": 1, "process": 1, "download": 0}
+
+
+def test_download_reports_exact_output_path(test_output_dir, media_server):
+    """디렉토리를 뒤지지 않고 yt-dlp가 만든 파일 경로를 반환"""
+    # 제목이 비슷한 다른 파일이 있어도 영향 없음
+    (test_output_dir / "clip (other user).mp4").write_bytes(b"x")
+
+    downloader = Downloader(DownloadOptions(output_dir=test_output_dir))
+    result = downloader.download(f"{media_server}/clip.mp4")
+
+    assert result.success is True
+    assert result.file_path == test_output_dir / "clip.mp4"
+    assert result.file_path.stat().st_size > 0
+
+
+def test_download_output_path_after_audio_extraction(test_output_dir, media_server):
+    """후처리기가 확장자를 바꿔도 최종 파일 경로를 반환"""
+    options = DownloadOptions(output_dir=test_output_dir, audio_only=True, audio_quality="64")
+    result = Downloader(options).download(f"{media_server}/tone.m4a")
+
+    assert result.success is True
+    assert result.file_path == test_output_dir / "tone.mp3"
+    assert result.file_path.exists()
+    assert not (test_output_dir / "tone.m4a").exists()
+
+
 @pytest.mark.integration
 @pytest.mark.skip(reason="실제 네트워크 요청이 필요한 통합 테스트")
 def test_download_real_video(test_output_dir, sample_video_url):
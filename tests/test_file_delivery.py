@@ -0,0 +1,198 @@
+"""프록시 전송 (X-Accel-Redirect / X-Sendfile / 서명된 URL) 테스트
+
+앞단 nginx/Apache 대신 헤더를 해석해서 파일을 보내는 ASGI 프록시를 앱 앞에 둡니다.
+"""
+
+
+from pathlib import Path
+from urllib.parse import unquote
+
+import pytest
+from fastapi.responses import FileResponse, PlainTextResponse
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+from starlette.datastructures import Headers, QueryParams
+
+from youtube_downloader.config import WebSettings
+from youtube_downloader.web import api
+from youtube_downloader.web.app import app
+from youtube_downloader.web.files import FileDelivery
+from youtube_downloader.web.tasks import task_manager
+
+
+class StandInProxy:
+    """X-Accel-Redirect/X-Sendfile를 따르고 서명된 정적 URL을 제공하는 가짜 프록시"""
+
+    def __init__(self, app, delivery: FileDelivery, root: Path):
+        self.app = app
+        self.delivery = delivery
+        self.root = root
+        self.upstream_bodies = []
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        path = scope["path"]
+        if path.startswith(self.delivery.internal_prefix):
+            # internal location은 밖에서 직접 요청할 수 없음
+            return await PlainTextResponse("not found", status_code=404)(scope, receive, send)
+
+        if path.startswith(self.delivery.signed_url_base):
+            # nginx auth_request처럼 원래 URI를 검증 엔드포인트에 물어봄
+            raw_path = scope.get("raw_path", path.encode()).decode()
+            original_uri = f"{raw_path}?{scope['query_string'].decode()}"
+            if await self.auth_request(scope, original_uri) != 204:
+                return await PlainTextResponse("forbidden", status_code=403)(scope, receive, send)
+            target = self.root / path[len(self.delivery.signed_url_base):]
+            return await FileResponse(target)(scope, receive, send)
+
+        redirect = {}
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if "x-accel-redirect" in headers:
+                    location = unquote(headers["x-accel-redirect"])
+                    redirect["path"] = self.root / location[len(self.delivery.internal_prefix):]
+                elif "x-sendfile" in headers:
+                    redirect["path"] = Path(unquote(headers["x-sendfile"]))
+                if redirect:
+                    redirect["headers"] = {
+                        name: headers[name] for name in ("content-type", "content-disposition") if name in headers
+                    }
+                    return
+            elif message["type"] == "http.response.body" and redirect:
+                self.upstream_bodies.append(message.get("body", b""))
+                return
+            await send(message)
+
+        await self.app(scope, receive, capture)
+        if redirect:
+            response = FileResponse(redirect["path"], headers=redirect["headers"])
+            await response(scope, receive, send)
+
+    async def auth_request(self, scope, original_uri: str) -> int:
+        """앱의 검증 엔드포인트 하위 요청 (응답 상태 코드)"""
+        status = {}
+        subrequest = {
+            **scope,
+            "method": "GET",
+            "path": "/api/v1/files/verify",
+            "raw_path": b"/api/v1/files/verify",
+            "query_string": b"",
+            "headers": [(b"x-original-uri", original_uri.encode())],
+        }
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+
+        await self.app(subrequest, receive, capture)
+        return status["code"]
+
+
+@pytest.fixture
+def served(tmp_path, monkeypatch):
+    """다운로드 디렉토리를 tmp_path로 바꾸고 완료된 작업 하나 생성"""
+    monkeypatch.setattr(task_manager, "output_dir", tmp_path)
+    content = bytes(range(256)) * 20
+    path = tmp_path / "노래 1.m4a"
+    path.write_bytes(content)
+
+    task_id = task_manager.create_task("https://youtu.be/offload", {})
+    task_manager.set_task_file_path(task_id, path)
+    task_manager.complete_task(task_id)
+    return content, f"/api/v1/download/{task_id}/file"
+
+
+def proxy_client(monkeypatch, tmp_path, mode):
+    delivery = FileDelivery(mode, signing_key="secret", signed_url_ttl=60)
+    monkeypatch.setattr(api, "file_delivery", delivery)
+    proxy = StandInProxy(app, delivery, tmp_path)
+    return TestClient(proxy), proxy
+
+
+@pytest.mark.parametrize("mode", ["x-accel-redirect", "x-sendfile"])
+def test_proxy_header_offloads_body(served, tmp_path, monkeypatch, mode):
+    """앱은 빈 본문과 헤더만 보내고, 프록시가 파일(Range 포함)을 전송"""
+    content, url = served
+    client, proxy = proxy_client(monkeypatch, tmp_path, mode)
+    with client:
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response.content == content
+        assert response.headers["content-type"] == "audio/mp4"
+        assert response.headers["content-disposition"].startswith("attachment; filename*=utf-8''")
+        assert b"".join(proxy.upstream_bodies) == b""
+
+        partial = client.get(url, headers={"Range": "bytes=10-19"})
+        assert partial.status_code == 206
+        assert partial.content == content[10:20]
+
+        assert client.get("/protected-downloads/" + "x.m4a").status_code == 404
+
+
+def test_signed_url_redirect(served, tmp_path, monkeypatch):
+    """서명된 URL로 리다이렉트, 서명이 틀리거나 만료되면 프록시가 거부"""
+    content, url = served
+    client, _ = proxy_client(monkeypatch, tmp_path, "signed-url")
+    with client:
+        response = client.get(url, follow_redirects=False)
+        assert response.status_code == 307
+        assert response.headers["cache-control"] == "no-store"
+        location = response.headers["location"]
+        assert location.startswith("/files/")
+
+        assert client.get(location).content == content
+        assert client.get(location.replace("signature=", "signature=x")).status_code == 403
+
+        # 검증 엔드포인트 (auth_request)
+        verify = "/api/v1/files/verify"
+        assert client.get(verify, headers={"X-Original-URI": location}).status_code == 204
+        assert client.get(verify, headers={"X-Original-URI": location.replace("/files/", "/files/x")}).status_code == 403
+        assert client.get(verify).status_code == 403
+
+
+def test_signature_expires():
+    """만료 시각이 지나거나 경로가 다르면 검증 실패"""
+    delivery = FileDelivery("signed-url", signing_key="secret", signed_url_ttl=60)
+    url = delivery.signed_url("a.mp4", now=1000)
+    path, query = url.split("?")
+    params = QueryParams(query)
+
+    assert delivery.verify(path, params["expires"], params["signature"], now=1059)
+    assert not delivery.verify(path, params["expires"], params["signature"], now=1061)
+    assert not delivery.verify("/files/b.mp4", params["expires"], params["signature"], now=1000)
+    assert not FileDelivery(signing_key="other").verify(path, params["expires"], params["signature"], now=1000)
+
+    assert delivery.verify_uri(url, now=1000)
+    assert not delivery.verify_uri(url, now=1061)
+    assert not FileDelivery("x-accel-redirect", signing_key="secret").verify_uri(url, now=1000)
+
+
+def test_signed_url_requires_signing_key(monkeypatch):
+    """서명 키 없이 signed-url 모드를 쓰면 설정 단계에서 거부 (워커마다 임의 키가 되지 않도록)"""
+    monkeypatch.setenv("WEB__FILE_DELIVERY", "signed-url")
+    with pytest.raises(ValidationError, match="file_signing_key"):
+        WebSettings()
+    with pytest.raises(ValueError):
+        FileDelivery("signed-url")
+
+    monkeypatch.setenv("WEB__FILE_SIGNING_KEY", "secret")
+    assert WebSettings().file_signing_key == "secret"
+
+
+def test_file_outside_download_dir_is_served_directly(served, tmp_path, monkeypatch):
+    """프록시가 모르는 위치의 파일은 직접 전송"""
+    content, url = served
+    monkeypatch.setattr(task_manager, "output_dir", tmp_path / "elsewhere")
+    monkeypatch.setattr(api, "file_delivery", FileDelivery("x-accel-redirect"))
+    with TestClient(app) as client:
+        response = client.get(url)
+    assert response.status_code == 200
+    assert "x-accel-redirect" not in response.headers
+    assert response.content == content
@@ -0,0 +1,117 @@
+"""결과 파일 전송 (Range / 조건부 요청) 테스트"""
+
+
+from email.utils import formatdate
+
+import pytest
+from fastapi.testclient import TestClient
+
+from youtube_downloader.web.app import app
+from youtube_downloader.web.tasks import task_manager
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def served(tmp_path):
+    """완료된 작업과 그 결과 파일 (내용, URL)"""
+    content = bytes(range(256)) * 40
+    path = tmp_path / "video.mp4"
+    path.write_bytes(content)
+
+    task_id = task_manager.create_task("https://youtu.be/file", {})
+    task_manager.set_task_file_path(task_id, path)
+    task_manager.complete_task(task_id)
+    return content, f"/api/v1/download/{task_id}/file", task_id
+
+
+def test_full_download_headers(client, served):
+    """전체 전송에 미디어 타입, 강한 ETag, Last-Modified, Accept-Ranges"""
+    content, url, _ = served
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.content == content
+    assert response.headers["content-type"] == "video/mp4"
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["etag"].startswith('"')
+    assert "last-modified" in response.headers
+    assert response.headers["content-disposition"].startswith("attachment")
+
+    inline = client.get(url, params={"inline": True})
+    assert inline.headers["content-disposition"].startswith("inline")
+
+    head = client.head(url)
+    assert head.status_code == 200
+    assert head.content == b""
+    assert head.headers["content-length"] == str(len(content))
+
+
+def test_single_range_resumes(client, served):
+    """한 구간 Range는 206, 여러 구간은 416"""
+    content, url, _ = served
+    response = client.get(url, headers={"Range": "bytes=1000-1999"})
+    assert response.status_code == 206
+    assert response.content == content[1000:2000]
+    assert response.headers["content-range"] == f"bytes 1000-1999/{len(content)}"
+
+    tail = client.get(url, headers={"Range": "bytes=-100"})
+    assert tail.status_code == 206
+    assert tail.content == content[-100:]
+
+    multi = client.get(url, headers={"Range": "bytes=0-9,20-29"})
+    assert multi.status_code == 416
+    assert multi.headers["content-range"] == f"bytes */{len(content)}"
+
+    outside = client.get(url, headers={"Range": f"bytes={len(content)}-"})
+    assert outside.status_code == 416
+
+
+def test_if_range_mismatch_sends_whole_file(client, served):
+    """If-Range가 현재 ETag와 다르면 Range를 무시하고 전체 전송"""
+    content, url, _ = served
+    etag = client.head(url).headers["etag"]
+
+    matched = client.get(url, headers={"Range": "bytes=0-9", "If-Range": etag})
+    assert matched.status_code == 206
+
+    stale = client.get(url, headers={"Range": "bytes=0-9", "If-Range": '"stale"'})
+    assert stale.status_code == 200
+    assert stale.content == content
+
+
+def test_conditional_requests_return_304(client, served):
+    """ETag나 수정 시각이 같으면 본문 없이 304"""
+    _, url, _ = served
+    first = client.get(url)
+    etag = first.headers["etag"]
+
+    not_modified = client.get(url, headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+
+    assert client.get(url, headers={"If-None-Match": f'"other", W/{etag}'}).status_code == 304
+    assert client.get(url, headers={"If-None-Match": '"other"'}).status_code == 200
+
+    since = first.headers["last-modified"]
+    assert client.get(url, headers={"If-Modified-Since": since}).status_code == 304
+    assert client.get(url, headers={"If-Modified-Since": formatdate(0, usegmt=True)}).status_code == 200
+
+
+def test_archive_digest_etag(client, served):
+    """아카이브에서 온 파일은 내용 해시로 ETag"""
+    _, url, task_id = served
+    task_manager.set_task_archive_digest(task_id, "ab" * 32)
+    assert client.head(url).headers["etag"] == f'"sha256-{"ab" * 32}"'
+
+
+def test_missing_file_returns_404(client, served, tmp_path):
+    """파일이 지워졌으면 404"""
+    _, url, _ = served
+    (tmp_path / "video.mp4").unlink()
+    response = client.get(url)
+    assert response.status_code == 404
@@ -0,0 +1,26 @@
+"""HLS/DASH 조각 다운로드 테스트"""
+
+
+from youtube_downloader.downloader import Downloader
+from youtube_downloader.models import DownloadOptions
+
+
+def test_downloader_sets_fragment_options(test_output_dir):
+    """조각 동시 다운로드/재시도 옵션을 yt-dlp에 전달"""
+    downloader = Downloader(
+        DownloadOptions(output_dir=test_output_dir, concurrent_fragments=8, fragment_retries=3)
+    )
+    opts = downloader._build_ydl_options(None)
+
+    assert opts["concurrent_fragment_downloads"] == 8
+    assert opts["fragment_retries"] == 3
+    assert opts["retry_sleep_functions"]["fragment"](n=10) <= 8.0
+
+
+def test_hls_download_with_concurrent_fragments(tmp_path, media_server):
+    """로컬 HLS 재생목록을 조각 동시 다운로드로 받음"""
+    downloader = Downloader(DownloadOptions(output_dir=tmp_path, concurrent_fragments=4))
+    result = downloader.download(f"{media_server}/hls/index.m3u8")
+
+    assert result.success, result.error_message
+    assert result.file_path.exists() and result.file_path.stat().st_size > 0
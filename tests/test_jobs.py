@@ -0,0 +1,110 @@
+"""다운로드 작업 큐 테스트"""
+
+
+import threading
+import time
+
+import pytest
+
+from youtube_downloader.web.jobs import JobScheduler, QueueFullError
+
+
+def wait_until(condition, timeout=5):
+    """조건이 참이 될 때까지 대기"""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = JobScheduler(max_workers=2, max_queue_size=2)
+    yield scheduler
+    scheduler.shutdown(wait=False)
+
+
+def test_limits_concurrency_and_rejects_when_full(scheduler):
+    """워커 수만큼만 실행하고 대기열이 차면 거절"""
+    release = threading.Event()
+    running = []
+    lock = threading.Lock()
+    peak = [0]
+
+    def job():
+        with lock:
+            running.append(1)
+            peak[0] = max(peak[0], len(running))
+        release.wait(5)
+        with lock:
+            running.pop()
+
+    scheduler.submit("a", job)
+    scheduler.submit("b", job)
+    # 두 워커가 작업을 가져갈 때까지 대기
+    wait_until(lambda: scheduler.stats()["running"] == 2)
+
+    assert scheduler.submit("c", job) == 1
+    assert scheduler.submit("d", job) == 2
+    assert scheduler.position("d") == 2
+    assert scheduler.position("a") is None
+    assert scheduler.is_full()
+
+    with pytest.raises(QueueFullError) as exc_info:
+        scheduler.submit("e", job)
+    assert exc_info.value.retry_after >= 1
+
+    release.set()
+    wait_until(lambda: not (scheduler.stats()["queued"] or scheduler.stats()["running"]))
+
+    assert peak[0] == 2
+    assert scheduler.stats()["queued"] == 0
+
+
+def test_priority_then_fifo_order():
+    """우선순위가 작을수록 먼저, 같으면 들어온 순서대로"""
+    scheduler = JobScheduler(max_workers=1, max_queue_size=10)
+    gate = threading.Event()
+    order = []
+    done = threading.Event()
+
+    scheduler.submit("block", gate.wait, 5)
+    wait_until(lambda: scheduler.stats()["running"] == 1)
+    scheduler.submit("low-1", order.append, "low-1", priority=5)
+    scheduler.submit("low-2", order.append, "low-2", priority=5)
+    assert scheduler.submit("high", order.append, "high", priority=0) == 1
+    scheduler.submit("done", done.set, priority=9)
+
+    gate.set()
+    assert done.wait(5)
+    assert order == ["high", "low-1", "low-2"]
+    scheduler.shutdown()
+
+
+def test_failing_job_does_not_stop_worker():
+    """작업에서 예외가 나도 다음 작업은 실행"""
+    scheduler = JobScheduler(max_workers=1, max_queue_size=10)
+    done = threading.Event()
+
+    def boom():
+        raise RuntimeError("boom")
+
+    scheduler.submit("bad", boom)
+    scheduler.submit("good", done.set)
+
+    assert done.wait(5)
+    scheduler.shutdown()
+
+
+def test_restart_after_shutdown():
+    """종료하면 작업을 거절하고, 다시 시작하면 받음 (서버 lifespan이 여러 번 실행되는 경우)"""
+    scheduler = JobScheduler(max_workers=1, max_queue_size=10)
+    scheduler.shutdown()
+    with pytest.raises(RuntimeError):
+        scheduler.submit("stopped", lambda: None)
+
+    done = threading.Event()
+    scheduler.start()
+    scheduler.submit("restarted", done.set)
+
+    assert done.wait(5)
+    scheduler.shutdown()
@@ -0,0 +1,83 @@
+"""재생목록 열거 테스트"""
+
+
+import pytest
+
+from youtube_downloader import playlist
+from youtube_downloader.playlist import iter_playlist_entries, parse_items, prefetch
+
+
+class FakeYoutubeDL:
+    """페이지를 가져올 때마다 기록하는 가짜 YoutubeDL"""
+
+    fetched: list[int] = []
+
+    def __init__(self, params):
+        self.params = params
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def extract_info(self, url, download=True, process=True, ie_key=None):
+        assert download is False and process is False
+
+        def entries():
+            for i in range(1, 1001):
+                FakeYoutubeDL.fetched.append(i)
+                yield {"_type": "url", "url": f"https://www.youtube.com/watch?v={i}"}
+
+        return {"_type": "playlist", "entries": entries()}
+
+
+@pytest.fixture
+def fake_ydl(monkeypatch):
+    FakeYoutubeDL.fetched = []
+    monkeypatch.setattr(playlist.yt_dlp, "YoutubeDL", FakeYoutubeDL)
+    return FakeYoutubeDL
+
+
+def test_parse_items():
+    """항목 범위 파싱"""
+    assert parse_items("1-100") == [(1, 100)]
+    assert parse_items("1,3, 5-") == [(1, 1), (3, 3), (5, None)]
+    with pytest.raises(ValueError):
+        parse_items("5-2")
+    with pytest.raises(ValueError):
+        parse_items("a-b")
+
+
+def test_entries_stop_after_selected_range(fake_ydl):
+    """선택 범위를 넘는 항목은 가져오지 않음"""
+    urls = list(iter_playlist_entries("https://example.com/list", parse_items("2-3,5")))
+
+    assert urls == [
+        "https://www.youtube.com/watch?v=2",
+        "https://www.youtube.com/watch?v=3",
+        "https://www.youtube.com/watch?v=5",
+    ]
+    assert max(fake_ydl.fetched) <= 6
+
+
+def test_entries_are_lazy(fake_ydl):
+    """첫 항목은 전체 목록을 열거하기 전에 반환됨"""
+    entries = iter_playlist_entries("https://example.com/list")
+    first = next(entries)
+
+    assert first.endswith("v=1")
+    assert len(fake_ydl.fetched) == 1
+
+
+def test_prefetch_propagates_errors():
+    """열거 중 예외는 소비하는 쪽에서 발생"""
+
+    def broken():
+        yield "a"
+        raise RuntimeError("boom")
+
+    it = prefetch(broken(), size=2)
+    assert next(it) == "a"
+    with pytest.raises(RuntimeError):
+        next(it)
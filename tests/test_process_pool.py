@@ -0,0 +1,83 @@
+"""프로세스 풀 다운로드 실행기 테스트"""
+
+
+import socket
+import threading
+import time
+
+import pytest
+
+from youtube_downloader.models import DownloadOptions
+from youtube_downloader.web.process_pool import ProcessDownloadExecutor
+
+
+@pytest.fixture
+def executor(monkeypatch, tmp_path):
+    # 워커 프로세스는 시작할 때 환경 변수에서 설정을 읽음
+    monkeypatch.setenv("CACHE__ENABLED", "false")
+    monkeypatch.setenv("ARCHIVE__ENABLED", "false")
+    executor = ProcessDownloadExecutor(max_workers=1, max_tasks_per_child=1)
+    yield executor
+    executor.shutdown()
+
+
+def test_download_runs_in_worker_process(tmp_path, media_server, executor):
+    """워커 프로세스에서 다운로드하고 진행률은 부모 프로세스로 전달"""
+    events = []
+    options = DownloadOptions(output_dir=tmp_path)
+
+    first = executor.run("job-1", f"{media_server}/clip.mp4", options, events.append)
+    # max_tasks_per_child=1이므로 새 워커 프로세스에서 실행
+    second = executor.run("job-2", f"{media_server}/tone.m4a", options)
+
+    assert first.success and first.file_path == tmp_path / "clip.mp4"
+    assert second.success and second.file_path == tmp_path / "tone.m4a"
+    assert events[-1]["status"] == "finished"
+    assert all(None not in event.values() for event in events)
+
+
+@pytest.fixture
+def stalled_server():
+    """연결만 받고 응답하지 않는 서버 URL"""
+    server = socket.create_server(("127.0.0.1", 0))
+    connections = []
+
+    def accept():
+        while True:
+            try:
+                connections.append(server.accept()[0])
+            except OSError:
+                return
+
+    threading.Thread(target=accept, daemon=True).start()
+    yield f"http://127.0.0.1:{server.getsockname()[1]}/stalled.mp4"
+    server.close()
+    for connection in connections:
+        connection.close()
+
+
+def test_timeout_fails_task_and_replaces_worker(
+    tmp_path, media_server, stalled_server, monkeypatch
+):
+    """제한 시간을 넘긴 작업은 실패로 처리하고 멈춘 워커는 새 풀로 교체"""
+    monkeypatch.setenv("CACHE__ENABLED", "false")
+    monkeypatch.setenv("ARCHIVE__ENABLED", "false")
+    executor = ProcessDownloadExecutor(max_workers=1, max_tasks_per_child=5, timeout=3)
+    try:
+        stuck_pool = executor._pool
+        options = DownloadOptions(output_dir=tmp_path)
+
+        started = time.monotonic()
+        stalled = executor.run("job-stalled", stalled_server, options)
+
+        assert not stalled.success
+        assert "제한 시간" in stalled.error_message
+        assert time.monotonic() - started < 10
+        assert executor._pool is not stuck_pool
+        assert not executor._stuck
+
+        # 워커가 하나뿐이어도 다음 작업은 새 풀에서 실행
+        result = executor.run("job-next", f"{media_server}/tone.m4a", options)
+        assert result.success, result.error_message
+    finally:
+        executor.shutdown()
@@ -0,0 +1,100 @@
+"""진행률 브리지 테스트"""
+
+
+import asyncio
+import threading
+import time
+
+from youtube_downloader.web.progress import ProgressBridge
+from youtube_downloader.web.websocket import (
+    complete_event,
+    error_event,
+    progress_event,
+    status_event,
+)
+
+
+def run_bridge(publish, max_rate=10.0):
+    """서버 루프에서 브리지를 시작하고, 다른 스레드에서 publish(bridge)를 실행한 뒤 보낸 메시지 반환"""
+    sent = []
+
+    async def send(task_id, message):
+        assert threading.current_thread() is threading.main_thread()
+        sent.append((task_id, message))
+
+    async def main():
+        bridge = ProgressBridge(send, max_rate=max_rate)
+        bridge.start()
+        worker = threading.Thread(target=publish, args=(bridge,))
+        worker.start()
+        await asyncio.to_thread(worker.join)
+        # 전송 태스크가 모두 끝날 때까지 대기
+        for _ in range(100):
+            if not bridge.pending():
+                break
+            await asyncio.sleep(0.02)
+        await bridge.stop()
+
+    asyncio.run(main())
+    return sent
+
+
+def test_progress_is_coalesced_and_terminal_event_kept():
+    """진행률은 최신 값만 제한된 횟수로 보내고, 완료 메시지는 마지막에 반드시 보냄"""
+    def publish(bridge):
+        bridge.publish("t", status_event("downloading"))
+        for i in range(1, 1001):
+            bridge.publish("t", progress_event(i // 10, i, 1000))
+        bridge.publish("t", complete_event("video.mp4", 1000, "/file"))
+
+    sent = run_bridge(publish)
+    types = [message["type"] for _, message in sent]
+
+    assert types[0] == "status"
+    assert types[-1] == "complete"
+    progress = [message["data"] for _, message in sent if message["type"] == "progress"]
+    assert 1 <= len(progress) < 10
+    assert progress[-1]["downloaded_bytes"] == 1000
+
+
+def test_tasks_are_independent_and_errors_delivered():
+    """작업마다 따로 합치고, 에러 메시지도 버리지 않음"""
+    def publish(bridge):
+        for i in range(100):
+            bridge.publish("a", progress_event(i, i, 100))
+            bridge.publish("b", progress_event(i, i, 100))
+        bridge.publish("a", complete_event("a.mp4", 100, "/a"))
+        bridge.publish("b", error_event("DOWNLOAD_FAILED", "실패"))
+
+    sent = run_bridge(publish)
+
+    for task_id, last in (("a", "complete"), ("b", "error")):
+        messages = [message for tid, message in sent if tid == task_id]
+        assert messages[-1]["type"] == last
+        assert messages[-2]["data"]["percentage"] == 99
+
+
+def test_progress_rate_is_limited():
+    """초당 max_rate번을 넘지 않음"""
+    elapsed = []
+
+    def publish(bridge):
+        began = time.monotonic()
+        for i in range(30):
+            bridge.publish("t", progress_event(i, i, 30))
+            time.sleep(0.01)
+        elapsed.append(time.monotonic() - began)
+        bridge.publish("t", complete_event("video.mp4", 30, "/file"))
+
+    sent = run_bridge(publish, max_rate=5.0)
+    progress = [message for _, message in sent if message["type"] == "progress"]
+    # 처음 한 번 + 0.2초마다 한 번 + 끝난 뒤 남은 최신 값 한 번
+    assert len(progress) <= elapsed[0] * 5 + 2
+    assert progress[-1]["data"]["percentage"] == 29
+
+
+def test_publish_without_loop_is_ignored():
+    """서버 루프가 없으면 (CLI, 테스트) 아무것도 하지 않음"""
+    bridge = ProgressBridge(lambda task_id, message: None)
+    bridge.publish("t", complete_event("video.mp4", 0, "/file"))
+    assert bridge.pending() == 0
@@ -0,0 +1,146 @@
+"""작업/파일 보관 기간 관리 테스트"""
+
+
+import os
+import threading
+import time
+
+import pytest
+
+from youtube_downloader.archive import DownloadArchive
+from youtube_downloader.web import tasks
+from youtube_downloader.web.jobs import JobScheduler
+from youtube_downloader.web.retention import TaskReaper
+from youtube_downloader.web.task_store import MemoryTaskStore, SQLiteTaskStore
+from youtube_downloader.web.tasks import TaskManager
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def manager(request, tmp_path):
+    if request.param == "memory":
+        store = MemoryTaskStore()
+    else:
+        store = SQLiteTaskStore(tmp_path / "tasks.db")
+    yield TaskManager(store, output_dir=tmp_path / "downloads")
+    store.close()
+
+
+def make_reaper(manager, **kwargs):
+    options = {
+        "ttls": {"completed": 3600, "failed": 600},
+        "max_tasks": 100,
+        "temp_file_ttl": 3600,
+    }
+    options.update(kwargs)
+    return TaskReaper(manager, **options)
+
+
+def finished_task(manager, name, age=0, size=1000):
+    """결과 파일이 있는 완료 작업 (age초 전에 끝남)"""
+    task_id = manager.create_task(f"https://youtu.be/{name}", {})
+    path = manager.output_dir / f"{name}.mp4"
+    path.write_bytes(b"x" * size)
+    manager.set_task_file_path(task_id, path)
+    manager.complete_task(task_id)
+    if age:
+        manager.store.update(task_id, {"updated_at": time.monotonic() - age})
+    return task_id, path
+
+
+def test_expired_tasks_and_files_are_removed(manager):
+    """상태별 보관 시간이 지난 작업과 결과 파일 삭제"""
+    old_id, old_path = finished_task(manager, "old", age=7200, size=4096)
+    new_id, new_path = finished_task(manager, "new")
+    running = manager.create_task("https://youtu.be/running", {})
+    manager.store.update(running, {"status": "downloading", "updated_at": time.monotonic() - 86400})
+
+    stats = make_reaper(manager).run_once()
+
+    assert manager.get_task(old_id) is None and not old_path.exists()
+    assert manager.get_task(new_id) is not None and new_path.exists()
+    # 진행 중 상태는 TTL을 설정하지 않았으므로 유지
+    assert manager.get_task(running) is not None
+    assert stats.expired_tasks == 1
+    assert stats.reclaimed_bytes == 4096
+    assert stats.tasks == 2
+
+
+def test_least_recently_used_tasks_are_evicted(manager):
+    """최대 작업 수를 넘으면 가장 오래 조회되지 않은 완료 작업부터 삭제"""
+    first, _ = finished_task(manager, "first")
+    second, _ = finished_task(manager, "second")
+    third, _ = finished_task(manager, "third")
+    active = manager.create_task("https://youtu.be/active", {})
+    time.sleep(0.01)
+    manager.get_task(first)
+
+    stats = make_reaper(manager, max_tasks=2).run_once()
+
+    assert manager.get_task(second) is None
+    assert manager.get_task(third) is None
+    assert manager.get_task(first) is not None
+    assert manager.get_task(active) is not None
+    assert stats.evicted_tasks == 2
+
+
+def test_stale_temp_and_partial_files_are_removed(manager):
+    """오래된 임시/부분 파일만 삭제하고 완성된 결과 파일은 남김"""
+    old = time.time() - 7200
+    stale_temp = manager.get_temp_file_path("abc", "video.mp4")
+    stale_temp.write_bytes(b"x" * 100)
+    fresh_temp = manager.get_temp_file_path("def", "video.mp4")
+    fresh_temp.write_bytes(b"x" * 100)
+    partial = manager.output_dir / "video.mp4.part"
+    partial.write_bytes(b"x" * 50)
+    finished = manager.output_dir / "video.mp4"
+    finished.write_bytes(b"x" * 10)
+    for path in (stale_temp, partial, finished):
+        os.utime(path, (old, old))
+
+    stats = make_reaper(manager).run_once()
+
+    assert not stale_temp.exists() and not partial.exists()
+    assert fresh_temp.exists() and finished.exists()
+    assert stats.deleted_temp_files == 2
+    assert stats.reclaimed_bytes == 150
+
+
+def test_queued_pending_tasks_are_not_reaped(manager):
+    """대기열에서 차례를 기다리는 작업은 오래돼도 남기고, 스케줄러가 모르는 작업만 삭제"""
+    scheduler = JobScheduler(max_workers=1, max_queue_size=10)
+    release = threading.Event()
+    scheduler.submit("blocker", release.wait)
+
+    queued = manager.create_task("https://youtu.be/queued", {})
+    orphan = manager.create_task("https://youtu.be/orphan", {})
+    scheduler.submit(queued, lambda: None)
+    for task_id in (queued, orphan):
+        manager.store.update(task_id, {"updated_at": time.monotonic() - 86400})
+
+    try:
+        stats = make_reaper(manager, ttls={"pending": 3600}, is_held=scheduler.holds).run_once()
+    finally:
+        release.set()
+        scheduler.shutdown()
+
+    assert manager.get_task(queued) is not None
+    assert manager.get_task(orphan) is None
+    assert stats.expired_tasks == 1
+
+
+def test_expired_archived_file_reclaims_archive_object(manager, tmp_path, monkeypatch):
+    """결과 파일이 아카이브 객체의 하드 링크면 마지막 참조를 지울 때 객체까지 지우고 용량을 셈"""
+    archive = DownloadArchive(tmp_path / "archive")
+    monkeypatch.setattr(tasks, "get_download_archive", lambda: archive)
+    task_id, path = finished_task(manager, "archived", size=4096)
+    entry = archive.add("youtube:archived|best", path)
+    archive.acquire(entry.digest, task_id)
+    manager.set_task_archive_digest(task_id, entry.digest)
+    manager.store.update(task_id, {"updated_at": time.monotonic() - 7200})
+
+    stats = make_reaper(manager).run_once()
+
+    assert not path.exists() and not entry.path.exists()
+    assert archive.lookup("youtube:archived|best") is None
+    assert stats.reclaimed_bytes == 4096
+    archive.close()
@@ -0,0 +1,184 @@
+"""다중 연결 구간 다운로더 테스트"""
+
+
+import hashlib
+import os
+import time
+import urllib.request
+
+import pytest
+
+from youtube_downloader import segmented
+from youtube_downloader.downloader import Downloader
+from youtube_downloader.models import DownloadOptions
+from youtube_downloader.segmented import (
+    SegmentedDownloader,
+    SegmentedDownloadError,
+    split_segments,
+)
+
+BLOB_SIZE = 3 * 1024 * 1024 + 123
+
+
+@pytest.fixture(scope="module")
+def blob(media_dir):
+    """media_server로 제공되는 임의 데이터 파일 (이름, 내용)"""
+    data = os.urandom(BLOB_SIZE)
+    (media_dir / "blob.bin").write_bytes(data)
+    return "blob.bin", data
+
+
+def open_url(url, headers):
+    return urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=10)
+
+
+class FlakyOpener:
+    """요청마다 일정 바이트만 보내고 연결을 끊는 opener (fail_from 이후 구간은 항상 실패)"""
+
+    def __init__(self, cut_after=None, fail_from=None):
+        self.cut_after = cut_after
+        self.fail_from = fail_from
+        self.received = 0
+
+    def __call__(self, url, headers):
+        start = int(headers["Range"].split("=")[1].split("-")[0])
+        if self.fail_from is not None and start >= self.fail_from:
+            raise OSError("connection refused")
+        response = open_url(url, headers)
+        opener = self
+
+        class Response:
+            status = response.status
+            headers = response.headers
+            sent = 0
+
+            def read(self, amt=None):
+                if opener.cut_after is not None and self.sent >= opener.cut_after:
+                    return b""
+                chunk = response.read(amt)
+                self.sent += len(chunk)
+                opener.received += len(chunk)
+                return chunk
+
+            def close(self):
+                response.close()
+
+        return Response()
+
+
+def test_split_segments_covers_whole_range():
+    """구간이 빈틈없이 전체를 덮음"""
+    segments = split_segments(10, 3)
+    assert [(s.start, s.end) for s in segments] == [(0, 3), (4, 6), (7, 9)]
+    assert sum(s.size for s in split_segments(BLOB_SIZE, 7)) == BLOB_SIZE
+
+
+def test_download_matches_source(tmp_path, media_server, blob):
+    """여러 연결로 받은 파일이 원본과 같음"""
+    name, data = blob
+    engine = SegmentedDownloader(connections=4, min_segment_size=256 * 1024, opener=open_url)
+    progress = []
+
+    total = engine.probe(f"{media_server}/{name}")
+    received = engine.download(
+        f"{media_server}/{name}", tmp_path / name, total,
+        progress=lambda done, size: progress.append(done),
+    )
+
+    assert total == received == BLOB_SIZE
+    assert hashlib.sha256((tmp_path / name).read_bytes()).digest() == hashlib.sha256(data).digest()
+    assert progress[-1] == BLOB_SIZE
+    assert not (tmp_path / f"{name}.segments").exists()
+
+
+def test_dropped_connections_are_retried(tmp_path, media_server, blob, monkeypatch):
+    """연결이 끊겨도 받은 위치부터 다시 요청"""
+    monkeypatch.setattr(segmented.time, "sleep", lambda seconds: None)
+    name, data = blob
+    opener = FlakyOpener(cut_after=200 * 1024)
+    engine = SegmentedDownloader(connections=3, min_segment_size=512 * 1024, retries=2, opener=opener)
+
+    engine.download(f"{media_server}/{name}", tmp_path / name, BLOB_SIZE)
+
+    assert (tmp_path / name).read_bytes() == data
+    assert opener.received == BLOB_SIZE
+
+
+def test_failed_download_resumes(tmp_path, media_server, blob, monkeypatch):
+    """실패한 구간만 이어받음"""
+    monkeypatch.setattr(segmented.time, "sleep", lambda seconds: None)
+    name, data = blob
+    url = f"{media_server}/{name}"
+    half = BLOB_SIZE // 2
+
+    failing = FlakyOpener(fail_from=half)
+    engine = SegmentedDownloader(connections=2, min_segment_size=256 * 1024, retries=1, opener=failing)
+    with pytest.raises(SegmentedDownloadError):
+        engine.download(url, tmp_path / name, BLOB_SIZE)
+    assert (tmp_path / f"{name}.segments").exists()
+
+    resuming = FlakyOpener()
+    engine = SegmentedDownloader(connections=2, min_segment_size=256 * 1024, opener=resuming)
+    engine.download(url, tmp_path / name, BLOB_SIZE)
+
+    assert (tmp_path / name).read_bytes() == data
+    assert failing.received + resuming.received == BLOB_SIZE
+
+
+def test_downloader_uses_segmented_engine(tmp_path, media_server, blob, monkeypatch):
+    """connections가 2 이상이면 yt-dlp 다운로드에 구간 다운로더 사용"""
+    monkeypatch.setattr(segmented, "MIN_SEGMENT_SIZE", 256 * 1024)
+    calls = []
+    original = SegmentedDownloader.download
+
+    def spy(self, *args, **kwargs):
+        calls.append(self.connections)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(SegmentedDownloader, "download", spy)
+    name, data = blob
+
+    downloader = Downloader(DownloadOptions(output_dir=tmp_path, connections=4))
+    result = downloader.download(f"{media_server}/{name}")
+
+    assert result.success, result.error_message
+    assert calls == [4]
+    assert result.file_path.read_bytes() == data
+
+
+def test_rate_limit_applies_across_connections(tmp_path, media_server, blob):
+    """속도 제한은 연결마다가 아니라 전체 합에 적용"""
+    name, data = blob
+    rate = 4 * 1024 * 1024
+    engine = SegmentedDownloader(
+        connections=4, min_segment_size=256 * 1024, opener=open_url, rate_limit=rate
+    )
+
+    started = time.monotonic()
+    engine.download(f"{media_server}/{name}", tmp_path / name, BLOB_SIZE)
+    elapsed = time.monotonic() - started
+
+    assert (tmp_path / name).read_bytes() == data
+    assert elapsed >= BLOB_SIZE / rate * 0.9
+
+
+def test_downloader_passes_rate_limit_to_segmented_engine(
+    tmp_path, media_server, blob, monkeypatch
+):
+    """yt-dlp의 ratelimit 옵션이 구간 다운로더에도 전달됨"""
+    monkeypatch.setattr(segmented, "MIN_SEGMENT_SIZE", 256 * 1024)
+    limits = []
+    original = SegmentedDownloader.download
+
+    def spy(self, *args, **kwargs):
+        limits.append(self.rate_limit)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(SegmentedDownloader, "download", spy)
+    name, _ = blob
+
+    options = DownloadOptions(output_dir=tmp_path, connections=4, rate_limit=64 * 1024 * 1024)
+    result = Downloader(options).download(f"{media_server}/{name}")
+
+    assert result.success, result.error_message
+    assert limits == [64 * 1024 * 1024]
@@ -0,0 +1,105 @@
+"""동일 다운로드 요청 합치기 테스트"""
+
+
+import threading
+
+from youtube_downloader.models import DownloadResult
+from youtube_downloader.web import api
+from youtube_downloader.web.models import DownloadOptions
+from youtube_downloader.web.singleflight import DownloadFlights, flight_key
+from youtube_downloader.web.tasks import task_manager
+
+
+def test_flight_key_normalizes_url_and_options():
+    """URL 형식과 결과에 영향 없는 옵션은 키에 영향 없음"""
+    options = DownloadOptions(quality="720P", audio_quality="320")
+    same = DownloadOptions(quality="720p", audio_quality="128")
+
+    assert flight_key("https://youtu.be/jNQXAC9IVRw", options) == flight_key(
+        "https://www.youtube.com/watch?v=jNQXAC9IVRw", same
+    )
+    assert flight_key(
+        "https://youtu.be/jNQXAC9IVRw", DownloadOptions(audio_only=True, audio_quality="320")
+    ) != flight_key(
+        "https://youtu.be/jNQXAC9IVRw", DownloadOptions(audio_only=True, audio_quality="128")
+    )
+
+
+def test_join_and_finish():
+    """첫 작업이 leader, 종료 후에는 새 다운로드"""
+    flights = DownloadFlights()
+
+    assert flights.join("k", "a") is None
+    assert flights.join("k", "b") == "a"
+    assert flights.finish("k") == ["a", "b"]
+    assert flights.join("k", "c") is None
+
+
+def test_subscribers_receive_leader_result(monkeypatch, tmp_path):
+    """합류한 작업도 같은 파일로 완료"""
+    file_path = tmp_path / "video.mp4"
+    file_path.write_bytes(b"data")
+    options = DownloadOptions()
+    url = "https://www.youtube.com/watch?v=jNQXAC9IVRw"
+    key = flight_key(url, options)
+
+    leader = task_manager.create_task(url=url, options=options.model_dump())
+    follower = task_manager.create_task(url=url, options=options.model_dump())
+    assert api.download_flights.join(key, leader) is None
+    assert api.download_flights.join(key, follower) == leader
+
+    class FakeDownloader:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def download(self, url, progress_callback=None, message_callback=None):
+            progress_callback({"status": "downloading", "downloaded_bytes": 5, "total_bytes": 10})
+            assert task_manager.get_task(follower)["progress"]["percentage"] == 50
+            return DownloadResult(success=True, file_path=file_path)
+
+    monkeypatch.setattr(api, "Downloader", FakeDownloader)
+    monkeypatch.setattr(api, "get_download_archive", lambda: None)
+
+    api.download_task(leader, url, options, flight_key=key)
+
+    for task_id in (leader, follower):
+        task = task_manager.get_task(task_id)
+        assert task["status"] == "completed"
+        assert task["file_path"] == str(file_path)
+    assert api.download_flights.subscribers(key) == []
+
+
+def test_join_callback_runs_before_finish():
+    """합류 처리(상태 복사)가 끝나기 전에는 leader가 종료할 수 없음"""
+    flights = DownloadFlights()
+    flights.join("k", "a")
+    finished = []
+
+    def copy_state(leader):
+        thread = threading.Thread(target=lambda: finished.append(flights.finish("k")))
+        thread.start()
+        thread.join(0.1)
+        # leader의 finish()는 합류가 끝날 때까지 기다림
+        assert thread.is_alive()
+        copy_state.thread = thread
+
+    assert flights.join("k", "b", on_join=copy_state) == "a"
+    copy_state.thread.join(1)
+    assert finished == [["a", "b"]]
+
+
+def test_deleting_one_subscriber_keeps_shared_file(tmp_path):
+    """아카이브가 없어도 같은 파일을 쓰는 다른 작업이 있으면 파일을 지우지 않음"""
+    file_path = tmp_path / "video.mp4"
+    file_path.write_bytes(b"data")
+    task_ids = [task_manager.create_task("https://youtu.be/shared", {}) for _ in range(2)]
+    for task_id in task_ids:
+        task_manager.set_task_file_path(task_id, file_path)
+        task_manager.complete_task(task_id)
+
+    assert task_manager.delete_task(task_ids[0]) == 0
+    assert file_path.exists()
+    assert task_manager.get_task(task_ids[1])["file_path"] == str(file_path)
+
+    assert task_manager.delete_task(task_ids[1]) == 4
+    assert not file_path.exists()
@@ -0,0 +1,161 @@
+"""상태 조회 long-poll / ETag / SSE 테스트"""
+
+
+import threading
+import time
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from youtube_downloader.web.app import app
+from youtube_downloader.web.auth_api import get_current_user
+from youtube_downloader.web.progress import progress_bridge
+from youtube_downloader.web.tasks import task_manager
+from youtube_downloader.web.websocket import complete_event, manager, progress_event, status_event
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+def status_url(task_id):
+    return f"/api/v1/download/{task_id}/status"
+
+
+def test_unchanged_status_returns_304(client):
+    """ETag나 since_version이 최신이면 본문 없이 304"""
+    task_id = task_manager.create_task("https://youtu.be/etag", {})
+
+    first = client.get(status_url(task_id))
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    version = first.json()["data"]["version"]
+
+    assert client.get(status_url(task_id), headers={"If-None-Match": etag}).status_code == 304
+    assert client.get(status_url(task_id), params={"since_version": version}).status_code == 304
+
+    task_manager.update_task_progress(task_id, 10, 10, 100)
+    changed = client.get(status_url(task_id), headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.json()["data"]["version"] > version
+
+
+def test_long_poll_returns_when_task_changes(client):
+    """wait 동안 바뀌면 바로 응답하고, 끝까지 안 바뀌면 304"""
+    task_id = task_manager.create_task("https://youtu.be/long-poll", {})
+    version = client.get(status_url(task_id)).json()["data"]["version"]
+
+    def update():
+        time.sleep(0.2)
+        task_manager.update_task_progress(task_id, 50, 50, 100)
+        progress_bridge.publish(task_id, progress_event(50, 50, 100))
+
+    threading.Thread(target=update).start()
+    began = time.monotonic()
+    response = client.get(status_url(task_id), params={"wait": 5, "since_version": version})
+    assert response.status_code == 200
+    assert response.json()["data"]["progress"]["percentage"] == 50
+    assert time.monotonic() - began < 2
+
+    version = response.json()["data"]["version"]
+    began = time.monotonic()
+    response = client.get(status_url(task_id), params={"wait": 0.3, "since_version": version})
+    assert response.status_code == 304
+    assert time.monotonic() - began >= 0.3
+
+
+def read_events(response):
+    """SSE 응답을 (event, data) 목록으로"""
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        events.append((fields["event"], fields["data"]))
+    return events
+
+
+def test_event_stream_replays_and_closes_after_complete(client):
+    """SSE 스트림은 지난 이벤트부터 보내고 완료 후 닫힘"""
+    task_id = task_manager.create_task("https://youtu.be/sse", {})
+    progress_bridge.publish(task_id, status_event("downloading"))
+    progress_bridge.publish(task_id, progress_event(30, 30, 100))
+    progress_bridge.publish(task_id, complete_event("video.mp4", 100, "/file"))
+
+    deadline = time.monotonic() + 2
+    while len(manager.history.get(task_id, ())) < 3:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+    response = client.get(f"/api/v1/download/{task_id}/events")
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert [event for event, _ in read_events(response)] == ["status", "progress", "complete"]
+
+
+def test_event_stream_for_finished_task_without_history(client):
+    """이벤트 기록이 없는 끝난 작업은 저장된 결과로 마지막 이벤트만 보냄"""
+    task_id = task_manager.create_task("https://youtu.be/sse-failed", {})
+    task_manager.fail_task(task_id, {"code": "DOWNLOAD_FAILED", "message": "실패"})
+
+    events = read_events(client.get(f"/api/v1/download/{task_id}/events"))
+    assert events == [("error", '{"code": "DOWNLOAD_FAILED", "message": "실패"}')]
+
+
+def test_missing_task_is_404(client):
+    assert client.get(status_url("missing"), params={"wait": 1}).status_code == 404
+    assert client.get("/api/v1/download/missing/events").status_code == 404
+
+
+def test_batch_status_returns_many_tasks(client, tmp_path):
+    """여러 작업 요약 상태를 한 번에, 파일 크기는 완료 시 저장한 값 사용"""
+    running = task_manager.create_task("https://youtu.be/batch-1", {})
+    task_manager.update_task_status(running, "downloading")
+    task_manager.update_task_progress(running, 25, 25, 100, "1.00MiB/s", "00:03")
+
+    finished = task_manager.create_task("https://youtu.be/batch-2", {})
+    path = tmp_path / "video.mp4"
+    path.write_bytes(b"x" * 123)
+    task_manager.set_task_file_path(finished, path)
+    task_manager.complete_task(finished)
+    # 상태 조회 때 파일을 다시 stat하지 않음
+    path.unlink()
+
+    response = client.get(
+        "/api/v1/downloads/status", params=[("ids", f"{running},missing"), ("ids", finished)]
+    )
+    body = response.json()
+
+    assert response.status_code == 200
+    assert [task["task_id"] for task in body["data"]] == [running, finished]
+    assert body["missing"] == ["missing"]
+    assert body["data"][0]["percentage"] == 25
+    assert "file" not in body["data"][0]
+    assert body["data"][1]["file"]["size"] == 123
+
+
+def test_batch_status_limits_task_count(client):
+    ids = ",".join(f"t{i}" for i in range(101))
+    assert client.get("/api/v1/downloads/status", params={"ids": ids}).status_code == 400
+
+
+def test_active_downloads_lists_only_my_active_tasks(client):
+    """내 작업 중 진행 중인 것만 최근 생성 순으로"""
+    user_id = str(uuid.uuid4())
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=user_id)
+    try:
+        older = task_manager.create_task("https://youtu.be/a1", {}, user_id=user_id)
+        newer = task_manager.create_task("https://youtu.be/a2", {}, user_id=user_id)
+        task_manager.update_task_status(newer, "downloading")
+        done = task_manager.create_task("https://youtu.be/a3", {}, user_id=user_id)
+        task_manager.complete_task(done)
+        task_manager.create_task("https://youtu.be/a4", {}, user_id="someone-else")
+
+        body = client.get("/api/v1/downloads/active").json()
+    finally:
+        app.dependency_overrides.clear()
+
+    assert [task["task_id"] for task in body["data"]] == [newer, older]
+    assert [task["status"] for task in body["data"]] == ["downloading", "pending"]
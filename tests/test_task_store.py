@@ -0,0 +1,190 @@
+"""작업 저장소 테스트"""
+
+
+import sqlite3
+import time
+
+import pytest
+
+from youtube_downloader.config import WebSettings
+from youtube_downloader.web.task_store import MemoryTaskStore, SQLiteTaskStore, TaskRecord
+from youtube_downloader.web.tasks import TaskManager, create_task_store
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def manager(request, tmp_path):
+    if request.param == "memory":
+        store = MemoryTaskStore()
+    else:
+        store = SQLiteTaskStore(tmp_path / "tasks.db", flush_interval=60)
+    yield TaskManager(store)
+    store.close()
+
+
+def test_task_lifecycle(manager):
+    """생성부터 완료까지 같은 API로 동작"""
+    task_id = manager.create_task("https://youtu.be/abc", {"quality": "720p"}, user_id="u1")
+    manager.update_task_status(task_id, "downloading")
+    manager.update_task_progress(task_id, 50, 500, 1000, "1MiB/s", "00:01")
+    manager.set_task_video_info(task_id, {"title": "제목"})
+    manager.set_task_file_path(task_id, "/tmp/video.mp4")
+    manager.complete_task(task_id)
+
+    task = manager.get_task(task_id)
+    assert task["status"] == "completed"
+    assert task["user_id"] == "u1"
+    assert task["options"] == {"quality": "720p"}
+    assert task["progress"]["percentage"] == 50
+    assert task["video_info"] == {"title": "제목"}
+    assert task["file_path"] == "/tmp/video.mp4"
+    assert task["completed_at"] >= task["created_at"]
+
+    manager.delete_task(task_id)
+    assert manager.get_task(task_id) is None
+
+
+def test_list_tasks_filters_by_status_and_user(manager):
+    """상태/사용자로 거른 목록을 최근 생성 순으로 반환"""
+    first = manager.create_task("https://youtu.be/a", {}, user_id="u1")
+    second = manager.create_task("https://youtu.be/b", {}, user_id="u1")
+    other = manager.create_task("https://youtu.be/c", {}, user_id="u2")
+    manager.fail_task(other, {"code": "DOWNLOAD_FAILED", "message": "x"})
+
+    assert [task["task_id"] for task in manager.list_tasks(user_id="u1")] == [second, first]
+    assert [task["task_id"] for task in manager.list_tasks(status="failed")] == [other]
+    assert manager.list_tasks(status="pending", limit=1)[0]["task_id"] == second
+
+
+def test_list_tasks_filters_by_several_statuses(manager):
+    """여러 상태 중 하나인 사용자 작업을 한 번에 최근 생성 순으로 반환"""
+    pending = manager.create_task("https://youtu.be/a", {}, user_id="u1")
+    downloading = manager.create_task("https://youtu.be/b", {}, user_id="u1")
+    manager.update_task_status(downloading, "downloading")
+    done = manager.create_task("https://youtu.be/c", {}, user_id="u1")
+    manager.complete_task(done)
+    manager.create_task("https://youtu.be/d", {}, user_id="u2")
+
+    active = ("pending", "downloading")
+    tasks = manager.list_tasks(user_id="u1", statuses=active)
+    assert [task["task_id"] for task in tasks] == [downloading, pending]
+    assert len(manager.list_tasks(statuses=active)) == 3
+    assert len(manager.list_tasks(user_id="u1", statuses=active, limit=1)) == 1
+
+
+def test_get_tasks_returns_found_tasks_in_order(manager):
+    """여러 작업을 한 번에 조회 (없는 ID는 빠지고 요청 순서 유지, 기록 전 진행률 반영)"""
+    first = manager.create_task("https://youtu.be/a", {})
+    second = manager.create_task("https://youtu.be/b", {})
+    manager.update_task_progress(second, 70, 70, 100)
+
+    tasks = manager.get_tasks([second, "missing", first, second])
+
+    assert [task["task_id"] for task in tasks] == [second, first]
+    assert tasks[0]["progress"]["percentage"] == 70
+
+
+def test_version_increases_on_every_change(manager):
+    """상태 변경과 (모아서 기록하는) 진행률 갱신 모두 버전을 올림"""
+    task_id = manager.create_task("https://youtu.be/abc", {})
+    assert manager.get_task(task_id)["version"] == 0
+
+    manager.update_task_status(task_id, "downloading")
+    manager.update_task_progress(task_id, 10, 10, 100)
+    manager.update_task_progress(task_id, 20, 20, 100)
+    assert manager.get_task(task_id)["version"] == 3
+
+    manager.complete_task(task_id)
+    manager.store.flush()
+    assert manager.get_task(task_id)["version"] == 4
+
+
+def test_file_references_follow_updates_and_deletes(manager):
+    """결과 파일 참조 수는 경로 변경과 삭제를 따라감"""
+    first = manager.create_task("https://youtu.be/a", {})
+    second = manager.create_task("https://youtu.be/a", {})
+    manager.set_task_file_path(first, "/tmp/a.mp4")
+    manager.set_task_file_path(second, "/tmp/a.mp4")
+    assert manager.store.file_references("/tmp/a.mp4") == 2
+
+    manager.set_task_file_path(second, "/tmp/b.mp4")
+    assert manager.store.file_references("/tmp/a.mp4") == 1
+    assert manager.store.file_references("/tmp/b.mp4") == 1
+
+    manager.store.delete(first)
+    assert manager.store.file_references("/tmp/a.mp4") == 0
+    assert manager.store.file_references("/tmp/b.mp4") == 1
+
+
+def test_memory_store_updates_progress_in_place():
+    """진행률 틱마다 새 객체를 만들지 않고 같은 레코드를 고쳐 씀"""
+    store = MemoryTaskStore()
+    record = TaskRecord(task_id="t", url="https://youtu.be/abc", options={})
+    store.insert(record)
+
+    store.update_progress("t", 10, 10, 100)
+    progress = record.progress
+    store.update_progress("t", 20, 20, 100, "1MiB/s", "00:01")
+
+    assert record.progress is progress
+    assert store.get("t")["progress"] == {
+        "percentage": 20, "downloaded_bytes": 20, "total_bytes": 100, "speed": "1MiB/s", "eta": "00:01",
+    }
+    assert record.updated_at >= record.created_at
+    assert not hasattr(record, "__dict__")
+
+
+def test_sqlite_store_survives_restart(tmp_path):
+    """다시 연 저장소(재시작, 다른 워커)에서도 작업이 보임"""
+    path = tmp_path / "tasks.db"
+    store = SQLiteTaskStore(path)
+    task_id = TaskManager(store).create_task("https://youtu.be/abc", {}, user_id="u1")
+    TaskManager(store).update_task_status(task_id, "downloading")
+
+    other = SQLiteTaskStore(path)
+    assert TaskManager(other).get_task(task_id)["status"] == "downloading"
+    store.close()
+    other.close()
+
+
+def test_sqlite_progress_writes_are_batched(tmp_path):
+    """진행률은 모아서 기록하고, 상태 변경 때는 바로 반영"""
+    path = tmp_path / "tasks.db"
+    store = SQLiteTaskStore(path, flush_interval=60)
+    manager = TaskManager(store)
+    task_id = manager.create_task("https://youtu.be/abc", {})
+
+    for percentage in range(1, 51):
+        manager.update_task_progress(task_id, percentage, percentage, 100)
+
+    def on_disk():
+        with sqlite3.connect(path) as conn:
+            return conn.execute("SELECT progress FROM tasks WHERE task_id = ?", (task_id,)).fetchone()[0]
+
+    # 같은 프로세스에서는 바로 보이지만 디스크에는 아직 없음
+    assert manager.get_task(task_id)["progress"]["percentage"] == 50
+    assert on_disk() is None
+
+    manager.complete_task(task_id)
+    assert '"percentage": 50' in on_disk()
+
+
+def test_sqlite_progress_flushes_after_interval(tmp_path):
+    """간격이 지나면 다음 진행률 갱신 때 한꺼번에 기록"""
+    path = tmp_path / "tasks.db"
+    store = SQLiteTaskStore(path, flush_interval=0.05)
+    manager = TaskManager(store)
+    task_ids = [manager.create_task(f"https://youtu.be/{i}", {}) for i in range(3)]
+    for task_id in task_ids:
+        manager.update_task_progress(task_id, 10, 10, 100)
+    time.sleep(0.06)
+    manager.update_task_progress(task_ids[0], 20, 20, 100)
+
+    other = TaskManager(SQLiteTaskStore(path))
+    assert [other.get_task(task_id)["progress"]["percentage"] for task_id in task_ids] == [20, 10, 10]
+
+
+def test_default_store_is_memory(monkeypatch):
+    """기본 저장소는 메모리 (import만으로 sqlite 파일을 만들지 않음)"""
+    monkeypatch.delenv("WEB__TASK_STORE", raising=False)
+    assert WebSettings().task_store == "memory"
+    assert isinstance(create_task_store(), MemoryTaskStore)
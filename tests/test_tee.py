@@ -0,0 +1,185 @@
+"""다운로드 중 파일 스트리밍 (tee) 테스트"""
+
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from youtube_downloader.models import DownloadResult
+from youtube_downloader.web import api
+from youtube_downloader.web.app import app
+from youtube_downloader.web.models import DownloadOptions
+from youtube_downloader.web.progress import progress_bridge
+from youtube_downloader.web.tasks import task_manager
+from youtube_downloader.web.tee import TeeAborted, stream_source, tee
+from youtube_downloader.web.websocket import complete_event, manager, progress_event
+
+
+def hook(filename, protocol="https", format_id="18", **info):
+    return {
+        "status": "downloading",
+        "filename": filename,
+        "tmpfilename": f"{filename}.part",
+        "info_dict": {"protocol": protocol, "format_id": format_id, **info},
+    }
+
+
+def test_stream_source_only_for_files_written_as_is(tmp_path):
+    """그대로 최종 파일이 되는 다운로드만 스트리밍"""
+    video = str(tmp_path / "video.mp4")
+    assert stream_source(hook(video)) == tmp_path / "video.mp4.part"
+
+    # process 모드: info_dict 대신 펼친 키
+    flat = {"filename": video, "tmpfilename": f"{video}.part", "protocol": "https", "format_id": "18"}
+    assert stream_source(flat) == tmp_path / "video.mp4.part"
+
+    assert stream_source(hook(str(tmp_path / "video.f137.mp4"), format_id="137")) is None
+    assert stream_source(hook(video, protocol="m3u8_native")) is None
+    assert stream_source(hook(str(tmp_path / "audio.m4a"), container="m4a_dash")) is None
+    assert stream_source({"filename": video}) is None
+
+    (tmp_path / "video.mp4.part.segments").write_text("{}")
+    assert stream_source(hook(video)) is None
+
+
+def downloading_task(tmp_path, data):
+    task_id = task_manager.create_task("https://youtu.be/tee", {})
+    task_manager.update_task_status(task_id, "downloading")
+    partial = tmp_path / "video.mp4.part"
+    partial.write_bytes(data)
+    task_manager.set_task_partial_path(task_id, partial)
+    return task_id, partial
+
+
+def finish_download(task_id, partial):
+    final = partial.with_name("video.mp4")
+    partial.rename(final)
+    task_manager.set_task_file_path(task_id, final)
+    task_manager.complete_task(task_id)
+    return final
+
+
+def test_tee_sends_bytes_before_completion(tmp_path):
+    """완료 전에 받은 만큼 보내고, 완료 이벤트 후 나머지를 보내고 끝남"""
+    task_id, partial = downloading_task(tmp_path, b"a" * 10)
+
+    async def main():
+        stream = tee(task_id, open(partial, "rb"), chunk_size=4)
+        received = [await anext(stream) for _ in range(3)]
+        assert b"".join(received) == b"a" * 10
+
+        pending = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0.05)
+        assert not pending.done()
+
+        with open(partial, "ab") as f:
+            f.write(b"b" * 6)
+        await manager.send_message(task_id, progress_event(50, 16, 32))
+        received.append(await asyncio.wait_for(pending, 1))
+
+        with open(partial, "ab") as f:
+            f.write(b"c" * 16)
+        finish_download(task_id, partial)
+        await manager.send_message(task_id, complete_event("video.mp4", 32, "/file"))
+        async for chunk in stream:
+            received.append(chunk)
+        return b"".join(received)
+
+    assert asyncio.run(main()) == b"a" * 10 + b"b" * 6 + b"c" * 16
+
+
+def test_tee_aborts_on_failure_or_replaced_file(tmp_path):
+    """다운로드가 실패하거나 후처리로 파일이 바뀌면 연결을 끊음"""
+    task_id, partial = downloading_task(tmp_path, b"data")
+    task_manager.fail_task(task_id, {"code": "DOWNLOAD_FAILED", "message": "x"})
+
+    async def drain(stream):
+        return [chunk async for chunk in stream]
+
+    with pytest.raises(TeeAborted):
+        asyncio.run(drain(tee(task_id, open(partial, "rb"))))
+
+    task_id, partial = downloading_task(tmp_path, b"data")
+    stream = tee(task_id, open(partial, "rb"))
+    remuxed = tmp_path / "video.mkv"
+    remuxed.write_bytes(b"remuxed")
+    partial.unlink()
+    task_manager.set_task_file_path(task_id, remuxed)
+    task_manager.complete_task(task_id)
+    with pytest.raises(TeeAborted):
+        asyncio.run(drain(stream))
+
+
+def test_stream_endpoint(tmp_path):
+    """stream=true면 받는 중인 파일을 보내고, 스트리밍할 수 없으면 완료까지 기다림"""
+    task_id, partial = downloading_task(tmp_path, b"x" * 1000)
+
+    def download():
+        for _ in range(5):
+            time.sleep(0.05)
+            with open(partial, "ab") as f:
+                f.write(b"y" * 1000)
+            progress_bridge.publish(task_id, progress_event(50, 1000, 6000))
+        finish_download(task_id, partial)
+        progress_bridge.publish(task_id, complete_event("video.mp4", 6000, "/file"))
+
+    with TestClient(app) as client:
+        threading.Thread(target=download).start()
+        response = client.get(f"/api/v1/download/{task_id}/file", params={"stream": True})
+        assert response.status_code == 200
+        assert response.content == b"x" * 1000 + b"y" * 5000
+        assert response.headers["content-type"] == "video/mp4"
+        assert response.headers["accept-ranges"] == "none"
+
+        # 스트리밍할 수 없는 작업 (partial_path 없음): 완료 후 일반 응답
+        waiting = task_manager.create_task("https://youtu.be/merge", {})
+        task_manager.update_task_status(waiting, "downloading")
+        final = tmp_path / "merged.mkv"
+        final.write_bytes(b"merged")
+
+        def complete():
+            time.sleep(0.2)
+            task_manager.set_task_file_path(waiting, final)
+            task_manager.complete_task(waiting)
+            progress_bridge.publish(waiting, complete_event("merged.mkv", 6, "/file"))
+
+        threading.Thread(target=complete).start()
+        response = client.get(f"/api/v1/download/{waiting}/file", params={"stream": True})
+        assert response.status_code == 200
+        assert response.content == b"merged"
+        assert response.headers["accept-ranges"] == "bytes"
+
+        # 스트리밍하지 않으면 기존처럼 완료 전에는 404
+        pending = task_manager.create_task("https://youtu.be/pending", {})
+        assert client.get(f"/api/v1/download/{pending}/file").status_code == 404
+
+
+def test_download_task_records_partial_path(monkeypatch, tmp_path):
+    """스트리밍할 수 있는 다운로드면 진행 중에 .part 경로를 저장 (오디오 변환은 제외)"""
+    video = tmp_path / "video.mp4"
+    seen = {}
+
+    class FakeDownloader:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def download(self, url, progress_callback=None, message_callback=None):
+            progress_callback({**hook(str(video)), "downloaded_bytes": 5, "total_bytes": 10})
+            seen[task_id] = task_manager.get_task(task_id)["partial_path"]
+            video.write_bytes(b"data")
+            return DownloadResult(success=True, file_path=video)
+
+    monkeypatch.setattr(api, "Downloader", FakeDownloader)
+    monkeypatch.setattr(api, "get_download_archive", lambda: None)
+
+    for options in (DownloadOptions(), DownloadOptions(audio_only=True)):
+        task_id = task_manager.create_task("https://youtu.be/partial", options.model_dump())
+        api.download_task(task_id, "https://youtu.be/partial", options)
+        assert task_manager.get_task(task_id)["status"] == "completed"
+
+    first, second = seen.values()
+    assert first == f"{video}.part"
+    assert second is None
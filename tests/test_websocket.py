@@ -0,0 +1,211 @@
+"""WebSocket pub/sub 허브 테스트"""
+
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from youtube_downloader.web import auth_api
+from youtube_downloader.web import websocket as websocket_module
+from youtube_downloader.web.app import app
+from youtube_downloader.web.progress import progress_bridge
+from youtube_downloader.web.tasks import task_manager
+from youtube_downloader.web.websocket import (
+    ConnectionManager,
+    complete_event,
+    manager,
+    progress_event,
+    status_event,
+)
+
+
+class SlowWebSocket:
+    """send_text가 release 전까지 멈춰 있는 가짜 연결"""
+
+    def __init__(self):
+        self.sent = []
+        self.release = asyncio.Event()
+        self.closed_with = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        await self.release.wait()
+        self.sent.append(text)
+
+    async def close(self, code=1000):
+        self.closed_with = code
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_every_tab_receives_events_and_late_joiners_get_replay():
+    """한 작업에 여러 연결이 붙을 수 있고, 늦게 연결해도 지난 이벤트를 받음"""
+    task_id = "ws-replay"
+    with TestClient(app) as client:
+        progress_bridge.publish(task_id, status_event("downloading"))
+        progress_bridge.publish(task_id, progress_event(40, 40, 100))
+        wait_for(lambda: len(manager.history.get(task_id, ())) == 2)
+
+        with client.websocket_connect(f"/ws/download/{task_id}") as first, \
+                client.websocket_connect(f"/ws/download/{task_id}") as second:
+            for ws in (first, second):
+                assert ws.receive_json()["type"] == "status"
+                assert ws.receive_json()["data"]["percentage"] == 40
+
+            progress_bridge.publish(task_id, complete_event("video.mp4", 100, "/file"))
+            for ws in (first, second):
+                assert ws.receive_json()["type"] == "complete"
+
+        # 끝난 작업에 나중에 연결해도 완료 메시지를 받음
+        with client.websocket_connect(f"/ws/download/{task_id}") as late:
+            assert [late.receive_json()["type"] for _ in range(3)] == ["status", "progress", "complete"]
+
+        wait_for(lambda: manager.connections(task_id) == 0)
+
+
+def test_history_keeps_only_latest_progress():
+    """링 버퍼에는 연속된 진행률 중 최신 값만 남음"""
+    hub = ConnectionManager(history_size=3)
+
+    async def publish():
+        await hub.send_message("t", status_event("downloading"))
+        for i in range(50):
+            await hub.send_message("t", progress_event(i, i, 50))
+        await hub.send_message("t", complete_event("video.mp4", 50, "/file"))
+
+    asyncio.run(publish())
+    history = list(hub.history["t"])
+    assert [message["type"] for message in history] == ["status", "progress", "complete"]
+    assert history[1]["data"]["percentage"] == 49
+
+
+def test_slow_subscriber_drops_progress_without_blocking():
+    """느린 연결은 진행률을 버리고, 완료 메시지는 받으며, 발행 쪽을 막지 않음"""
+    hub = ConnectionManager(queue_size=4)
+
+    async def main():
+        slow = SlowWebSocket()
+        subscriber = await hub.connect("t", slow)
+        began = time.monotonic()
+        for i in range(1000):
+            await hub.send_message("t", progress_event(i // 10, i, 1000))
+        await hub.send_message("t", complete_event("video.mp4", 1000, "/file"))
+        assert time.monotonic() - began < 1.0
+
+        slow.release.set()
+        while len(slow.sent) < 2:
+            await asyncio.sleep(0.01)
+        return subscriber, slow
+
+    subscriber, slow = asyncio.run(main())
+    assert subscriber.dropped > 0
+    assert '"complete"' in slow.sent[-1]
+    assert len(slow.sent) <= 4
+
+
+def test_subscriber_that_cannot_keep_up_is_disconnected():
+    """진행률을 버려도 자리가 없으면 연결을 끊음"""
+    hub = ConnectionManager(queue_size=2)
+
+    async def main():
+        slow = SlowWebSocket()
+        await hub.connect("t", slow)
+        for status in ("downloading", "processing", "downloading"):
+            await hub.send_message("t", status_event(status))
+        return slow
+
+    slow = asyncio.run(main())
+    assert slow.closed_with == 1013
+    assert hub.connections("t") == 0
+
+
+@pytest.fixture
+def user_client(monkeypatch):
+    """토큰 "good"이면 사용자 7로 인증되는 TestClient"""
+    monkeypatch.setattr(
+        auth_api, "user_from_token", lambda token, db: SimpleNamespace(id=7) if token == "good" else None
+    )
+    with TestClient(app) as client:
+        yield client
+
+
+def receive_events(ws, count, decode=None):
+    """batch 프레임을 풀어서 이벤트 count개 반환"""
+    events = []
+    while len(events) < count:
+        frame = decode(ws.receive_bytes()) if decode else ws.receive_json()
+        assert frame["type"] == "batch"
+        events.extend(frame["events"])
+    return events
+
+
+def test_user_socket_multiplexes_tasks(user_client):
+    """연결 하나로 사용자의 여러 작업 이벤트를 묶어서 받음"""
+    first = task_manager.create_task("https://youtu.be/a", {}, user_id="7")
+    second = task_manager.create_task("https://youtu.be/b", {}, user_id="7")
+    other = task_manager.create_task("https://youtu.be/c", {}, user_id="8")
+
+    with user_client.websocket_connect("/ws/tasks?token=good") as ws:
+        subscribed = receive_events(ws, 1)[0]
+        assert subscribed["type"] == "subscribed"
+        assert {first, second} <= set(subscribed["data"]["task_ids"])
+        assert other not in subscribed["data"]["task_ids"]
+
+        for i in range(20):
+            progress_bridge.publish(first, progress_event(i, i, 20))
+        progress_bridge.publish(second, complete_event("b.mp4", 10, "/file"))
+        progress_bridge.publish(first, complete_event("a.mp4", 20, "/file"))
+
+        events = []
+        while sum(event["type"] == "complete" for event in events) < 2:
+            events.extend(receive_events(ws, 1))
+        assert {event["task_id"] for event in events} == {first, second}
+        # 진행률은 합쳐져서 20개보다 훨씬 적게 도착
+        assert sum(event["type"] == "progress" for event in events) < 10
+
+        ws.send_json({"action": "subscribe", "task_ids": [other, "missing"]})
+        reply = receive_events(ws, 1)[0]
+        assert reply["data"] == {"task_ids": [], "rejected": [other, "missing"]}
+
+        ws.send_json({"action": "unsubscribe", "task_ids": [first]})
+        assert receive_events(ws, 1)[0]["type"] == "unsubscribed"
+        wait_for(lambda: manager.connections(first) == 0)
+        assert manager.connections(second) == 1
+
+        ws.send_text("not json")
+        assert receive_events(ws, 1)[0]["data"]["code"] == "INVALID_MESSAGE"
+
+
+def test_user_socket_requires_token(user_client):
+    """토큰이 없거나 잘못되면 연결 거부"""
+    with pytest.raises(WebSocketDisconnect) as exc_info:
+        with user_client.websocket_connect("/ws/tasks?token=bad"):
+            pass
+    assert exc_info.value.code == 1008
+
+
+def test_user_socket_msgpack_encoding(user_client, monkeypatch):
+    """encoding=msgpack이면 바이너리 프레임, msgpack이 없으면 거부"""
+    monkeypatch.setattr(websocket_module, "msgpack", None)
+    with pytest.raises(WebSocketDisconnect) as exc_info:
+        with user_client.websocket_connect("/ws/tasks?token=good&encoding=msgpack"):
+            pass
+    assert exc_info.value.code == 1003
+
+    fake = SimpleNamespace(packb=lambda frame: json.dumps(frame).encode())
+    monkeypatch.setattr(websocket_module, "msgpack", fake)
+    with user_client.websocket_connect("/ws/tasks?token=good&encoding=msgpack") as ws:
+        events = receive_events(ws, 1, decode=json.loads)
+        assert events[0]["type"] == "subscribed"